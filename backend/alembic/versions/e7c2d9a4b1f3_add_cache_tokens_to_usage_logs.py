@@ -0,0 +1,31 @@
+"""add prompt-cache token columns to usage_logs
+
+Revision ID: e7c2d9a4b1f3
+Revises: a1b2c3d4e5f6
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e7c2d9a4b1f3"
+down_revision: str | Sequence[str] | None = "a1b2c3d4e5f6"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Add cache_read_tokens and cache_write_tokens to usage_logs."""
+    op.add_column("usage_logs", sa.Column("cache_read_tokens", sa.Integer(), nullable=False, server_default="0"))
+    op.add_column("usage_logs", sa.Column("cache_write_tokens", sa.Integer(), nullable=False, server_default="0"))
+
+
+def downgrade() -> None:
+    """Remove prompt-cache token columns from usage_logs."""
+    op.drop_column("usage_logs", "cache_write_tokens")
+    op.drop_column("usage_logs", "cache_read_tokens")
@@ -0,0 +1,48 @@
+"""LangGraph checkpointer lifecycle shared by the API and worker entry points."""
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+
+async def open_checkpointer(database_url: str | None):
+    """Open the LangGraph checkpointer (production: AsyncPostgresSaver, fallback: MemorySaver).
+
+    Args:
+        database_url: SQLAlchemy database URL from Settings
+
+    Returns:
+        Tuple of (checkpointer, context_manager). context_manager is None for MemorySaver
+        and must be passed to close_checkpointer() on shutdown otherwise.
+    """
+    try:
+        from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+
+        if database_url and "postgresql" in database_url:
+            # AsyncPostgresSaver uses psycopg directly — strip SQLAlchemy dialect
+            conn_string = database_url.replace("+asyncpg", "").replace("+psycopg", "")
+            # from_conn_string returns an async context manager — enter it
+            checkpointer_cm = AsyncPostgresSaver.from_conn_string(conn_string)
+            checkpointer = await checkpointer_cm.__aenter__()
+            await checkpointer.setup()  # idempotent — creates tables if missing
+            logger.info("checkpointer_initialized", type="AsyncPostgresSaver")
+            return checkpointer, checkpointer_cm
+
+        from langgraph.checkpoint.memory import MemorySaver
+
+        logger.info("checkpointer_initialized", type="MemorySaver", reason="no_database_url")
+        return MemorySaver(), None
+    except Exception as e:
+        from langgraph.checkpoint.memory import MemorySaver
+
+        logger.warning("checkpointer_fallback", type="MemorySaver", error=str(e), error_type=type(e).__name__)
+        return MemorySaver(), None
+
+
+async def close_checkpointer(checkpointer_cm) -> None:
+    """Close a checkpointer opened by open_checkpointer(). Never raises."""
+    try:
+        if checkpointer_cm is not None:
+            await checkpointer_cm.__aexit__(None, None, None)
+    except Exception:
+        pass
@@ -0,0 +1,259 @@
+"""Token-budgeted file context for agent prompts.
+
+The coder, debugger and reviewer each need some of the project's files in their
+prompt. Sending every file overflows the prompt on large projects; sending file
+names only leaves the model guessing. This module ranks the working files by
+relevance to the current step and packs their contents into a per-role token
+budget (CODER_CONTEXT_TOKENS, DEBUGGER_CONTEXT_TOKENS, REVIEWER_CONTEXT_TOKENS).
+
+Ranking, highest first:
+1. the step's files_to_modify
+2. files named in the active errors (ErrorInfo.file_path, paths in stderr/stdout)
+3. import-graph neighbours of those files, in either direction (imports parsed
+   with KnowledgeGraph._parse_python / _parse_javascript, cached by content hash)
+4. everything else, in working_files order
+
+Files are added whole while they fit. The first file that does not fit is
+truncated to the remaining budget, and files after that are listed by name only.
+Token counts use a local estimate (characters / CHARS_PER_TOKEN), not a tokenizer
+round trip.
+
+report_context() logs each call's context and estimated prompt tokens and emits
+them to CloudWatch so the budgets can be tuned.
+"""
+
+import hashlib
+import math
+import posixpath
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+
+import structlog
+
+from app.agent.llm_helpers import message_text
+from app.agent.state import CoFounderState
+from app.core.config import get_settings
+from app.memory.knowledge_graph import get_knowledge_graph
+from app.metrics.cloudwatch import emit_context_tokens
+
+logger = structlog.get_logger(__name__)
+
+CHARS_PER_TOKEN = 3.5  # conservative for source code; English prose is closer to 4
+MIN_TRUNCATED_TOKENS = 200  # below this, list the file by name instead of truncating it
+IMPORT_CACHE_MAX = 4096
+
+SCORE_TARGET = 100
+SCORE_ERROR = 80
+SCORE_NEIGHBOUR = 40
+
+_PYTHON_EXTENSIONS = (".py", ".pyi")
+_JS_EXTENSIONS = (".ts", ".tsx", ".js", ".jsx", ".mjs", ".cjs")
+
+# (path, sha256 of content) -> import names found in the file
+_import_cache: OrderedDict[tuple[str, str], list[str]] = OrderedDict()
+
+
+def estimate_tokens(text: str) -> int:
+    """Fast local estimate of the Anthropic token count of text."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def budget_for(role: str) -> int:
+    """Context token budget for an agent role."""
+    settings = get_settings()
+    return {
+        "coder": settings.coder_context_tokens,
+        "debugger": settings.debugger_context_tokens,
+        "reviewer": settings.reviewer_context_tokens,
+    }[role]
+
+
+@dataclass
+class PackedContext:
+    """File sections packed into a token budget, in rank order."""
+
+    budget: int
+    blocks: list[tuple[str, str]] = field(default_factory=list)  # (path, rendered block)
+    truncated: list[str] = field(default_factory=list)
+    omitted: list[str] = field(default_factory=list)
+    tokens: int = 0
+
+    @property
+    def included(self) -> list[str]:
+        return [path for path, _ in self.blocks]
+
+    def render(self, include: Callable[[str], bool] = lambda path: True) -> str:
+        """Packed blocks whose path passes include, with a trailer naming omitted files."""
+        text = "".join(block for path, block in self.blocks if include(path))
+        omitted = [path for path in self.omitted if include(path)]
+        if omitted:
+            text += f"(Not shown, over the context budget: {', '.join(omitted)})\n"
+        return text
+
+
+def pack(sections: Iterable[tuple[str, str]], budget: int) -> PackedContext:
+    """Pack (path, body) sections, already in rank order, into budget tokens."""
+    packed = PackedContext(budget=budget)
+    for path, body in sections:
+        block = f"=== {path} ===\n{body}\n"
+        cost = estimate_tokens(block)
+        remaining = budget - packed.tokens
+        if packed.omitted or (cost > remaining and remaining < MIN_TRUNCATED_TOKENS):
+            packed.omitted.append(path)
+            continue
+        if cost > remaining:
+            header = f"=== {path} (truncated) ===\n"
+            marker = "\n... [truncated]\n"
+            keep = int((remaining - estimate_tokens(header + marker)) * CHARS_PER_TOKEN)
+            block = header + body[: max(keep, 0)] + marker
+            cost = estimate_tokens(block)
+            packed.truncated.append(path)
+        packed.blocks.append((path, block))
+        packed.tokens += cost
+    return packed
+
+
+def rank_files(state: CoFounderState, paths: Iterable[str] | None = None) -> list[str]:
+    """Working file paths (or the given subset) ordered by relevance to the current step."""
+    working_files = state["working_files"]
+    candidates = list(paths if paths is not None else working_files)
+    step = state["plan"][state["current_step_index"]] if state.get("plan") else {}
+
+    scores = dict.fromkeys(candidates, 0)
+    targets = {p for p in step.get("files_to_modify", []) if p in working_files}
+    errored = error_paths(state.get("active_errors", []), working_files)
+    graph = import_graph(working_files)
+
+    for path in targets | errored:
+        for neighbour in graph.get(path, set()):
+            if neighbour in scores:
+                scores[neighbour] = max(scores[neighbour], SCORE_NEIGHBOUR)
+    for path in errored:
+        if path in scores:
+            scores[path] = max(scores[path], SCORE_ERROR)
+    for path in targets:
+        if path in scores:
+            scores[path] = SCORE_TARGET
+
+    order = {path: i for i, path in enumerate(candidates)}
+    return sorted(candidates, key=lambda p: (-scores[p], order[p]))
+
+
+def build_file_context(state: CoFounderState, role: str, budget: int | None = None) -> PackedContext:
+    """Rank the working files and pack their contents into role's token budget."""
+    files = state["working_files"]
+    ranked = rank_files(state)
+    return pack(((path, files[path]["new_content"]) for path in ranked), budget or budget_for(role))
+
+
+def error_paths(errors: list, working_files: dict) -> set[str]:
+    """Working file paths named by the errors (file_path, or mentioned in their output)."""
+    found = {err["file_path"] for err in errors if err.get("file_path") in working_files}
+    text = "\n".join(f"{err.get('message', '')}\n{err.get('stdout', '')}\n{err.get('stderr', '')}" for err in errors)
+    if text.strip():
+        found.update(path for path in working_files if path in text)
+    return found
+
+
+def import_graph(working_files: dict) -> dict[str, set[str]]:
+    """Undirected import adjacency between working files (imports resolved to file paths)."""
+    modules = _python_module_index(working_files)
+    graph: dict[str, set[str]] = {path: set() for path in working_files}
+    for path, change in working_files.items():
+        for name in _imports(path, change["new_content"]):
+            target = _resolve_import(path, name, working_files, modules)
+            if target is not None and target != path:
+                graph[path].add(target)
+                graph[target].add(path)
+    return graph
+
+
+async def report_context(role: str, state: CoFounderState, packed: PackedContext, messages: list) -> None:
+    """Log and emit the tokens a call spends on packed file context and on the whole prompt."""
+    prompt_tokens = sum(estimate_tokens(message_text(m)) for m in messages)
+    logger.info(
+        "llm_context_tokens",
+        role=role,
+        session_id=state.get("session_id"),
+        step_index=state.get("current_step_index"),
+        budget=packed.budget,
+        context_tokens=packed.tokens,
+        prompt_tokens=prompt_tokens,
+        files_included=len(packed.blocks),
+        files_truncated=len(packed.truncated),
+        files_omitted=len(packed.omitted),
+    )
+    await emit_context_tokens(role, packed.tokens, prompt_tokens, packed.budget)
+
+
+def _imports(path: str, content: str) -> list[str]:
+    """Import names in a source file, cached by content hash."""
+    if not path.endswith(_PYTHON_EXTENSIONS + _JS_EXTENSIONS):
+        return []
+    key = (path, hashlib.sha256(content.encode("utf-8")).hexdigest())
+    names = _import_cache.get(key)
+    if names is not None:
+        _import_cache.move_to_end(key)
+        return names
+
+    kg = get_knowledge_graph()
+    parse = kg._parse_python if path.endswith(_PYTHON_EXTENSIONS) else kg._parse_javascript
+    entities, _ = parse(path, content)
+    names = [e.name for e in entities if e.entity_type == "import"]
+
+    _import_cache[key] = names
+    if len(_import_cache) > IMPORT_CACHE_MAX:
+        _import_cache.popitem(last=False)
+    return names
+
+
+def _python_module_index(working_files: dict) -> dict[str, str]:
+    """Dotted module name -> path for every Python working file."""
+    index: dict[str, str] = {}
+    for path in working_files:
+        if path.endswith(_PYTHON_EXTENSIONS):
+            module = path.rsplit(".", 1)[0].removesuffix("/__init__").replace("/", ".")
+            index[module] = path
+    return index
+
+
+def _resolve_import(importer: str, name: str, working_files: dict, modules: dict[str, str]) -> str | None:
+    if importer.endswith(_PYTHON_EXTENSIONS):
+        return _resolve_python(importer, name, modules)
+    return _resolve_javascript(importer, name, working_files)
+
+
+def _resolve_python(importer: str, name: str, modules: dict[str, str]) -> str | None:
+    """Match "pkg.mod" / "pkg.mod.Name" against module paths (also when rooted under src/ etc.)."""
+    parts = name.split(".")
+    importer_dir = posixpath.dirname(importer).replace("/", ".")
+    for k in range(len(parts), 0, -1):
+        candidate = ".".join(parts[:k])
+        # Relative imports lose their dots in the parser; try the importer's package first
+        for module in (f"{importer_dir}.{candidate}" if importer_dir else candidate, candidate):
+            if module in modules:
+                return modules[module]
+        matches = [path for module, path in modules.items() if module.endswith("." + candidate)]
+        if len(matches) == 1:
+            return matches[0]
+    return None
+
+
+def _resolve_javascript(importer: str, spec: str, working_files: dict) -> str | None:
+    """Resolve a relative or "@/" import specifier to a working file path."""
+    if spec.startswith("."):
+        bases = [posixpath.normpath(posixpath.join(posixpath.dirname(importer), spec))]
+    elif spec.startswith("@/"):
+        bases = [f"src/{spec[2:]}", spec[2:]]
+    else:
+        return None  # package import
+    for base in bases:
+        for candidate in (
+            base,
+            *(base + ext for ext in _JS_EXTENSIONS),
+            *(f"{base}/index{ext}" for ext in _JS_EXTENSIONS),
+        ):
+            if candidate in working_files:
+                return candidate
+    return None
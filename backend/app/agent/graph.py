@@ -7,10 +7,20 @@ The graph supports:
 - Checkpointing for long-running tasks
 - Human-in-the-loop interrupts for safety gates
 - Cyclic retries with automatic escalation
+- Parallel plan steps (max_parallel_steps > 1)
+
+With max_parallel_steps > 1 the architect's plan is scheduled by step dependencies
+(PlanStep.depends_on): every step whose dependencies are complete is fanned out
+with Send to a "step" node, which runs the Coder -> Executor -> (Debugger) ->
+Reviewer loop for that step alone. Branches return only the files they changed
+or approved (merged by the merge_files reducer) plus a StepResult; "merge_steps"
+folds the results into the plan and dispatches the next wave, or hands off to
+GitManager once every step is complete. At most max_parallel_steps branches run per wave.
 """
 
 from langgraph.checkpoint.memory import MemorySaver
 from langgraph.graph import END, StateGraph
+from langgraph.types import Send
 
 from app.agent.nodes import (
     architect_node,
@@ -20,7 +30,7 @@ from app.agent.nodes import (
     git_manager_node,
     reviewer_node,
 )
-from app.agent.state import CoFounderState
+from app.agent.state import CoFounderState, StepResult
 
 
 def should_continue_after_executor(state: CoFounderState) -> str:
@@ -77,16 +87,154 @@ def should_continue_after_architect(state: CoFounderState) -> str:
     return "coder"
 
 
-def create_cofounder_graph(checkpointer=None):
+def ready_steps(state: CoFounderState) -> list[int]:
+    """Plan positions of pending steps whose dependencies have all completed."""
+    plan = state.get("plan", [])
+    done = {i for i, step in enumerate(plan) if step["status"] == "completed"}
+    return [
+        i
+        for i, step in enumerate(plan)
+        if step["status"] == "pending" and set(step.get("depends_on", range(i))) <= done
+    ]
+
+
+def dispatch_steps(state: CoFounderState, max_parallel_steps: int) -> list[Send] | str:
+    """Fan out every ready plan step (up to max_parallel_steps) to its own branch."""
+    if not state.get("plan") or state.get("needs_human_review") or state.get("has_fatal_error"):
+        return "end"
+    if state.get("is_complete"):
+        return "git_manager"
+
+    ready = ready_steps(state)
+    if not ready:
+        # Remaining steps depend on a step that did not complete
+        return "end"
+    return [
+        Send(
+            "step",
+            {
+                **state,
+                "current_step_index": i,
+                "active_errors": [],
+                "retry_count": 0,
+                "is_complete": False,
+                "step_results": [],
+            },
+        )
+        for i in ready[:max_parallel_steps]
+    ]
+
+
+async def step_reviewer_node(state: CoFounderState) -> dict:
+    """Reviewer for a single-step branch: approval ends the branch.
+
+    reviewer_node advances current_step_index on approval (the sequential graph
+    moves on to the next step); on a branch the step index stays put and
+    is_complete marks this step as done.
+    """
+    update = await reviewer_node(state)
+    if "plan" in update:  # only approvals update the plan
+        update = {**update, "current_step_index": state["current_step_index"], "is_complete": True}
+    return update
+
+
+def create_step_graph():
+    """Compile the Coder -> Executor -> (Debugger) -> Reviewer loop for one plan step."""
+    builder = StateGraph(CoFounderState)
+    builder.add_node("coder", coder_node)
+    builder.add_node("executor", executor_node)
+    builder.add_node("debugger", debugger_node)
+    builder.add_node("reviewer", step_reviewer_node)
+    builder.set_entry_point("coder")
+    builder.add_edge("coder", "executor")
+    builder.add_conditional_edges(
+        "executor",
+        should_continue_after_executor,
+        {"reviewer": "reviewer", "debugger": "debugger", "end": END},
+    )
+    builder.add_conditional_edges("debugger", should_continue_after_debugger, {"coder": "coder", "end": END})
+    builder.add_conditional_edges(
+        "reviewer",
+        should_continue_after_reviewer,
+        {"coder": "coder", "git_manager": END, "end": END},
+    )
+    # Branches are short-lived; the parent graph checkpoints between waves
+    return builder.compile(checkpointer=False)
+
+
+def _make_step_node(step_graph):
+    async def step_node(state: CoFounderState) -> dict:
+        """Build one plan step on its own branch and report what changed."""
+        final = await step_graph.ainvoke(state)
+        changed = {
+            path: change
+            for path, change in final["working_files"].items()
+            if state["working_files"].get(path) != change
+        }
+        approved = {
+            path: content
+            for path, content in final.get("approved_files", {}).items()
+            if state.get("approved_files", {}).get(path) != content
+        }
+        result = StepResult(
+            index=state["current_step_index"],
+            status="completed" if final.get("is_complete") else "failed",
+            retry_count=final.get("retry_count", 0),
+            needs_human_review=final.get("needs_human_review", False),
+            has_fatal_error=final.get("has_fatal_error", False),
+            active_errors=final.get("active_errors", []),
+            last_tool_output=final.get("last_tool_output"),
+            last_command_exit_code=final.get("last_command_exit_code"),
+        )
+        return {
+            "working_files": changed,
+            "approved_files": approved,
+            "step_results": [result],
+            "messages": final["messages"][len(state["messages"]) :],
+        }
+
+    return step_node
+
+
+def merge_steps_node(state: CoFounderState) -> dict:
+    """Fold the branches' StepResults into the plan and control-flow flags."""
+    latest = {r["index"]: r for r in state["step_results"]}
+    plan = [{**step, "status": latest[i]["status"]} if i in latest else step for i, step in enumerate(state["plan"])]
+    failed = [r for r in latest.values() if r["status"] == "failed"]
+    completed = sum(1 for step in plan if step["status"] == "completed")
+    pending = [i for i, step in enumerate(plan) if step["status"] != "completed"]
+    last = state["step_results"][-1] if state["step_results"] else None
+
+    return {
+        "plan": plan,
+        "current_step_index": pending[0] if pending else len(plan) - 1,
+        "is_complete": not pending,
+        "needs_human_review": any(r["needs_human_review"] for r in failed),
+        "has_fatal_error": any(r["has_fatal_error"] for r in failed),
+        "active_errors": [e for r in failed for e in r["active_errors"]],
+        "retry_count": max((r["retry_count"] for r in failed), default=0),
+        "last_tool_output": last["last_tool_output"] if last else state.get("last_tool_output"),
+        "last_command_exit_code": last["last_command_exit_code"] if last else state.get("last_command_exit_code"),
+        "current_node": "merge_steps",
+        "status_message": f"Completed {completed}/{len(plan)} steps",
+    }
+
+
+def create_cofounder_graph(checkpointer=None, max_parallel_steps: int = 1):
     """Create the AI Co-Founder graph with optional checkpointing.
 
     Args:
         checkpointer: Optional checkpointer for state persistence.
                      Use MemorySaver for testing, PostgresSaver for production.
+        max_parallel_steps: Plan steps built concurrently. 1 keeps the sequential
+                     step-by-step graph; above 1, independent steps fan out.
 
     Returns:
         Compiled LangGraph that can be invoked with a CoFounderState.
     """
+    if max_parallel_steps > 1:
+        return _create_parallel_graph(checkpointer, max_parallel_steps)
+
     # Create the graph builder
     builder = StateGraph(CoFounderState)
 
@@ -157,6 +305,34 @@ def create_cofounder_graph(checkpointer=None):
     return graph
 
 
+def _create_parallel_graph(checkpointer, max_parallel_steps: int):
+    builder = StateGraph(CoFounderState)
+
+    builder.add_node("architect", architect_node)
+    builder.add_node("step", _make_step_node(create_step_graph()))
+    builder.add_node("merge_steps", merge_steps_node)
+    builder.add_node("git_manager", git_manager_node)
+
+    builder.set_entry_point("architect")
+
+    def dispatch(state: CoFounderState) -> list[Send] | str:
+        return dispatch_steps(state, max_parallel_steps)
+
+    destinations = {"step": "step", "git_manager": "git_manager", "end": END}
+    builder.add_conditional_edges("architect", dispatch, destinations)
+    builder.add_edge("step", "merge_steps")
+    builder.add_conditional_edges("merge_steps", dispatch, destinations)
+    builder.add_edge("git_manager", END)
+
+    if checkpointer is None:
+        checkpointer = MemorySaver()
+
+    return builder.compile(
+        checkpointer=checkpointer,
+        interrupt_before=["git_manager"],  # Safety gate before git operations
+    )
+
+
 # Convenience function to create a production-ready graph
 def create_production_graph(database_url: str | None = None, checkpointer=None):
     """Create a graph with optional production checkpointing.
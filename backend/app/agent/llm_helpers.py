@@ -4,12 +4,14 @@ This module provides:
 - _strip_json_fences: Remove markdown code fences from LLM output
 - _parse_json_response: Parse JSON from LLM response after stripping fences
 - _invoke_with_retry: Retry LLM invocation on Claude 529 OverloadedError
+- cacheable_system / cacheable_context: Messages with Anthropic prompt-cache breakpoints
 """
 
 import json
 
 import structlog
 from anthropic._exceptions import OverloadedError
+from langchain_core.messages import HumanMessage, SystemMessage
 from tenacity import (
     retry,
     retry_if_exception_type,
@@ -37,6 +39,44 @@ def _parse_json_response(content: str) -> dict | list:
     return json.loads(_strip_json_fences(content))
 
 
+# Anthropic caches the prompt prefix up to and including a block carrying this marker
+# (5 minute TTL, refreshed on every hit). Prefixes below the model's minimum (1024
+# tokens for Sonnet/Opus) are simply not cached, so marking short prompts is harmless.
+# At most 4 breakpoints per request.
+CACHE_CONTROL = {"type": "ephemeral"}
+
+
+def cacheable_system(prompt: str, suffix: str | None = None) -> SystemMessage:
+    """SystemMessage whose prompt is a cache breakpoint.
+
+    suffix (e.g. a stricter output instruction on retry) goes after the breakpoint,
+    so the retry still reads the cached prompt.
+    """
+    blocks: list[str | dict] = [{"type": "text", "text": prompt, "cache_control": CACHE_CONTROL}]
+    if suffix:
+        blocks.append({"type": "text", "text": suffix})
+    return SystemMessage(content=blocks)
+
+
+def cacheable_context(stable: str, volatile: str) -> HumanMessage:
+    """HumanMessage with a cached stable block followed by an uncached volatile one.
+
+    Put context that repeats across calls (e.g. files a retry loop does not touch)
+    in stable, and per-call details (errors, test output) in volatile.
+    """
+    blocks: list[str | dict] = [{"type": "text", "text": stable, "cache_control": CACHE_CONTROL}]
+    if volatile:
+        blocks.append({"type": "text", "text": volatile})
+    return HumanMessage(content=blocks)
+
+
+def message_text(message) -> str:
+    """Plain text of a message whose content is a string or a list of text blocks."""
+    if isinstance(message.content, str):
+        return message.content
+    return "".join(block["text"] for block in message.content if isinstance(block, dict) and "text" in block)
+
+
 @retry(
     retry=retry_if_exception_type(OverloadedError),
     stop=stop_after_attempt(4),
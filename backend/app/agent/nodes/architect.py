@@ -4,8 +4,9 @@ Uses Claude Opus for complex reasoning and planning.
 """
 
 import structlog
-from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.messages import HumanMessage
 
+from app.agent.llm_helpers import cacheable_system
 from app.agent.state import CoFounderState, PlanStep
 from app.core.llm_config import create_tracked_llm
 from app.memory.mem0_client import get_semantic_memory
@@ -34,6 +35,10 @@ Output your plan as a JSON array of steps, each with:
 - description: clear description of what to do
 - status: "pending"
 - files_to_modify: list of file paths to touch
+- depends_on: indices of earlier steps whose output this step needs
+
+Steps with no dependency on each other are built in parallel, so only list the
+steps a step really builds on. Every step implicitly depends on step 0.
 
 Example:
 [
@@ -41,13 +46,29 @@ Example:
     "index": 0,
     "description": "Scaffold project with package.json (dependencies, scripts) and tsconfig.json",
     "status": "pending",
-    "files_to_modify": ["package.json", "tsconfig.json"]
+    "files_to_modify": ["package.json", "tsconfig.json"],
+    "depends_on": []
   },
   {
     "index": 1,
     "description": "Create the main application entry point and layout",
     "status": "pending",
-    "files_to_modify": ["src/App.tsx", "src/index.tsx"]
+    "files_to_modify": ["src/App.tsx", "src/index.tsx"],
+    "depends_on": [0]
+  },
+  {
+    "index": 2,
+    "description": "Create the pricing page",
+    "status": "pending",
+    "files_to_modify": ["src/pages/Pricing.tsx"],
+    "depends_on": [1]
+  },
+  {
+    "index": 3,
+    "description": "Create the contact form component",
+    "status": "pending",
+    "files_to_modify": ["src/components/ContactForm.tsx"],
+    "depends_on": [1]
   }
 ]
 
@@ -87,7 +108,7 @@ Previous context:
 """
 
     messages = [
-        SystemMessage(content=ARCHITECT_SYSTEM_PROMPT),
+        cacheable_system(ARCHITECT_SYSTEM_PROMPT),
         HumanMessage(content=context),
     ]
 
@@ -104,8 +125,9 @@ Previous context:
                 description=step["description"],
                 status="pending",
                 files_to_modify=step.get("files_to_modify", []),
+                depends_on=deps,
             )
-            for step in plan_data
+            for step, deps in zip(plan_data, _resolve_dependencies(plan_data), strict=True)
         ]
     except json.JSONDecodeError:
         # Fallback: create a single-step plan
@@ -115,6 +137,7 @@ Previous context:
                 description=state["current_goal"],
                 status="pending",
                 files_to_modify=[],
+                depends_on=[],
             )
         ]
 
@@ -141,6 +164,28 @@ Previous context:
     }
 
 
+def _resolve_dependencies(steps: list[dict]) -> list[list[int]]:
+    """Sanitized depends_on for each step of a raw plan, by position.
+
+    Only earlier steps are kept (so the graph is acyclic). Step 0 (scaffolding) and
+    any earlier step touching one of the same files are always added. A step with no
+    depends_on list depends on its predecessor, i.e. the plan runs sequentially.
+    """
+    resolved: list[list[int]] = []
+    for i, step in enumerate(steps):
+        raw = step.get("depends_on")
+        if not isinstance(raw, list):
+            resolved.append([i - 1] if i else [])
+            continue
+        deps = {d for d in raw if isinstance(d, int) and 0 <= d < i}
+        files = set(step.get("files_to_modify", []))
+        deps.update(j for j in range(i) if files & set(steps[j].get("files_to_modify", [])))
+        if i:
+            deps.add(0)
+        resolved.append(sorted(deps))
+    return resolved
+
+
 def _format_messages(messages: list[dict]) -> str:
     """Format messages for context."""
     if not messages:
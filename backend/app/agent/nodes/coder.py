@@ -1,12 +1,28 @@
 """Coder Node: Generates code changes for the current plan step.
 
-Uses Claude Sonnet for efficient code generation.
+Uses Claude Sonnet for efficient code generation. The response is streamed:
+===FILE: ...=== blocks are parsed as tokens arrive, and each file is announced
+on the job's log stream as soon as its ===END FILE=== marker is received, rather
+than after the whole multi-file response has been generated.
 """
 
-from langchain_core.messages import HumanMessage, SystemMessage
+import re
+import time
 
+import structlog
+from langchain_core.messages import HumanMessage
+
+from app.agent.context_builder import build_file_context, report_context
+from app.agent.llm_helpers import cacheable_system, message_text
 from app.agent.state import CoFounderState, FileChange
 from app.core.llm_config import create_tracked_llm
+from app.services.log_streamer import get_streamer
+
+logger = structlog.get_logger(__name__)
+
+_FILE_START = "===FILE:"
+_FILE_HEADER_RE = re.compile(r"===FILE:\s*(.+?)===\n")
+_FILE_END = "===END FILE==="
 
 CODER_SYSTEM_PROMPT = """You are an expert software engineer implementing code changes.
 Your task is to write or modify code according to the current plan step.
@@ -49,6 +65,9 @@ async def coder_node(state: CoFounderState) -> dict:
 
     current_step = state["plan"][state["current_step_index"]]
 
+    # Step files, error-trace files and their import neighbours first, within budget
+    files = build_file_context(state, "coder")
+
     # Build context
     context = f"""
 Project Path: {state["project_path"]}
@@ -64,17 +83,39 @@ Previous errors (if any):
 
 Existing working files:
 {_format_working_files(state["working_files"])}
+
+Relevant file contents:
+{files.render() or "None"}
 """
 
     messages = [
-        SystemMessage(content=CODER_SYSTEM_PROMPT),
+        cacheable_system(CODER_SYSTEM_PROMPT),
         HumanMessage(content=context),
     ]
-
-    response = await llm.ainvoke(messages)
-
-    # Parse file changes from response
-    new_files = _parse_file_changes(response.content)
+    await report_context("coder", state, files, messages)
+
+    # Stream the response and collect each file as soon as its block closes
+    streamer = get_streamer(state["session_id"])
+    parser = FileBlockParser()
+    new_files: dict[str, FileChange] = {}
+    chunks: list[str] = []
+    started = time.monotonic()
+    async for chunk in llm.astream(messages):
+        text = message_text(chunk)
+        chunks.append(text)
+        for change in parser.feed(text):
+            if not new_files:
+                logger.info(
+                    "coder_first_file",
+                    session_id=state["session_id"],
+                    path=change["path"],
+                    seconds=round(time.monotonic() - started, 2),
+                )
+            new_files[change["path"]] = change
+            if streamer is not None:
+                lines = change["new_content"].count("\n") + 1
+                await streamer.write_event(f"--- Wrote {change['path']} ({lines} lines) ---")
+    content = "".join(chunks)
 
     # Guard: if the LLM returned no parseable ===FILE:=== blocks this is a
     # silent failure — the coder produced no code.  Treat it as an error so
@@ -94,7 +135,7 @@ Existing working files:
                         "===FILE: path===...===END FILE=== format."
                     ),
                     "stdout": "",
-                    "stderr": response.content[:500],
+                    "stderr": content[:500],
                     "file_path": None,
                 }
             ],
@@ -157,22 +198,49 @@ def _format_working_files(files: dict) -> str:
     return "\n".join(f"- {path}: {change['change_type']}" for path, change in files.items())
 
 
-def _parse_file_changes(content: str) -> dict[str, FileChange]:
-    """Parse file changes from LLM response."""
-    import re
+def _file_change(path: str, file_content: str) -> FileChange:
+    return FileChange(
+        path=path,
+        original_content=None,  # Will be populated when we read existing files
+        new_content=file_content.strip(),
+        change_type="create",  # Assume create, executor will determine actual type
+    )
 
-    files: dict[str, FileChange] = {}
 
-    pattern = r"===FILE:\s*(.+?)===\n(.*?)===END FILE==="
-    matches = re.findall(pattern, content, re.DOTALL)
+class FileBlockParser:
+    """Incremental parser for ===FILE: path=== ... ===END FILE=== blocks.
+
+    feed() takes response text in arbitrary chunks (markers may be split across
+    chunks) and returns the files whose END marker arrived in that chunk. File
+    paths are single-line; text outside blocks is discarded.
+    """
+
+    def __init__(self) -> None:
+        self._buf = ""
+        self._path: str | None = None  # set while inside a file block
+
+    def feed(self, text: str) -> list[FileChange]:
+        self._buf += text
+        completed: list[FileChange] = []
+        while True:
+            if self._path is None:
+                match = _FILE_HEADER_RE.search(self._buf)
+                if match is None:
+                    # Keep only what could still become a header
+                    start = self._buf.rfind(_FILE_START)
+                    self._buf = self._buf[start:] if start >= 0 else self._buf[-(len(_FILE_START) - 1) :]
+                    return completed
+                self._path = match.group(1).strip()
+                self._buf = self._buf[match.end() :]
+            else:
+                end = self._buf.find(_FILE_END)
+                if end < 0:
+                    return completed
+                completed.append(_file_change(self._path, self._buf[:end]))
+                self._path = None
+                self._buf = self._buf[end + len(_FILE_END) :]
 
-    for path, file_content in matches:
-        path = path.strip()
-        files[path] = FileChange(
-            path=path,
-            original_content=None,  # Will be populated when we read existing files
-            new_content=file_content.strip(),
-            change_type="create",  # Assume create, executor will determine actual type
-        )
 
-    return files
+def _parse_file_changes(content: str) -> dict[str, FileChange]:
+    """Parse file changes from LLM response."""
+    return {change["path"]: change for change in FileBlockParser().feed(content)}
@@ -3,8 +3,8 @@
 Uses Claude Sonnet for fast iterative debugging.
 """
 
-from langchain_core.messages import HumanMessage, SystemMessage
-
+from app.agent.context_builder import PackedContext, build_file_context, report_context
+from app.agent.llm_helpers import cacheable_context, cacheable_system
 from app.agent.state import CoFounderState, ErrorInfo
 from app.core.llm_config import create_tracked_llm
 
@@ -55,13 +55,15 @@ async def debugger_node(state: CoFounderState) -> dict:
         session_id=state["session_id"],
     )
 
-    # Build context from errors
-    context = _build_debug_context(state)
+    # Build context from errors; files named in the trace rank right after the step's own
+    files = build_file_context(state, "debugger")
+    stable, volatile = _build_debug_context(state, files)
 
     messages = [
-        SystemMessage(content=DEBUGGER_SYSTEM_PROMPT),
-        HumanMessage(content=context),
+        cacheable_system(DEBUGGER_SYSTEM_PROMPT),
+        cacheable_context(stable, volatile),
     ]
+    await report_context("debugger", state, files, messages)
 
     response = await llm.ainvoke(messages)
 
@@ -84,29 +86,35 @@ async def debugger_node(state: CoFounderState) -> dict:
     }
 
 
-def _build_debug_context(state: CoFounderState) -> str:
-    """Build context for debugging."""
-    current_step = state["plan"][state["current_step_index"]]
+def _build_debug_context(state: CoFounderState, files: PackedContext) -> tuple[str, str]:
+    """Build context for debugging as (stable, volatile) parts.
 
-    # Get relevant file contents
-    file_contents = []
-    for path, change in state["working_files"].items():
-        file_contents.append(f"=== {path} ===\n{change['new_content'][:2000]}")
+    files holds the ranked, budget-packed file contents. Files outside the current
+    step's files_to_modify stay the same across retries of the step and form the
+    cacheable stable part.
+    """
+    current_step = state["plan"][state["current_step_index"]]
+    step_files = set(current_step["files_to_modify"])
 
-    return f"""
+    stable = f"""
+Other Project Files:
+{files.render(lambda path: path not in step_files) or "None"}
+"""
+    volatile = f"""
 Current Step: {current_step["description"]}
 
 Errors:
 {_format_errors(state["active_errors"])}
 
 Last Output:
-{state.get("last_tool_output", "N/A")[:2000]}
+{(state.get("last_tool_output") or "N/A")[:2000]}
 
 Relevant Files:
-{chr(10).join(file_contents)}
+{files.render(lambda path: path in step_files) or "None"}
 
 Retry attempt: {state["retry_count"] + 1} of {state["max_retries"]}
 """
+    return stable, volatile
 
 
 def _format_errors(errors: list[ErrorInfo]) -> str:
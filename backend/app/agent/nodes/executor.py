@@ -7,7 +7,9 @@ from app.agent.path_safety import resolve_safe_project_path
 from app.agent.state import CoFounderState
 from app.core.config import get_settings
 from app.core.exceptions import SandboxError
-from app.sandbox.e2b_runtime import E2BSandboxRuntime
+from app.sandbox.e2b_runtime import E2BSandboxRuntime, dependency_manifest_hash
+from app.sandbox.lease import SandboxLease, get_lease
+from app.sandbox.pool import detect_stack
 
 
 async def executor_node(state: CoFounderState) -> dict:
@@ -22,75 +24,16 @@ async def executor_node(state: CoFounderState) -> dict:
         # Fallback to local execution for development
         return await _execute_locally(state)
 
-    # Use E2B sandbox
-    runtime = E2BSandboxRuntime(template=template)
-    files_written = []
-    errors = []
-
     try:
-        async with runtime.session():
-            # Write all working files to sandbox
-            for path, change in state["working_files"].items():
-                try:
-                    # Create parent directories
-                    if "/" in path:
-                        parent = "/".join(path.split("/")[:-1])
-                        try:
-                            await runtime.make_dir(parent)
-                        except SandboxError:
-                            pass  # Directory might exist
-
-                    await runtime.write_file(path, change["new_content"])
-                    files_written.append(path)
-                except SandboxError as e:
-                    errors.append(
-                        {
-                            "step_index": state["current_step_index"],
-                            "error_type": "file_write",
-                            "message": str(e),
-                            "stdout": "",
-                            "stderr": str(e),
-                            "file_path": path,
-                        }
-                    )
-
-            if errors:
-                return {
-                    "active_errors": errors,
-                    "current_node": "executor",
-                    "status_message": f"Failed to write {len(errors)} files",
-                    "last_tool_output": f"File write errors: {errors}",
-                    "last_command_exit_code": 1,
-                    "messages": [
-                        {
-                            "role": "assistant",
-                            "content": f"Executor: failed to write {len(errors)} file(s) to sandbox.",
-                            "node": "executor",
-                        }
-                    ],
-                }
-
-            # Install dependencies if needed
-            await _install_dependencies(runtime, template, state["working_files"])
+        # Reuse the job's sandbox lease when the graph runs inside a build
+        lease = get_lease(state.get("session_id"))
+        if lease is not None:
+            return await _execute_in_sandbox(state, lease, template)
 
-            # Run tests or validation commands
-            current_step = state["plan"][state["current_step_index"]]
-            test_result = await _run_tests_in_sandbox(runtime, template, current_step)
-
-            return {
-                "last_tool_output": test_result["output"],
-                "last_command_exit_code": test_result["exit_code"],
-                "current_node": "executor",
-                "status_message": f"Executed step, exit code: {test_result['exit_code']}",
-                "active_errors": test_result.get("errors", []),
-                "messages": [
-                    {
-                        "role": "assistant",
-                        "content": f"Executed: {len(files_written)} files written, tests {'passed' if test_result['exit_code'] == 0 else 'failed'}",
-                        "node": "executor",
-                    }
-                ],
-            }
+        # Standalone graph run: one-off sandbox for this visit
+        runtime = E2BSandboxRuntime(template=template)
+        async with runtime.session():
+            return await _execute_in_sandbox(state, SandboxLease(runtime=runtime), template)
 
     except SandboxError as e:
         return {
@@ -118,6 +61,64 @@ async def executor_node(state: CoFounderState) -> dict:
         }
 
 
+async def _execute_in_sandbox(state: CoFounderState, lease: SandboxLease, template: str) -> dict:
+    """Sync changed files into the leased sandbox, install dependencies if needed, run tests."""
+    runtime = await lease.acquire(detect_stack(state["working_files"]))
+
+    # Only files changed since the last visit are written (debugger retries touch a few)
+    files_written, failed = await lease.sync_files(state["working_files"])
+    errors = [
+        {
+            "step_index": state["current_step_index"],
+            "error_type": "file_write",
+            "message": str(e),
+            "stdout": "",
+            "stderr": str(e),
+            "file_path": path,
+        }
+        for path, e in failed.items()
+    ]
+
+    if errors:
+        return {
+            "active_errors": errors,
+            "current_node": "executor",
+            "status_message": f"Failed to write {len(errors)} files",
+            "last_tool_output": f"File write errors: {errors}",
+            "last_command_exit_code": 1,
+            "messages": [
+                {
+                    "role": "assistant",
+                    "content": f"Executor: failed to write {len(errors)} file(s) to sandbox.",
+                    "node": "executor",
+                }
+            ],
+        }
+
+    # Install dependencies if the manifest changed since the last install
+    async with lease.install_lock:
+        await _install_dependencies(runtime, template, state["working_files"], lease.workspace_path)
+
+    # Run tests or validation commands
+    current_step = state["plan"][state["current_step_index"]]
+    test_result = await _run_tests_in_sandbox(runtime, template, current_step, lease.workspace_path)
+
+    return {
+        "last_tool_output": test_result["output"],
+        "last_command_exit_code": test_result["exit_code"],
+        "current_node": "executor",
+        "status_message": f"Executed step, exit code: {test_result['exit_code']}",
+        "active_errors": test_result.get("errors", []),
+        "messages": [
+            {
+                "role": "assistant",
+                "content": f"Executed: {len(files_written)} files written, tests {'passed' if test_result['exit_code'] == 0 else 'failed'}",
+                "node": "executor",
+            }
+        ],
+    }
+
+
 def _detect_project_type(working_files: dict) -> str:
     """Detect project type from file extensions."""
     extensions = set()
@@ -138,21 +139,34 @@ async def _install_dependencies(
     runtime: E2BSandboxRuntime,
     template: str,
     working_files: dict,
+    cwd: str,
 ) -> None:
-    """Install project dependencies based on template type."""
+    """Install project dependencies based on template type, skipping unchanged manifests."""
+    files = {
+        path: change.get("new_content", "") if isinstance(change, dict) else str(change)
+        for path, change in working_files.items()
+    }
     try:
         if template == "python":
-            # Check for requirements.txt
-            if "requirements.txt" in working_files:
-                await runtime.run_command("pip install -r requirements.txt", timeout=180)
-            # Check for pyproject.toml
-            elif "pyproject.toml" in working_files:
-                await runtime.run_command("pip install -e .", timeout=180)
+            # requirements.txt takes precedence over pyproject.toml
+            if "requirements.txt" in files:
+                await runtime.install_dependencies(
+                    "python", dependency_manifest_hash(files, "python"), cwd=cwd, timeout=180
+                )
+            elif "pyproject.toml" in files:
+                await runtime.install_dependencies(
+                    "python",
+                    dependency_manifest_hash(files, "python"),
+                    cwd=cwd,
+                    timeout=180,
+                    command="pip install -e .",
+                )
 
         elif template == "node":
-            # Check for package.json
-            if "package.json" in working_files:
-                await runtime.run_command("npm install", timeout=180)
+            if "package.json" in files:
+                await runtime.install_dependencies(
+                    "node", dependency_manifest_hash(files, "node"), cwd=cwd, timeout=180
+                )
 
     except SandboxError:
         pass  # Dependencies are optional, tests will fail if needed
@@ -162,6 +176,7 @@ async def _run_tests_in_sandbox(
     runtime: E2BSandboxRuntime,
     template: str,
     step: dict,
+    cwd: str | None = None,
 ) -> dict:
     """Run tests in the sandbox based on project type."""
     files = step.get("files_to_modify", [])
@@ -176,13 +191,15 @@ async def _run_tests_in_sandbox(
             result = await runtime.run_command(
                 "python -m pytest -v --tb=short 2>/dev/null || python -m unittest discover -v",
                 timeout=120,
+                cwd=cwd,
             )
         else:
             # Just do syntax check on Python files
             py_files = [f for f in files if f.endswith(".py")]
             if py_files:
-                check_cmd = " && ".join(f"python -m py_compile /home/user/{f}" for f in py_files)
-                result = await runtime.run_command(check_cmd, timeout=60)
+                root = cwd or "/home/user"
+                check_cmd = " && ".join(f"python -m py_compile {root}/{f}" for f in py_files)
+                result = await runtime.run_command(check_cmd, timeout=60, cwd=cwd)
             else:
                 result = {"stdout": "No Python files to check", "stderr": "", "exit_code": 0}
     elif template == "node":
@@ -191,6 +208,7 @@ async def _run_tests_in_sandbox(
             result = await runtime.run_command(
                 "npm test 2>/dev/null || echo 'No tests configured'",
                 timeout=120,
+                cwd=cwd,
             )
         else:
             # Just check syntax with node
@@ -1,13 +1,38 @@
 """Reviewer Node: Performs code review and quality checks.
 
 Uses Claude Opus for thorough code review.
+
+Reviews are incremental: the reviewer sees a unified diff of every file changed
+since the last approved review (state["approved_files"] holds the approved
+content) and only a short structural summary of files that are unchanged since
+approval. Summaries are cached per process by content hash. On approval the
+reviewed content becomes the new baseline, so a debugger retry that touches one
+file costs one file's diff, not a re-review of the whole project.
 """
 
-from langchain_core.messages import HumanMessage, SystemMessage
+import difflib
+import hashlib
+import re
+from collections import OrderedDict
 
+from app.agent.context_builder import PackedContext, budget_for, pack, rank_files, report_context
+from app.agent.llm_helpers import cacheable_context, cacheable_system
 from app.agent.state import CoFounderState
 from app.core.llm_config import create_tracked_llm
 
+SUMMARY_CACHE_MAX = 4096
+SUMMARY_MAX_SYMBOLS = 12
+
+# Top-level definitions in Python / JS / TS sources
+_SYMBOL_RE = re.compile(
+    r"^(?:export\s+)?(?:default\s+)?(?:async\s+)?"
+    r"(?:def|class|function|const|let|var|interface|type|enum)\s+([A-Za-z_$][\w$]*)",
+    re.MULTILINE,
+)
+
+# sha256 of file content -> summary (without the path)
+_summary_cache: OrderedDict[str, str] = OrderedDict()
+
 REVIEWER_SYSTEM_PROMPT = """You are a senior code reviewer performing a thorough review.
 Your task is to evaluate code quality, security, and correctness.
 
@@ -37,12 +62,14 @@ async def reviewer_node(state: CoFounderState) -> dict:
     )
 
     # Build review context
-    context = _build_review_context(state)
+    diffs = _pack_review_diffs(state)
+    stable, volatile = _build_review_context(state, diffs)
 
     messages = [
-        SystemMessage(content=REVIEWER_SYSTEM_PROMPT),
-        HumanMessage(content=context),
+        cacheable_system(REVIEWER_SYSTEM_PROMPT),
+        cacheable_context(stable, volatile),
     ]
+    await report_context("reviewer", state, diffs, messages)
 
     response = await llm.ainvoke(messages)
 
@@ -50,6 +77,14 @@ async def reviewer_node(state: CoFounderState) -> dict:
     review = _parse_review_response(response.content)
 
     if review["approved"]:
+        # Reviewed content becomes the baseline for the next diff
+        approved = state.get("approved_files", {})
+        newly_approved = {
+            path: change["new_content"]
+            for path, change in state["working_files"].items()
+            if approved.get(path) != change["new_content"]
+        }
+
         # Mark current step as completed
         plan = list(state["plan"])
         plan[state["current_step_index"]] = {
@@ -63,6 +98,7 @@ async def reviewer_node(state: CoFounderState) -> dict:
 
         return {
             "plan": plan,
+            "approved_files": newly_approved,
             "current_step_index": next_step_index if not all_steps_complete else state["current_step_index"],
             "current_node": "reviewer",
             "status_message": "Code review passed",
@@ -127,29 +163,87 @@ async def reviewer_node(state: CoFounderState) -> dict:
         }
 
 
-def _build_review_context(state: CoFounderState) -> str:
-    """Build context for code review."""
+def _pack_review_diffs(state: CoFounderState) -> PackedContext:
+    """Diffs of files changed since the last approval, ranked and packed into the reviewer budget."""
+    approved = state.get("approved_files", {})
+    files = state["working_files"]
+    changed = [path for path, change in files.items() if approved.get(path) != change["new_content"]]
+    return pack(
+        (
+            (path, _unified_diff(path, approved.get(path), files[path]["new_content"]))
+            for path in rank_files(state, changed)
+        ),
+        budget_for("reviewer"),
+    )
+
+
+def _build_review_context(state: CoFounderState, diffs: PackedContext | None = None) -> tuple[str, str]:
+    """Build context for code review as (stable, volatile) parts.
+
+    Files unchanged since the last approval are only summarised; they stay the same
+    while the step cycles through review rejections, so they form the cacheable
+    stable part. Diffs of changed files and the test output are re-sent uncached.
+    """
     current_step = state["plan"][state["current_step_index"]]
+    approved = state.get("approved_files", {})
+    if diffs is None:
+        diffs = _pack_review_diffs(state)
 
-    # Collect all file changes
-    file_diffs = []
-    for path, change in state["working_files"].items():
-        file_diffs.append(f"""
-=== {path} ({change["change_type"]}) ===
-{change["new_content"]}
-""")
+    summaries = [
+        f"- {path}: {_file_summary(change['new_content'])}"
+        for path, change in state["working_files"].items()
+        if approved.get(path) == change["new_content"]
+    ]
 
-    return f"""
+    stable = f"""
 Goal: {state["current_goal"]}
+
+Previously approved files (unchanged since approval):
+{chr(10).join(summaries) or "None"}
+"""
+    volatile = f"""
 Current Step: {current_step["description"]}
 
 Test Result: Exit code {state.get("last_command_exit_code", "N/A")}
 Test Output:
-{state.get("last_tool_output", "No test output")[:2000]}
+{(state.get("last_tool_output") or "No test output")[:2000]}
 
-Files Changed:
-{"".join(file_diffs)}
+Changes since last approved review:
+{diffs.render() or "None"}
 """
+    return stable, volatile
+
+
+def _unified_diff(path: str, before: str | None, after: str) -> str:
+    """Unified diff of one file against its approved content (new files diff against /dev/null)."""
+    diff = difflib.unified_diff(
+        (before or "").splitlines(keepends=True),
+        after.splitlines(keepends=True),
+        fromfile=f"a/{path}" if before is not None else "/dev/null",
+        tofile=f"b/{path}",
+    )
+    text = "".join(line if line.endswith("\n") else line + "\n" for line in diff)
+    return text or f"--- /dev/null\n+++ b/{path}\n(empty file)\n"
+
+
+def _file_summary(content: str) -> str:
+    """One-line structural summary of a file (size and top-level symbols), cached by content hash."""
+    key = hashlib.sha256(content.encode("utf-8")).hexdigest()
+    summary = _summary_cache.get(key)
+    if summary is not None:
+        _summary_cache.move_to_end(key)
+        return summary
+
+    symbols = list(dict.fromkeys(_SYMBOL_RE.findall(content)))
+    summary = f"{content.count(chr(10)) + 1} lines"
+    if symbols:
+        more = f", +{len(symbols) - SUMMARY_MAX_SYMBOLS} more" if len(symbols) > SUMMARY_MAX_SYMBOLS else ""
+        summary += f"; defines {', '.join(symbols[:SUMMARY_MAX_SYMBOLS])}{more}"
+
+    _summary_cache[key] = summary
+    if len(_summary_cache) > SUMMARY_CACHE_MAX:
+        _summary_cache.popitem(last=False)
+    return summary
 
 
 def _parse_review_response(content: str) -> dict:
@@ -0,0 +1,76 @@
+"""Redis response cache for deterministic RunnerReal generation calls.
+
+Methods such as generate_artifacts and assess_section_confidence are called
+repeatedly with the same inputs (generate_cascade asks for the full artifact set
+once per artifact type; confidence is re-assessed per section on every edit).
+Their results are a function of the prompt and the model, so a repeated call can
+be answered from Redis instead of Claude.
+
+Keys are cofounder:llm_cache:{method}:{model}:{sha256 of the normalized prompt},
+where normalizing joins each message's role and text and collapses whitespace.
+Values are the parsed JSON result, stored with a TTL of
+LLM_RESPONSE_CACHE_TTL_SECONDS (0, the default, disables the cache).
+
+Callers skip lookup when the user explicitly asked to regenerate but still store
+the fresh result, so the next identical call sees the new version. Redis errors
+are logged and treated as misses. Hits and misses are emitted to CloudWatch.
+"""
+
+import hashlib
+import json
+import re
+from typing import Any
+
+import structlog
+
+from app.agent.llm_helpers import message_text
+from app.core.config import get_settings
+from app.metrics.cloudwatch import emit_llm_cache
+
+logger = structlog.get_logger(__name__)
+
+KEY_PREFIX = "cofounder:llm_cache:"
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def prompt_hash(messages: list) -> str:
+    """sha256 of the messages' roles and text, whitespace-normalized."""
+    normalized = "\n".join(f"{m.type}:{_WHITESPACE_RE.sub(' ', message_text(m)).strip()}" for m in messages)
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def cache_key(method: str, model: str, messages: list) -> str:
+    return f"{KEY_PREFIX}{method}:{model}:{prompt_hash(messages)}"
+
+
+async def get_cached_response(method: str, model: str, messages: list) -> Any | None:
+    """Cached result for this prompt, or None on a miss or when the cache is disabled."""
+    if get_settings().llm_response_cache_ttl_seconds <= 0:
+        return None
+    key = cache_key(method, model, messages)
+    try:
+        from app.db.redis import get_redis
+
+        raw = await get_redis().get(key)
+    except Exception as e:
+        logger.warning("llm_cache_get_failed", method=method, error=str(e), error_type=type(e).__name__)
+        return None
+
+    hit = raw is not None
+    logger.debug("llm_cache_lookup", method=method, model=model, hit=hit)
+    await emit_llm_cache(method, hit)
+    return json.loads(raw) if hit else None
+
+
+async def cache_response(method: str, model: str, messages: list, result: Any) -> None:
+    """Store result for this prompt with the configured TTL. No-op when the cache is disabled."""
+    ttl = get_settings().llm_response_cache_ttl_seconds
+    if ttl <= 0:
+        return
+    try:
+        from app.db.redis import get_redis
+
+        await get_redis().set(cache_key(method, model, messages), json.dumps(result), ex=ttl)
+    except Exception as e:
+        logger.warning("llm_cache_set_failed", method=method, error=str(e), error_type=type(e).__name__)
@@ -6,17 +6,18 @@ Implements all 10 Runner protocol methods with:
 - Markdown fence stripping before JSON parsing
 - Co-founder "we" voice in all prompts
 - Silent JSON retry with stricter prompt on first parse failure
+- Opt-in Redis response cache for deterministic generation calls (bypassed by "_regenerate")
 """
 
 import json
 import time
 
 import structlog
-from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.messages import HumanMessage
 from langgraph.checkpoint.memory import MemorySaver
 
 from app.agent.graph import create_cofounder_graph
-from app.agent.llm_helpers import _invoke_with_retry, _parse_json_response
+from app.agent.llm_helpers import _invoke_with_retry, _parse_json_response, cacheable_system
 from app.agent.nodes import (
     architect_node,
     coder_node,
@@ -25,7 +26,9 @@ from app.agent.nodes import (
     git_manager_node,
     reviewer_node,
 )
+from app.agent.response_cache import cache_response, get_cached_response
 from app.agent.state import CoFounderState
+from app.core.config import get_settings
 from app.core.llm_config import create_tracked_llm
 from app.metrics.cloudwatch import emit_llm_latency
 
@@ -43,6 +46,16 @@ Your voice:
 
 {task_instructions}"""
 
+
+def _strict_json_instruction(opening: str) -> str:
+    """Extra system text for the retry after an unparseable JSON response."""
+    return (
+        "IMPORTANT: Your response MUST be valid JSON only. "
+        "Do not include any explanation, markdown, or code fences. "
+        f"Start your response with {opening} ."
+    )
+
+
 # Tier-based interview question counts (locked decision)
 QUESTION_COUNT_BY_TIER = {
     "bootstrapper": "6-8",
@@ -124,7 +137,7 @@ class RunnerReal:
         """
         if checkpointer is None:
             checkpointer = MemorySaver()
-        self.graph = create_cofounder_graph(checkpointer)
+        self.graph = create_cofounder_graph(checkpointer, max_parallel_steps=get_settings().max_parallel_steps)
         self._node_map = {
             "architect": architect_node,
             "coder": coder_node,
@@ -210,7 +223,8 @@ Return ONLY a JSON array of objects:
   }
 ]"""
 
-        system_msg = SystemMessage(content=COFOUNDER_SYSTEM.format(task_instructions=task_instructions))
+        system_prompt = COFOUNDER_SYSTEM.format(task_instructions=task_instructions)
+        system_msg = cacheable_system(system_prompt)
         human_msg = HumanMessage(
             content=f"Generate onboarding questions for an idea with these keywords: {idea_keywords or 'general software product'}"
         )
@@ -221,11 +235,7 @@ Return ONLY a JSON array of objects:
             result = _parse_json_response(response.content)
         except json.JSONDecodeError:
             log.warning("json_parse_failed_retrying", user_id=user_id, session_id=session_id)
-            strict_system = SystemMessage(
-                content="IMPORTANT: Your response MUST be valid JSON only. "
-                "Do not include any explanation, markdown, or code fences. "
-                "Start your response with [ .\n\n" + system_msg.content
-            )
+            strict_system = cacheable_system(system_prompt, suffix=_strict_json_instruction("["))
             response = await _invoke_with_retry(llm, [strict_system, human_msg])
             result = _parse_json_response(response.content)
         await emit_llm_latency(
@@ -277,20 +287,23 @@ Return ONLY a JSON object:
   "smallest_viable_experiment": "Minimal test to validate our idea"
 }"""
 
-        system_msg = SystemMessage(content=COFOUNDER_SYSTEM.format(task_instructions=task_instructions))
+        system_prompt = COFOUNDER_SYSTEM.format(task_instructions=task_instructions)
+        system_msg = cacheable_system(system_prompt)
         human_msg = HumanMessage(content=f"Generate a product brief from these onboarding answers: {clean_answers}")
 
+        messages = [system_msg, human_msg]
+        if not answers.get("_regenerate"):
+            cached = await get_cached_response("generate_brief", llm.model, messages)
+            if cached is not None:
+                return cached
+
         t0 = time.perf_counter()
         try:
-            response = await _invoke_with_retry(llm, [system_msg, human_msg])
+            response = await _invoke_with_retry(llm, messages)
             result = _parse_json_response(response.content)
         except json.JSONDecodeError:
             log.warning("json_parse_failed_retrying", user_id=user_id, session_id=session_id)
-            strict_system = SystemMessage(
-                content="IMPORTANT: Your response MUST be valid JSON only. "
-                "Do not include any explanation, markdown, or code fences. "
-                "Start your response with { .\n\n" + system_msg.content
-            )
+            strict_system = cacheable_system(system_prompt, suffix=_strict_json_instruction("{"))
             response = await _invoke_with_retry(llm, [strict_system, human_msg])
             result = _parse_json_response(response.content)
         await emit_llm_latency(
@@ -298,6 +311,7 @@ Return ONLY a JSON object:
             duration_ms=(time.perf_counter() - t0) * 1000,
             model=llm.model,
         )
+        await cache_response("generate_brief", llm.model, messages, result)
         return result
 
     async def generate_understanding_questions(self, context: dict) -> list[dict]:
@@ -344,7 +358,8 @@ Return ONLY a JSON array of objects:
 
 End the interview with a closing question like: "I have enough to build your brief. Want to add anything else before I do?\""""
 
-        system_msg = SystemMessage(content=COFOUNDER_SYSTEM.format(task_instructions=task_instructions))
+        system_prompt = COFOUNDER_SYSTEM.format(task_instructions=task_instructions)
+        system_msg = cacheable_system(system_prompt)
         human_msg = HumanMessage(content=f"Idea: {idea_text}\n\nOnboarding answers: {onboarding_answers}")
 
         t0 = time.perf_counter()
@@ -353,11 +368,7 @@ End the interview with a closing question like: "I have enough to build your bri
             result = _parse_json_response(response.content)
         except json.JSONDecodeError:
             log.warning("json_parse_failed_retrying", user_id=user_id, session_id=session_id, tier=tier)
-            strict_system = SystemMessage(
-                content="IMPORTANT: Your response MUST be valid JSON only. "
-                "Do not include any explanation, markdown, or code fences. "
-                "Start your response with [ .\n\n" + system_msg.content
-            )
+            strict_system = cacheable_system(system_prompt, suffix=_strict_json_instruction("["))
             response = await _invoke_with_retry(llm, [strict_system, human_msg])
             result = _parse_json_response(response.content)
         await emit_llm_latency(
@@ -441,7 +452,8 @@ For confidence_scores, assess each section as:
 - "moderate": Reasonable hypothesis but not yet validated with real data
 - "needs_depth": Vague or missing — the founder should revisit this section"""
 
-        system_msg = SystemMessage(content=COFOUNDER_SYSTEM.format(task_instructions=task_instructions))
+        system_prompt = COFOUNDER_SYSTEM.format(task_instructions=task_instructions)
+        system_msg = cacheable_system(system_prompt)
         human_msg = HumanMessage(content=f"Idea: {idea}\n\nUnderstanding interview answers:\n\n{formatted_qa}")
 
         t0 = time.perf_counter()
@@ -450,11 +462,7 @@ For confidence_scores, assess each section as:
             result = _parse_json_response(response.content)
         except json.JSONDecodeError:
             log.warning("json_parse_failed_retrying", user_id=user_id, session_id=session_id, tier=tier)
-            strict_system = SystemMessage(
-                content="IMPORTANT: Your response MUST be valid JSON only. "
-                "Do not include any explanation, markdown, or code fences. "
-                "Start your response with { .\n\n" + system_msg.content
-            )
+            strict_system = cacheable_system(system_prompt, suffix=_strict_json_instruction("{"))
             response = await _invoke_with_retry(llm, [strict_system, human_msg])
             result = _parse_json_response(response.content)
         await emit_llm_latency(
@@ -512,7 +520,8 @@ Return ONLY a JSON object:
 - preserve_indices: indices (0-based) of remaining questions to keep as-is
 - new_questions: optional array of 1-2 new questions based on the changed answer (use same question format)"""
 
-        system_msg = SystemMessage(content=COFOUNDER_SYSTEM.format(task_instructions=task_instructions))
+        system_prompt = COFOUNDER_SYSTEM.format(task_instructions=task_instructions)
+        system_msg = cacheable_system(system_prompt)
         human_msg = HumanMessage(
             content=(f"Idea: {idea}\n\nAnswered questions:\n{answered_str}\n\nRemaining questions:\n{remaining_str}")
         )
@@ -523,11 +532,7 @@ Return ONLY a JSON object:
             result = _parse_json_response(response.content)
         except json.JSONDecodeError:
             log.warning("json_parse_failed_retrying", user_id=user_id, session_id=session_id)
-            strict_system = SystemMessage(
-                content="IMPORTANT: Your response MUST be valid JSON only. "
-                "Do not include any explanation, markdown, or code fences. "
-                "Start your response with { .\n\n" + system_msg.content
-            )
+            strict_system = cacheable_system(system_prompt, suffix=_strict_json_instruction("{"))
             response = await _invoke_with_retry(llm, [strict_system, human_msg])
             result = _parse_json_response(response.content)
         await emit_llm_latency(
@@ -560,21 +565,26 @@ Return ONLY one of: "strong", "moderate", "needs_depth"
 - "moderate": Reasonable hypothesis, some supporting logic, but unvalidated
 - "needs_depth": Vague, generic, or missing critical detail"""
 
-        system_msg = SystemMessage(content=COFOUNDER_SYSTEM.format(task_instructions=task_instructions))
+        system_prompt = COFOUNDER_SYSTEM.format(task_instructions=task_instructions)
+        system_msg = cacheable_system(system_prompt)
         human_msg = HumanMessage(content=f"Section: {section_key}\n\nContent: {content}")
 
+        messages = [system_msg, human_msg]
+        cached = await get_cached_response("assess_section_confidence", llm.model, messages)
+        if cached is not None:
+            return cached
+
         t0 = time.perf_counter()
-        response = await _invoke_with_retry(llm, [system_msg, human_msg])
+        response = await _invoke_with_retry(llm, messages)
         await emit_llm_latency(
             method_name="assess_section_confidence",
             duration_ms=(time.perf_counter() - t0) * 1000,
             model=llm.model,
         )
         text = response.content.strip().lower()
-        for level in ("strong", "moderate", "needs_depth"):
-            if level in text:
-                return level
-        return "moderate"  # safe default
+        level = next((lvl for lvl in ("strong", "moderate", "needs_depth") if lvl in text), "moderate")  # safe default
+        await cache_response("assess_section_confidence", llm.model, messages, level)
+        return level
 
     async def generate_execution_options(self, brief: dict, feedback: str | None = None) -> dict:
         """Generate 2-3 execution plan options from the Idea Brief.
@@ -633,22 +643,25 @@ Return ONLY a JSON object:
 }}
 {feedback_context}"""
 
-        system_msg = SystemMessage(content=COFOUNDER_SYSTEM.format(task_instructions=task_instructions))
+        system_prompt = COFOUNDER_SYSTEM.format(task_instructions=task_instructions)
+        system_msg = cacheable_system(system_prompt)
         human_msg = HumanMessage(
             content=f"Generate execution plan options from this Idea Brief:\n\n{json.dumps(clean_brief, indent=2)}"
         )
 
+        messages = [system_msg, human_msg]
+        if not brief.get("_regenerate"):
+            cached = await get_cached_response("generate_execution_options", llm.model, messages)
+            if cached is not None:
+                return cached
+
         t0 = time.perf_counter()
         try:
-            response = await _invoke_with_retry(llm, [system_msg, human_msg])
+            response = await _invoke_with_retry(llm, messages)
             result = _parse_json_response(response.content)
         except json.JSONDecodeError:
             log.warning("json_parse_failed_retrying", user_id=user_id, session_id=session_id, tier=tier)
-            strict_system = SystemMessage(
-                content="IMPORTANT: Your response MUST be valid JSON only. "
-                "Do not include any explanation, markdown, or code fences. "
-                "Start your response with { .\n\n" + system_msg.content
-            )
+            strict_system = cacheable_system(system_prompt, suffix=_strict_json_instruction("{"))
             response = await _invoke_with_retry(llm, [strict_system, human_msg])
             result = _parse_json_response(response.content)
         await emit_llm_latency(
@@ -656,6 +669,7 @@ Return ONLY a JSON object:
             duration_ms=(time.perf_counter() - t0) * 1000,
             model=llm.model,
         )
+        await cache_response("generate_execution_options", llm.model, messages, result)
         return result
 
     async def generate_strategy_graph(self, idea: str, brief: dict, onboarding_answers: dict) -> dict:
@@ -728,7 +742,8 @@ Node status rules:
 
 Use "we" voice in descriptions."""
 
-        system_msg = SystemMessage(content=COFOUNDER_SYSTEM.format(task_instructions=task_instructions))
+        system_prompt = COFOUNDER_SYSTEM.format(task_instructions=task_instructions)
+        system_msg = cacheable_system(system_prompt)
         human_msg = HumanMessage(
             content=(
                 f"Idea: {idea}\n\n"
@@ -737,17 +752,19 @@ Use "we" voice in descriptions."""
             )
         )
 
+        messages = [system_msg, human_msg]
+        if not brief.get("_regenerate"):
+            cached = await get_cached_response("generate_strategy_graph", llm.model, messages)
+            if cached is not None:
+                return cached
+
         t0 = time.perf_counter()
         try:
-            response = await _invoke_with_retry(llm, [system_msg, human_msg])
+            response = await _invoke_with_retry(llm, messages)
             result = _parse_json_response(response.content)
         except json.JSONDecodeError:
             log.warning("json_parse_failed_retrying", user_id=user_id, session_id=session_id)
-            strict_system = SystemMessage(
-                content="IMPORTANT: Your response MUST be valid JSON only. "
-                "Do not include any explanation, markdown, or code fences. "
-                "Start your response with { .\n\n" + system_msg.content
-            )
+            strict_system = cacheable_system(system_prompt, suffix=_strict_json_instruction("{"))
             response = await _invoke_with_retry(llm, [strict_system, human_msg])
             result = _parse_json_response(response.content)
         await emit_llm_latency(
@@ -755,6 +772,7 @@ Use "we" voice in descriptions."""
             duration_ms=(time.perf_counter() - t0) * 1000,
             model=llm.model,
         )
+        await cache_response("generate_strategy_graph", llm.model, messages, result)
         return result
 
     async def generate_mvp_timeline(self, idea: str, brief: dict, tier: str) -> dict:
@@ -826,22 +844,25 @@ Return ONLY a JSON object:
   "adapted_for": "{tier}"
 }}"""
 
-        system_msg = SystemMessage(content=COFOUNDER_SYSTEM.format(task_instructions=task_instructions))
+        system_prompt = COFOUNDER_SYSTEM.format(task_instructions=task_instructions)
+        system_msg = cacheable_system(system_prompt)
         human_msg = HumanMessage(
             content=(f"Idea: {idea}\n\nIdea Brief:\n{json.dumps(clean_brief, indent=2)}\n\nTier: {tier}")
         )
 
+        messages = [system_msg, human_msg]
+        if not brief.get("_regenerate"):
+            cached = await get_cached_response("generate_mvp_timeline", llm.model, messages)
+            if cached is not None:
+                return cached
+
         t0 = time.perf_counter()
         try:
-            response = await _invoke_with_retry(llm, [system_msg, human_msg])
+            response = await _invoke_with_retry(llm, messages)
             result = _parse_json_response(response.content)
         except json.JSONDecodeError:
             log.warning("json_parse_failed_retrying", user_id=user_id, session_id=session_id, tier=tier)
-            strict_system = SystemMessage(
-                content="IMPORTANT: Your response MUST be valid JSON only. "
-                "Do not include any explanation, markdown, or code fences. "
-                "Start your response with { .\n\n" + system_msg.content
-            )
+            strict_system = cacheable_system(system_prompt, suffix=_strict_json_instruction("{"))
             response = await _invoke_with_retry(llm, [strict_system, human_msg])
             result = _parse_json_response(response.content)
         await emit_llm_latency(
@@ -849,6 +870,7 @@ Return ONLY a JSON object:
             duration_ms=(time.perf_counter() - t0) * 1000,
             model=llm.model,
         )
+        await cache_response("generate_mvp_timeline", llm.model, messages, result)
         return result
 
     async def generate_app_architecture(self, idea: str, brief: dict, tier: str) -> dict:
@@ -927,22 +949,25 @@ Return ONLY a JSON object:
   ]
 }}"""
 
-        system_msg = SystemMessage(content=COFOUNDER_SYSTEM.format(task_instructions=task_instructions))
+        system_prompt = COFOUNDER_SYSTEM.format(task_instructions=task_instructions)
+        system_msg = cacheable_system(system_prompt)
         human_msg = HumanMessage(
             content=(f"Idea: {idea}\n\nIdea Brief:\n{json.dumps(clean_brief, indent=2)}\n\nTier: {tier}")
         )
 
+        messages = [system_msg, human_msg]
+        if not brief.get("_regenerate"):
+            cached = await get_cached_response("generate_app_architecture", llm.model, messages)
+            if cached is not None:
+                return cached
+
         t0 = time.perf_counter()
         try:
-            response = await _invoke_with_retry(llm, [system_msg, human_msg])
+            response = await _invoke_with_retry(llm, messages)
             result = _parse_json_response(response.content)
         except json.JSONDecodeError:
             log.warning("json_parse_failed_retrying", user_id=user_id, session_id=session_id, tier=tier)
-            strict_system = SystemMessage(
-                content="IMPORTANT: Your response MUST be valid JSON only. "
-                "Do not include any explanation, markdown, or code fences. "
-                "Start your response with { .\n\n" + system_msg.content
-            )
+            strict_system = cacheable_system(system_prompt, suffix=_strict_json_instruction("{"))
             response = await _invoke_with_retry(llm, [strict_system, human_msg])
             result = _parse_json_response(response.content)
         await emit_llm_latency(
@@ -950,6 +975,7 @@ Return ONLY a JSON object:
             duration_ms=(time.perf_counter() - t0) * 1000,
             model=llm.model,
         )
+        await cache_response("generate_app_architecture", llm.model, messages, result)
         return result
 
     async def generate_artifacts(self, brief: dict) -> dict:
@@ -1032,22 +1058,25 @@ Return ONLY a JSON object with these 5 keys:
 Each artifact should cross-reference others (e.g., milestones reference MVP features,
 risk log references brief assumptions)."""
 
-        system_msg = SystemMessage(content=COFOUNDER_SYSTEM.format(task_instructions=task_instructions))
+        system_prompt = COFOUNDER_SYSTEM.format(task_instructions=task_instructions)
+        system_msg = cacheable_system(system_prompt)
         human_msg = HumanMessage(
             content=f"Generate project artifacts from this brief:\n\n{json.dumps(clean_brief, indent=2)}"
         )
 
+        messages = [system_msg, human_msg]
+        if not brief.get("_regenerate"):
+            cached = await get_cached_response("generate_artifacts", llm.model, messages)
+            if cached is not None:
+                return cached
+
         t0 = time.perf_counter()
         try:
-            response = await _invoke_with_retry(llm, [system_msg, human_msg])
+            response = await _invoke_with_retry(llm, messages)
             result = _parse_json_response(response.content)
         except json.JSONDecodeError:
             log.warning("json_parse_failed_retrying", user_id=user_id, session_id=session_id, tier=tier)
-            strict_system = SystemMessage(
-                content="IMPORTANT: Your response MUST be valid JSON only. "
-                "Do not include any explanation, markdown, or code fences. "
-                "Start your response with { .\n\n" + system_msg.content
-            )
+            strict_system = cacheable_system(system_prompt, suffix=_strict_json_instruction("{"))
             response = await _invoke_with_retry(llm, [strict_system, human_msg])
             result = _parse_json_response(response.content)
         await emit_llm_latency(
@@ -1055,4 +1084,5 @@ risk log references brief assumptions)."""
             duration_ms=(time.perf_counter() - t0) * 1000,
             model=llm.model,
         )
+        await cache_response("generate_artifacts", llm.model, messages, result)
         return result
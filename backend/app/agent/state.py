@@ -5,7 +5,7 @@ checkpointing for long-running tasks.
 """
 
 import operator
-from typing import Annotated, TypedDict
+from typing import Annotated, NotRequired, TypedDict
 
 
 class PlanStep(TypedDict):
@@ -15,6 +15,7 @@ class PlanStep(TypedDict):
     description: str
     status: str  # "pending" | "in_progress" | "completed" | "failed"
     files_to_modify: list[str]
+    depends_on: NotRequired[list[int]]  # earlier step indices that must complete first
 
 
 class FileChange(TypedDict):
@@ -37,6 +38,27 @@ class ErrorInfo(TypedDict):
     file_path: str | None
 
 
+class StepResult(TypedDict):
+    """Outcome of one plan step built on its own branch of the parallel graph."""
+
+    index: int
+    status: str  # "completed" | "failed"
+    retry_count: int
+    needs_human_review: bool
+    has_fatal_error: bool
+    active_errors: list[ErrorInfo]
+    last_tool_output: str | None
+    last_command_exit_code: int | None
+
+
+def merge_files(left: dict, right: dict) -> dict:
+    """Reducer for path-keyed file maps: updates add or replace entries, never drop them.
+
+    Lets parallel plan-step branches each return only the files they changed.
+    """
+    return {**left, **right}
+
+
 class CoFounderState(TypedDict):
     """The complete state of the AI Co-Founder agent.
 
@@ -62,8 +84,14 @@ class CoFounderState(TypedDict):
     plan: list[PlanStep]
     current_step_index: int
 
-    # Working files (in-memory before commit)
-    working_files: dict[str, FileChange]
+    # Working files (in-memory before commit), merged across parallel step branches
+    working_files: Annotated[dict[str, FileChange], merge_files]
+
+    # Content of each file as of the last approved review (the reviewer diffs against it)
+    approved_files: Annotated[dict[str, str], merge_files]
+
+    # Results of plan steps built in parallel (append-only)
+    step_results: Annotated[list[StepResult], operator.add]
 
     # Tool execution results
     last_tool_output: str | None
@@ -107,6 +135,8 @@ def create_initial_state(
         plan=[],
         current_step_index=0,
         working_files={},
+        approved_files={},
+        step_results=[],
         last_tool_output=None,
         last_command_exit_code=None,
         active_errors=[],
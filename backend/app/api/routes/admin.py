@@ -8,6 +8,8 @@ from sqlalchemy import func, select
 from app.api.schemas.admin import (
     PlanTierResponse,
     PlanTierUpdate,
+    PromptCacheUsage,
+    QueueWaitSnapshot,
     UsageAggregate,
     UserDetail,
     UserSummary,
@@ -15,11 +17,13 @@ from app.api.schemas.admin import (
     UserUsageBreakdown,
 )
 from app.core.auth import ClerkUser, require_admin
+from app.core.llm_config import invalidate_user_settings
 from app.db.base import get_session_factory
 from app.db.models.plan_tier import PlanTier
 from app.db.models.usage_log import UsageLog
 from app.db.models.user_settings import UserSettings
 from app.db.redis import get_redis
+from app.queue.estimator import QueueWaitHistogram
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
@@ -55,6 +59,7 @@ async def update_plan(
             setattr(tier, field, value)
 
         await session.commit()
+        invalidate_user_settings()  # every user on this tier
         await session.refresh(tier)
         return _tier_to_response(tier)
 
@@ -162,6 +167,7 @@ async def update_user(
             setattr(u, field, value)
 
         await session.commit()
+        invalidate_user_settings(clerk_id)
         await session.refresh(u, ["plan_tier"])
 
         r = get_redis()
@@ -212,6 +218,42 @@ async def global_usage(
         )
 
 
+@router.get("/usage/prompt-cache", response_model=list[PromptCacheUsage])
+async def prompt_cache_usage(
+    period: str = Query("today", pattern="^(today|week|month)$"),
+    _: ClerkUser = Depends(require_admin),
+):
+    """Anthropic prompt-cache hit ratio per agent role."""
+    factory = get_session_factory()
+    async with factory() as session:
+        query = select(
+            UsageLog.agent_role,
+            func.sum(UsageLog.input_tokens).label("input_tokens"),
+            func.sum(UsageLog.cache_read_tokens).label("cache_read_tokens"),
+            func.sum(UsageLog.cache_write_tokens).label("cache_write_tokens"),
+            func.count(UsageLog.id).label("request_count"),
+        ).group_by(UsageLog.agent_role)
+
+        query = _apply_period_filter(query, period)
+        result = await session.execute(query)
+        rows = result.all()
+
+    report = []
+    for r in rows:
+        prompt_tokens = r.input_tokens + r.cache_read_tokens + r.cache_write_tokens
+        report.append(
+            PromptCacheUsage(
+                role=r.agent_role,
+                input_tokens=r.input_tokens,
+                cache_read_tokens=r.cache_read_tokens,
+                cache_write_tokens=r.cache_write_tokens,
+                hit_ratio=round(r.cache_read_tokens / prompt_tokens, 4) if prompt_tokens else 0.0,
+                request_count=r.request_count,
+            )
+        )
+    return sorted(report, key=lambda row: row.role)
+
+
 @router.get("/usage/{clerk_id}", response_model=list[UserUsageBreakdown])
 async def user_usage(
     clerk_id: str,
@@ -251,6 +293,18 @@ async def user_usage(
         ]
 
 
+# ---------- Queue ----------
+
+
+@router.get("/queue/wait-times", response_model=list[QueueWaitSnapshot])
+async def queue_wait_times(
+    hours: int = Query(24, ge=1, le=168),
+    _: ClerkUser = Depends(require_admin),
+):
+    """Per-tier queue-wait histograms (time from enqueue to admission) over the last N hours."""
+    return await QueueWaitHistogram(get_redis()).snapshot_all(hours=hours)
+
+
 # ---------- Helpers ----------
 
 
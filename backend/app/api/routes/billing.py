@@ -12,6 +12,7 @@ from sqlalchemy.exc import IntegrityError
 
 from app.core.auth import ClerkUser, require_auth
 from app.core.config import get_settings
+from app.core.llm_config import invalidate_user_settings
 from app.db.base import get_session_factory
 from app.db.models.plan_tier import PlanTier
 from app.db.models.stripe_event import StripeWebhookEvent
@@ -135,6 +136,7 @@ async def _get_or_create_stripe_customer(user_settings: UserSettings, clerk_user
             us = result.scalar_one()
             us.stripe_customer_id = customer.id
             await session.commit()
+            invalidate_user_settings(clerk_user_id)
         except IntegrityError:
             # Concurrent request already set stripe_customer_id — re-query to get it
             await session.rollback()
@@ -390,6 +392,7 @@ async def _handle_checkout_completed(session_data: dict) -> None:
             user_settings.stripe_customer_id = customer_id
 
         await session.commit()
+        invalidate_user_settings(clerk_user_id)
         logger.info("plan_upgraded", plan_slug=plan_slug, user_id=clerk_user_id)
 
     await emit_business_event("new_subscription", user_id=clerk_user_id)
@@ -414,6 +417,7 @@ async def _handle_subscription_updated(subscription: dict) -> None:
         user_settings.stripe_subscription_status = status
         user_settings.stripe_subscription_id = subscription.get("id")
         await session.commit()
+        invalidate_user_settings(user_settings.clerk_user_id)
         logger.info("subscription_status_updated", status=status, customer_id=customer_id)
 
 
@@ -441,6 +445,7 @@ async def _handle_subscription_deleted(subscription: dict) -> None:
         user_settings.stripe_subscription_id = None
         user_settings.stripe_subscription_status = None
         await session.commit()
+        invalidate_user_settings(clerk_user_id)
         logger.info("plan_downgraded_to_bootstrapper", customer_id=customer_id)
 
     await emit_business_event("subscription_cancelled", user_id=clerk_user_id)
@@ -468,4 +473,5 @@ async def _handle_payment_failed(invoice: dict) -> None:
         user_settings.stripe_subscription_status = "past_due"
         # Do NOT clear stripe_subscription_id — Stripe may still recover the subscription
         await session.commit()
+        invalidate_user_settings(user_settings.clerk_user_id)
         logger.info("payment_failed_restricted_to_bootstrapper", customer_id=customer_id)
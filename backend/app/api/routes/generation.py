@@ -5,7 +5,7 @@ from datetime import UTC, datetime, timedelta
 
 import httpx
 import structlog
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, Field
 from sqlalchemy import select
 
@@ -17,7 +17,15 @@ from app.queue.manager import QueueManager
 from app.queue.schemas import JobStatus
 from app.queue.state_machine import JobStateMachine
 from app.sandbox.e2b_runtime import E2BSandboxRuntime
-from app.services.resume_service import SandboxExpiredError, SandboxUnreachableError, resume_sandbox
+from app.services.dashboard_cache import invalidate_dashboard
+from app.services.resume_service import (
+    RestoreResult,
+    SandboxExpiredError,
+    SandboxUnreachableError,
+    SnapshotUnavailableError,
+    restore_sandbox,
+    resume_sandbox,
+)
 
 logger = structlog.get_logger(__name__)
 
@@ -107,6 +115,7 @@ class ResumeResponse(BaseModel):
 
     preview_url: str
     sandbox_id: str
+    restored: bool = False  # True when an expired sandbox was rebuilt from the workspace snapshot
 
 
 class SnapshotResponse(BaseModel):
@@ -183,22 +192,6 @@ async def _predicted_build_version(project_id: str) -> str:
     return f"build_v0_{max_n + 1}"
 
 
-def _get_runner(request: Request):
-    """Build a Runner instance — RunnerReal in production, RunnerFake in dev."""
-    from app.core.config import get_settings
-
-    settings = get_settings()
-    if settings.anthropic_api_key:
-        from app.agent.runner_real import RunnerReal
-
-        checkpointer = getattr(request.app.state, "checkpointer", None)
-        return RunnerReal(checkpointer=checkpointer)
-    else:
-        from app.agent.runner_fake import RunnerFake
-
-        return RunnerFake()
-
-
 # ──────────────────────────────────────────────────────────────────────────────
 # Endpoints
 # ──────────────────────────────────────────────────────────────────────────────
@@ -206,9 +199,7 @@ def _get_runner(request: Request):
 
 @router.post("/start", status_code=201, response_model=StartGenerationResponse)
 async def start_generation(
-    request_obj: Request,
     request: StartGenerationRequest,
-    background_tasks: BackgroundTasks,
     user: ClerkUser = Depends(require_build_subscription),
     redis=Depends(get_redis),
 ):
@@ -217,7 +208,7 @@ async def start_generation(
     - Verifies project ownership.
     - Checks no pending gate is blocking.
     - Creates job in state machine and enqueues it.
-    - Triggers background worker with real Runner.
+    - Worker processes (app/worker.py) consume the queue and run the build.
 
     Returns:
         StartGenerationResponse with job_id, status="queued", and predicted build_version.
@@ -256,15 +247,10 @@ async def start_generation(
 
     # Enqueue
     queue_manager = QueueManager(redis)
-    await queue_manager.enqueue(job_id, "bootstrapper")
-
-    # Build a real Runner so the worker uses GenerationService instead of simulation
-    runner = _get_runner(request_obj)
-
-    # Trigger background worker
-    from app.queue.worker import process_next_job
+    await queue_manager.enqueue(job_id, "bootstrapper", user_id=user.user_id)
 
-    background_tasks.add_task(process_next_job, runner=runner, redis=redis)
+    # No dispatch here — the worker pool (app/worker.py) picks the job up and runs
+    # it through GenerationService with a real Runner
 
     return StartGenerationResponse(
         job_id=job_id,
@@ -537,14 +523,17 @@ async def resume_sandbox_preview(
     - Kills lingering processes, restarts dev server
     - Polls until the dev server is ready
 
-    On success: updates Redis (preview_url, sandbox_paused=false, updated_at) and Postgres.
+    If the sandbox has expired, a new one is booted from the build's workspace snapshot
+    (resume_service.restore_sandbox: stored files + cached dependency install, no LLM calls).
+
+    On success: updates Redis (preview_url, sandbox_id, sandbox_paused=false, updated_at) and Postgres.
 
     Returns:
-        ResumeResponse with fresh preview_url and sandbox_id.
+        ResumeResponse with fresh preview_url and sandbox_id (new when restored).
 
     Raises:
         HTTPException(404): Job not found, user mismatch, or no sandbox_id.
-        HTTPException(503): Sandbox expired or unreachable (distinct error_type).
+        HTTPException(503): Sandbox expired with no snapshot to restore, or unreachable (distinct error_type).
     """
     state_machine = JobStateMachine(redis)
     job_data = await state_machine.get_job(job_id)
@@ -558,16 +547,20 @@ async def resume_sandbox_preview(
 
     workspace_path = job_data.get("workspace_path", "/home/user/project")
 
+    restored = False
     try:
         new_preview_url = await resume_sandbox(sandbox_id, workspace_path)
     except SandboxExpiredError as exc:
-        raise HTTPException(
-            status_code=503,
-            detail={
-                "message": "Sandbox has expired and cannot be resumed. Please rebuild.",
-                "error_type": "sandbox_expired",
-            },
-        ) from exc
+        result = await _restore_expired_sandbox(job_id, job_data, workspace_path)
+        if result is None:
+            raise HTTPException(
+                status_code=503,
+                detail={
+                    "message": "Sandbox has expired and cannot be resumed. Please rebuild.",
+                    "error_type": "sandbox_expired",
+                },
+            ) from exc
+        new_preview_url, sandbox_id, restored = result.preview_url, result.sandbox_id, True
     except SandboxUnreachableError as exc:
         raise HTTPException(
             status_code=503,
@@ -577,20 +570,21 @@ async def resume_sandbox_preview(
             },
         ) from exc
 
-    # Update Redis: fresh preview_url, mark as not paused
+    # Update Redis: fresh preview_url (and sandbox_id after a restore), mark as not paused
     await redis.hset(
         f"job:{job_id}",
         mapping={
             "preview_url": new_preview_url,
+            "sandbox_id": sandbox_id,
             "sandbox_paused": "false",
             "updated_at": datetime.now(UTC).isoformat(),
         },
     )
 
-    # Update Postgres: sandbox_paused=False, preview_url=new_url
-    await _mark_sandbox_resumed(job_id, new_preview_url)
+    # Update Postgres: sandbox_paused=False, preview_url=new_url, sandbox_id
+    await _mark_sandbox_resumed(job_id, new_preview_url, sandbox_id)
 
-    return ResumeResponse(preview_url=new_preview_url, sandbox_id=sandbox_id)
+    return ResumeResponse(preview_url=new_preview_url, sandbox_id=sandbox_id, restored=restored)
 
 
 @router.post("/{job_id}/snapshot", response_model=SnapshotResponse)
@@ -696,8 +690,8 @@ async def get_generation_docs(
 # ──────────────────────────────────────────────────────────────────────────────
 
 
-async def _mark_sandbox_resumed(job_id: str, new_preview_url: str) -> None:
-    """Update jobs table: sandbox_paused=False, preview_url=new_preview_url.
+async def _mark_sandbox_resumed(job_id: str, new_preview_url: str, sandbox_id: str | None = None) -> None:
+    """Update jobs table: sandbox_paused=False, preview_url=new_preview_url (and sandbox_id when given).
 
     Non-fatal: logs warning on failure, does not raise.
     """
@@ -713,11 +707,44 @@ async def _mark_sandbox_resumed(job_id: str, new_preview_url: str) -> None:
             if job:
                 job.sandbox_paused = False
                 job.preview_url = new_preview_url
+                if sandbox_id:
+                    job.sandbox_id = sandbox_id
                 await session.commit()
+                await invalidate_dashboard(job.project_id)
     except Exception as exc:
         logger.warning("mark_sandbox_resumed_failed", job_id=job_id, error=str(exc))
 
 
+async def _restore_expired_sandbox(job_id: str, job_data: dict, workspace_path: str) -> RestoreResult | None:
+    """Boot a new sandbox from the job's workspace snapshot. None when there is none or the restore fails."""
+    build_version = job_data.get("build_version") or await _job_build_version(job_id)
+    if not build_version:
+        return None
+    try:
+        return await restore_sandbox(job_data["project_id"], build_version, workspace_path)
+    except SnapshotUnavailableError:
+        return None
+    except Exception as exc:
+        logger.warning("sandbox_restore_failed", job_id=job_id, build_version=build_version, error=str(exc))
+        return None
+
+
+async def _job_build_version(job_id: str) -> str | None:
+    """build_version of a job from Postgres (jobs finished before Redis carried it). None on failure."""
+    import uuid as _uuid_mod
+
+    from app.db.models.job import Job
+
+    try:
+        factory = get_session_factory()
+        async with factory() as session:
+            result = await session.execute(select(Job.build_version).where(Job.id == _uuid_mod.UUID(job_id)))
+            return result.scalar_one_or_none()
+    except Exception as exc:
+        logger.warning("job_build_version_lookup_failed", job_id=job_id, error=str(exc))
+        return None
+
+
 async def _mark_sandbox_paused_in_postgres(job_id: str) -> None:
     """Update jobs table: sandbox_paused=True.
 
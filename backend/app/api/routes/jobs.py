@@ -1,11 +1,10 @@
 """Job queue API routes."""
 
-import asyncio
 import json
 import time
 import uuid
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
@@ -17,6 +16,13 @@ from app.queue.manager import QueueManager
 from app.queue.schemas import TIER_ITERATION_DEPTH, JobStatus, UsageCounters
 from app.queue.state_machine import IterationTracker, JobStateMachine
 from app.queue.usage import UsageTracker
+from app.services.job_stream_broadcaster import (
+    TERMINAL_STATUSES,
+    JobStreamBroadcaster,
+    get_stream_broadcaster,
+    parse_last_event_id,
+    terminal_status,
+)
 
 router = APIRouter()
 
@@ -62,7 +68,6 @@ class ConfirmResponse(BaseModel):
 @router.post("", status_code=201, response_model=SubmitJobResponse)
 async def submit_job(
     request: SubmitJobRequest,
-    background_tasks: BackgroundTasks,
     user: ClerkUser = Depends(require_build_subscription),
     redis=Depends(get_redis),
 ):
@@ -70,7 +75,6 @@ async def submit_job(
 
     Args:
         request: SubmitJobRequest with project_id and goal
-        background_tasks: FastAPI background tasks
         user: Authenticated user from JWT
         redis: Redis client (injected)
 
@@ -143,7 +147,7 @@ async def submit_job(
     )
 
     # Enqueue
-    result = await queue_manager.enqueue(job_id, tier)
+    result = await queue_manager.enqueue(job_id, tier, user_id=user.user_id)
 
     # Increment daily usage
     await usage_tracker.increment_daily_usage(user.user_id)
@@ -155,10 +159,7 @@ async def submit_job(
     # Get usage counters
     counters = await usage_tracker.get_usage_counters(user.user_id, tier, job_id)
 
-    # Trigger background worker to process queue
-    from app.queue.worker import process_next_job
-
-    background_tasks.add_task(process_next_job, redis=redis)
+    # No dispatch here — the worker pool (app/worker.py) blocks on queue:pending
 
     return SubmitJobResponse(
         job_id=job_id,
@@ -216,15 +217,22 @@ async def get_job_status(
 @router.get("/{job_id}/stream")
 async def stream_job_status(
     job_id: str,
+    request: Request,
     user: ClerkUser = Depends(require_auth),
     redis=Depends(get_redis),
+    broadcaster: JobStreamBroadcaster = Depends(get_stream_broadcaster),
 ):
     """Stream real-time job status updates via SSE.
 
+    Events carry their job:{id}:events stream ID as `id:`; a reconnect with
+    Last-Event-ID replays the events missed in between.
+
     Args:
         job_id: Job UUID
+        request: FastAPI Request (for the Last-Event-ID header)
         user: Authenticated user from JWT
         redis: Redis client (injected)
+        broadcaster: Per-process event fan-out (injected)
 
     Returns:
         StreamingResponse with text/event-stream
@@ -238,30 +246,35 @@ async def stream_job_status(
     if not job_data or job_data.get("user_id") != user.user_id:
         raise HTTPException(status_code=404, detail="Job not found")
 
+    after_id = parse_last_event_id(request.headers.get("last-event-id"))
+
     async def event_generator():
         # Send initial status
         yield f"data: {json.dumps({'job_id': job_id, 'status': job_data.get('status'), 'message': job_data.get('status_message', '')})}\n\n"
 
-        # Check if already terminal
+        # Check if already terminal (a resuming client may still be owed missed events)
         status = job_data.get("status")
-        if status in ["ready", "failed"]:
+        if status in TERMINAL_STATUSES and after_id is None:
             return
 
-        # Subscribe to events
-        pubsub = redis.pubsub()
-        channel = f"job:{job_id}:events"
-        await pubsub.subscribe(channel)
-
+        sub = await broadcaster.subscribe(job_id, "events", after_id=after_id)
         try:
-            async for message in pubsub.listen():
-                if message["type"] == "message":
-                    yield f"data: {message['data']}\n\n"
-                    data = json.loads(message["data"])
-                    if data.get("status") in ["ready", "failed"]:
-                        break
+            if after_id is not None:
+                async for message in broadcaster.replay(sub):
+                    yield f"id: {message.id}\ndata: {message.data}\n\n"
+                    if terminal_status(message.data):
+                        return
+            if status in TERMINAL_STATUSES:
+                return
+
+            while True:
+                message = await sub.get()
+                if message.kind == "event":
+                    yield f"id: {message.id}\ndata: {message.data}\n\n"
+                elif message.kind in ("done", "evicted"):
+                    break
         finally:
-            await pubsub.unsubscribe(channel)
-            await pubsub.close()
+            await broadcaster.unsubscribe(sub)
 
     return StreamingResponse(
         event_generator(),
@@ -280,13 +293,19 @@ async def stream_job_events(
     request: Request,
     user: ClerkUser = Depends(require_auth),
     redis=Depends(get_redis),
+    broadcaster: JobStreamBroadcaster = Depends(get_stream_broadcaster),
 ):
     """Stream typed build events via SSE with 15-second heartbeat keepalive.
 
-    Subscribes to job:{job_id}:events Redis Pub/Sub channel and passes through
-    all event types: build.stage.started, build.stage.completed, snapshot.updated,
+    Receives job:{job_id}:events from the pod's shared Pub/Sub subscription
+    (JobStreamBroadcaster) and passes through all event types:
+    build.stage.started, build.stage.completed, snapshot.updated,
     documentation.updated.
 
+    Each event carries its job:{id}:events stream ID as `id:`. A reconnect
+    with Last-Event-ID replays every event after that ID before going live,
+    so events published while the client was reconnecting are not lost.
+
     Sends heartbeat events every 15 seconds to prevent ALB idle timeout (60s default).
     Closes stream when job reaches terminal state (ready/failed).
 
@@ -297,6 +316,7 @@ async def stream_job_events(
         request: FastAPI Request (for disconnect detection)
         user: Authenticated user from JWT
         redis: Redis client (injected)
+        broadcaster: Per-process event fan-out (injected)
 
     Returns:
         StreamingResponse with text/event-stream
@@ -310,19 +330,35 @@ async def stream_job_events(
     if not job_data or job_data.get("user_id") != user.user_id:
         raise HTTPException(status_code=404, detail="Job not found")
 
+    after_id = parse_last_event_id(request.headers.get("last-event-id"))
+
+    def final_status(status: str) -> str:
+        return f"data: {json.dumps({'type': 'build.stage.started', 'status': status, 'job_id': job_id})}\n\n"
+
     async def event_generator():
         # Check if already terminal — emit final status and close immediately
         current_status = job_data.get("status")
-        if current_status in ("ready", "failed"):
-            yield f"data: {json.dumps({'type': 'build.stage.started', 'status': current_status, 'job_id': job_id})}\n\n"
+        if current_status in TERMINAL_STATUSES and after_id is None:
+            yield final_status(current_status)
             return
 
-        pubsub = redis.pubsub()
-        channel = f"job:{job_id}:events"
-        await pubsub.subscribe(channel)
+        sub = await broadcaster.subscribe(job_id, "events", after_id=after_id)
         last_heartbeat = time.monotonic()
 
         try:
+            # Resume: replay what the client missed while reconnecting
+            if after_id is not None:
+                async for message in broadcaster.replay(sub):
+                    yield f"id: {message.id}\ndata: {message.data}\n\n"
+                    if terminal_status(message.data):
+                        return
+
+            # Re-check after subscribing so a transition in between is not missed
+            status = await state_machine.get_status(job_id)
+            if status is not None and status.value in TERMINAL_STATUSES:
+                yield final_status(status.value)
+                return
+
             while True:
                 if await request.is_disconnected():
                     return
@@ -333,27 +369,17 @@ async def stream_job_events(
                     yield "event: heartbeat\ndata: {}\n\n"
                     last_heartbeat = now
 
-                # Non-blocking poll with 1-second timeout
-                try:
-                    message = await asyncio.wait_for(
-                        pubsub.get_message(ignore_subscribe_messages=True),
-                        timeout=1.0,
-                    )
-                except TimeoutError:
+                message = await sub.get(timeout=1.0)
+                if message is None:
                     continue
-
-                if message and message["type"] == "message":
-                    yield f"data: {message['data']}\n\n"
+                if message.kind == "event":
+                    yield f"id: {message.id}\ndata: {message.data}\n\n"
                     last_heartbeat = time.monotonic()  # Reset heartbeat on data
-                    try:
-                        data = json.loads(message["data"])
-                        if data.get("status") in ("ready", "failed"):
-                            return
-                    except (json.JSONDecodeError, TypeError):
-                        pass
+                elif message.kind in ("done", "evicted"):
+                    # done follows the terminal status event, already passed through
+                    return
         finally:
-            await pubsub.unsubscribe(channel)
-            await pubsub.close()
+            await broadcaster.unsubscribe(sub)
 
     return StreamingResponse(
         event_generator(),
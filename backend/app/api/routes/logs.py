@@ -1,6 +1,5 @@
 """Build log streaming and pagination API routes."""
 
-import asyncio
 import json
 import time
 
@@ -10,14 +9,20 @@ from fastapi.responses import StreamingResponse
 from app.core.auth import ClerkUser, require_auth
 from app.db.redis import get_redis
 from app.queue.state_machine import JobStateMachine
+from app.services.job_stream_broadcaster import (
+    TERMINAL_STATUSES,
+    BroadcastMessage,
+    JobStreamBroadcaster,
+    get_stream_broadcaster,
+    parse_last_event_id,
+)
 
 router = APIRouter()
 
 # Stream key pattern: job:{job_id}:logs
 _STREAM_KEY = "job:{job_id}:logs"
 _HEARTBEAT_INTERVAL = 20  # seconds
-_POLL_BLOCK_MS = 500  # milliseconds for xread blocking poll
-_DRAIN_COUNT = 200  # max entries to drain on terminal state
+_WAIT_TIMEOUT = 0.5  # seconds between disconnect/heartbeat checks while idle
 
 
 def _stream_key(job_id: str) -> str:
@@ -25,6 +30,11 @@ def _stream_key(job_id: str) -> str:
     return f"job:{job_id}:logs"
 
 
+def _sse_log(message: BroadcastMessage) -> str:
+    """Format a log entry as an SSE event whose id is the stream entry ID."""
+    return f"id: {message.id}\nevent: log\ndata: {json.dumps(_parse_entry(message.id, message.data))}\n\n"
+
+
 def _parse_entry(entry_id: str, fields: dict) -> dict:
     """Parse a Redis Stream entry into a log line dict."""
     return {
@@ -42,20 +52,27 @@ async def stream_job_logs(
     request: Request,
     user: ClerkUser = Depends(require_auth),
     redis=Depends(get_redis),
+    broadcaster: JobStreamBroadcaster = Depends(get_stream_broadcaster),
 ):
     """Stream real-time build log lines via SSE.
 
     Delivers live log output as Server-Sent Events. Late joiners see only
-    new lines (last_id='$') — no full replay on initial connect.
+    new lines — no full replay on initial connect (history is paged through
+    GET /logs). Each event carries the stream entry ID as `id:`; a reconnect
+    with Last-Event-ID replays every line after it before going live. Lines
+    come from the pod's shared per-job reader (JobStreamBroadcaster), not a
+    Redis loop per client.
 
     Sends heartbeat events every 20 seconds to prevent ALB idle timeout.
-    Sends a 'done' event and closes when job reaches READY or FAILED.
+    Sends a 'done' event and closes when the job's event stream reports
+    READY or FAILED (after the remaining log lines are drained).
 
     Args:
         job_id: Job UUID
         request: FastAPI Request (used for disconnect detection)
         user: Authenticated user from JWT
         redis: Redis client (injected)
+        broadcaster: Per-process log/event fan-out (injected)
 
     Returns:
         StreamingResponse with text/event-stream
@@ -69,62 +86,47 @@ async def stream_job_logs(
     if not job_data or job_data.get("user_id") != user.user_id:
         raise HTTPException(status_code=404, detail="Job not found")
 
-    stream_key = _stream_key(job_id)
+    after_id = parse_last_event_id(request.headers.get("last-event-id"))
 
     async def event_generator():
-        # Live-only: start from current end of stream (no full replay)
-        last_id = "$"
-        last_heartbeat = time.monotonic()
-
-        while True:
-            # Check for client disconnect
-            if await request.is_disconnected():
-                return
-
-            # Heartbeat check
-            now = time.monotonic()
-            if now - last_heartbeat >= _HEARTBEAT_INTERVAL:
-                yield "event: heartbeat\ndata: {}\n\n"
-                last_heartbeat = now
-
-            # Check terminal state
+        sub = await broadcaster.subscribe(job_id, "logs", after_id=after_id)
+        try:
+            if after_id is not None:
+                async for message in broadcaster.replay(sub):
+                    yield _sse_log(message)
+
+            # Checked once, after subscribing: a terminal event published from
+            # here on reaches the subscription; one published before is seen here
             current_status = await state_machine.get_status(job_id)
-            if current_status is not None and current_status.value in ("ready", "failed"):
-                # Drain remaining entries before closing
-                try:
-                    remaining = await redis.xread(
-                        {stream_key: last_id},
-                        count=_DRAIN_COUNT,
-                        block=None,
-                    )
-                    if remaining:
-                        for _key, entries in remaining:
-                            for entry_id, fields in entries:
-                                line = _parse_entry(entry_id, fields)
-                                yield f"event: log\ndata: {json.dumps(line)}\n\n"
-                                last_id = entry_id
-                except Exception:
-                    pass
-
-                # Emit done event and close
+            if current_status is not None and current_status.value in TERMINAL_STATUSES:
                 yield f"event: done\ndata: {json.dumps({'status': current_status.value})}\n\n"
                 return
 
-            # Poll for new log entries (500ms block)
-            try:
-                results = await redis.xread(
-                    {stream_key: last_id},
-                    block=_POLL_BLOCK_MS,
-                    count=100,
-                )
-                if results:
-                    for _key, entries in results:
-                        for entry_id, fields in entries:
-                            line = _parse_entry(entry_id, fields)
-                            yield f"event: log\ndata: {json.dumps(line)}\n\n"
-                            last_id = entry_id
-            except Exception:
-                await asyncio.sleep(0.5)
+            last_heartbeat = time.monotonic()
+            while True:
+                # Check for client disconnect
+                if await request.is_disconnected():
+                    return
+
+                # Heartbeat check
+                now = time.monotonic()
+                if now - last_heartbeat >= _HEARTBEAT_INTERVAL:
+                    yield "event: heartbeat\ndata: {}\n\n"
+                    last_heartbeat = now
+
+                message = await sub.get(timeout=_WAIT_TIMEOUT)
+                if message is None:
+                    continue
+                if message.kind == "log":
+                    yield _sse_log(message)
+                elif message.kind == "done":
+                    yield f"event: done\ndata: {json.dumps({'status': message.data})}\n\n"
+                    return
+                elif message.kind == "evicted":
+                    # Too slow to keep up — close so the client reconnects
+                    return
+        finally:
+            await broadcaster.unsubscribe(sub)
 
     return StreamingResponse(
         event_generator(),
@@ -12,7 +12,7 @@ from app.agent.llm_helpers import enqueue_failed_request
 from app.agent.runner import Runner
 from app.agent.runner_fake import RunnerFake
 from app.core.auth import ClerkUser, require_auth
-from app.core.llm_config import get_or_create_user_settings
+from app.core.llm_config import get_or_create_user_settings, invalidate_user_settings
 from app.db.base import get_session_factory
 from app.db.models.onboarding_session import OnboardingSession
 from app.db.models.user_settings import UserSettings
@@ -210,6 +210,7 @@ async def get_onboarding_status(
         if has_completed_session and user_settings and not user_settings.onboarding_completed:
             user_settings.onboarding_completed = True
             await session.commit()
+            invalidate_user_settings(user.user_id)
 
     return OnboardingStatusResponse(onboarding_completed=onboarding_completed)
 
@@ -82,3 +82,24 @@ class UserUsageBreakdown(BaseModel):
     total_tokens: int
     total_cost_microdollars: int
     request_count: int
+
+
+class PromptCacheUsage(BaseModel):
+    role: str
+    input_tokens: int  # uncached prompt tokens
+    cache_read_tokens: int
+    cache_write_tokens: int
+    hit_ratio: float  # cache_read / all prompt tokens
+    request_count: int
+
+
+# ---------- Queue ----------
+
+
+class QueueWaitSnapshot(BaseModel):
+    tier: str
+    count: int
+    mean_seconds: float | None
+    p50_seconds: int | None
+    p95_seconds: int | None
+    buckets: dict[str, int]
@@ -1,11 +1,15 @@
 """ArtifactGenerator: Core generation engine with cascade logic.
 
 Generates structured artifacts using Claude structured outputs via Runner protocol.
-Supports cascade generation (all 5 artifacts in order), partial failure handling, and tier filtering.
+Supports cascade generation (all 5 artifacts, concurrently where the dependencies allow),
+partial failure handling, and tier filtering.
 """
 
+import asyncio
+from collections.abc import Awaitable, Callable
+
 from app.agent.runner import Runner
-from app.schemas.artifacts import GENERATION_ORDER, ArtifactType
+from app.schemas.artifacts import ARTIFACT_DEPENDENCIES, GENERATION_ORDER, ArtifactType
 
 
 class ArtifactGenerator:
@@ -29,6 +33,7 @@ class ArtifactGenerator:
         artifact_type: ArtifactType,
         onboarding_data: dict,
         prior_artifacts: dict[str, dict] | None = None,
+        regenerate: bool = False,
     ) -> dict:
         """Generate a single artifact with optional context from prior artifacts.
 
@@ -36,6 +41,7 @@ class ArtifactGenerator:
             artifact_type: Type of artifact to generate
             onboarding_data: From onboarding session (idea, answers)
             prior_artifacts: Already-generated artifacts to use as context
+            regenerate: User asked for a fresh version; bypasses the runner's response cache
 
         Returns:
             Structured content dict matching the artifact type's Pydantic schema
@@ -52,6 +58,8 @@ class ArtifactGenerator:
             "idea": onboarding_data.get("idea", ""),
             "answers": onboarding_data.get("answers", {}),
         }
+        if regenerate:
+            brief_context["_regenerate"] = True
 
         # Generate all artifacts via Runner (RunnerFake returns pre-built data)
         all_artifacts = await self.runner.generate_artifacts(brief_context)
@@ -67,70 +75,69 @@ class ArtifactGenerator:
         self,
         onboarding_data: dict,
         existing_artifacts: dict[str, dict] | None = None,
+        on_complete: Callable[[ArtifactType, dict], Awaitable[None]] | None = None,
     ) -> tuple[dict[str, dict], list[str]]:
-        """Generate all artifacts in cascade order.
+        """Generate all artifacts, running each as soon as its dependencies are done.
+
+        Dependencies (ARTIFACT_DEPENDENCIES): Brief -> MVP Scope -> {Milestones, Risk Log,
+        How It Works}. The last three run concurrently once MVP Scope completes, and each
+        gets its completed dependencies as context.
 
-        Linear chain: Brief -> MVP Scope -> Milestones -> Risk Log -> How It Works
-        Each artifact gets all prior artifacts as context.
+        Partial failure: an artifact whose dependency failed is marked failed without being
+        generated (Brief failure fails all five; MVP Scope failure fails the last three).
+        A failure among the last three does not affect the others.
 
         Args:
             onboarding_data: From onboarding session (idea, answers)
             existing_artifacts: Already-generated artifacts to skip (for retry)
+            on_complete: Awaited with (artifact_type, content) as each artifact completes,
+                e.g. to persist it. An exception here fails that artifact.
 
         Returns:
-            Tuple of (completed_artifacts dict, failed_artifact_types list)
-
-        Raises:
-            RuntimeError: If generation fails (propagates from runner)
+            Tuple of (completed_artifacts dict, failed_artifact_types list in generation order)
         """
         completed = existing_artifacts.copy() if existing_artifacts else {}
-        failed = []
-        prior_artifacts = {}
-
-        # Generate in order
-        for artifact_type in GENERATION_ORDER:
-            # Skip if already exists
-            if artifact_type in completed:
-                prior_artifacts[artifact_type.value] = completed[artifact_type]
-                continue
-
-            try:
-                # Generate with context from all prior artifacts
-                content = await self.generate_artifact(
-                    artifact_type=artifact_type,
-                    onboarding_data=onboarding_data,
-                    prior_artifacts=prior_artifacts.copy() if prior_artifacts else None,
-                )
-                completed[artifact_type] = content
-                prior_artifacts[artifact_type.value] = content
-
-            except Exception:
-                # On failure: track failed type, don't continue cascade
-                failed.append(artifact_type.value)
-
-                # Brief failure: all downstream fail (can't generate without Brief)
-                if artifact_type == ArtifactType.BRIEF:
-                    # Add remaining to failed
-                    for remaining_type in GENERATION_ORDER[1:]:
-                        if remaining_type not in completed:
-                            failed.append(remaining_type.value)
+        failed: set[ArtifactType] = set()
+        pending = [at for at in GENERATION_ORDER if at not in completed]
+        running: dict[asyncio.Task, ArtifactType] = {}
+
+        async def run(artifact_type: ArtifactType) -> dict:
+            deps = ARTIFACT_DEPENDENCIES[artifact_type]
+            content = await self.generate_artifact(
+                artifact_type=artifact_type,
+                onboarding_data=onboarding_data,
+                prior_artifacts={dep.value: completed[dep] for dep in deps} or None,
+            )
+            if on_complete is not None:
+                await on_complete(artifact_type, content)
+            return content
+
+        try:
+            while pending or running:
+                for artifact_type in list(pending):
+                    deps = ARTIFACT_DEPENDENCIES[artifact_type]
+                    if any(dep in failed for dep in deps):
+                        # Can't generate without its dependencies
+                        failed.add(artifact_type)
+                        pending.remove(artifact_type)
+                    elif all(dep in completed for dep in deps):
+                        running[asyncio.create_task(run(artifact_type))] = artifact_type
+                        pending.remove(artifact_type)
+
+                if not running:
                     break
-
-                # MVP Scope failure: skip Milestones, Risk Log, How It Works
-                if artifact_type == ArtifactType.MVP_SCOPE:
-                    # Add remaining to failed (they depend on MVP)
-                    for remaining_type in GENERATION_ORDER[2:]:
-                        if remaining_type not in completed:
-                            failed.append(remaining_type.value)
-                    break
-
-                # Milestones failure: attempt Risk Log and How It Works (they can use Brief + MVP)
-                # Continue cascade
-
-                # Risk Log or How It Works failure: just track and continue
-                continue
-
-        return (completed, failed)
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    artifact_type = running.pop(task)
+                    if task.exception() is None:
+                        completed[artifact_type] = task.result()
+                    else:
+                        failed.add(artifact_type)
+        finally:
+            for task in running:
+                task.cancel()
+
+        return (completed, [at.value for at in GENERATION_ORDER if at in failed])
 
     @staticmethod
     def filter_by_tier(tier: str, artifact_type: ArtifactType, content: dict) -> dict:
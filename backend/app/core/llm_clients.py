@@ -0,0 +1,180 @@
+"""Process-wide Anthropic clients sharing one pooled HTTP transport.
+
+Every agent node used to get a fresh ChatAnthropic from create_tracked_llm, and the
+doc/narration services built their own anthropic.AsyncAnthropic per call — each with
+its own connection pool, so most calls paid a TLS handshake to the Anthropic API.
+
+This module keeps, per process (and event loop):
+- one keep-alive HTTP client (the SDK's DefaultAsyncHttpxClient, LLM_MAX_CONNECTIONS)
+- one anthropic.AsyncAnthropic on that transport (get_anthropic_client)
+- one ChatAnthropic per (model, max_tokens) on that client (get_chat_model)
+
+Per-call state (the usage-tracking callback) is bound per invocation by
+create_tracked_llm, so the shared models carry none.
+
+Each HTTP request records whether it opened a new connection and its time to first
+byte (request sent → response headers), attributed to the LLM role of the calling
+task (set_llm_role / llm_role). Totals are in stats(); each request is also emitted
+to CloudWatch via emit_llm_connection.
+"""
+
+import asyncio
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+import anthropic
+import httpx
+import structlog
+from langchain_anthropic import ChatAnthropic
+
+from app.core.config import get_settings
+from app.metrics.cloudwatch import emit_llm_connection
+
+logger = structlog.get_logger(__name__)
+
+_llm_role: ContextVar[str] = ContextVar("llm_role", default="other")
+
+
+def set_llm_role(role: str) -> None:
+    """Attribute this task's subsequent Anthropic requests to role (for connection metrics)."""
+    _llm_role.set(role)
+
+
+@contextmanager
+def llm_role(role: str) -> Iterator[None]:
+    """Attribute Anthropic requests made inside the block to role."""
+    token = _llm_role.set(role)
+    try:
+        yield
+    finally:
+        _llm_role.reset(token)
+
+
+@dataclass
+class _RoleStats:
+    requests: int = 0
+    new_connections: int = 0
+    ttfb_ms_total: float = 0.0
+
+
+class _RequestTrace:
+    """httpcore trace hook for one request: notes whether a TCP connection was opened."""
+
+    def __init__(self, role: str):
+        self.role = role
+        self.started = time.perf_counter()
+        self.new_connection = False
+
+    async def __call__(self, event_name: str, info: dict) -> None:
+        if event_name == "connection.connect_tcp.started":
+            self.new_connection = True
+
+
+@dataclass
+class _Clients:
+    loop: asyncio.AbstractEventLoop
+    http: anthropic.DefaultAsyncHttpxClient
+    anthropic: anthropic.AsyncAnthropic
+    chat_models: dict[tuple[str, int], ChatAnthropic] = field(default_factory=dict)
+
+
+_clients: _Clients | None = None
+_stats: dict[str, _RoleStats] = {}
+
+
+# Hooks receive the SDK's httpx Request/Response types, hence no annotations
+async def _on_request(request) -> None:
+    request.extensions["trace"] = _RequestTrace(_llm_role.get())
+
+
+async def _on_response(response) -> None:
+    trace = response.request.extensions.get("trace")
+    if not isinstance(trace, _RequestTrace):
+        return
+    ttfb_ms = (time.perf_counter() - trace.started) * 1000
+    stats = _stats.setdefault(trace.role, _RoleStats())
+    stats.requests += 1
+    stats.new_connections += trace.new_connection
+    stats.ttfb_ms_total += ttfb_ms
+    await emit_llm_connection(trace.role, ttfb_ms, reused=not trace.new_connection)
+
+
+def _build_clients(loop: asyncio.AbstractEventLoop) -> _Clients:
+    settings = get_settings()
+    http = anthropic.DefaultAsyncHttpxClient(
+        timeout=anthropic.Timeout(600.0, connect=10.0),
+        limits=httpx.Limits(
+            max_connections=settings.llm_max_connections,
+            max_keepalive_connections=settings.llm_max_connections,
+            keepalive_expiry=settings.llm_keepalive_seconds,
+        ),
+        event_hooks={"request": [_on_request], "response": [_on_response]},
+    )
+    client = anthropic.AsyncAnthropic(api_key=settings.anthropic_api_key, http_client=http, max_retries=2)
+    return _Clients(loop=loop, http=http, anthropic=client)
+
+
+def _get_clients() -> _Clients:
+    global _clients
+    loop = asyncio.get_running_loop()
+    # httpx pools are bound to the loop that opened them; rebuild if it changed
+    # (e.g. successive asyncio.run() calls in scripts and tests)
+    if _clients is None or _clients.loop is not loop:
+        _clients = _build_clients(loop)
+    return _clients
+
+
+def get_anthropic_client() -> anthropic.AsyncAnthropic:
+    """Return the shared AsyncAnthropic client. Must be called from the event loop."""
+    return _get_clients().anthropic
+
+
+class _PooledChatAnthropic(ChatAnthropic):
+    """ChatAnthropic that sends requests through the shared AsyncAnthropic client."""
+
+    @property
+    def _async_client(self) -> anthropic.AsyncAnthropic:
+        return get_anthropic_client()
+
+
+def get_chat_model(model: str, max_tokens: int) -> ChatAnthropic:
+    """Return the shared ChatAnthropic for (model, max_tokens), creating it on first use.
+
+    Bind per-call callbacks with .with_config(callbacks=[...]); never mutate the
+    returned instance.
+    """
+    clients = _get_clients()
+    chat_model = clients.chat_models.get((model, max_tokens))
+    if chat_model is None:
+        chat_model = _PooledChatAnthropic(
+            model=model,
+            api_key=get_settings().anthropic_api_key,
+            max_tokens=max_tokens,
+        )
+        clients.chat_models[(model, max_tokens)] = chat_model
+    return chat_model
+
+
+def stats() -> dict[str, dict[str, float]]:
+    """Per-role request count, connection reuse ratio and mean TTFB since process start."""
+    return {
+        role: {
+            "requests": s.requests,
+            "new_connections": s.new_connections,
+            "reuse_ratio": (s.requests - s.new_connections) / s.requests if s.requests else 0.0,
+            "mean_ttfb_ms": s.ttfb_ms_total / s.requests if s.requests else 0.0,
+        }
+        for role, s in _stats.items()
+    }
+
+
+async def close_llm_clients() -> None:
+    """Close the shared HTTP transport (app and worker shutdown)."""
+    global _clients
+    clients, _clients = _clients, None
+    if clients is not None and clients.loop is asyncio.get_running_loop():
+        await clients.http.aclose()
+        logger.info("llm_clients_closed", stats=stats())
@@ -4,30 +4,51 @@ Resolution order:
 1. UserSettings.override_models[role]  (admin override)
 2. PlanTier.default_models[role]       (plan default)
 3. Settings.*_model                    (global fallback)
+
+UserSettings (with plan_tier) is served from a short-TTL in-process cache, so an
+agent run no longer opens a DB session per LLM construction. Writers that change
+a user's settings or a plan tier call invalidate_user_settings(); other processes
+(workers, other API pods) pick the change up when the TTL lapses. Resolved models
+are additionally memoized per (user, job, role) so a job keeps one model for its
+whole run. The daily token-budget check always reads Redis live.
 """
 
+import time
+from collections import OrderedDict
 from datetime import date
 from typing import Any
 
 import structlog
-from langchain_anthropic import ChatAnthropic
 from langchain_core.callbacks import AsyncCallbackHandler
 from langchain_core.outputs import LLMResult
+from langchain_core.runnables import Runnable
 from sqlalchemy import select
 
 from app.core.config import get_settings
+from app.core.llm_clients import get_chat_model, set_llm_role
+from app.core.usage_ledger import UsageRecord, get_usage_ledger
 from app.db.base import get_session_factory
 from app.db.models.plan_tier import PlanTier
-from app.db.models.usage_log import UsageLog
 from app.db.models.user_settings import UserSettings
 from app.db.redis import get_redis
 
 logger = structlog.get_logger(__name__)
 
-# Cost per million tokens in microdollars (1 microdollar = $0.000001)
+# Cost per million tokens in microdollars (1 microdollar = $0.000001).
+# Prompt-cache writes (5 minute TTL) cost 1.25x input, cache reads 0.1x input.
 MODEL_COSTS: dict[str, dict[str, int]] = {
-    "claude-opus-4-20250514": {"input": 15_000_000, "output": 75_000_000},
-    "claude-sonnet-4-20250514": {"input": 3_000_000, "output": 15_000_000},
+    "claude-opus-4-20250514": {
+        "input": 15_000_000,
+        "output": 75_000_000,
+        "cache_write": 18_750_000,
+        "cache_read": 1_500_000,
+    },
+    "claude-sonnet-4-20250514": {
+        "input": 3_000_000,
+        "output": 15_000_000,
+        "cache_write": 3_750_000,
+        "cache_read": 300_000,
+    },
 }
 
 GLOBAL_MODEL_FALLBACK: dict[str, str] = {
@@ -37,9 +58,51 @@ GLOBAL_MODEL_FALLBACK: dict[str, str] = {
     "reviewer": "reviewer_model",
 }
 
+USER_SETTINGS_CACHE_MAX = 10_000  # users held in the settings cache
+JOB_MODEL_MEMO_MAX = 4096  # (user, job, role) entries held in the model memo
+
+# user_id -> (loaded_at monotonic, detached UserSettings with plan_tier loaded)
+_user_settings_cache: OrderedDict[str, tuple[float, UserSettings]] = OrderedDict()
+# (user_id, session_id, role) -> model name
+_job_models: OrderedDict[tuple[str, str, str], str] = OrderedDict()
+
+
+def invalidate_user_settings(user_id: str | None = None) -> None:
+    """Drop cached settings and memoized job models for one user, or for everyone.
+
+    Pass no user_id after a PlanTier edit — it changes every user on that tier.
+    """
+    if user_id is None:
+        _user_settings_cache.clear()
+        _job_models.clear()
+        return
+    _user_settings_cache.pop(user_id, None)
+    for key in [k for k in _job_models if k[0] == user_id]:
+        del _job_models[key]
+
 
 async def get_or_create_user_settings(user_id: str) -> UserSettings:
-    """Return UserSettings for user_id, creating with bootstrapper plan if new."""
+    """Return UserSettings for user_id, creating with bootstrapper plan if new.
+
+    Cached for Settings.user_settings_cache_ttl_seconds. The returned instance is
+    detached and shared between callers — treat it as read-only.
+    """
+    ttl = get_settings().user_settings_cache_ttl_seconds
+    cached = _user_settings_cache.get(user_id)
+    if cached is not None and time.monotonic() - cached[0] < ttl:
+        _user_settings_cache.move_to_end(user_id)
+        return cached[1]
+
+    user_settings = await _load_user_settings(user_id)
+    if ttl > 0:
+        _user_settings_cache[user_id] = (time.monotonic(), user_settings)
+        _user_settings_cache.move_to_end(user_id)
+        while len(_user_settings_cache) > USER_SETTINGS_CACHE_MAX:
+            _user_settings_cache.popitem(last=False)
+    return user_settings
+
+
+async def _load_user_settings(user_id: str) -> UserSettings:
     factory = get_session_factory()
 
     async with factory() as session:
@@ -65,9 +128,12 @@ async def get_or_create_user_settings(user_id: str) -> UserSettings:
         return new_settings
 
 
-async def resolve_llm_config(user_id: str, role: str) -> str:
+async def resolve_llm_config(user_id: str, role: str, session_id: str | None = None) -> str:
     """Resolve the model name for a given user and agent role.
 
+    With a session_id the resolved model is memoized for that job, so its calls
+    share one model until invalidate_user_settings() drops the entry.
+
     Raises:
         PermissionError: if user is suspended or over daily token limit.
     """
@@ -79,6 +145,20 @@ async def resolve_llm_config(user_id: str, role: str) -> str:
     # Check daily token limit
     await _check_daily_token_limit(user_id, user_settings)
 
+    if session_id is None:
+        return _resolve_model(user_settings, role)
+
+    key = (user_id, session_id, role)
+    model = _job_models.get(key)
+    if model is None:
+        model = _resolve_model(user_settings, role)
+        _job_models[key] = model
+        while len(_job_models) > JOB_MODEL_MEMO_MAX:
+            _job_models.popitem(last=False)
+    return model
+
+
+def _resolve_model(user_settings: UserSettings, role: str) -> str:
     # 1. Admin override
     if user_settings.override_models and role in user_settings.override_models:
         return user_settings.override_models[role]
@@ -120,14 +200,16 @@ async def create_tracked_llm(
     user_id: str,
     role: str,
     session_id: str,
-) -> ChatAnthropic:
-    """Return a ChatAnthropic instance with usage tracking callback.
+) -> Runnable:
+    """Return the shared ChatAnthropic for the resolved model, bound to a usage tracking callback.
 
-    Resolves the model via plan/override/global fallback and attaches a
-    callback that writes UsageLog rows and increments the Redis daily counter.
+    Resolves the model via plan/override/global fallback. The client comes from the
+    process-wide registry (llm_clients.get_chat_model); the callback that queues
+    UsageLog rows and increments the Redis daily counter is attached per invocation
+    via with_config, so the returned runnable is per-call and the client is not.
     """
-    model = await resolve_llm_config(user_id, role)
-    settings = get_settings()
+    model = await resolve_llm_config(user_id, role, session_id)
+    set_llm_role(role)
 
     callback = UsageTrackingCallback(
         user_id=user_id,
@@ -136,16 +218,12 @@ async def create_tracked_llm(
         model=model,
     )
 
-    return ChatAnthropic(
-        model=model,
-        api_key=settings.anthropic_api_key,
-        max_tokens=8192 if role == "coder" else 4096,
-        callbacks=[callback],
-    )
+    chat_model = get_chat_model(model, max_tokens=8192 if role == "coder" else 4096)
+    return chat_model.with_config(callbacks=[callback])
 
 
 class UsageTrackingCallback(AsyncCallbackHandler):
-    """LangChain async callback that logs token usage to DB + Redis."""
+    """LangChain async callback that records token usage (usage ledger) and bumps the Redis daily counter."""
 
     def __init__(self, user_id: str, session_id: str, role: str, model: str):
         super().__init__()
@@ -160,40 +238,41 @@ class UsageTrackingCallback(AsyncCallbackHandler):
         if usage is None:
             return
 
+        # Anthropic's input_tokens excludes prompt-cache reads and writes
         input_tokens = usage.get("input_tokens", 0)
         output_tokens = usage.get("output_tokens", 0)
-        total_tokens = input_tokens + output_tokens
-
-        cost = _calculate_cost(self.model, input_tokens, output_tokens)
-
-        # Write to Postgres
-        try:
-            factory = get_session_factory()
-            async with factory() as session:
-                log = UsageLog(
-                    clerk_user_id=self.user_id,
-                    session_id=self.session_id,
-                    agent_role=self.role,
-                    model_used=self.model,
-                    input_tokens=input_tokens,
-                    output_tokens=output_tokens,
-                    total_tokens=total_tokens,
-                    cost_microdollars=cost,
-                )
-                session.add(log)
-                await session.commit()
-        except Exception as e:
-            logger.warning(
-                "usage_tracking_db_write_failed", user_id=self.user_id, error=str(e), error_type=type(e).__name__
+        cache_read_tokens = usage.get("cache_read_input_tokens") or 0
+        cache_write_tokens = usage.get("cache_creation_input_tokens") or 0
+        # The daily budget counts every prompt token, cached or not
+        total_tokens = input_tokens + cache_read_tokens + cache_write_tokens + output_tokens
+
+        cost = _calculate_cost(self.model, input_tokens, output_tokens, cache_read_tokens, cache_write_tokens)
+
+        # Queue the UsageLog row; the ledger bulk-inserts off the call path
+        get_usage_ledger().record(
+            UsageRecord(
+                clerk_user_id=self.user_id,
+                session_id=self.session_id,
+                agent_role=self.role,
+                model_used=self.model,
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
+                total_tokens=total_tokens,
+                cost_microdollars=cost,
+                cache_read_tokens=cache_read_tokens,
+                cache_write_tokens=cache_write_tokens,
             )
+        )
 
-        # Increment Redis daily counter
+        # Increment Redis daily counter (real-time: the budget check reads it)
         try:
             r = get_redis()
             today = date.today().isoformat()
             key = f"cofounder:usage:{self.user_id}:{today}"
-            await r.incrby(key, total_tokens)
-            await r.expire(key, 90_000)  # 25h TTL for safety
+            pipe = r.pipeline(transaction=False)
+            pipe.incrby(key, total_tokens)
+            pipe.expire(key, 90_000)  # 25h TTL for safety
+            await pipe.execute()
         except Exception as e:
             logger.warning(
                 "usage_tracking_redis_write_failed", user_id=self.user_id, error=str(e), error_type=type(e).__name__
@@ -215,12 +294,34 @@ def _extract_usage(response: LLMResult) -> dict | None:
     if not usage and hasattr(response, "llm_output") and response.llm_output:
         usage = response.llm_output.get("usage", {})
 
+    if not usage:
+        # Streamed calls (astream) only carry LangChain's usage_metadata, whose
+        # input_tokens includes cache reads/writes; convert to Anthropic's shape
+        metadata = getattr(getattr(gen[0], "message", None), "usage_metadata", None)
+        if metadata:
+            details = metadata.get("input_token_details") or {}
+            cache_read = details.get("cache_read") or 0
+            cache_write = details.get("cache_creation") or 0
+            usage = {
+                "input_tokens": metadata.get("input_tokens", 0) - cache_read - cache_write,
+                "output_tokens": metadata.get("output_tokens", 0),
+                "cache_read_input_tokens": cache_read,
+                "cache_creation_input_tokens": cache_write,
+            }
+
     return usage if usage else None
 
 
-def _calculate_cost(model: str, input_tokens: int, output_tokens: int) -> int:
+def _calculate_cost(
+    model: str,
+    input_tokens: int,
+    output_tokens: int,
+    cache_read_tokens: int = 0,
+    cache_write_tokens: int = 0,
+) -> int:
     """Return cost in microdollars."""
-    costs = MODEL_COSTS.get(model, {"input": 3_000_000, "output": 15_000_000})
+    costs = MODEL_COSTS.get(model, MODEL_COSTS["claude-sonnet-4-20250514"])
     input_cost = (input_tokens * costs["input"]) // 1_000_000
     output_cost = (output_tokens * costs["output"]) // 1_000_000
-    return input_cost + output_cost
+    cache_cost = (cache_read_tokens * costs["cache_read"] + cache_write_tokens * costs["cache_write"]) // 1_000_000
+    return input_cost + output_cost + cache_cost
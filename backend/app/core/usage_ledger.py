@@ -0,0 +1,161 @@
+"""In-process usage ledger: batches UsageLog rows off the LLM call path.
+
+UsageTrackingCallback.on_llm_end used to open a session, INSERT one UsageLog row
+and commit before the LangGraph run could continue — one Postgres transaction per
+LLM response. It now calls UsageLedger.record(), which only appends to a buffer.
+The buffer is written as one bulk INSERT when it reaches USAGE_LEDGER_BATCH_SIZE
+rows or USAGE_LEDGER_FLUSH_SECONDS after its first row, whichever comes first.
+
+Durability: a batch whose INSERT fails is pushed to the Redis list
+cofounder:usage_ledger:fallback, and every successful flush drains up to one batch
+from that list back into Postgres. The app lifespan and the worker flush the
+ledger on shutdown.
+
+The daily token counter (cofounder:usage:{user}:{date}) is not batched — the
+callback still updates it immediately so budget checks stay real-time.
+"""
+
+import asyncio
+import json
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+
+import structlog
+from sqlalchemy import insert
+
+from app.core.config import get_settings
+from app.db.base import get_session_factory
+from app.db.models.usage_log import UsageLog
+from app.db.redis import get_redis
+
+logger = structlog.get_logger(__name__)
+
+FALLBACK_KEY = "cofounder:usage_ledger:fallback"
+
+
+@dataclass
+class UsageRecord:
+    """One LLM response's usage, as written to usage_logs."""
+
+    clerk_user_id: str
+    session_id: str
+    agent_role: str
+    model_used: str
+    input_tokens: int
+    output_tokens: int
+    total_tokens: int
+    cost_microdollars: int
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
+    created_at: datetime = field(default_factory=lambda: datetime.now(UTC))
+
+
+class UsageLedger:
+    """Buffers UsageRecords and writes them to Postgres in bulk.
+
+    Args:
+        batch_size: Buffered records that trigger an immediate flush
+        flush_interval: Max seconds a record waits before its batch is flushed
+    """
+
+    def __init__(self, batch_size: int = 100, flush_interval: float = 2.0) -> None:
+        self._batch_size = max(1, batch_size)
+        self._flush_interval = flush_interval
+        self._pending: list[UsageRecord] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._flush_task: asyncio.Task | None = None
+        self._flush_lock = asyncio.Lock()
+        self._loop = asyncio.get_running_loop()
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def record(self, usage: UsageRecord) -> None:
+        """Queue a record; never blocks on the database."""
+        self._pending.append(usage)
+        if len(self._pending) >= self._batch_size:
+            self._schedule_flush()
+        elif self._timer is None:
+            self._timer = self._loop.call_later(self._flush_interval, self._schedule_flush)
+
+    async def flush(self) -> None:
+        """Write everything buffered now (shutdown, tests)."""
+        await self._flush()
+        if self._flush_task is not None:
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+
+    def _schedule_flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        # Keep a reference so the task is not garbage-collected mid-write
+        self._flush_task = asyncio.ensure_future(self._flush())
+
+    async def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        async with self._flush_lock:
+            batch, self._pending = self._pending, []
+            if batch:
+                rows = [asdict(r) for r in batch]
+                if not await self._insert(rows):
+                    await self._push_fallback(rows)
+                    return
+            await self._drain_fallback()
+
+    async def _insert(self, rows: list[dict]) -> bool:
+        try:
+            factory = get_session_factory()
+            async with factory() as session:
+                await session.execute(insert(UsageLog), rows)
+                await session.commit()
+        except Exception as e:
+            logger.warning("usage_ledger_insert_failed", rows=len(rows), error=str(e), error_type=type(e).__name__)
+            return False
+        return True
+
+    async def _push_fallback(self, rows: list[dict]) -> None:
+        try:
+            await get_redis().rpush(FALLBACK_KEY, *[json.dumps(row, default=datetime.isoformat) for row in rows])
+        except Exception as e:
+            # Both stores are down: the rows are lost, but the daily counter already counted them
+            logger.error("usage_ledger_rows_dropped", rows=len(rows), error=str(e), error_type=type(e).__name__)
+
+    async def _drain_fallback(self) -> None:
+        """Move up to one batch of rows from the Redis fallback list into Postgres."""
+        try:
+            raw = await get_redis().lpop(FALLBACK_KEY, self._batch_size)
+        except Exception:
+            return
+        if not raw:
+            return
+        rows = [json.loads(item) for item in raw]
+        for row in rows:
+            row["created_at"] = datetime.fromisoformat(row["created_at"])
+            # Rows queued before the cache columns existed
+            row.setdefault("cache_read_tokens", 0)
+            row.setdefault("cache_write_tokens", 0)
+        if await self._insert(rows):
+            logger.info("usage_ledger_fallback_replayed", rows=len(rows))
+        else:
+            await self._push_fallback(rows)
+
+
+_ledger: UsageLedger | None = None
+
+
+def get_usage_ledger() -> UsageLedger:
+    """Return this process's ledger (created on first use). Must be called from the event loop."""
+    global _ledger
+    if _ledger is None or _ledger._loop is not asyncio.get_running_loop():
+        settings = get_settings()
+        _ledger = UsageLedger(settings.usage_ledger_batch_size, settings.usage_ledger_flush_seconds)
+    return _ledger
+
+
+async def flush_usage_ledger() -> None:
+    """Flush buffered usage rows (app and worker shutdown)."""
+    if _ledger is not None and _ledger._loop is asyncio.get_running_loop():
+        await _ledger.flush()
@@ -1,5 +1,8 @@
 """Shared SQLAlchemy base and database initialization."""
 
+from typing import Any
+from uuid import uuid4
+
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
@@ -8,7 +11,8 @@ from sqlalchemy.ext.asyncio import (
 )
 from sqlalchemy.orm import DeclarativeBase
 
-from app.core.config import get_settings
+from app.core.config import Settings, get_settings
+from app.db.pool_metrics import TimedAsyncQueuePool, instrument_pool
 
 
 class Base(DeclarativeBase):
@@ -19,10 +23,40 @@ _engine: AsyncEngine | None = None
 _session_factory: async_sessionmaker[AsyncSession] | None = None
 
 
-async def init_db(url: str | None = None) -> None:
+def engine_options(settings: Settings, db_url: str) -> dict[str, Any]:
+    """create_async_engine() keyword arguments for the configured pool and statement caches.
+
+    In pgbouncer mode (transaction pooling) consecutive statements may run on
+    different server connections, so asyncpg's prepared statement cache and
+    SQLAlchemy's cache of prepared statements are disabled, and the statements
+    asyncpg still prepares get unique names so they cannot collide across clients.
+    """
+    options: dict[str, Any] = {
+        "echo": settings.debug,
+        "poolclass": TimedAsyncQueuePool,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+    if db_url.startswith("postgresql+asyncpg"):
+        if settings.db_pgbouncer:
+            options["connect_args"] = {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+            }
+        else:
+            options["connect_args"] = {"statement_cache_size": settings.db_statement_cache_size}
+    return options
+
+
+async def init_db(url: str | None = None, service: str = "api") -> None:
     """Initialize the async database engine and session factory.
 
-    Creates all tables defined via Base.metadata.
+    Creates all tables defined via Base.metadata. service ("api" or "worker")
+    tags the pool telemetry.
     """
     global _engine, _session_factory
 
@@ -32,7 +66,8 @@ async def init_db(url: str | None = None) -> None:
     settings = get_settings()
     db_url = url or settings.database_url
 
-    _engine = create_async_engine(db_url, echo=settings.debug, pool_pre_ping=True)
+    _engine = create_async_engine(db_url, **engine_options(settings, db_url))
+    instrument_pool(_engine, service)
     _session_factory = async_sessionmaker(
         _engine,
         class_=AsyncSession,
@@ -21,5 +21,8 @@ class UsageLog(Base):
     output_tokens = Column(Integer, nullable=False, default=0)
     total_tokens = Column(Integer, nullable=False, default=0)
     cost_microdollars = Column(Integer, nullable=False, default=0)
+    # Prompt-cache tokens (Anthropic reports these separately from input_tokens)
+    cache_read_tokens = Column(Integer, nullable=False, default=0, server_default="0")
+    cache_write_tokens = Column(Integer, nullable=False, default=0, server_default="0")
 
     created_at = Column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(UTC), index=True)
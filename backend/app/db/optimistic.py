@@ -0,0 +1,30 @@
+"""Optimistic concurrency for writes that follow an LLM call.
+
+Services read what a Runner call needs, close the session (returning its pooled
+connection) for the seconds the call takes, then write the result in a short
+transaction. That write is a compare-and-set on a version column observed during
+the read — Artifact.version_number, or updated_at for interview sessions — so a
+concurrent change made while the LLM was running is never silently overwritten.
+"""
+
+from typing import Any
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+async def update_if_unchanged(
+    session: AsyncSession, model: type, row_id: Any, version_column: Any, seen: Any, **values: Any
+) -> bool:
+    """UPDATE model row row_id with values, only if version_column still equals seen.
+
+    Returns False (and writes nothing) if the row changed or no longer exists;
+    callers answer 409 so the client can retry against the current state.
+    """
+    result = await session.execute(
+        update(model)
+        .where(model.id == row_id, version_column == seen)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
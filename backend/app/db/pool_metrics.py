@@ -0,0 +1,151 @@
+"""Connection-pool telemetry for the SQLAlchemy engine.
+
+A request that opens a session while every pooled connection is checked out
+waits in QueuePool until one is returned (or DB_POOL_TIMEOUT_SECONDS expires).
+Services that hold a session across an LLM call cause exactly that wait for
+unrelated requests, so checkout wait time is the metric that shows whether
+sessions are released promptly and whether DB_POOL_SIZE/DB_MAX_OVERFLOW fit the
+process (API and worker pods are sized independently).
+
+TimedAsyncQueuePool measures each checkout; instrument_pool() adds pool events
+(checkouts, new connections, invalidations, overflow in use). Everything is
+aggregated in-process and flushed once per FLUSH_INTERVAL_SECONDS as one
+db_pool_stats log line and one CloudWatch put_metric_data, rather than per
+checkout. Waits over SLOW_WAIT_SECONDS and every invalidation are also logged
+individually.
+"""
+
+import threading
+import time
+
+import structlog
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.metrics.cloudwatch import emit_db_pool_stats
+
+logger = structlog.get_logger(__name__)
+
+FLUSH_INTERVAL_SECONDS = 60.0
+SLOW_WAIT_SECONDS = 0.5
+
+
+class PoolStats:
+    """Counters for one flush window, flushed every flush_interval seconds."""
+
+    def __init__(self, flush_interval: float = FLUSH_INTERVAL_SECONDS, service: str = "api"):
+        self.flush_interval = flush_interval
+        self.service = service
+        self._lock = threading.Lock()
+        self._reset(time.monotonic())
+
+    def _reset(self, now: float) -> None:
+        self.wait_count = 0
+        self.wait_total = 0.0
+        self.wait_min = 0.0
+        self.wait_max = 0.0
+        self.checkouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.peak_checked_out = 0
+        self.peak_overflow = 0
+        self._window_start = now
+
+    def record_wait(self, seconds: float) -> None:
+        if seconds >= SLOW_WAIT_SECONDS:
+            logger.warning("db_pool_wait_slow", service=self.service, wait_ms=round(seconds * 1000, 1))
+        with self._lock:
+            self.wait_min = seconds if self.wait_count == 0 else min(self.wait_min, seconds)
+            self.wait_max = max(self.wait_max, seconds)
+            self.wait_count += 1
+            self.wait_total += seconds
+        self._maybe_flush()
+
+    def record_checkout(self, checked_out: int, overflow: int) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.peak_checked_out = max(self.peak_checked_out, checked_out)
+            self.peak_overflow = max(self.peak_overflow, overflow)
+        self._maybe_flush()
+
+    def record_connect(self) -> None:
+        with self._lock:
+            self.connects += 1
+        self._maybe_flush()
+
+    def record_invalidate(self, error: BaseException | None, soft: bool = False) -> None:
+        logger.warning(
+            "db_connection_invalidated",
+            service=self.service,
+            soft=soft,
+            error=str(error) if error else None,
+            error_type=type(error).__name__ if error else None,
+        )
+        with self._lock:
+            self.invalidations += 1
+        self._maybe_flush()
+
+    def _maybe_flush(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if now - self._window_start < self.flush_interval:
+                return
+            stats = {
+                "wait_count": self.wait_count,
+                "wait_total_ms": self.wait_total * 1000,
+                "wait_min_ms": self.wait_min * 1000,
+                "wait_max_ms": self.wait_max * 1000,
+                "checkouts": self.checkouts,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "peak_checked_out": self.peak_checked_out,
+                "peak_overflow": self.peak_overflow,
+            }
+            self._reset(now)
+        logger.info("db_pool_stats", service=self.service, **stats)
+        emit_db_pool_stats(self.service, stats)
+
+
+pool_stats = PoolStats()
+
+
+class TimedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records how long each checkout waited for a connection.
+
+    The measured time covers queueing for a free connection and, when the pool
+    may still overflow, opening a new one.
+    """
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            pool_stats.record_wait(time.perf_counter() - start)
+
+
+def instrument_pool(engine: AsyncEngine, service: str) -> None:
+    """Feed engine's pool events into pool_stats, tagged with service ("api" or "worker")."""
+    pool_stats.service = service
+    sync_engine = engine.sync_engine
+
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        pool = sync_engine.pool
+        checked_out = pool.checkedout() if hasattr(pool, "checkedout") else 0
+        overflow = max(pool.overflow(), 0) if hasattr(pool, "overflow") else 0
+        pool_stats.record_checkout(checked_out, overflow)
+
+    def on_connect(dbapi_connection, connection_record):
+        pool_stats.record_connect()
+
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        pool_stats.record_invalidate(exception)
+
+    def on_soft_invalidate(dbapi_connection, connection_record, exception):
+        pool_stats.record_invalidate(exception, soft=True)
+
+    event.listen(sync_engine, "checkout", on_checkout)
+    event.listen(sync_engine, "connect", on_connect)
+    event.listen(sync_engine, "invalidate", on_invalidate)
+    event.listen(sync_engine, "soft_invalidate", on_soft_invalidate)
@@ -21,8 +21,11 @@ from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
+from app.agent.checkpointer import close_checkpointer, open_checkpointer
 from app.api.routes import api_router
 from app.core.config import get_settings
+from app.core.llm_clients import close_llm_clients
+from app.core.usage_ledger import flush_usage_ledger
 from app.db import close_db, close_redis, init_db, init_redis
 from app.db.seed import seed_plan_tiers
 from app.middleware.correlation import (
@@ -90,48 +93,25 @@ async def lifespan(app: FastAPI):
         logger.info("neo4j_schema_skipped", reason=str(e))
 
     # Initialize LangGraph checkpointer (production: AsyncPostgresSaver, fallback: MemorySaver)
-    try:
-        from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
-
-        db_url = settings.database_url
-        if db_url and "postgresql" in db_url:
-            # AsyncPostgresSaver uses psycopg directly — strip SQLAlchemy dialect
-            conn_string = db_url.replace("+asyncpg", "").replace("+psycopg", "")
-            checkpointer = AsyncPostgresSaver.from_conn_string(conn_string)
-            # from_conn_string returns an async context manager — enter it
-            app.state._checkpointer_cm = checkpointer
-            app.state.checkpointer = await checkpointer.__aenter__()
-            await app.state.checkpointer.setup()  # idempotent — creates tables if missing
-            logger.info("checkpointer_initialized", type="AsyncPostgresSaver")
-        else:
-            from langgraph.checkpoint.memory import MemorySaver
-
-            app.state.checkpointer = MemorySaver()
-            app.state._checkpointer_cm = None
-            logger.info("checkpointer_initialized", type="MemorySaver", reason="no_database_url")
-    except Exception as e:
-        from langgraph.checkpoint.memory import MemorySaver
-
-        app.state.checkpointer = MemorySaver()
-        app.state._checkpointer_cm = None
-        logger.warning("checkpointer_fallback", type="MemorySaver", error=str(e), error_type=type(e).__name__)
+    app.state.checkpointer, app.state._checkpointer_cm = await open_checkpointer(settings.database_url)
 
     yield
 
     # Shutdown
     logger.info("shutdown_begin")
     # Close checkpointer connection
-    try:
-        if hasattr(app.state, "_checkpointer_cm") and app.state._checkpointer_cm is not None:
-            await app.state._checkpointer_cm.__aexit__(None, None, None)
-    except Exception:
-        pass
+    await close_checkpointer(getattr(app.state, "_checkpointer_cm", None))
     try:
         from app.db.graph.strategy_graph import get_strategy_graph
 
         await get_strategy_graph().close()
     except Exception:
         pass
+    broadcaster = getattr(app.state, "stream_broadcaster", None)
+    if broadcaster is not None:
+        await broadcaster.close()
+    await close_llm_clients()
+    await flush_usage_ledger()
     await close_redis()
     await close_db()
     logger.info("shutdown_complete")
@@ -1,4 +1,4 @@
-"""CloudWatch custom metric emission for LLM latency and business events.
+"""CloudWatch custom metric emission for LLM latency, business events, queue depth, sandboxes and the DB pool.
 
 All functions are fire-and-forget: they catch exceptions internally and log
 warnings via structlog. They NEVER raise or block the caller.
@@ -71,13 +71,249 @@ def _put_business_event(event_name: str, user_id: str | None = None) -> None:
         logger.warning("business_event_emit_failed", error=str(e), event=event_name)
 
 
+def _put_queue_backlog(pending: int, backlog_per_worker: float) -> None:
+    """Synchronous put_metric_data for queue depth. Runs in thread pool."""
+    now = datetime.now(UTC)
+    try:
+        _get_client().put_metric_data(
+            Namespace="CoFounder/Queue",
+            MetricData=[
+                {"MetricName": "PendingJobs", "Value": float(pending), "Unit": "Count", "Timestamp": now},
+                {"MetricName": "BacklogPerWorker", "Value": backlog_per_worker, "Unit": "Count", "Timestamp": now},
+            ],
+        )
+    except Exception as e:
+        logger.warning("queue_backlog_emit_failed", error=str(e))
+
+
+def _put_sandbox_pool_checkout(stack: str, hit: bool) -> None:
+    """Synchronous put_metric_data for warm-pool checkouts. Runs in thread pool."""
+    try:
+        _get_client().put_metric_data(
+            Namespace="CoFounder/Sandbox",
+            MetricData=[
+                {
+                    "MetricName": "PoolHit" if hit else "PoolMiss",
+                    "Dimensions": [{"Name": "Stack", "Value": stack}],
+                    "Value": 1.0,
+                    "Unit": "Count",
+                    "Timestamp": datetime.now(UTC),
+                }
+            ],
+        )
+    except Exception as e:
+        logger.warning("sandbox_pool_emit_failed", error=str(e), stack=stack)
+
+
+def _put_time_to_preview(seconds: float, pool_hit: bool) -> None:
+    """Synchronous put_metric_data for build start → preview URL latency. Runs in thread pool."""
+    try:
+        _get_client().put_metric_data(
+            Namespace="CoFounder/Sandbox",
+            MetricData=[
+                {
+                    "MetricName": "TimeToPreview",
+                    "Dimensions": [{"Name": "PoolHit", "Value": "true" if pool_hit else "false"}],
+                    "Value": seconds,
+                    "Unit": "Seconds",
+                    "Timestamp": datetime.now(UTC),
+                }
+            ],
+        )
+    except Exception as e:
+        logger.warning("time_to_preview_emit_failed", error=str(e))
+
+
+def _put_sandbox_restore(seconds: float) -> None:
+    """Synchronous put_metric_data for expired-sandbox snapshot restore latency. Runs in thread pool."""
+    try:
+        _get_client().put_metric_data(
+            Namespace="CoFounder/Sandbox",
+            MetricData=[
+                {
+                    "MetricName": "RestoreTime",
+                    "Value": seconds,
+                    "Unit": "Seconds",
+                    "Timestamp": datetime.now(UTC),
+                }
+            ],
+        )
+    except Exception as e:
+        logger.warning("sandbox_restore_emit_failed", error=str(e))
+
+
+def _put_llm_connection(role: str, ttfb_ms: float, reused: bool) -> None:
+    """Synchronous put_metric_data for one Anthropic HTTP request. Runs in thread pool."""
+    now = datetime.now(UTC)
+    dimensions = [{"Name": "Role", "Value": role}]
+    try:
+        _get_client().put_metric_data(
+            Namespace="CoFounder/LLM",
+            MetricData=[
+                {
+                    "MetricName": "TimeToFirstByte",
+                    "Dimensions": dimensions,
+                    "Value": ttfb_ms,
+                    "Unit": "Milliseconds",
+                    "Timestamp": now,
+                },
+                {
+                    "MetricName": "ConnectionReused" if reused else "ConnectionOpened",
+                    "Dimensions": dimensions,
+                    "Value": 1.0,
+                    "Unit": "Count",
+                    "Timestamp": now,
+                },
+            ],
+        )
+    except Exception as e:
+        logger.warning("llm_connection_emit_failed", error=str(e), role=role)
+
+
+def _put_context_tokens(role: str, context_tokens: int, prompt_tokens: int, budget: int) -> None:
+    """Synchronous put_metric_data for one agent prompt's context size. Runs in thread pool."""
+    now = datetime.now(UTC)
+    dimensions = [{"Name": "Role", "Value": role}]
+    try:
+        _get_client().put_metric_data(
+            Namespace="CoFounder/LLM",
+            MetricData=[
+                {
+                    "MetricName": "ContextTokens",
+                    "Dimensions": dimensions,
+                    "Value": float(context_tokens),
+                    "Unit": "Count",
+                    "Timestamp": now,
+                },
+                {
+                    "MetricName": "PromptTokensEstimated",
+                    "Dimensions": dimensions,
+                    "Value": float(prompt_tokens),
+                    "Unit": "Count",
+                    "Timestamp": now,
+                },
+                {
+                    "MetricName": "ContextBudgetUsed",
+                    "Dimensions": dimensions,
+                    "Value": 100.0 * context_tokens / budget if budget else 0.0,
+                    "Unit": "Percent",
+                    "Timestamp": now,
+                },
+            ],
+        )
+    except Exception as e:
+        logger.warning("context_tokens_emit_failed", error=str(e), role=role)
+
+
+def _put_llm_cache(method_name: str, hit: bool) -> None:
+    """Synchronous put_metric_data for one RunnerReal response cache lookup. Runs in thread pool."""
+    try:
+        _get_client().put_metric_data(
+            Namespace="CoFounder/LLM",
+            MetricData=[
+                {
+                    "MetricName": "ResponseCacheHit" if hit else "ResponseCacheMiss",
+                    "Dimensions": [{"Name": "Method", "Value": method_name}],
+                    "Value": 1.0,
+                    "Unit": "Count",
+                    "Timestamp": datetime.now(UTC),
+                }
+            ],
+        )
+    except Exception as e:
+        logger.warning("llm_cache_emit_failed", error=str(e), method=method_name)
+
+
+def _put_db_pool_stats(service: str, stats: dict) -> None:
+    """Synchronous put_metric_data for one window of DB pool telemetry. Runs in thread pool."""
+    now = datetime.now(UTC)
+    dimensions = [{"Name": "Service", "Value": service}]
+    metric_data = [
+        {"MetricName": "PoolCheckouts", "Value": float(stats["checkouts"]), "Unit": "Count"},
+        {"MetricName": "PoolNewConnections", "Value": float(stats["connects"]), "Unit": "Count"},
+        {"MetricName": "PoolInvalidations", "Value": float(stats["invalidations"]), "Unit": "Count"},
+        {"MetricName": "PoolCheckedOutPeak", "Value": float(stats["peak_checked_out"]), "Unit": "Count"},
+        {"MetricName": "PoolOverflowPeak", "Value": float(stats["peak_overflow"]), "Unit": "Count"},
+    ]
+    if stats["wait_count"]:
+        metric_data.append(
+            {
+                "MetricName": "PoolWaitTime",
+                "StatisticValues": {
+                    "SampleCount": float(stats["wait_count"]),
+                    "Sum": stats["wait_total_ms"],
+                    "Minimum": stats["wait_min_ms"],
+                    "Maximum": stats["wait_max_ms"],
+                },
+                "Unit": "Milliseconds",
+            }
+        )
+    try:
+        _get_client().put_metric_data(
+            Namespace="CoFounder/Database",
+            MetricData=[{**datum, "Dimensions": dimensions, "Timestamp": now} for datum in metric_data],
+        )
+    except Exception as e:
+        logger.warning("db_pool_stats_emit_failed", error=str(e), service=service)
+
+
 async def emit_llm_latency(method_name: str, duration_ms: float, model: str) -> None:
     """Emit LLM call latency metric. Non-blocking, fire-and-forget."""
     loop = asyncio.get_event_loop()
     loop.run_in_executor(_executor, _put_llm_latency, method_name, duration_ms, model)
 
 
+async def emit_llm_connection(role: str, ttfb_ms: float, reused: bool) -> None:
+    """Emit Anthropic request TTFB and connection reuse for role. Non-blocking, fire-and-forget."""
+    loop = asyncio.get_event_loop()
+    loop.run_in_executor(_executor, _put_llm_connection, role, ttfb_ms, reused)
+
+
+async def emit_context_tokens(role: str, context_tokens: int, prompt_tokens: int, budget: int) -> None:
+    """Emit the packed-context and estimated prompt size of one agent call. Non-blocking, fire-and-forget."""
+    loop = asyncio.get_event_loop()
+    loop.run_in_executor(_executor, _put_context_tokens, role, context_tokens, prompt_tokens, budget)
+
+
+async def emit_llm_cache(method_name: str, hit: bool) -> None:
+    """Emit a response cache hit or miss for a RunnerReal method. Non-blocking, fire-and-forget."""
+    loop = asyncio.get_event_loop()
+    loop.run_in_executor(_executor, _put_llm_cache, method_name, hit)
+
+
 async def emit_business_event(event_name: str, user_id: str | None = None) -> None:
     """Emit business event metric. Non-blocking, fire-and-forget."""
     loop = asyncio.get_event_loop()
     loop.run_in_executor(_executor, _put_business_event, event_name, user_id)
+
+
+async def emit_queue_backlog(pending: int, backlog_per_worker: float) -> None:
+    """Emit queue depth metrics used by worker autoscaling. Non-blocking, fire-and-forget."""
+    loop = asyncio.get_event_loop()
+    loop.run_in_executor(_executor, _put_queue_backlog, pending, backlog_per_worker)
+
+
+async def emit_sandbox_pool_checkout(stack: str, hit: bool) -> None:
+    """Emit a warm-pool hit or miss for stack. Non-blocking, fire-and-forget."""
+    loop = asyncio.get_event_loop()
+    loop.run_in_executor(_executor, _put_sandbox_pool_checkout, stack, hit)
+
+
+async def emit_time_to_preview(seconds: float, pool_hit: bool) -> None:
+    """Emit build start → preview URL latency. Non-blocking, fire-and-forget."""
+    loop = asyncio.get_event_loop()
+    loop.run_in_executor(_executor, _put_time_to_preview, seconds, pool_hit)
+
+
+async def emit_sandbox_restore(seconds: float) -> None:
+    """Emit snapshot restore → preview URL latency (not a build). Non-blocking, fire-and-forget."""
+    loop = asyncio.get_event_loop()
+    loop.run_in_executor(_executor, _put_sandbox_restore, seconds)
+
+
+def emit_db_pool_stats(service: str, stats: dict) -> None:
+    """Emit one window of DB pool checkouts, waits, overflow and invalidations. Non-blocking, fire-and-forget.
+
+    Plain function: it is called from the pool's synchronous checkout path.
+    """
+    _executor.submit(_put_db_pool_stats, service, stats)
@@ -1,7 +1,11 @@
-"""Wait time estimator using Exponential Moving Average."""
+"""Wait time estimator (Exponential Moving Average) and per-tier queue-wait histograms."""
+
+from datetime import UTC, datetime, timedelta
 
 from redis.asyncio import Redis
 
+from app.queue.schemas import QUEUE_WAIT_BUCKETS, TIER_BOOST
+
 
 class WaitTimeEstimator:
     """Estimates wait time using Exponential Moving Average per tier."""
@@ -96,3 +100,80 @@ class WaitTimeEstimator:
             if minutes > 0:
                 return f"{hours}h {minutes}m"
             return f"{hours}h"
+
+
+class QueueWaitHistogram:
+    """Per-tier histograms of time spent in queue:pending before admission.
+
+    Written atomically by the ADMIT_NEXT script into one hash per tier per UTC hour
+    (fields: le_<bound> bucket counts, inf, count, sum), so any window of recent
+    hours can be summed to compare wait percentiles before and after a change.
+    """
+
+    KEY_PREFIX = "queue:wait_hist"
+    RETENTION_SECONDS = 8 * 86400
+
+    def __init__(self, redis: Redis):
+        self.redis = redis
+
+    @staticmethod
+    def hour_suffix(moment: datetime) -> str:
+        return moment.astimezone(UTC).strftime("%Y%m%d%H")
+
+    async def snapshot(self, tier: str, hours: int = 24, now: datetime | None = None) -> dict:
+        """Aggregate the last `hours` hourly histograms for a tier.
+
+        Args:
+            tier: User tier (bootstrapper, partner, cto_scale)
+            hours: Window size in hours (bounded by RETENTION_SECONDS)
+            now: Current time (for deterministic testing)
+
+        Returns:
+            Dict with count, mean_seconds, p50_seconds, p95_seconds and cumulative
+            buckets ({"le_5": n, ..., "inf": n}). Percentiles are bucket upper bounds
+            (None for the +Inf bucket or an empty window).
+        """
+        now = now or datetime.now(UTC)
+        pipe = self.redis.pipeline(transaction=False)
+        for offset in range(hours):
+            pipe.hgetall(f"{self.KEY_PREFIX}:{tier}:{self.hour_suffix(now - timedelta(hours=offset))}")
+        hourly = await pipe.execute()
+
+        fields = [f"le_{bound}" for bound in QUEUE_WAIT_BUCKETS] + ["inf"]
+        counts = dict.fromkeys(fields, 0)
+        total_seconds = 0.0
+        for entry in hourly:
+            for field in fields:
+                counts[field] += int(entry.get(field, 0))
+            total_seconds += float(entry.get("sum", 0))
+
+        count = sum(counts.values())
+        cumulative: dict[str, int] = {}
+        running = 0
+        for field in fields:
+            running += counts[field]
+            cumulative[field] = running
+
+        return {
+            "tier": tier,
+            "count": count,
+            "mean_seconds": round(total_seconds / count, 1) if count else None,
+            "p50_seconds": self._quantile(cumulative, count, 0.50),
+            "p95_seconds": self._quantile(cumulative, count, 0.95),
+            "buckets": cumulative,
+        }
+
+    async def snapshot_all(self, hours: int = 24, now: datetime | None = None) -> list[dict]:
+        """Snapshot every tier, highest priority first."""
+        tiers = sorted(TIER_BOOST, key=TIER_BOOST.get, reverse=True)
+        return [await self.snapshot(tier, hours=hours, now=now) for tier in tiers]
+
+    @staticmethod
+    def _quantile(cumulative: dict[str, int], count: int, q: float) -> int | None:
+        if not count:
+            return None
+        target = q * count
+        for bound in QUEUE_WAIT_BUCKETS:
+            if cumulative[f"le_{bound}"] >= target:
+                return bound
+        return None
@@ -1,27 +1,62 @@
-"""QueueManager — Redis sorted set priority queue with tier boost and FIFO tiebreaker."""
+"""QueueManager — Redis sorted set priority queue with tier boost and per-user fair queuing."""
+
+import json
+import time
+from datetime import UTC, datetime
 
 from redis.asyncio import Redis
 
-from app.queue.schemas import GLOBAL_QUEUE_CAP, TIER_BOOST
+from app.queue import scripts
+from app.queue.estimator import QueueWaitHistogram
+from app.queue.schemas import (
+    FAIR_SHARE_QUANTUM,
+    GLOBAL_QUEUE_CAP,
+    QUEUE_WAIT_BUCKETS,
+    TIER_BOOST,
+    TIER_CONCURRENT_PROJECT,
+    TIER_CONCURRENT_USER,
+)
+
+# Jobs inspected per admission attempt — bounds script run time while letting runnable
+# jobs get past a user whose concurrency slots are all taken
+ADMISSION_WINDOW = 50
 
 
 class QueueManager:
     """Manages job queue using Redis sorted set with composite priority scoring.
 
-    Score formula: (1000 - boost) * 1e12 + counter
+    Score formula: (1000 - boost) * 1e12 + finish_tag
     - Lower score = higher priority
     - Tier boost: CTO=5, Partner=2, Bootstrapper=0
-    - Counter ensures FIFO within same tier
+    - finish_tag implements weighted fair queuing across users within a tier:
+      finish = max(tier virtual time, user's previous finish) + FAIR_SHARE_QUANTUM / weight.
+      A single user's jobs stay FIFO; a user with many queued jobs is interleaved
+      with other users rather than served first-come-first-served.
     """
 
     QUEUE_KEY = "queue:pending"
-    COUNTER_KEY = "queue:counter"
+    ENQUEUED_AT_KEY = "queue:enqueued_at"
+    ANONYMOUS_FLOW = "_anonymous"
 
     def __init__(self, redis: Redis):
         self.redis = redis
 
-    async def enqueue(self, job_id: str, tier: str) -> dict:
-        """Enqueue a job with tier-based priority.
+    @staticmethod
+    def vtime_key(tier: str) -> str:
+        return f"queue:fair:vtime:{tier}"
+
+    @staticmethod
+    def finish_key(tier: str) -> str:
+        return f"queue:fair:finish:{tier}"
+
+    async def enqueue(self, job_id: str, tier: str, user_id: str | None = None, weight: float = 1.0) -> dict:
+        """Enqueue a job with tier-based priority and per-user fair share.
+
+        Args:
+            job_id: Job identifier
+            tier: Plan tier (selects the priority band)
+            user_id: Fair-queuing flow; jobs without one share a single FIFO flow
+            weight: Relative share of the tier for this user (default 1)
 
         Returns dict with:
         - rejected: bool (True if queue at capacity)
@@ -30,9 +65,23 @@ class QueueManager:
         - message: str (rejection message if rejected)
         - retry_after_minutes: int (retry estimate if rejected)
         """
-        # Check global cap
-        length = await self.redis.zcard(self.QUEUE_KEY)
-        if length >= GLOBAL_QUEUE_CAP:
+        # Cap check, finish tag, ZADD and rank in one atomic round trip
+        boost = TIER_BOOST.get(tier, 0)
+        cost = max(round(FAIR_SHARE_QUANTUM / max(weight, 0.001)), 1)
+        result = await scripts.ENQUEUE(
+            self.redis,
+            [
+                self.QUEUE_KEY,
+                scripts.QUEUE_SIGNAL_KEY,
+                self.ENQUEUED_AT_KEY,
+                self.vtime_key(tier),
+                self.finish_key(tier),
+            ],
+            [job_id, boost, GLOBAL_QUEUE_CAP, user_id or self.ANONYMOUS_FLOW, cost, time.time()],
+        )
+
+        if not int(result[0]):
+            length = int(result[1])
             # Estimate retry time: assume 2 min per job, divided by concurrent capacity
             avg_concurrency = 5  # Average across tiers
             retry_minutes = int((length - GLOBAL_QUEUE_CAP + 1) * 2 / avg_concurrency)
@@ -42,20 +91,57 @@ class QueueManager:
                 "retry_after_minutes": max(1, retry_minutes),
             }
 
-        # Atomic counter for FIFO tiebreaker
-        counter = await self.redis.incr(self.COUNTER_KEY)
+        return {"rejected": False, "position": int(result[1]), "score": float(result[2])}
 
-        # Composite score: (1000 - boost) * 1e12 + counter
-        boost = TIER_BOOST.get(tier, 0)
-        score = (1000 - boost) * 1e12 + counter
+    async def admit_next(
+        self, slot_ttl: int = 3600, window: int = ADMISSION_WINDOW, now: float | None = None
+    ) -> tuple[str, str] | None:
+        """Admit the highest-priority job whose user and project semaphores have capacity.
 
-        # Add to sorted set
-        await self.redis.zadd(self.QUEUE_KEY, {job_id: score})
+        One atomic round trip: scan the first `window` jobs → check both tier limits
+        → ZREM + acquire both slots → advance tier virtual time → record queue wait.
+        Skipped (blocked) jobs keep their score, so they neither lose their place nor
+        hold up runnable jobs from other users.
 
-        # Get position
-        position = await self.get_position(job_id)
+        Args:
+            slot_ttl: Semaphore lease timeout in seconds (see RedisSemaphore.ttl)
+            window: Maximum number of queued jobs to inspect per call
+            now: Current epoch seconds (for deterministic testing)
 
-        return {"rejected": False, "position": position, "score": score}
+        Returns:
+            None if queue empty, otherwise (outcome, job_id) where outcome is
+            "admitted" (slots held, caller must release), "blocked" (nothing in the
+            window is runnable; job_id is the head) or "missing" (job metadata gone —
+            removed from queue).
+        """
+        now = time.time() if now is None else now
+        result = await scripts.ADMIT_NEXT(
+            self.redis,
+            [self.QUEUE_KEY, scripts.QUEUE_SIGNAL_KEY, self.ENQUEUED_AT_KEY],
+            [
+                json.dumps(TIER_CONCURRENT_USER),
+                json.dumps(TIER_CONCURRENT_PROJECT),
+                2,
+                slot_ttl,
+                window,
+                now,
+                QueueWaitHistogram.hour_suffix(datetime.fromtimestamp(now, UTC)),
+                json.dumps(QUEUE_WAIT_BUCKETS),
+                QueueWaitHistogram.RETENTION_SECONDS,
+            ],
+        )
+        if not result:
+            return None
+
+        outcome, job_id = result
+        return outcome, job_id
+
+    async def wait_for_signal(self, timeout: float = 5.0) -> bool:
+        """Block until a job is enqueued or a concurrency slot is released.
+
+        Returns True if signalled, False on timeout. Spurious wakeups are possible.
+        """
+        return await self.redis.blpop([scripts.QUEUE_SIGNAL_KEY], timeout=timeout) is not None
 
     async def dequeue(self) -> str | None:
         """Remove and return the highest priority job (lowest score).
@@ -67,6 +153,7 @@ class QueueManager:
             return None
 
         job_id, _score = result[0]
+        await self.redis.hdel(self.ENQUEUED_AT_KEY, job_id)
         return job_id
 
     async def get_position(self, job_id: str) -> int:
@@ -84,3 +171,4 @@ class QueueManager:
     async def remove(self, job_id: str) -> None:
         """Remove a job from the queue (e.g., cancellation)."""
         await self.redis.zrem(self.QUEUE_KEY, job_id)
+        await self.redis.hdel(self.ENQUEUED_AT_KEY, job_id)
@@ -77,10 +77,9 @@ async def process_scheduled_jobs(now: datetime | None = None) -> int:
         success = await state_machine.transition(job_id, JobStatus.QUEUED, "Daily limit reset — moved to queue")
 
         if success:
-            # Enqueue with tier-based priority
-            # Jitter is applied by introducing randomness in the order we process jobs
-            # (All jobs are enqueued immediately, but counter provides natural jitter)
-            result = await queue.enqueue(job_id, tier)
+            # Enqueue with tier-based priority; fair queuing interleaves users whose
+            # scheduled jobs are released in the same batch
+            result = await queue.enqueue(job_id, tier, user_id=job_data.get("user_id"))
 
             if result.get("rejected"):
                 # Queue at capacity, leave in SCHEDULED state
@@ -42,6 +42,13 @@ TIER_BOOST = {
 # Global queue capacity limit
 GLOBAL_QUEUE_CAP = 100
 
+# Weighted fair queuing: a weight-1 job advances its user's finish tag by this many
+# virtual-time units (weight 2 → half as much, i.e. twice the share within the tier)
+FAIR_SHARE_QUANTUM = 1000
+
+# Queue-wait histogram bucket upper bounds, in seconds (plus an implicit +Inf bucket)
+QUEUE_WAIT_BUCKETS = (5, 15, 30, 60, 120, 300, 600, 1200, 1800, 3600)
+
 
 class JobStatus(StrEnum):
     """Job lifecycle states."""
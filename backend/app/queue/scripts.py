@@ -0,0 +1,233 @@
+"""Server-side Lua scripts for the job queue and concurrency semaphores.
+
+Each queue/semaphore operation is a single EVALSHA round trip and executes atomically
+on the Redis server, so concurrent workers can never overshoot a tier limit or
+interleave between a length check and an insert.
+
+Scripts are loaded lazily (SCRIPT LOAD on first NOSCRIPT) and invoked by SHA1
+thereafter.
+"""
+
+import hashlib
+
+from redis.asyncio import Redis
+from redis.asyncio.cluster import RedisCluster
+from redis.exceptions import NoScriptError
+
+# Woken by enqueue and semaphore release so idle consumers can BLPOP instead of polling.
+# Holds at most one token: a signal means "something may have changed, re-check".
+QUEUE_SIGNAL_KEY = "queue:signal"
+
+
+class LuaScript:
+    """A Lua script invoked via EVALSHA with transparent SCRIPT LOAD on cache miss.
+
+    Args:
+        source: Lua source
+        declares_all_keys: False when the script derives key names at run time
+            (not passed in KEYS). Such scripts cannot run on cluster-mode Redis, where
+            every key must be declared and hash to the same slot, so calling them with
+            a RedisCluster client fails fast instead of erroring per-call on the server.
+    """
+
+    def __init__(self, source: str, declares_all_keys: bool = True):
+        self.source = source
+        self.declares_all_keys = declares_all_keys
+        self.sha = hashlib.sha1(source.encode("utf-8")).hexdigest()
+
+    async def __call__(self, redis: Redis, keys: list[str], args: list) -> object:
+        if not self.declares_all_keys and isinstance(redis, RedisCluster):
+            raise RuntimeError("Queue admission script accesses undeclared keys and requires non-cluster Redis")
+        try:
+            return await redis.evalsha(self.sha, len(keys), *keys, *args)
+        except NoScriptError:
+            # First call on this server (or after SCRIPT FLUSH / failover)
+            await redis.script_load(self.source)
+            return await redis.evalsha(self.sha, len(keys), *keys, *args)
+
+
+# Shared Lua helpers: purge_stale drops slots whose TTL key expired (crashed worker)
+# before counting; signal leaves a single wake-up token for an idle consumer
+_LUA_HELPERS = """
+local function purge_stale(prefix)
+  local slots = prefix .. ':slots'
+  for _, member in ipairs(redis.call('SMEMBERS', slots)) do
+    if redis.call('EXISTS', prefix .. ':slot:' .. member) == 0 then
+      redis.call('SREM', slots, member)
+    end
+  end
+  return redis.call('SCARD', slots)
+end
+
+local function signal(key)
+  redis.call('LPUSH', key, '1')
+  redis.call('LTRIM', key, 0, 0)
+end
+"""
+
+# KEYS: queue, signal, enqueued-at hash, tier virtual time, tier finish-tag hash
+# ARGV: job_id, tier boost, global cap, flow (user) id, cost, now (epoch seconds)
+# Weighted fair queuing within a tier: each flow's finish tag advances by `cost`
+# (quantum / weight) from max(tier virtual time, its previous finish tag), so a user
+# with a deep backlog is interleaved with users who arrive later instead of
+# monopolising the tier. Ties between flows are broken by job_id.
+# Returns {1, position, score} if accepted, {0, queue length} if at capacity
+ENQUEUE = LuaScript(
+    _LUA_HELPERS
+    + """
+local length = redis.call('ZCARD', KEYS[1])
+if length >= tonumber(ARGV[3]) then
+  return {0, length}
+end
+local vtime = tonumber(redis.call('GET', KEYS[4]) or '0')
+local finish = tonumber(redis.call('HGET', KEYS[5], ARGV[4]) or '0')
+finish = math.max(vtime, finish) + tonumber(ARGV[5])
+redis.call('HSET', KEYS[5], ARGV[4], string.format('%.0f', finish))
+-- The TTL covers the whole hash and is refreshed by every enqueue, so per-flow tags
+-- persist while the tier is busy; it only reclaims the hash once the tier goes idle.
+-- A returning idle flow is not penalised for old tags: max(vtime, finish) above
+-- restarts any tag that the tier's virtual time has already passed.
+redis.call('EXPIRE', KEYS[5], 86400)
+local score = string.format('%.0f', (1000 - tonumber(ARGV[2])) * 1e12 + finish)
+redis.call('ZADD', KEYS[1], score, ARGV[1])
+redis.call('HSET', KEYS[3], ARGV[1], ARGV[6])
+signal(KEYS[2])
+return {1, redis.call('ZRANK', KEYS[1], ARGV[1]) + 1, score}
+"""
+)
+
+# KEYS: queue, signal, enqueued-at hash
+# ARGV: user limits (JSON tier->int), project limits (JSON tier->int), default limit,
+#       slot TTL, window size, now (epoch seconds), histogram hour suffix,
+#       histogram bucket bounds (JSON list of seconds), histogram retention seconds
+# Scans the first `window` jobs in priority order and admits the first one whose user
+# and project semaphores both have capacity. Jobs it skips keep their score, so a busy
+# user's jobs hold their fair-queue position without blocking other users behind them.
+# Returns nil if queue empty, {'admitted', job_id}, {'blocked', head_job_id} if nothing
+# in the window is runnable, or {'missing', job_id} (metadata gone — removed from queue).
+# An admitted job is removed from the queue with both semaphore slots already held; its
+# finish tag advances the tier's virtual time and its queue wait lands in the tier's
+# hourly histogram (see QueueWaitHistogram).
+#
+# Semaphore, job and per-tier keys are derived from job metadata, so this script is not
+# cluster-safe (see LuaScript.declares_all_keys).
+ADMIT_NEXT = LuaScript(
+    _LUA_HELPERS
+    + """
+local candidates = redis.call('ZRANGE', KEYS[1], 0, tonumber(ARGV[5]) - 1, 'WITHSCORES')
+if #candidates == 0 then
+  return false
+end
+
+local user_limits = cjson.decode(ARGV[1])
+local project_limits = cjson.decode(ARGV[2])
+local default_limit = tonumber(ARGV[3])
+
+local function record_wait(tier, job_id)
+  local enqueued_at = tonumber(redis.call('HGET', KEYS[3], job_id))
+  redis.call('HDEL', KEYS[3], job_id)
+  if not enqueued_at then
+    return
+  end
+  local wait = math.max(tonumber(ARGV[6]) - enqueued_at, 0)
+  local field = 'inf'
+  for _, bound in ipairs(cjson.decode(ARGV[8])) do
+    if wait <= bound then
+      field = 'le_' .. bound
+      break
+    end
+  end
+  local hist = 'queue:wait_hist:' .. tier .. ':' .. ARGV[7]
+  redis.call('HINCRBY', hist, field, 1)
+  redis.call('HINCRBY', hist, 'count', 1)
+  redis.call('HINCRBYFLOAT', hist, 'sum', wait)
+  redis.call('EXPIRE', hist, tonumber(ARGV[9]))
+end
+
+for i = 1, #candidates, 2 do
+  local job_id = candidates[i]
+  local meta = redis.call('HMGET', 'job:' .. job_id, 'user_id', 'project_id', 'tier')
+  if not meta[1] or not meta[2] then
+    redis.call('ZREM', KEYS[1], job_id)
+    redis.call('HDEL', KEYS[3], job_id)
+    return {'missing', job_id}
+  end
+
+  local tier = meta[3] or 'bootstrapper'
+  local user_prefix = 'concurrency:user:' .. meta[1]
+  local project_prefix = 'concurrency:project:' .. meta[2]
+
+  if purge_stale(user_prefix) < (user_limits[tier] or default_limit)
+    and purge_stale(project_prefix) < (project_limits[tier] or default_limit) then
+    redis.call('ZREM', KEYS[1], job_id)
+    for _, prefix in ipairs({user_prefix, project_prefix}) do
+      redis.call('SADD', prefix .. ':slots', job_id)
+      redis.call('SET', prefix .. ':slot:' .. job_id, '1', 'EX', tonumber(ARGV[4]))
+    end
+    -- Tier virtual time = finish tag of the latest admitted job (score minus tier band)
+    local vtime_key = 'queue:fair:vtime:' .. tier
+    local finish = math.fmod(tonumber(candidates[i + 1]), 1e12)
+    if finish > tonumber(redis.call('GET', vtime_key) or '0') then
+      redis.call('SET', vtime_key, string.format('%.0f', finish))
+    end
+    record_wait(tier, job_id)
+    -- Chain the wake-up so another idle consumer looks at the remaining jobs
+    if redis.call('ZCARD', KEYS[1]) > 0 then
+      signal(KEYS[2])
+    end
+    return {'admitted', job_id}
+  end
+end
+
+return {'blocked', candidates[1]}
+""",
+    declares_all_keys=False,
+)
+
+# KEYS: slots set, slot TTL key
+# ARGV: job_id, max concurrent, ttl
+# Returns 1 if acquired, 0 if at limit or already held
+SEMAPHORE_ACQUIRE = LuaScript(
+    _LUA_HELPERS
+    + """
+local prefix = string.sub(KEYS[1], 1, -7)
+if purge_stale(prefix) >= tonumber(ARGV[2]) then
+  return 0
+end
+if redis.call('SADD', KEYS[1], ARGV[1]) == 0 then
+  return 0
+end
+redis.call('SET', KEYS[2], '1', 'EX', tonumber(ARGV[3]))
+return 1
+"""
+)
+
+# KEYS: slots set, slot TTL key, signal
+# ARGV: job_id
+# Returns 1 if a held slot was released, 0 otherwise
+SEMAPHORE_RELEASE = LuaScript(
+    _LUA_HELPERS
+    + """
+local removed = redis.call('SREM', KEYS[1], ARGV[1])
+redis.call('DEL', KEYS[2])
+if removed == 1 then
+  signal(KEYS[3])
+end
+return removed
+"""
+)
+
+# KEYS: slots set, slot TTL key
+# ARGV: job_id, ttl
+# Returns 1 if the lease was extended, 0 if the slot is no longer held (an expired
+# lease is dropped rather than revived — another job may already have been admitted)
+SEMAPHORE_HEARTBEAT = LuaScript(
+    """
+if redis.call('SISMEMBER', KEYS[1], ARGV[1]) == 0 or redis.call('EXISTS', KEYS[2]) == 0 then
+  redis.call('SREM', KEYS[1], ARGV[1])
+  return 0
+end
+redis.call('SET', KEYS[2], '1', 'EX', tonumber(ARGV[2]))
+return 1
+"""
+)
@@ -2,6 +2,7 @@
 
 from redis.asyncio import Redis
 
+from app.queue import scripts
 from app.queue.schemas import TIER_CONCURRENT_PROJECT, TIER_CONCURRENT_USER
 
 
@@ -15,29 +16,37 @@ class RedisSemaphore:
         self.ttl = ttl  # Lease timeout (prevents deadlock on crash)
 
     async def acquire(self, job_id: str) -> bool:
-        """Try to acquire a slot. Returns True if acquired, False if at limit."""
-        slot_set_key = f"{self.key}:slots"
-        current = await self.redis.scard(slot_set_key)
-
-        if current >= self.max_concurrent:
-            return False
+        """Try to acquire a slot. Returns True if acquired, False if at limit.
 
-        added = await self.redis.sadd(slot_set_key, job_id)
-        if added:
-            # Set individual TTL key for auto-release on crash
-            await self.redis.setex(f"{self.key}:slot:{job_id}", self.ttl, "1")
-            return True
-        return False
+        Stale-slot purge, limit check and SADD run as one atomic script, so
+        concurrent callers can never overshoot max_concurrent.
+        """
+        acquired = await scripts.SEMAPHORE_ACQUIRE(
+            self.redis,
+            [f"{self.key}:slots", f"{self.key}:slot:{job_id}"],
+            [job_id, self.max_concurrent, self.ttl],
+        )
+        return bool(acquired)
 
     async def release(self, job_id: str) -> None:
-        """Release a slot back to the semaphore."""
-        slot_set_key = f"{self.key}:slots"
-        await self.redis.srem(slot_set_key, job_id)
-        await self.redis.delete(f"{self.key}:slot:{job_id}")
+        """Release a slot back to the semaphore and wake one idle queue consumer."""
+        await scripts.SEMAPHORE_RELEASE(
+            self.redis,
+            [f"{self.key}:slots", f"{self.key}:slot:{job_id}", scripts.QUEUE_SIGNAL_KEY],
+            [job_id],
+        )
+
+    async def heartbeat(self, job_id: str) -> bool:
+        """Extend TTL for long-running job (prevents premature release).
 
-    async def heartbeat(self, job_id: str) -> None:
-        """Extend TTL for long-running job (prevents premature release)."""
-        await self.redis.expire(f"{self.key}:slot:{job_id}", self.ttl)
+        Returns False if the slot is no longer held (lease already expired and purged).
+        """
+        extended = await scripts.SEMAPHORE_HEARTBEAT(
+            self.redis,
+            [f"{self.key}:slots", f"{self.key}:slot:{job_id}"],
+            [job_id, self.ttl],
+        )
+        return bool(extended)
 
     async def count(self) -> int:
         """Return current number of acquired slots."""
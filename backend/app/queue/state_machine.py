@@ -10,11 +10,17 @@ from app.queue.schemas import TIER_ITERATION_DEPTH, JobStatus
 # ──────────────────────────────────────────────────────────────────────────────
 # SSE Event Types (Phase 33: INFRA-03)
 #
-# Published to job:{id}:events Redis Pub/Sub channel.
-# Flat envelope with 'type' discriminator for backward compatibility.
+# Published to job:{id}:events Redis Pub/Sub channel and appended to the capped
+# job:{id}:events Redis Stream (field "data"), whose entry IDs let SSE clients
+# resume with Last-Event-ID. Flat envelope with 'type' discriminator for
+# backward compatibility.
 # ──────────────────────────────────────────────────────────────────────────────
 
 
+EVENT_STREAM_MAXLEN = 500  # approximate cap on events kept per job
+EVENT_STREAM_TTL_SECONDS = 86400  # 24 hours, matching the job's log stream
+
+
 class SSEEventType:
     """Event type constants for the job:{id}:events Pub/Sub channel."""
 
@@ -88,7 +94,7 @@ class JobStateMachine:
         message: str = "",
         now: datetime | None = None,
     ) -> bool:
-        """Transition job to new status if valid. Publishes event on success.
+        """Transition job to new status if valid. Records and publishes an event on success.
 
         Args:
             job_id: Unique job identifier
@@ -112,33 +118,34 @@ class JobStateMachine:
         if new_status not in self.TRANSITIONS.get(current_status, []):
             return False
 
-        # Atomic update using Redis transaction
+        # Typed event envelope for SSE
+        payload = json.dumps(
+            {
+                "type": SSEEventType.BUILD_STAGE_STARTED,
+                "job_id": job_id,
+                "status": new_status.value,
+                "stage": new_status.value,
+                "stage_label": STAGE_LABELS.get(new_status.value, new_status.value),
+                "message": message,
+                "timestamp": now.isoformat(),
+            }
+        )
+
+        # Atomic update using Redis transaction — status and its event entry together
         async with self.redis.pipeline(transaction=True) as pipe:
             pipe.hset(f"job:{job_id}", "status", new_status.value)
             pipe.hset(f"job:{job_id}", "status_message", message)
             pipe.hset(f"job:{job_id}", "updated_at", now.isoformat())
+            self._append_event(pipe, job_id, payload)
             await pipe.execute()
 
-        # Publish status change for SSE with typed event envelope
-        await self.redis.publish(
-            f"job:{job_id}:events",
-            json.dumps(
-                {
-                    "type": SSEEventType.BUILD_STAGE_STARTED,
-                    "job_id": job_id,
-                    "status": new_status.value,
-                    "stage": new_status.value,
-                    "stage_label": STAGE_LABELS.get(new_status.value, new_status.value),
-                    "message": message,
-                    "timestamp": now.isoformat(),
-                }
-            ),
-        )
+        # Publish status change for live Pub/Sub listeners
+        await self.redis.publish(f"job:{job_id}:events", payload)
 
         return True
 
     async def publish_event(self, job_id: str, event: dict) -> None:
-        """Publish a typed event to the job's SSE channel.
+        """Publish a typed event to the job's SSE channel and event stream.
 
         Used by ScreenshotService and DocGenerationService to emit
         snapshot.updated and documentation.updated events.
@@ -151,10 +158,18 @@ class JobStateMachine:
         if "timestamp" not in event:
             event["timestamp"] = datetime.now(UTC).isoformat()
         event["job_id"] = job_id
-        await self.redis.publish(
-            f"job:{job_id}:events",
-            json.dumps(event),
-        )
+        payload = json.dumps(event)
+        async with self.redis.pipeline(transaction=False) as pipe:
+            self._append_event(pipe, job_id, payload)
+            await pipe.execute()
+        await self.redis.publish(f"job:{job_id}:events", payload)
+
+    @staticmethod
+    def _append_event(pipe, job_id: str, payload: str) -> None:
+        """Queue the XADD (capped) + TTL refresh for one event on a pipeline."""
+        key = f"job:{job_id}:events"
+        pipe.xadd(key, {"data": payload}, maxlen=EVENT_STREAM_MAXLEN, approximate=True)
+        pipe.expire(key, EVENT_STREAM_TTL_SECONDS)
 
     async def get_status(self, job_id: str) -> JobStatus | None:
         """Get current status of a job.
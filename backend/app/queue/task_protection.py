@@ -0,0 +1,57 @@
+"""ECS task scale-in protection for worker processes.
+
+While a worker holds in-flight builds it marks its own ECS task as protected, so
+queue-depth autoscaling (and rolling deployments) never pick a busy task to stop.
+Protection is dropped as soon as the task goes idle.
+
+Uses the ECS agent endpoint exposed to Fargate tasks via $ECS_AGENT_URI. Outside ECS
+(local dev, docker compose, tests) the variable is unset and every call is a no-op.
+All calls are non-fatal: failures are logged and the worker keeps running.
+"""
+
+import os
+
+import httpx
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+
+class TaskProtection:
+    """Toggles scale-in protection for the current ECS task.
+
+    Args:
+        agent_uri: ECS agent endpoint (defaults to $ECS_AGENT_URI; None disables)
+        expires_minutes: Protection lease. Renewed each time a job starts, so it only
+            needs to outlast the longest single build.
+    """
+
+    def __init__(self, agent_uri: str | None = None, expires_minutes: int = 120):
+        self.agent_uri = agent_uri if agent_uri is not None else os.environ.get("ECS_AGENT_URI")
+        self.expires_minutes = expires_minutes
+        self.protected = False
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.agent_uri)
+
+    async def set(self, protected: bool) -> bool:
+        """Enable or disable protection. Returns True if the agent accepted the change."""
+        if not self.enabled:
+            return False
+
+        payload: dict = {"ProtectionEnabled": protected}
+        if protected:
+            payload["ExpiresInMinutes"] = self.expires_minutes
+
+        try:
+            async with httpx.AsyncClient(timeout=5.0) as client:
+                response = await client.put(f"{self.agent_uri}/task-protection/v1/state", json=payload)
+                response.raise_for_status()
+        except Exception as exc:
+            logger.warning("task_protection_update_failed", protected=protected, error=str(exc))
+            return False
+
+        self.protected = protected
+        logger.info("task_protection_updated", protected=protected)
+        return True
@@ -1,5 +1,6 @@
 """JobWorker: pulls jobs from queue, enforces concurrency, executes via GenerationService."""
 
+import asyncio
 import json
 import time
 import uuid
@@ -14,44 +15,69 @@ from app.queue.manager import QueueManager
 from app.queue.schemas import JobStatus
 from app.queue.semaphore import project_semaphore, user_semaphore
 from app.queue.state_machine import JobStateMachine
+from app.queue.task_protection import TaskProtection
 
 logger = structlog.get_logger(__name__)
 
 
 async def process_next_job(runner: Runner | None = None, redis=None) -> bool:
-    """Pull next job from queue and process it.
+    """Admit the next runnable job from the queue and process it.
 
-    Called by FastAPI BackgroundTasks. Returns True if job processed, False if queue empty.
+    Returns True if job processed, False if nothing was admissible.
+    Long-running consumers use JobWorkerPool, which blocks on the queue signal instead.
+
+    Args:
+        runner: Optional Runner instance (see process_job)
+        redis: Redis client instance (injected by caller, or uses get_redis() if None)
+
+    Returns:
+        True if job was processed, False otherwise
+    """
+    if redis is None:
+        redis = get_redis()
+
+    admission = await QueueManager(redis).admit_next()
+    if admission is None:
+        return False
+
+    outcome, job_id = admission
+    if outcome != "admitted":
+        logger.info("job_not_admitted", job_id=job_id, outcome=outcome)
+        return False
+
+    return await process_job(job_id, runner=runner, redis=redis)
+
+
+async def process_job(job_id: str, runner: Runner | None = None, redis=None) -> bool:
+    """Process a job admitted by QueueManager.admit_next().
+
+    Admission already removed the job from the queue and acquired its per-user and
+    per-project concurrency slots; this function owns releasing them.
 
     Steps:
-    1. Dequeue highest priority job
-    2. Check per-user and per-project concurrency semaphores
-    3. If runner provided: delegate to GenerationService.execute_build()
+    1. Load job metadata
+    2. If runner provided: delegate to GenerationService.execute_build()
        Otherwise: simulate status transitions (backwards-compatible fallback)
-    4. On READY: persist build result to Postgres and publish preview_url in Redis event
-    5. Record duration for wait time estimation
-    6. Release semaphore on completion (or crash via TTL)
+    3. On READY: persist build result to Postgres and publish preview_url in Redis event
+    4. Record duration for wait time estimation
+    5. Release semaphore on completion (or crash via TTL)
 
     Args:
+        job_id: Job identifier admitted from queue:pending
         runner: Optional Runner instance. When provided, real GenerationService is used.
                 When None, simulated status loop runs (backwards-compatible).
         redis: Redis client instance (injected by caller, or uses get_redis() if None)
 
     Returns:
-        True if job was processed, False if queue empty
+        True if job was processed, False if metadata missing
     """
     if redis is None:
         redis = get_redis()
-    queue = QueueManager(redis)
     state_machine = JobStateMachine(redis)
 
-    # Dequeue
-    job_id = await queue.dequeue()
-    if job_id is None:
-        return False
-
     job_data = await state_machine.get_job(job_id)
     if job_data is None:
+        # Slots acquired at admission expire via their lease TTL
         logger.error("job_metadata_missing", job_id=job_id)
         return False
 
@@ -59,24 +85,10 @@ async def process_next_job(runner: Runner | None = None, redis=None) -> bool:
     project_id = job_data.get("project_id")
     tier = job_data.get("tier", "bootstrapper")
 
-    # Acquire concurrency semaphores
+    # Concurrency slots were acquired atomically at admission — used here for heartbeat/release
     user_sem = user_semaphore(redis, user_id, tier)
     project_sem = project_semaphore(redis, project_id, tier)
 
-    user_acquired = await user_sem.acquire(job_id)
-    if not user_acquired:
-        # Re-enqueue with same priority
-        await queue.enqueue(job_id, tier)
-        logger.info("job_user_concurrency_limit_reenqueued", job_id=job_id, user_id=user_id)
-        return False
-
-    project_acquired = await project_sem.acquire(job_id)
-    if not project_acquired:
-        await user_sem.release(job_id)
-        await queue.enqueue(job_id, tier)
-        logger.info("job_project_concurrency_limit_reenqueued", job_id=job_id, project_id=project_id)
-        return False
-
     start_time = time.time()
     build_result: dict | None = None
     error_message: str | None = None
@@ -86,11 +98,13 @@ async def process_next_job(runner: Runner | None = None, redis=None) -> bool:
         if runner:
             # Real execution path: GenerationService handles all FSM transitions
             from app.sandbox.e2b_runtime import E2BSandboxRuntime
+            from app.sandbox.pool import get_sandbox_pool
             from app.services.generation_service import GenerationService
 
             generation_service = GenerationService(
                 runner=runner,
                 sandbox_runtime_factory=lambda: E2BSandboxRuntime(),
+                sandbox_pool=get_sandbox_pool(),
             )
             build_result = await generation_service.execute_build(job_id, job_data, state_machine, redis=redis)
         else:
@@ -130,6 +144,7 @@ async def process_next_job(runner: Runner | None = None, redis=None) -> bool:
                         "sandbox_id": build_result.get("sandbox_id", ""),
                         "workspace_path": build_result.get("workspace_path", ""),
                         "preview_url": build_result.get("preview_url", ""),
+                        "build_version": build_result.get("build_version", ""),
                     },
                 )
                 logger.info("sandbox_auto_paused", job_id=job_id, sandbox_id=build_result.get("sandbox_id"))
@@ -187,6 +202,203 @@ async def process_next_job(runner: Runner | None = None, redis=None) -> bool:
     return True
 
 
+class JobWorkerPool:
+    """N asyncio consumers that admit jobs from queue:pending and run them to completion.
+
+    Runs inside the dedicated worker process (app/worker.py) so build execution is
+    decoupled from API request traffic. Throughput scales by adding worker replicas
+    or raising concurrency; each consumer holds at most one job at a time.
+
+    Admission is atomic (QueueManager.admit_next): a job whose user/project slots are
+    full stays at its queue position, and idle consumers block on the queue signal
+    list until an enqueue or slot release wakes them.
+
+    Graceful drain: stop() prevents consumers from taking new jobs and waits up to
+    drain_timeout for in-flight jobs to finish. Jobs still running after that are
+    cancelled and explicitly marked FAILED so they never sit in a non-terminal state.
+
+    Scaling: while any job is in flight the ECS task is scale-in protected (see
+    TaskProtection), and every metrics_interval seconds the pool publishes the
+    queue backlog per worker that the autoscaling policy tracks.
+    """
+
+    WORKERS_KEY = "queue:workers"
+
+    def __init__(
+        self,
+        redis,
+        runner: Runner | None = None,
+        concurrency: int = 4,
+        poll_timeout: float = 5.0,
+        error_backoff: float = 1.0,
+        protection: TaskProtection | None = None,
+        metrics_interval: float = 0.0,
+    ):
+        self.redis = redis
+        self.runner = runner
+        self.concurrency = max(concurrency, 1)
+        self.poll_timeout = poll_timeout
+        self.error_backoff = error_backoff
+        self.protection = protection or TaskProtection(agent_uri="")
+        self.metrics_interval = metrics_interval
+        self.worker_id = uuid.uuid4().hex[:12]
+        self.in_flight: dict[int, str] = {}
+        self._stopping = asyncio.Event()
+        self._tasks: list[asyncio.Task] = []
+        self._reporter: asyncio.Task | None = None
+        self._protection_lock = asyncio.Lock()
+
+    @property
+    def stopping(self) -> bool:
+        return self._stopping.is_set()
+
+    def start(self) -> None:
+        """Spawn consumer tasks on the running event loop."""
+        if self._tasks:
+            return
+        self._tasks = [
+            asyncio.create_task(self._consume(index), name=f"job-consumer-{index}") for index in range(self.concurrency)
+        ]
+        if self.metrics_interval > 0:
+            self._reporter = asyncio.create_task(self._report_backlog(), name="queue-backlog-reporter")
+        logger.info("worker_pool_started", concurrency=self.concurrency, worker_id=self.worker_id)
+
+    async def stop(self, drain_timeout: float = 600.0) -> None:
+        """Stop taking new jobs and wait for in-flight jobs to finish.
+
+        Args:
+            drain_timeout: Seconds to wait for in-flight jobs before cancelling them
+        """
+        self._stopping.set()
+        registered = self._reporter is not None
+        if self._reporter is not None:
+            self._reporter.cancel()
+            await asyncio.gather(self._reporter, return_exceptions=True)
+            self._reporter = None
+
+        if self._tasks:
+            logger.info("worker_pool_draining", in_flight=list(self.in_flight.values()), drain_timeout=drain_timeout)
+            _done, pending = await asyncio.wait(self._tasks, timeout=drain_timeout)
+            if pending:
+                logger.warning("worker_pool_drain_timeout", abandoned_jobs=list(self.in_flight.values()))
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+            self._tasks = []
+            logger.info("worker_pool_stopped")
+
+        # Deregister only after the drain: a Redis outage here must not skip it
+        if registered:
+            try:
+                await self.redis.hdel(self.WORKERS_KEY, self.worker_id)
+            except Exception as exc:
+                logger.warning("worker_deregister_failed", error=str(exc))
+
+    async def wait(self) -> None:
+        """Block until every consumer task has exited."""
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _consume(self, index: int) -> None:
+        queue = QueueManager(self.redis)
+
+        while not self._stopping.is_set():
+            try:
+                admission = await queue.admit_next()
+                if admission is None or admission[0] == "blocked":
+                    # Nothing runnable — sleep until an enqueue or slot release signals us
+                    await queue.wait_for_signal(timeout=self.poll_timeout)
+                    continue
+            except Exception as exc:
+                logger.warning("worker_dequeue_failed", consumer=index, error=str(exc), error_type=type(exc).__name__)
+                await asyncio.sleep(self.error_backoff)
+                continue
+
+            outcome, job_id = admission
+            if outcome == "missing":
+                logger.error("job_metadata_missing", job_id=job_id)
+                continue
+
+            self.in_flight[index] = job_id
+            await self._sync_protection()
+            try:
+                await process_job(job_id, runner=self.runner, redis=self.redis)
+            except asyncio.CancelledError:
+                # Drain timeout hit — record the job as failed before the task unwinds
+                await asyncio.shield(_fail_interrupted_job(job_id, self.redis))
+                raise
+            except Exception as exc:
+                # process_job handles build failures itself — this only catches infrastructure errors
+                logger.error("worker_job_crashed", consumer=index, job_id=job_id, error=str(exc), exc_info=True)
+            finally:
+                self.in_flight.pop(index, None)
+                await asyncio.shield(self._sync_protection())
+
+    async def _sync_protection(self) -> None:
+        """Protect the task while it holds jobs; renews the lease on every job start."""
+        if not self.protection.enabled:
+            return
+        async with self._protection_lock:
+            busy = bool(self.in_flight)
+            if busy or self.protection.protected:
+                await self.protection.set(busy)
+
+    async def _report_backlog(self) -> None:
+        """Publish (pending + running jobs) / live workers for queue-depth autoscaling.
+
+        Each pool registers its busy count in the queue:workers hash; entries not
+        refreshed within three intervals belong to dead tasks and are dropped.
+        """
+        from app.metrics.cloudwatch import emit_queue_backlog
+
+        stale_after = self.metrics_interval * 3
+        while True:
+            try:
+                now = time.time()
+                await self.redis.hset(
+                    self.WORKERS_KEY, self.worker_id, json.dumps({"busy": len(self.in_flight), "seen": now})
+                )
+                workers = await self.redis.hgetall(self.WORKERS_KEY)
+                busy_total = 0
+                live = 0
+                for worker_id, raw in workers.items():
+                    entry = json.loads(raw)
+                    if now - entry["seen"] > stale_after:
+                        await self.redis.hdel(self.WORKERS_KEY, worker_id)
+                        continue
+                    live += 1
+                    busy_total += entry["busy"]
+
+                pending = await QueueManager(self.redis).get_length()
+                await emit_queue_backlog(pending, (pending + busy_total) / max(live, 1))
+            except Exception as exc:
+                logger.warning("queue_backlog_report_failed", error=str(exc))
+            await asyncio.sleep(self.metrics_interval)
+
+
+async def _fail_interrupted_job(job_id: str, redis) -> None:
+    """Mark a job cancelled by worker shutdown as FAILED and free its slots.
+
+    Called under asyncio.shield from the cancelled consumer. Never raises.
+    """
+    state_machine = JobStateMachine(redis)
+    try:
+        job_data = await state_machine.get_job(job_id)
+        if job_data is None:
+            return
+        debug_id = str(uuid.uuid4())
+        message = f"Job interrupted by worker shutdown — debug_id: {debug_id}. Please retry the build."
+        await state_machine.transition(job_id, JobStatus.FAILED, message)
+        await _persist_job_to_postgres(
+            job_id, job_data, JobStatus.FAILED, 0.0, error_message=message, debug_id=debug_id
+        )
+        await user_semaphore(redis, job_data.get("user_id"), job_data.get("tier", "bootstrapper")).release(job_id)
+        await project_semaphore(redis, job_data.get("project_id"), job_data.get("tier", "bootstrapper")).release(job_id)
+        logger.warning("job_interrupted_by_shutdown", job_id=job_id, debug_id=debug_id)
+    except Exception as exc:
+        logger.error("job_interrupt_cleanup_failed", job_id=job_id, error=str(exc), exc_info=True)
+
+
 async def _mark_sandbox_paused(job_id: str, paused: bool) -> None:
     """Update jobs.sandbox_paused in Postgres.
 
@@ -294,6 +506,7 @@ async def _persist_job_to_postgres(
     """
     from app.db.base import get_session_factory
     from app.db.models.job import Job
+    from app.services.dashboard_cache import invalidate_dashboard
 
     try:
         factory = get_session_factory()
@@ -317,5 +530,6 @@ async def _persist_job_to_postgres(
             )
             session.add(job)
             await session.commit()
+        await invalidate_dashboard(job_data.get("project_id"))
     except Exception as exc:
         logger.error("job_persist_failed", job_id=job_id, error=str(exc), error_type=type(exc).__name__, exc_info=True)
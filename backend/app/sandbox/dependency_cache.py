@@ -0,0 +1,121 @@
+"""Content-addressed store for installed dependency trees (node_modules tarballs).
+
+E2BSandboxRuntime.install_dependencies keys archives on sandbox template, ecosystem
+and dependency_manifest_hash() (manifest + lockfile). On a manifest change it first
+tries to restore the tree from this store, which takes seconds instead of a full
+`npm install`; after a real install it uploads the tree so the next sandbox with the
+same manifest can restore it. Each entry records how long the real install took so
+builds can report the time saved.
+
+Backends: a local directory (DEPENDENCY_CACHE_DIR) with size-capped LRU eviction,
+or an S3 bucket (DEPENDENCY_CACHE_BUCKET) whose lifecycle rules handle expiry.
+"""
+
+import asyncio
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+
+import boto3
+import structlog
+
+from app.core.config import get_settings
+
+logger = structlog.get_logger(__name__)
+
+
+class LocalDependencyCache:
+    """Filesystem-backed store: <root>/<key>.tar.gz plus <root>/<key>.json metadata.
+
+    Args:
+        root: Directory holding the archives (created on first write)
+        max_bytes: Total size cap; least recently used archives are evicted past it
+    """
+
+    def __init__(self, root: str | Path, max_bytes: int = 2 * 1024**3):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+
+    async def get(self, key: str) -> tuple[bytes, float] | None:
+        """Return (archive bytes, install seconds) or None when the key is not cached."""
+        return await asyncio.to_thread(self._get, key)
+
+    async def put(self, key: str, data: bytes, install_seconds: float) -> None:
+        """Store an archive and the duration of the install it replaces."""
+        await asyncio.to_thread(self._put, key, data, install_seconds)
+
+    def _get(self, key: str) -> tuple[bytes, float] | None:
+        archive = self.root / f"{key}.tar.gz"
+        try:
+            data = archive.read_bytes()
+            meta = json.loads((self.root / f"{key}.json").read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        os.utime(archive)  # LRU: a hit refreshes the entry
+        return data, float(meta.get("install_seconds", 0.0))
+
+    def _put(self, key: str, data: bytes, install_seconds: float) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        # Write-then-rename so concurrent readers never see a partial archive
+        for name, payload in (
+            (f"{key}.json", json.dumps({"install_seconds": install_seconds}).encode()),
+            (f"{key}.tar.gz", data),
+        ):
+            tmp = self.root / f".{name}.{os.getpid()}.tmp"
+            tmp.write_bytes(payload)
+            os.replace(tmp, self.root / name)
+        self._evict()
+
+    def _evict(self) -> None:
+        archives = sorted(self.root.glob("*.tar.gz"), key=lambda p: p.stat().st_mtime)
+        total = sum(p.stat().st_size for p in archives)
+        while archives and total > self.max_bytes:
+            oldest = archives.pop(0)
+            total -= oldest.stat().st_size
+            oldest.unlink(missing_ok=True)
+            (self.root / oldest.name.replace(".tar.gz", ".json")).unlink(missing_ok=True)
+            logger.info("dependency_cache_evicted", key=oldest.name)
+
+
+class S3DependencyCache:
+    """S3-backed store: s3://<bucket>/<prefix><key>.tar.gz with install seconds in object metadata."""
+
+    def __init__(self, bucket: str, prefix: str = "dependency-cache/"):
+        self.bucket = bucket
+        self.prefix = prefix
+        self._s3 = boto3.client("s3", region_name="us-east-1")
+
+    async def get(self, key: str) -> tuple[bytes, float] | None:
+        try:
+            response = await asyncio.to_thread(
+                self._s3.get_object, Bucket=self.bucket, Key=f"{self.prefix}{key}.tar.gz"
+            )
+        except self._s3.exceptions.NoSuchKey:
+            return None
+        data = await asyncio.to_thread(response["Body"].read)
+        return data, float(response.get("Metadata", {}).get("install-seconds", "0"))
+
+    async def put(self, key: str, data: bytes, install_seconds: float) -> None:
+        await asyncio.to_thread(
+            self._s3.put_object,
+            Bucket=self.bucket,
+            Key=f"{self.prefix}{key}.tar.gz",
+            Body=data,
+            ContentType="application/gzip",
+            Metadata={"install-seconds": f"{install_seconds:.1f}"},
+        )
+
+
+DependencyCache = LocalDependencyCache | S3DependencyCache
+
+
+@lru_cache
+def get_dependency_cache() -> DependencyCache | None:
+    """Return the configured store, or None when dependency caching is disabled."""
+    settings = get_settings()
+    if settings.dependency_cache_bucket:
+        return S3DependencyCache(settings.dependency_cache_bucket)
+    if settings.dependency_cache_dir:
+        return LocalDependencyCache(settings.dependency_cache_dir, max_bytes=settings.dependency_cache_max_mb * 1024**2)
+    return None
@@ -7,7 +7,13 @@ This module provides a sandboxed environment for the AI Co-Founder to:
 - Sync files between sandbox and persistent storage
 """
 
+import asyncio
+import hashlib
+import io
 import logging
+import tarfile
+import time
+import uuid
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 
@@ -16,23 +22,81 @@ from e2b_code_interpreter import AsyncSandbox
 
 from app.core.config import get_settings
 from app.core.exceptions import SandboxError
+from app.sandbox.dependency_cache import DependencyCache, get_dependency_cache
 
 logger = logging.getLogger(__name__)
 
+# Files whose content determines the installed dependency tree, per ecosystem
+DEPENDENCY_MANIFESTS = {
+    "node": ("package.json", "package-lock.json"),
+    "python": ("requirements.txt", "pyproject.toml"),
+}
+
+# Bulk writes: files per multi-file upload, uploads in flight, and the file count at
+# which write_files() switches to a single tar archive by default
+WRITE_BATCH_SIZE = 25
+WRITE_CONCURRENCY = 4
+ARCHIVE_MIN_FILES = 40
+
+# Installed trees archived in the dependency cache, relative to the project directory.
+# Python is not cached: pip installs into the template's interpreter outside the project.
+_CACHED_DEPENDENCY_DIRS = {"node": "node_modules"}
+
+# Archives above this size are not uploaded to the dependency cache
+MAX_DEPENDENCY_ARCHIVE_BYTES = 512 * 1024**2
+
+_INSTALL_COMMANDS = {
+    "node": "npm install",
+    "python": "pip install -r requirements.txt",
+}
+
+
+def dependency_manifest_hash(files: dict[str, str], ecosystem: str) -> str | None:
+    """Hash the root-level dependency manifests present in files.
+
+    Args:
+        files: Mapping of project-relative path to file content
+        ecosystem: Key of DEPENDENCY_MANIFESTS ("node" or "python")
+
+    Returns:
+        Hex digest, or None if the project has no manifest for this ecosystem
+    """
+    digest = hashlib.sha256()
+    found = False
+    for name in DEPENDENCY_MANIFESTS[ecosystem]:
+        content = files.get(name)
+        if content is None:
+            continue
+        found = True
+        digest.update(name.encode())
+        digest.update(b"\0")
+        digest.update(content.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest() if found else None
+
 
 class E2BSandboxRuntime:
     """Manages E2B sandbox instances for secure code execution."""
 
-    def __init__(self, template: str = "base"):
+    def __init__(self, template: str = "base", dependency_cache: DependencyCache | None = None):
         """Initialize the E2B runtime.
 
         Args:
             template: E2B template to use. Options: "base", "python", "node"
+            dependency_cache: Store of installed dependency trees; defaults to the one
+                configured in Settings (None when caching is disabled)
         """
         self.settings = get_settings()
         self.template = template
+        self.dependency_cache = dependency_cache if dependency_cache is not None else get_dependency_cache()
         self._sandbox: AsyncSandbox | None = None
         self._background_processes: dict[str, any] = {}
+        # (cwd, ecosystem) -> manifest hash of the last successful install
+        self._installed_manifests: dict[tuple[str, str], str] = {}
+        # manifest hash -> seconds a real install of it took (what a skip or restore saves)
+        self._install_seconds: dict[str, float] = {}
+        # Install time avoided by manifest skips and cache restores on this runtime
+        self.install_seconds_saved = 0.0
 
     @asynccontextmanager
     async def session(self) -> AsyncGenerator["E2BSandboxRuntime", None]:
@@ -81,6 +145,7 @@ class E2BSandboxRuntime:
         try:
             os.environ["E2B_API_KEY"] = self.settings.e2b_api_key
             self._sandbox = await AsyncSandbox.connect(sandbox_id)
+            self._installed_manifests = {}
         except Exception as e:
             raise SandboxError(f"Failed to connect to sandbox {sandbox_id}: {e}") from e
 
@@ -99,6 +164,7 @@ class E2BSandboxRuntime:
             pass  # Best effort cleanup
 
         self._sandbox = None
+        self._installed_manifests = {}
 
     async def set_timeout(self, seconds: int) -> None:
         """Extend sandbox lifetime. Must be awaited.
@@ -162,6 +228,93 @@ class E2BSandboxRuntime:
         except Exception as e:
             raise SandboxError(f"Failed to write file {path}: {e}") from e
 
+    async def write_files(self, files: dict[str, str], archive: bool | None = None) -> dict[str, SandboxError]:
+        """Write many files with as few round trips as possible.
+
+        Files are uploaded in batches of WRITE_BATCH_SIZE through the SDK's multi-file
+        write (which creates parent directories, so no make_dir calls are needed), with
+        up to WRITE_CONCURRENCY batches in flight. With archive=True the files are packed
+        into one tar.gz, uploaded once and extracted in the sandbox; if that fails the
+        batched upload is used instead.
+
+        Args:
+            files: Mapping of path (relative to /home/user, or absolute) to content
+            archive: Force (True) or skip (False) the tar upload. None uses it when
+                there are at least ARCHIVE_MIN_FILES files.
+
+        Returns:
+            {path: SandboxError} for files that could not be written (empty on success).
+            A failed batch is retried file by file so only the bad paths are reported.
+        """
+        if not self._sandbox:
+            raise SandboxError("Sandbox not started")
+        if not files:
+            return {}
+
+        # E2B expects absolute paths - prepend /home/user if relative
+        by_abs = {(path if path.startswith("/") else f"/home/user/{path}"): path for path in files}
+        if len(by_abs) != len(files):
+            raise SandboxError("Duplicate paths in write_files()")
+
+        if archive is None:
+            archive = len(files) >= ARCHIVE_MIN_FILES
+        if archive:
+            try:
+                await self._write_archive({abs_path: files[path] for abs_path, path in by_abs.items()})
+                return {}
+            except Exception as e:
+                logger.warning("Archive upload failed, falling back to batched writes: %s", e)
+
+        semaphore = asyncio.Semaphore(WRITE_CONCURRENCY)
+        failed: dict[str, SandboxError] = {}
+
+        async def write_batch(batch: list[str]) -> None:
+            async with semaphore:
+                try:
+                    await self._sandbox.files.write_files(
+                        [{"path": abs_path, "data": files[by_abs[abs_path]]} for abs_path in batch]
+                    )
+                    return
+                except Exception as e:
+                    logger.warning("Batch write of %d files failed, retrying singly: %s", len(batch), e)
+                for abs_path in batch:
+                    path = by_abs[abs_path]
+                    try:
+                        await self.write_file(abs_path, files[path])
+                    except SandboxError as e:
+                        failed[path] = e
+
+        paths = list(by_abs)
+        await asyncio.gather(
+            *(write_batch(paths[i : i + WRITE_BATCH_SIZE]) for i in range(0, len(paths), WRITE_BATCH_SIZE))
+        )
+        return failed
+
+    async def _write_archive(self, files: dict[str, str]) -> None:
+        """Upload absolute-path files as one tar.gz and extract it at /."""
+
+        def pack() -> bytes:
+            # Stamp entries with the upload time: tar keeps archive mtimes on extraction,
+            # and mtime-based dev-server caches would miss changes at the default of 0
+            mtime = time.time()
+            buffer = io.BytesIO()
+            with tarfile.open(fileobj=buffer, mode="w:gz") as tar:
+                for abs_path, content in files.items():
+                    data = content.encode("utf-8")
+                    info = tarfile.TarInfo(abs_path.lstrip("/"))
+                    info.size = len(data)
+                    info.mode = 0o644
+                    info.mtime = mtime
+                    tar.addfile(info, io.BytesIO(data))
+            return buffer.getvalue()
+
+        payload = await asyncio.to_thread(pack)
+        archive_path = f"/tmp/upload-{uuid.uuid4().hex}.tar.gz"
+        await self._sandbox.files.write(archive_path, payload)
+        result = await self.run_command(f"tar -xzf {archive_path} -C / && rm -f {archive_path}", timeout=120)
+        if result["exit_code"] != 0:
+            raise SandboxError(f"tar extraction failed: {result['stderr'][:200]}")
+
     async def read_file(self, path: str) -> str:
         """Read content from a file in the sandbox.
 
@@ -265,6 +418,127 @@ class E2BSandboxRuntime:
         except Exception as e:
             raise SandboxError(f"Failed to run command '{command}': {e}") from e
 
+    async def install_dependencies(
+        self,
+        ecosystem: str,
+        manifest_hash: str | None,
+        cwd: str | None = None,
+        timeout: int = 300,
+        command: str | None = None,
+        on_stdout=None,  # Optional[Callable[[str], Awaitable[None]]]
+        on_stderr=None,  # Optional[Callable[[str], Awaitable[None]]]
+    ) -> dict | None:
+        """Install project dependencies unless the same manifest is already installed.
+
+        Args:
+            ecosystem: "node" (npm install) or "python" (pip install -r requirements.txt)
+            manifest_hash: dependency_manifest_hash() of the project; None always installs
+            cwd: Project directory (defaults to /home/user)
+            timeout: Install timeout in seconds
+            command: Override the ecosystem's default install command
+            on_stdout: Optional async callback for stdout chunks
+            on_stderr: Optional async callback for stderr chunks
+
+        Returns:
+            Command result dict, or None if the install was skipped
+        """
+        key = (cwd or "/home/user", ecosystem)
+        if manifest_hash is not None and self._installed_manifests.get(key) == manifest_hash:
+            self.install_seconds_saved += self._install_seconds.get(manifest_hash, 0.0)
+            logger.info("Dependencies unchanged (%s in %s) — skipping install", ecosystem, key[0])
+            return None
+
+        # Custom commands install something other than the canonical tree — never cache those
+        cache_key = None
+        if (
+            self.dependency_cache is not None
+            and manifest_hash is not None
+            and command is None
+            and ecosystem in _CACHED_DEPENDENCY_DIRS
+        ):
+            cache_key = f"{self.template}-{ecosystem}-{manifest_hash}"
+            restored = await self._restore_dependencies(cache_key, ecosystem, key[0])
+            if restored is not None:
+                restore_seconds, install_seconds = restored
+                saved = max(install_seconds - restore_seconds, 0.0)
+                self._installed_manifests[key] = manifest_hash
+                self._install_seconds[manifest_hash] = install_seconds
+                self.install_seconds_saved += saved
+                message = (
+                    f"Restored {ecosystem} dependencies from cache in {restore_seconds:.1f}s (saved ~{saved:.0f}s)"
+                )
+                logger.info(message)
+                if on_stdout is not None:
+                    await on_stdout(message + "\n")
+                return {"stdout": message, "stderr": "", "exit_code": 0}
+
+        started = time.monotonic()
+        result = await self.run_command(
+            command or _INSTALL_COMMANDS[ecosystem], timeout=timeout, cwd=cwd, on_stdout=on_stdout, on_stderr=on_stderr
+        )
+        if result.get("exit_code", 1) == 0 and manifest_hash is not None:
+            install_seconds = time.monotonic() - started
+            self._installed_manifests[key] = manifest_hash
+            self._install_seconds[manifest_hash] = install_seconds
+            if cache_key is not None:
+                await self._store_dependencies(cache_key, ecosystem, key[0], install_seconds)
+        return result
+
+    async def _restore_dependencies(self, cache_key: str, ecosystem: str, cwd: str) -> tuple[float, float] | None:
+        """Unpack a cached dependency tree into cwd.
+
+        Returns:
+            (restore seconds, original install seconds), or None on a miss or any failure
+        """
+        started = time.monotonic()
+        try:
+            entry = await self.dependency_cache.get(cache_key)
+        except Exception as e:
+            logger.warning("Dependency cache read failed for %s: %s", cache_key, e)
+            return None
+        if entry is None:
+            logger.info("Dependency cache miss for %s", cache_key)
+            return None
+
+        data, install_seconds = entry
+        archive_path = f"/tmp/deps-{cache_key}.tar.gz"
+        target = _CACHED_DEPENDENCY_DIRS[ecosystem]
+        try:
+            await self._sandbox.files.write(archive_path, data)
+            result = await self.run_command(
+                f"rm -rf {target} && tar -xzf {archive_path} && rm -f {archive_path}", timeout=300, cwd=cwd
+            )
+        except SandboxError as e:
+            logger.warning("Dependency cache restore failed for %s: %s", cache_key, e)
+            return None
+        if result["exit_code"] != 0:
+            logger.warning("Dependency cache extract failed for %s: %s", cache_key, result["stderr"][:200])
+            return None
+        return time.monotonic() - started, install_seconds
+
+    async def _store_dependencies(self, cache_key: str, ecosystem: str, cwd: str, install_seconds: float) -> None:
+        """Archive the freshly installed tree and upload it to the cache. Never raises."""
+        archive_path = f"/tmp/deps-{cache_key}.tar.gz"
+        try:
+            result = await self.run_command(
+                f"tar -czf {archive_path} {_CACHED_DEPENDENCY_DIRS[ecosystem]} && stat -c %s {archive_path}",
+                timeout=300,
+                cwd=cwd,
+            )
+            if result["exit_code"] != 0:
+                logger.warning("Dependency archive failed for %s: %s", cache_key, result["stderr"][:200])
+                return
+            size = int(result["stdout"].strip().splitlines()[-1])
+            if size <= MAX_DEPENDENCY_ARCHIVE_BYTES:
+                data = await self._sandbox.files.read(archive_path, format="bytes")
+                await self.dependency_cache.put(cache_key, bytes(data), install_seconds)
+                logger.info("Cached %s dependencies as %s (%d bytes)", ecosystem, cache_key, size)
+            else:
+                logger.info("Dependency archive %s too large to cache (%d bytes)", cache_key, size)
+            await self.run_command(f"rm -f {archive_path}", timeout=30)
+        except Exception as e:
+            logger.warning("Dependency cache upload failed for %s: %s", cache_key, e)
+
     async def run_background(
         self,
         command: str,
@@ -461,21 +735,26 @@ class E2BSandboxRuntime:
 
         start_cmd, port = self._detect_framework(package_json_content)
 
-        # Install dependencies first
-        install_result = await self.run_command(
-            "npm install", timeout=300, cwd=workspace_path, on_stdout=on_stdout, on_stderr=on_stderr
+        # Install dependencies first (skipped when this manifest is already installed,
+        # e.g. by the executor node earlier in the same job)
+        node_files = {"package.json": package_json_content}
+        lockfile = (working_files or {}).get("package-lock.json")
+        if isinstance(lockfile, dict):
+            node_files["package-lock.json"] = lockfile.get("new_content", "")
+        manifest_hash = dependency_manifest_hash(node_files, "node") if package_json_content else None
+
+        install_result = await self.install_dependencies(
+            "node", manifest_hash, cwd=workspace_path, on_stdout=on_stdout, on_stderr=on_stderr
         )
-        if install_result.get("exit_code", 1) != 0:
+        if install_result is not None and install_result.get("exit_code", 1) != 0:
             stderr = install_result.get("stderr", "")
             # Retry once on network errors
             if any(keyword in stderr.lower() for keyword in ["econnreset", "network", "etimedout"]):
-                import asyncio
-
                 await asyncio.sleep(10)
-                install_result = await self.run_command(
-                    "npm install", timeout=300, cwd=workspace_path, on_stdout=on_stdout, on_stderr=on_stderr
+                install_result = await self.install_dependencies(
+                    "node", manifest_hash, cwd=workspace_path, on_stdout=on_stdout, on_stderr=on_stderr
                 )
-                if install_result.get("exit_code", 1) != 0:
+                if install_result is not None and install_result.get("exit_code", 1) != 0:
                     raise SandboxError(f"npm install failed after retry: {install_result.get('stderr', '')[:500]}")
             else:
                 raise SandboxError(f"npm install failed: {install_result.get('stderr', '')[:500]}")
@@ -533,17 +812,9 @@ async def execute_in_sandbox(
     runtime = E2BSandboxRuntime(template=template)
 
     async with runtime.session():
-        # Write all files
-        for path, content in files.items():
-            # Create parent directories
-            if "/" in path:
-                parent = "/".join(path.split("/")[:-1])
-                try:
-                    await runtime.make_dir(parent)
-                except SandboxError:
-                    pass  # Directory might exist
-
-            await runtime.write_file(path, content)
+        failed = await runtime.write_files(files)
+        if failed:
+            raise SandboxError(f"Failed to write {len(failed)} file(s): {', '.join(sorted(failed))}")
 
         # Run command
         return await runtime.run_command(command)
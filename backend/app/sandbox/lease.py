@@ -0,0 +1,174 @@
+"""Per-job sandbox lease shared by the LangGraph executor and the build pipeline.
+
+GenerationService registers a lease under the job's session_id before running the
+graph. executor_node looks it up on every visit (including debugger retries) and
+reuses the same sandbox, writing only files whose content changed; DEPS/CHECKS then
+run in that sandbox instead of provisioning another one.
+
+Runtime objects cannot live in CoFounderState (the checkpointer serialises it), so
+leases are held in a process-local registry keyed by session_id. The graph always
+runs in the same worker process as the build that registered the lease.
+
+When the lease has a SandboxPool, the first acquire() takes a warm sandbox for the
+project's stack before falling back to booting one through runtime_factory.
+"""
+
+import asyncio
+import hashlib
+from collections.abc import Callable
+from typing import TYPE_CHECKING
+
+import structlog
+
+from app.core.exceptions import SandboxError
+from app.sandbox.e2b_runtime import E2BSandboxRuntime
+
+if TYPE_CHECKING:
+    from app.sandbox.pool import SandboxPool
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_WORKSPACE = "/home/user/project"
+
+
+class SandboxLease:
+    """A sandbox owned by one job, started on first use and reused until released.
+
+    Args:
+        runtime_factory: Zero-arg callable returning an E2BSandboxRuntime (or fake).
+            Not called when runtime is given.
+        runtime: Already started/connected runtime to adopt (iteration builds)
+        workspace_path: Project root inside the sandbox
+        timeout: Sandbox lifetime applied when the lease starts the sandbox
+        pool: Warm pool consulted on first acquire (None boots cold)
+    """
+
+    def __init__(
+        self,
+        runtime_factory: Callable[[], E2BSandboxRuntime] | None = None,
+        runtime: E2BSandboxRuntime | None = None,
+        workspace_path: str = DEFAULT_WORKSPACE,
+        timeout: int = 3600,
+        pool: "SandboxPool | None" = None,
+    ):
+        self._runtime_factory = runtime_factory
+        self._pool = pool
+        self.runtime = runtime
+        self.workspace_path = workspace_path
+        self.timeout = timeout
+        self._started = runtime is not None
+        self.pool_hit = False
+        # abs path -> sha256 of content last written to the sandbox
+        self._written: dict[str, str] = {}
+        # Parallel plan steps share the lease: one sandbox start, one install at a time
+        self._start_lock = asyncio.Lock()
+        self.install_lock = asyncio.Lock()
+
+    @property
+    def started(self) -> bool:
+        return self._started
+
+    async def acquire(self, stack: str | None = None) -> E2BSandboxRuntime:
+        """Return the leased runtime, starting the sandbox on first call.
+
+        Args:
+            stack: Pooled stack of the project (see detect_stack); only used on the
+                first call, to take a warm sandbox from the pool
+        """
+        if self._started:
+            return self.runtime
+        async with self._start_lock:
+            if self.runtime is None and self._pool is not None:
+                warm = await self._pool.checkout(stack)
+                if warm is not None:
+                    self.runtime = warm
+                    self.pool_hit = True
+                    # Savings from warming the sandbox belong to the pool, not to this job
+                    warm.install_seconds_saved = 0.0
+                    self._started = True
+                    await warm.set_timeout(self.timeout)
+                    logger.info("sandbox_lease_warm", sandbox_id=warm.sandbox_id, stack=stack)
+            if self.runtime is None:
+                self.runtime = self._runtime_factory()
+            if not self._started:
+                await self.runtime.start()
+                # Outlive the gaps between executor visits (LLM calls can take minutes)
+                await self.runtime.set_timeout(self.timeout)
+                self._started = True
+                logger.info("sandbox_lease_started", sandbox_id=self.runtime.sandbox_id)
+        return self.runtime
+
+    def abs_path(self, rel_path: str) -> str:
+        return rel_path if rel_path.startswith("/") else f"{self.workspace_path}/{rel_path}"
+
+    async def sync_files(self, working_files: dict) -> tuple[list[str], dict[str, SandboxError]]:
+        """Write files whose content differs from what this lease last wrote.
+
+        Args:
+            working_files: Mapping of path to FileChange dict (or raw content)
+
+        Returns:
+            (paths written, {path: error} for writes that failed). Failed paths are
+            retried on the next sync.
+        """
+        runtime = await self.acquire()
+        pending: dict[str, tuple[str, str]] = {}  # abs path -> (rel path, digest)
+        contents: dict[str, str] = {}
+        for rel_path, change in working_files.items():
+            content = change.get("new_content", "") if isinstance(change, dict) else str(change)
+            abs_path = self.abs_path(rel_path)
+            digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+            if self._written.get(abs_path) == digest:
+                continue
+            pending[abs_path] = (rel_path, digest)
+            contents[abs_path] = content
+
+        # One bulk upload for everything that changed
+        errors = await runtime.write_files(contents) if contents else {}
+        written: list[str] = []
+        failed: dict[str, SandboxError] = {}
+        for abs_path, (rel_path, digest) in pending.items():
+            if abs_path in errors:
+                self._written.pop(abs_path, None)
+                failed[rel_path] = errors[abs_path]
+            else:
+                self._written[abs_path] = digest
+                written.append(rel_path)
+
+        logger.info(
+            "sandbox_lease_synced",
+            written=len(written),
+            unchanged=len(working_files) - len(written) - len(failed),
+            failed=len(failed),
+        )
+        return written, failed
+
+    async def close(self) -> None:
+        """Kill the sandbox. Used when the build fails; successful builds hand it off."""
+        if self.runtime is not None and self._started:
+            try:
+                await self.runtime.stop()
+            except Exception:
+                logger.warning("sandbox_lease_stop_failed", exc_info=True)
+        self._started = False
+        self._written = {}
+
+
+_leases: dict[str, SandboxLease] = {}
+
+
+def register_lease(key: str, lease: SandboxLease) -> None:
+    """Make lease available to graph nodes running under session_id == key."""
+    _leases[key] = lease
+
+
+def get_lease(key: str | None) -> SandboxLease | None:
+    """Return the lease registered for a session, if any."""
+    if not key:
+        return None
+    return _leases.get(key)
+
+
+def release_lease(key: str) -> SandboxLease | None:
+    """Remove a lease from the registry without stopping its sandbox."""
+    return _leases.pop(key, None)
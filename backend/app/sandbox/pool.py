@@ -0,0 +1,279 @@
+"""Warm pool of pre-booted E2B sandboxes with framework dependencies pre-installed.
+
+Booting a sandbox and running a cold `npm install` dominates time-to-preview for
+generated apps. The pool keeps a configurable number of sandboxes per stack booted,
+with a canonical package.json for that stack installed in the project workspace, so
+a build's own `npm install` only has to add the delta.
+
+Builds check out a sandbox through SandboxLease.acquire(stack=...). Every checkout
+(hit or miss) triggers a background refill; a periodic maintenance loop reaps
+sandboxes idle longer than idle_seconds and tops the pool back up.
+
+One pool per worker process (see app/worker.py); disabled when SANDBOX_POOL_SIZE=0.
+"""
+
+import asyncio
+import json
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+import structlog
+
+from app.metrics.cloudwatch import emit_sandbox_pool_checkout
+from app.sandbox.e2b_runtime import E2BSandboxRuntime, dependency_manifest_hash
+
+logger = structlog.get_logger(__name__)
+
+# Canonical manifests pre-installed in warm sandboxes. Versions track what the
+# architect/coder prompts generate so most of a build's tree is already present.
+STACK_MANIFESTS: dict[str, dict] = {
+    "nextjs": {
+        "name": "app",
+        "private": True,
+        "scripts": {"dev": "next dev", "build": "next build", "start": "next start"},
+        "dependencies": {"next": "^14.2.0", "react": "^18.3.0", "react-dom": "^18.3.0"},
+        "devDependencies": {"typescript": "^5.4.0", "@types/react": "^18.3.0", "@types/node": "^20.0.0"},
+    },
+    "vite": {
+        "name": "app",
+        "private": True,
+        "type": "module",
+        "scripts": {"dev": "vite", "build": "vite build"},
+        "dependencies": {"react": "^18.3.0", "react-dom": "^18.3.0"},
+        "devDependencies": {"vite": "^5.2.0", "@vitejs/plugin-react": "^4.3.0", "typescript": "^5.4.0"},
+    },
+}
+
+
+# Stack dimension for checkouts whose stack is unknown or not pooled
+UNKNOWN_STACK = "unknown"
+
+
+def detect_stack(working_files: dict) -> str | None:
+    """Map a project's package.json to a pooled stack ("nextjs", "vite") or None."""
+    change = working_files.get("package.json")
+    if change is None:
+        return None
+    content = change.get("new_content", "") if isinstance(change, dict) else str(change)
+    try:
+        pkg = json.loads(content)
+    except (json.JSONDecodeError, TypeError):
+        return None
+    deps = {**pkg.get("dependencies", {}), **pkg.get("devDependencies", {})}
+    # Same precedence as E2BSandboxRuntime._detect_framework
+    if "next" in deps:
+        return "nextjs"
+    if "vite" in deps:
+        return "vite"
+    return None
+
+
+@dataclass
+class _WarmSandbox:
+    runtime: E2BSandboxRuntime
+    booted_at: float = field(default_factory=time.monotonic)
+
+
+class SandboxPool:
+    """Keeps `size` warm sandboxes per stack and hands them out to builds.
+
+    Args:
+        runtime_factory: Zero-arg callable returning an unstarted E2BSandboxRuntime
+        stacks: Stack names (keys of STACK_MANIFESTS) to keep warm
+        size: Warm sandboxes to keep per stack
+        idle_seconds: Reap warm sandboxes older than this (E2B bills idle time)
+        maintenance_interval: Seconds between reap/refill passes
+        workspace_path: Project root the canonical manifest is installed into
+    """
+
+    def __init__(
+        self,
+        runtime_factory: Callable[[], E2BSandboxRuntime],
+        stacks: list[str],
+        size: int = 1,
+        idle_seconds: float = 1200.0,
+        maintenance_interval: float = 30.0,
+        workspace_path: str = "/home/user/project",
+    ):
+        unknown = set(stacks) - set(STACK_MANIFESTS)
+        if unknown:
+            raise ValueError(f"Unknown sandbox pool stacks: {sorted(unknown)}")
+        self.runtime_factory = runtime_factory
+        self.stacks = list(stacks)
+        self.size = size
+        self.idle_seconds = idle_seconds
+        self.maintenance_interval = maintenance_interval
+        self.workspace_path = workspace_path
+        self._idle: dict[str, list[_WarmSandbox]] = {stack: [] for stack in self.stacks}
+        self._booting: dict[str, int] = dict.fromkeys(self.stacks, 0)
+        self._hits: dict[str, int] = dict.fromkeys(self.stacks, 0)
+        self._misses: dict[str, int] = dict.fromkeys([*self.stacks, UNKNOWN_STACK], 0)
+        self._background: set[asyncio.Task] = set()
+        self._maintenance: asyncio.Task | None = None
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Start the reap/refill loop on the running event loop."""
+        if self._maintenance is None:
+            self._maintenance = asyncio.create_task(self._maintain(), name="sandbox-pool-maintenance")
+            logger.info("sandbox_pool_started", stacks=self.stacks, size=self.size)
+
+    async def stop(self) -> None:
+        """Stop background work and kill every idle sandbox."""
+        tasks = [t for t in (self._maintenance, *self._background) if t is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._maintenance = None
+        self._background.clear()
+        for stack in self.stacks:
+            while self._idle[stack]:
+                await self._kill(self._idle[stack].pop())
+        logger.info("sandbox_pool_stopped")
+
+    # ------------------------------------------------------------------
+    # Checkout
+    # ------------------------------------------------------------------
+
+    async def checkout(self, stack: str | None) -> E2BSandboxRuntime | None:
+        """Take a warm sandbox for stack, or None on a miss (caller boots its own).
+
+        The returned runtime is owned by the caller; the pool refills in the background.
+        """
+        if stack not in self._idle:
+            # Unknown or unpooled stack (e.g. no package.json yet): the lease boots cold,
+            # which is a miss for pool sizing purposes
+            self._misses[UNKNOWN_STACK] += 1
+            await emit_sandbox_pool_checkout(UNKNOWN_STACK, False)
+            logger.info("sandbox_pool_checkout", stack=stack or UNKNOWN_STACK, hit=False, idle=0)
+            return None
+
+        warm = None
+        while self._idle[stack]:
+            candidate = self._idle[stack].pop()
+            if time.monotonic() - candidate.booted_at < self.idle_seconds:
+                warm = candidate
+                break
+            await self._kill(candidate)
+
+        hit = warm is not None
+        if hit:
+            self._hits[stack] += 1
+        else:
+            self._misses[stack] += 1
+        await emit_sandbox_pool_checkout(stack, hit)
+        logger.info("sandbox_pool_checkout", stack=stack, hit=hit, idle=len(self._idle[stack]))
+
+        self._spawn(self._refill(stack))
+        return warm.runtime if warm else None
+
+    def stats(self) -> dict[str, dict]:
+        """Per-stack idle/booting counts and hit/miss totals since start.
+
+        Checkouts for unknown or unpooled stacks are counted as misses under "unknown".
+        """
+        stats = {
+            stack: {
+                "idle": len(self._idle[stack]),
+                "booting": self._booting[stack],
+                "hits": self._hits[stack],
+                "misses": self._misses[stack],
+            }
+            for stack in self.stacks
+        }
+        stats[UNKNOWN_STACK] = {"idle": 0, "booting": 0, "hits": 0, "misses": self._misses[UNKNOWN_STACK]}
+        return stats
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _spawn(self, coro) -> None:
+        task = asyncio.create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def _maintain(self) -> None:
+        while True:
+            try:
+                await self.reap()
+                await asyncio.gather(*(self._refill(stack) for stack in self.stacks))
+            except Exception as exc:
+                logger.warning("sandbox_pool_maintenance_failed", error=str(exc))
+            await asyncio.sleep(self.maintenance_interval)
+
+    async def reap(self) -> int:
+        """Kill warm sandboxes idle longer than idle_seconds. Returns the number reaped."""
+        now = time.monotonic()
+        reaped = 0
+        for stack in self.stacks:
+            keep = []
+            for warm in self._idle[stack]:
+                if now - warm.booted_at >= self.idle_seconds:
+                    await self._kill(warm)
+                    reaped += 1
+                else:
+                    keep.append(warm)
+            self._idle[stack] = keep
+        if reaped:
+            logger.info("sandbox_pool_reaped", count=reaped)
+        return reaped
+
+    async def _refill(self, stack: str) -> None:
+        missing = self.size - len(self._idle[stack]) - self._booting[stack]
+        if missing <= 0:
+            return
+        self._booting[stack] += missing
+        try:
+            await asyncio.gather(*(self._boot(stack) for _ in range(missing)))
+        finally:
+            self._booting[stack] -= missing
+
+    async def _boot(self, stack: str) -> None:
+        started = time.monotonic()
+        runtime = self.runtime_factory()
+        try:
+            await runtime.start()
+            # Outlive the idle window; the lease extends it again on checkout
+            await runtime.set_timeout(int(self.idle_seconds) + 600)
+            manifest = json.dumps(STACK_MANIFESTS[stack], indent=2)
+            await runtime.write_file(f"{self.workspace_path}/package.json", manifest)
+            result = await runtime.install_dependencies(
+                "node",
+                dependency_manifest_hash({"package.json": manifest}, "node"),
+                cwd=self.workspace_path,
+            )
+            if result is not None and result.get("exit_code", 1) != 0:
+                raise RuntimeError(f"npm install failed: {result.get('stderr', '')[:200]}")
+        except Exception as exc:
+            logger.warning("sandbox_pool_boot_failed", stack=stack, error=str(exc))
+            await self._kill(_WarmSandbox(runtime))
+            return
+
+        self._idle[stack].append(_WarmSandbox(runtime))
+        logger.info("sandbox_pool_booted", stack=stack, seconds=round(time.monotonic() - started, 1))
+
+    @staticmethod
+    async def _kill(warm: _WarmSandbox) -> None:
+        try:
+            await warm.runtime.stop()
+        except Exception:
+            logger.warning("sandbox_pool_stop_failed", exc_info=True)
+
+
+_pool: SandboxPool | None = None
+
+
+def set_sandbox_pool(pool: SandboxPool | None) -> None:
+    """Install the process-wide pool (worker startup) or clear it (shutdown)."""
+    global _pool
+    _pool = pool
+
+
+def get_sandbox_pool() -> SandboxPool | None:
+    """Return the process-wide pool, or None when pooling is disabled."""
+    return _pool
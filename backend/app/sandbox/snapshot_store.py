@@ -0,0 +1,240 @@
+"""Content-addressed snapshots of each build's generated workspace.
+
+working_files otherwise lives only in LangGraph state and inside the E2B sandbox,
+which expires. GenerationService writes a snapshot at the end of every build:
+
+    blobs/<sha[:2]>/<sha>                          file contents, deduplicated by SHA-256
+    manifests/<project_id>/<build_version>.json    {"files": {path: sha}, ...}
+
+Unchanged files cost nothing on the next build version because their blobs already
+exist. Deploy checks, rollback and expired-sandbox resume read real files back with
+load_snapshot() instead of regenerating them through the LLM.
+
+Backends: a local directory (WORKSPACE_SNAPSHOT_DIR) or an S3 bucket
+(WORKSPACE_SNAPSHOT_BUCKET, takes precedence). Neither set disables snapshots.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+from datetime import UTC, datetime
+from functools import lru_cache
+from pathlib import Path
+
+import boto3
+import structlog
+from botocore.exceptions import ClientError
+
+from app.core.config import get_settings
+
+logger = structlog.get_logger(__name__)
+
+UPLOAD_CONCURRENCY = 16
+
+
+def blob_digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class LocalSnapshotStore:
+    """Filesystem-backed store rooted at root (created on first write)."""
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+
+    async def has_blob(self, digest: str) -> bool:
+        return await asyncio.to_thread(self._blob_path(digest).exists)
+
+    async def get_blob(self, digest: str) -> bytes | None:
+        try:
+            return await asyncio.to_thread(self._blob_path(digest).read_bytes)
+        except FileNotFoundError:
+            return None
+
+    async def put_blob(self, digest: str, data: bytes) -> None:
+        await asyncio.to_thread(self._write, self._blob_path(digest), data)
+
+    async def get_manifest(self, project_id: str, build_version: str) -> dict | None:
+        try:
+            text = await asyncio.to_thread(self._manifest_path(project_id, build_version).read_text)
+        except FileNotFoundError:
+            return None
+        return json.loads(text)
+
+    async def put_manifest(self, project_id: str, build_version: str, manifest: dict) -> None:
+        path = self._manifest_path(project_id, build_version)
+        await asyncio.to_thread(self._write, path, json.dumps(manifest).encode("utf-8"))
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.root / "blobs" / digest[:2] / digest
+
+    def _manifest_path(self, project_id: str, build_version: str) -> Path:
+        return self.root / "manifests" / project_id / f"{build_version}.json"
+
+    @staticmethod
+    def _write(path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write-then-rename so concurrent readers never see a partial file
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+
+class S3SnapshotStore:
+    """S3-backed store: s3://<bucket>/<prefix>blobs/... and <prefix>manifests/..."""
+
+    def __init__(self, bucket: str, prefix: str = "workspace-snapshots/"):
+        self.bucket = bucket
+        self.prefix = prefix
+        self._s3 = boto3.client("s3", region_name="us-east-1")
+
+    async def has_blob(self, digest: str) -> bool:
+        try:
+            await asyncio.to_thread(self._s3.head_object, Bucket=self.bucket, Key=self._blob_key(digest))
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+        return True
+
+    async def get_blob(self, digest: str) -> bytes | None:
+        return await self._get(self._blob_key(digest))
+
+    async def put_blob(self, digest: str, data: bytes) -> None:
+        await asyncio.to_thread(self._s3.put_object, Bucket=self.bucket, Key=self._blob_key(digest), Body=data)
+
+    async def get_manifest(self, project_id: str, build_version: str) -> dict | None:
+        data = await self._get(self._manifest_key(project_id, build_version))
+        return json.loads(data) if data is not None else None
+
+    async def put_manifest(self, project_id: str, build_version: str, manifest: dict) -> None:
+        await asyncio.to_thread(
+            self._s3.put_object,
+            Bucket=self.bucket,
+            Key=self._manifest_key(project_id, build_version),
+            Body=json.dumps(manifest).encode("utf-8"),
+            ContentType="application/json",
+        )
+
+    async def _get(self, key: str) -> bytes | None:
+        try:
+            response = await asyncio.to_thread(self._s3.get_object, Bucket=self.bucket, Key=key)
+        except self._s3.exceptions.NoSuchKey:
+            return None
+        return await asyncio.to_thread(response["Body"].read)
+
+    def _blob_key(self, digest: str) -> str:
+        return f"{self.prefix}blobs/{digest[:2]}/{digest}"
+
+    def _manifest_key(self, project_id: str, build_version: str) -> str:
+        return f"{self.prefix}manifests/{project_id}/{build_version}.json"
+
+
+SnapshotStore = LocalSnapshotStore | S3SnapshotStore
+
+
+@lru_cache
+def get_snapshot_store() -> SnapshotStore | None:
+    """Return the configured store, or None when workspace snapshots are disabled."""
+    settings = get_settings()
+    if settings.workspace_snapshot_bucket:
+        return S3SnapshotStore(settings.workspace_snapshot_bucket)
+    if settings.workspace_snapshot_dir:
+        return LocalSnapshotStore(settings.workspace_snapshot_dir)
+    return None
+
+
+async def save_snapshot(
+    store: SnapshotStore,
+    project_id: str,
+    build_version: str,
+    working_files: dict,
+    base_version: str | None = None,
+) -> dict:
+    """Store working_files as the manifest for (project_id, build_version).
+
+    Args:
+        store: Snapshot backend
+        project_id: Project UUID string
+        build_version: e.g. "build_v0_2"
+        working_files: Mapping of path to FileChange dict (or raw content)
+        base_version: Earlier build whose manifest working_files is applied on top of
+            (iteration builds only carry the files they changed). FileChanges with
+            change_type "delete" remove the path.
+
+    Returns:
+        The manifest written: files ({path: sha256}), file_count, total_bytes,
+        new_blobs (blobs uploaded by this snapshot), base_version and created_at.
+    """
+    base = await store.get_manifest(project_id, base_version) if base_version else None
+    files: dict[str, str] = dict(base["files"]) if base else {}
+    sizes: dict[str, int] = dict(base.get("sizes", {})) if base else {}
+    blobs: dict[str, bytes] = {}
+    for path, change in sorted(working_files.items()):
+        if isinstance(change, dict) and change.get("change_type") == "delete":
+            files.pop(path, None)
+            continue
+        content = change.get("new_content", "") if isinstance(change, dict) else str(change)
+        data = content.encode("utf-8")
+        digest = blob_digest(data)
+        files[path] = digest
+        sizes[digest] = len(data)
+        blobs[digest] = data
+
+    semaphore = asyncio.Semaphore(UPLOAD_CONCURRENCY)
+
+    async def upload(digest: str, data: bytes) -> bool:
+        async with semaphore:
+            if await store.has_blob(digest):
+                return False
+            await store.put_blob(digest, data)
+            return True
+
+    uploaded = await asyncio.gather(*(upload(digest, data) for digest, data in blobs.items()))
+
+    manifest = {
+        "project_id": project_id,
+        "build_version": build_version,
+        "files": files,
+        "sizes": {digest: sizes[digest] for digest in sorted(set(files.values()))},
+        "file_count": len(files),
+        "total_bytes": sum(sizes[digest] for digest in files.values()),
+        "new_blobs": sum(uploaded),
+        "base_version": base_version if base else None,
+        "created_at": datetime.now(UTC).isoformat(),
+    }
+    # Manifest last: a manifest that exists always has all of its blobs
+    await store.put_manifest(project_id, build_version, manifest)
+    logger.info(
+        "workspace_snapshot_saved",
+        project_id=project_id,
+        build_version=build_version,
+        file_count=manifest["file_count"],
+        total_bytes=manifest["total_bytes"],
+        new_blobs=manifest["new_blobs"],
+    )
+    return manifest
+
+
+async def load_snapshot(store: SnapshotStore, project_id: str, build_version: str) -> dict[str, str] | None:
+    """Return {path: content} for (project_id, build_version), or None if no snapshot exists."""
+    manifest = await store.get_manifest(project_id, build_version)
+    if manifest is None:
+        return None
+
+    semaphore = asyncio.Semaphore(UPLOAD_CONCURRENCY)
+
+    async def fetch(digest: str) -> bytes | None:
+        async with semaphore:
+            return await store.get_blob(digest)
+
+    digests = sorted(set(manifest["files"].values()))
+    contents = dict(zip(digests, await asyncio.gather(*(fetch(d) for d in digests)), strict=True))
+    missing = [path for path, digest in manifest["files"].items() if contents[digest] is None]
+    if missing:
+        logger.warning(
+            "workspace_snapshot_incomplete", project_id=project_id, build_version=build_version, missing=missing[:10]
+        )
+        return None
+    return {path: contents[digest].decode("utf-8") for path, digest in manifest["files"].items()}
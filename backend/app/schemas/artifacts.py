@@ -45,6 +45,16 @@ GENERATION_ORDER = [
     ArtifactType.HOW_IT_WORKS,
 ]
 
+# Artifacts each cascade artifact is generated from. Milestones, Risk Log and How It Works
+# only need Brief + MVP Scope, so the cascade runs them concurrently.
+ARTIFACT_DEPENDENCIES: dict[ArtifactType, list[ArtifactType]] = {
+    ArtifactType.BRIEF: [],
+    ArtifactType.MVP_SCOPE: [ArtifactType.BRIEF],
+    ArtifactType.MILESTONES: [ArtifactType.BRIEF, ArtifactType.MVP_SCOPE],
+    ArtifactType.RISK_LOG: [ArtifactType.BRIEF, ArtifactType.MVP_SCOPE],
+    ArtifactType.HOW_IT_WORKS: [ArtifactType.BRIEF, ArtifactType.MVP_SCOPE],
+}
+
 
 # ==================== ARTIFACT CONTENT SCHEMAS ====================
 
@@ -19,6 +19,7 @@ from app.db.graph.strategy_graph import get_strategy_graph
 from app.db.models.artifact import Artifact
 from app.db.models.project import Project
 from app.schemas.artifacts import GENERATION_ORDER, ArtifactType
+from app.services.dashboard_cache import invalidate_dashboard
 from app.services.graph_service import GraphService
 
 
@@ -55,12 +56,11 @@ class ArtifactService:
         Steps:
         1. Verify project belongs to user (404 pattern)
         2. Check if artifacts already exist (for retry: pass existing to generator)
-        3. Set generation_status="generating" on all artifacts
-        4. Call generator.generate_cascade()
-        5. For each completed artifact: upsert with ON CONFLICT (project_id, artifact_type)
-        6. Filter content by tier before persisting (locked decision)
-        7. Set generation_status="idle" on completed, "failed" on failed
-        8. Return artifact IDs and failed types
+        3. Call generator.generate_cascade() with no DB session held across LLM calls
+        4. As each artifact completes: filter by tier (locked decision) and upsert it in its
+           own short session, so it is visible before the rest of the cascade finishes
+        5. Set generation_status="failed" on failed artifacts
+        6. Sync to the strategy graph and return artifact IDs and failed types
 
         Args:
             project_id: Project UUID
@@ -96,65 +96,32 @@ class ArtifactService:
                     artifact_type = ArtifactType(artifact_row.artifact_type)
                     existing_artifacts[artifact_type] = artifact_row.current_content
 
-            # Inject tier into onboarding_data so it reaches generate_artifacts
-            onboarding_data_with_tier = {**onboarding_data, "_tier": tier}
+        # Inject tier into onboarding_data so it reaches generate_artifacts
+        onboarding_data_with_tier = {**onboarding_data, "_tier": tier}
 
-            # Generate cascade
-            completed, failed = await self.generator.generate_cascade(
-                onboarding_data=onboarding_data_with_tier,
-                existing_artifacts=existing_artifacts if existing_artifacts else None,
-            )
-
-            # Persist completed artifacts
-            artifact_ids = []
-            for artifact_type, content in completed.items():
-                # Filter by tier before persisting
-                filtered_content = self.generator.filter_by_tier(
-                    tier=tier, artifact_type=artifact_type, content=content
-                )
+        async def persist(artifact_type: ArtifactType, content: dict) -> None:
+            await self._upsert_generated(project_id, artifact_type, content, tier)
 
-                # Upsert artifact (ON CONFLICT DO UPDATE pattern)
-                result = await session.execute(
-                    select(Artifact).where(
-                        Artifact.project_id == project_id,
-                        Artifact.artifact_type == artifact_type.value,
-                    )
-                )
-                artifact = result.scalar_one_or_none()
+        # Generate cascade, persisting each artifact as it completes
+        completed, failed = await self.generator.generate_cascade(
+            onboarding_data=onboarding_data_with_tier,
+            existing_artifacts=existing_artifacts if existing_artifacts else None,
+            on_complete=persist,
+        )
 
-                if artifact is None:
-                    # Create new artifact
-                    artifact = Artifact(
-                        project_id=project_id,
-                        artifact_type=artifact_type.value,
-                        current_content=filtered_content,
-                        version_number=1,
-                        schema_version=filtered_content.get("_schema_version", 1),
-                        generation_status="idle",
-                        has_user_edits=False,
-                    )
-                    session.add(artifact)
-                else:
-                    # Update existing (shouldn't happen in normal flow, but handles retry)
-                    artifact.current_content = filtered_content
-                    artifact.generation_status = "idle"
-                    flag_modified(artifact, "current_content")
+        async with self.session_factory() as session:
+            result = await session.execute(select(Artifact).where(Artifact.project_id == project_id))
+            rows = {ArtifactType(row.artifact_type): row for row in result.scalars().all()}
 
-                await session.flush()
-                artifact_ids.append(artifact.id)
+            # Existing artifacts reused by a retry count as completed again
+            for artifact_type in existing_artifacts:
+                if artifact_type in completed and artifact_type in rows:
+                    rows[artifact_type].generation_status = "idle"
 
             # Mark failed artifacts (create with generation_status="failed")
             for failed_type_str in failed:
                 failed_type = ArtifactType(failed_type_str)
-                # Only create if doesn't already exist
-                result = await session.execute(
-                    select(Artifact).where(
-                        Artifact.project_id == project_id,
-                        Artifact.artifact_type == failed_type.value,
-                    )
-                )
-                artifact = result.scalar_one_or_none()
-
+                artifact = rows.get(failed_type)
                 if artifact is None:
                     artifact = Artifact(
                         project_id=project_id,
@@ -170,38 +137,60 @@ class ArtifactService:
                     artifact.generation_status = "failed"
 
             await session.commit()
+            await invalidate_dashboard(project_id)
+
+            artifact_ids = [rows[at].id for at in GENERATION_ORDER if at in completed and at in rows]
 
             # Sync completed artifacts to Neo4j strategy graph (non-fatal)
             graph_service = GraphService(get_strategy_graph())
-            for artifact_type, content in completed.items():
-                result = await session.execute(
-                    select(Artifact).where(
-                        Artifact.project_id == project_id,
-                        Artifact.artifact_type == artifact_type.value,
-                    )
-                )
-                artifact = result.scalar_one_or_none()
+            for artifact_type in completed:
+                artifact = rows.get(artifact_type)
                 if artifact:
                     await graph_service.sync_artifact_to_graph(artifact, str(project_id))
 
             # Create edges: each artifact FOLLOWS the previous in generation order
-            synced_ids = []
-            for at in GENERATION_ORDER:
-                result = await session.execute(
-                    select(Artifact).where(
-                        Artifact.project_id == project_id,
-                        Artifact.artifact_type == at.value,
-                    )
-                )
-                artifact = result.scalar_one_or_none()
-                if artifact and artifact.generation_status == "idle":
-                    synced_ids.append(str(artifact.id))
-
+            synced_ids = [
+                str(rows[at].id) for at in GENERATION_ORDER if at in rows and rows[at].generation_status == "idle"
+            ]
             for i in range(1, len(synced_ids)):
                 await graph_service.create_decision_edge(synced_ids[i - 1], synced_ids[i], "LEADS_TO")
 
             return (artifact_ids, failed)
 
+    async def _upsert_generated(self, project_id: UUID, artifact_type: ArtifactType, content: dict, tier: str) -> None:
+        """Filter a freshly generated artifact by tier and upsert it in its own session."""
+        filtered_content = self.generator.filter_by_tier(tier=tier, artifact_type=artifact_type, content=content)
+
+        async with self.session_factory() as session:
+            result = await session.execute(
+                select(Artifact).where(
+                    Artifact.project_id == project_id,
+                    Artifact.artifact_type == artifact_type.value,
+                )
+            )
+            artifact = result.scalar_one_or_none()
+
+            if artifact is None:
+                # Create new artifact
+                artifact = Artifact(
+                    project_id=project_id,
+                    artifact_type=artifact_type.value,
+                    current_content=filtered_content,
+                    version_number=1,
+                    schema_version=filtered_content.get("_schema_version", 1),
+                    generation_status="idle",
+                    has_user_edits=False,
+                )
+                session.add(artifact)
+            else:
+                # Update existing (a row marked failed by an earlier attempt)
+                artifact.current_content = filtered_content
+                artifact.generation_status = "idle"
+                flag_modified(artifact, "current_content")
+
+            await session.commit()
+        await invalidate_dashboard(project_id)
+
     async def get_artifact(self, artifact_id: UUID, user_id: str) -> Artifact | None:
         """Get artifact by ID with user isolation via project ownership.
 
@@ -327,6 +316,7 @@ class ArtifactService:
                 artifact_type=artifact_type,
                 onboarding_data=onboarding_data,
                 prior_artifacts=prior_artifacts if prior_artifacts else None,
+                regenerate=True,
             )
 
             # Filter by tier
@@ -347,6 +337,7 @@ class ArtifactService:
 
             await session.commit()
             await session.refresh(artifact)
+            await invalidate_dashboard(artifact.project_id)
 
             return (artifact, had_edits)
 
@@ -408,6 +399,7 @@ class ArtifactService:
 
             await session.commit()
             await session.refresh(artifact)
+            await invalidate_dashboard(artifact.project_id)
 
             return artifact
 
@@ -464,6 +456,7 @@ class ArtifactService:
 
             await session.commit()
             await session.refresh(artifact)
+            await invalidate_dashboard(artifact.project_id)
 
             return artifact
 
@@ -24,6 +24,7 @@ from app.db.models.job import Job
 from app.db.models.project import Project
 from app.domain.alignment import compute_alignment_score
 from app.queue.schemas import TIER_ITERATION_DEPTH
+from app.services.dashboard_cache import invalidate_dashboard
 
 logger = structlog.get_logger(__name__)
 
@@ -146,6 +147,7 @@ class ChangeRequestService:
             session.add(artifact)
             await session.commit()
             await session.refresh(artifact)
+            await invalidate_dashboard(project_uuid)
 
             # 9. Return the artifact content + id
             return {
@@ -0,0 +1,66 @@
+"""Per-project Redis snapshot of the dashboard's database reads.
+
+The frontend polls GET /api/dashboard/{project_id}, and between writes every
+poll would rebuild the same project state from Postgres. DashboardService stores
+that state (everything except the per-user LLM usage risk) under
+cofounder:dashboard:{project_id} for DASHBOARD_CACHE_TTL_SECONDS (0 disables).
+
+Write paths that change what the dashboard shows call invalidate_dashboard()
+after committing: artifact writes, gate creation and decisions, job persistence,
+stage transitions and milestone updates. The TTL bounds staleness from anything
+else. Redis errors are logged and treated as misses.
+"""
+
+import json
+from uuid import UUID
+
+import structlog
+
+from app.core.config import get_settings
+
+logger = structlog.get_logger(__name__)
+
+KEY_PREFIX = "cofounder:dashboard:"
+
+
+def dashboard_key(project_id: UUID | str) -> str:
+    return f"{KEY_PREFIX}{project_id}"
+
+
+async def get_dashboard_snapshot(project_id: UUID | str) -> dict | None:
+    """Cached snapshot for project_id, or None on a miss or when the cache is disabled."""
+    if get_settings().dashboard_cache_ttl_seconds <= 0:
+        return None
+    try:
+        from app.db.redis import get_redis
+
+        raw = await get_redis().get(dashboard_key(project_id))
+    except Exception as e:
+        logger.warning("dashboard_cache_get_failed", project_id=str(project_id), error=str(e))
+        return None
+    return json.loads(raw) if raw is not None else None
+
+
+async def store_dashboard_snapshot(project_id: UUID | str, snapshot: dict) -> None:
+    """Store snapshot with the configured TTL. No-op when the cache is disabled."""
+    ttl = get_settings().dashboard_cache_ttl_seconds
+    if ttl <= 0:
+        return
+    try:
+        from app.db.redis import get_redis
+
+        await get_redis().set(dashboard_key(project_id), json.dumps(snapshot), ex=ttl)
+    except Exception as e:
+        logger.warning("dashboard_cache_set_failed", project_id=str(project_id), error=str(e))
+
+
+async def invalidate_dashboard(project_id: UUID | str | None) -> None:
+    """Drop the cached snapshot for project_id. Never raises."""
+    if project_id is None or get_settings().dashboard_cache_ttl_seconds <= 0:
+        return
+    try:
+        from app.db.redis import get_redis
+
+        await get_redis().delete(dashboard_key(project_id))
+    except Exception as e:
+        logger.warning("dashboard_cache_invalidate_failed", project_id=str(project_id), error=str(e))
@@ -1,12 +1,13 @@
 """DashboardService: Aggregates state machine, artifacts, and build status.
 
 Orchestrates domain functions with database queries to provide full dashboard view.
+The project's state is read in two queries and cached per project in Redis.
 """
 
 from datetime import UTC, datetime
 from uuid import UUID
 
-from sqlalchemy import and_, func, select
+from sqlalchemy import Boolean, Integer, and_, cast, func, literal, null, select, true, union_all
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.models.artifact import Artifact
@@ -22,6 +23,7 @@ from app.schemas.dashboard import (
     PendingDecision,
     RiskFlagResponse,
 )
+from app.services.dashboard_cache import get_dashboard_snapshot, store_dashboard_snapshot
 
 # Stage name mapping
 STAGE_NAMES = {
@@ -64,170 +66,186 @@ class DashboardService:
         - Decision gates (pending only)
         - Risk flags (from domain functions)
         - Suggested focus (deterministic priority)
+
+        Project state comes from a per-project Redis snapshot when one is cached
+        (see dashboard_cache); LLM usage risk is per user and always read live.
+        """
+        snapshot = await get_dashboard_snapshot(project_id)
+        if snapshot is not None:
+            if snapshot["clerk_user_id"] != user_id:
+                return None  # 404 pattern
+            dashboard = DashboardResponse.model_validate(snapshot["dashboard"])
+        else:
+            dashboard = await self._load_project_dashboard(session, project_id, user_id)
+            if dashboard is None:
+                return None  # 404 pattern
+            await store_dashboard_snapshot(
+                project_id, {"clerk_user_id": user_id, "dashboard": dashboard.model_dump(mode="json")}
+            )
+
+        # Detect LLM risks and combine with system risks
+        llm_risks = await detect_llm_risks(user_id, session)
+        dashboard.risk_flags = dashboard.risk_flags + [
+            RiskFlagResponse(type=r["type"], rule=r["rule"], message=r["message"]) for r in llm_risks
+        ]
+
+        # Compute suggested focus
+        dashboard.suggested_focus = self._compute_suggested_focus(
+            pending_decisions=dashboard.pending_decisions,
+            artifacts=dashboard.artifacts,
+            risk_flags=dashboard.risk_flags,
+        )
+        return dashboard
+
+    async def _load_project_dashboard(
+        self, session: AsyncSession, project_id: UUID, user_id: str
+    ) -> DashboardResponse | None:
+        """Build the project part of the dashboard (system risks only) in two queries.
+
+        1. The project with its current stage's milestones, the last gate decision,
+           the failed-job count, the latest ready build and the in-flight job status
+           (outer join, correlated scalar subqueries and a LATERAL subquery).
+        2. Artifact summaries and pending gates (UNION ALL).
         """
-        # Load project with user isolation
+        last_decision_at = (
+            select(func.max(DecisionGate.decided_at))
+            .where(DecisionGate.project_id == Project.id, DecisionGate.status == "decided")
+            .scalar_subquery()
+        )
+        failed_job_count = (
+            select(func.count(Job.id)).where(Job.project_id == Project.id, Job.status == "failed").scalar_subquery()
+        )
+        # Latest job without a build_version: running or failed
+        in_flight_status = (
+            select(Job.status)
+            .where(Job.project_id == Project.id, Job.build_version.is_(None))
+            .order_by(Job.created_at.desc())
+            .limit(1)
+            .scalar_subquery()
+        )
+        # Latest READY job with build_version for dynamic product_version (MVPS-02)
+        latest_build = (
+            select(Job.build_version, Job.preview_url)
+            .where(Job.project_id == Project.id, Job.status == "ready", Job.build_version.isnot(None))
+            .order_by(Job.created_at.desc())
+            .limit(1)
+            .lateral("latest_build")
+        )
         result = await session.execute(
-            select(Project).where(
+            select(
+                Project,
+                StageConfig.milestones,
+                last_decision_at,
+                failed_job_count,
+                latest_build.c.build_version,
+                latest_build.c.preview_url,
+                in_flight_status,
+            )
+            .outerjoin(
+                StageConfig,
+                and_(
+                    StageConfig.project_id == Project.id,
+                    StageConfig.stage_number == func.coalesce(Project.stage_number, 0),
+                ),
+            )
+            .outerjoin(latest_build, true())
+            .where(
                 Project.id == project_id,
                 Project.clerk_user_id == user_id,
             )
         )
-        project = result.scalar_one_or_none()
+        row = result.one_or_none()
 
-        if project is None:
+        if row is None:
             return None  # 404 pattern
 
-        # Load stage config for current stage
+        project, milestones, last_gate_decision_at, build_failure_count, build_version, preview_url, in_flight = row
         stage_number = project.stage_number if project.stage_number is not None else 0
-        result = await session.execute(
-            select(StageConfig).where(
-                StageConfig.project_id == project_id,
-                StageConfig.stage_number == stage_number,
-            )
-        )
-        stage_config = result.scalar_one_or_none()
 
         # Compute progress from domain function
-        mvp_completion_percent = 0
-        if stage_config and stage_config.milestones:
-            mvp_completion_percent = compute_stage_progress(stage_config.milestones)
+        mvp_completion_percent = compute_stage_progress(milestones) if milestones else 0
 
         # Get next milestone
-        next_milestone = self._get_next_milestone(stage_config)
-
-        # Load artifacts
-        result = await session.execute(select(Artifact).where(Artifact.project_id == project_id))
-        artifacts_rows = result.scalars().all()
-
-        artifacts = [
-            ArtifactSummary(
-                id=str(artifact.id),
-                artifact_type=artifact.artifact_type,
-                generation_status=artifact.generation_status,
-                version_number=artifact.version_number,
-                has_user_edits=artifact.has_user_edits,
-                updated_at=artifact.updated_at,
-            )
-            for artifact in artifacts_rows
-        ]
-
-        # Load pending decision gates
-        result = await session.execute(
-            select(DecisionGate)
-            .where(
-                DecisionGate.project_id == project_id,
-                DecisionGate.status == "pending",
-            )
-            .order_by(DecisionGate.created_at.asc())
-        )
-        gates_rows = result.scalars().all()
-
-        pending_decisions = [
-            PendingDecision(
-                id=str(gate.id),
-                gate_type=gate.gate_type,
-                status=gate.status,
-                created_at=gate.created_at,
-            )
-            for gate in gates_rows
-        ]
-
-        # Detect risks using domain function
-        result = await session.execute(
-            select(DecisionGate)
-            .where(
-                DecisionGate.project_id == project_id,
-                DecisionGate.status == "decided",
-            )
-            .order_by(DecisionGate.decided_at.desc())
-            .limit(1)
+        next_milestone = self._get_next_milestone(milestones)
+
+        # Load artifact summaries and pending decision gates (oldest first)
+        artifact_rows = select(
+            literal("artifact").label("kind"),
+            Artifact.id,
+            Artifact.artifact_type.label("type"),
+            Artifact.generation_status.label("status"),
+            Artifact.version_number,
+            Artifact.has_user_edits,
+            Artifact.updated_at.label("at"),
+        ).where(Artifact.project_id == project_id)
+        gate_rows = select(
+            literal("gate").label("kind"),
+            DecisionGate.id,
+            DecisionGate.gate_type,
+            DecisionGate.status,
+            cast(null(), Integer),
+            cast(null(), Boolean),
+            DecisionGate.created_at,
+        ).where(
+            DecisionGate.project_id == project_id,
+            DecisionGate.status == "pending",
         )
-        last_gate = result.scalar_one_or_none()
-        last_gate_decision_at = last_gate.decided_at if last_gate else None
-
-        # Count failed jobs for this project
-        failed_jobs_result = await session.execute(
-            select(func.count(Job.id)).where(
-                and_(
-                    Job.project_id == project_id,
-                    Job.status == "failed",
+        union = union_all(artifact_rows, gate_rows).subquery()
+        result = await session.execute(select(union).order_by(union.c.kind, union.c.at.asc()))
+
+        artifacts: list[ArtifactSummary] = []
+        pending_decisions: list[PendingDecision] = []
+        for item in result.all():
+            if item.kind == "artifact":
+                artifacts.append(
+                    ArtifactSummary(
+                        id=str(item.id),
+                        artifact_type=item.type,
+                        generation_status=item.status,
+                        version_number=item.version_number,
+                        has_user_edits=item.has_user_edits,
+                        updated_at=item.at,
+                    )
+                )
+            else:
+                pending_decisions.append(
+                    PendingDecision(id=str(item.id), gate_type=item.type, status=item.status, created_at=item.at)
                 )
-            )
-        )
-        build_failure_count = failed_jobs_result.scalar() or 0
 
+        # Detect risks using domain function
         risks = detect_system_risks(
             last_gate_decision_at=last_gate_decision_at,
-            build_failure_count=build_failure_count,
+            build_failure_count=build_failure_count or 0,
             last_activity_at=project.updated_at,
             now=datetime.now(UTC),
         )
-
-        # Detect LLM risks
-        llm_risks = await detect_llm_risks(user_id, session)
-
-        # Combine system + LLM risks
-        all_risks = risks + [{"type": r["type"], "rule": r["rule"], "message": r["message"]} for r in llm_risks]
-
         risk_flags = [
             RiskFlagResponse(
                 type=risk["type"],
                 rule=risk["rule"],
                 message=risk["message"],
             )
-            for risk in all_risks
+            for risk in risks
         ]
 
-        # Compute suggested focus
-        suggested_focus = self._compute_suggested_focus(
-            pending_decisions=pending_decisions,
-            artifacts=artifacts,
-            risk_flags=risk_flags,
-        )
-
         # Stage name
         stage_name = STAGE_NAMES.get(stage_number, f"Stage {stage_number}")
 
-        # Query latest READY job with build_version for dynamic product_version (MVPS-02)
-        result = await session.execute(
-            select(Job)
-            .where(
-                Job.project_id == project_id,
-                Job.status == "ready",
-                Job.build_version.isnot(None),
-            )
-            .order_by(Job.created_at.desc())
-            .limit(1)
-        )
-        latest_build = result.scalar_one_or_none()
-
-        if latest_build and latest_build.build_version:
+        if build_version:
             # "build_v0_1" -> "v0.1", "build_v0_2" -> "v0.2"
-            parts = latest_build.build_version.replace("build_v", "").split("_")
+            parts = build_version.replace("build_v", "").split("_")
             product_version = f"v{parts[0]}.{parts[1]}"
             latest_build_status = "success"
-            preview_url = latest_build.preview_url
         else:
             product_version = "v0.0"
             latest_build_status = None
             preview_url = None
 
-        # Check for a running or failed job (latest job without a build_version)
-        result = await session.execute(
-            select(Job)
-            .where(
-                Job.project_id == project_id,
-                Job.build_version.is_(None),
-            )
-            .order_by(Job.created_at.desc())
-            .limit(1)
-        )
-        in_flight_job = result.scalar_one_or_none()
-        if in_flight_job:
-            if in_flight_job.status == "failed":
-                latest_build_status = "failed"
-            elif in_flight_job.status not in ("ready", "failed"):
-                latest_build_status = "running"
+        # A running or failed job supersedes the last successful build's status
+        if in_flight == "failed":
+            latest_build_status = "failed"
+        elif in_flight is not None and in_flight != "ready":
+            latest_build_status = "running"
 
         return DashboardResponse(
             project_id=str(project_id),
@@ -237,27 +255,27 @@ class DashboardService:
             mvp_completion_percent=mvp_completion_percent,
             next_milestone=next_milestone,
             risk_flags=risk_flags,
-            suggested_focus=suggested_focus,
+            suggested_focus=self._compute_suggested_focus(pending_decisions, artifacts, risk_flags),
             artifacts=artifacts,
             pending_decisions=pending_decisions,
             latest_build_status=latest_build_status,
             preview_url=preview_url,
         )
 
-    def _get_next_milestone(self, stage_config: StageConfig | None) -> str | None:
+    def _get_next_milestone(self, milestones: dict | None) -> str | None:
         """Get next uncompleted milestone name.
 
         Args:
-            stage_config: StageConfig for current stage
+            milestones: StageConfig.milestones for the current stage
 
         Returns:
             Milestone name or None if all completed or no milestones
         """
-        if stage_config is None or not stage_config.milestones:
+        if not milestones:
             return None
 
         # Find first uncompleted milestone (preserving order)
-        for milestone_key, milestone_data in stage_config.milestones.items():
+        for milestone_key, milestone_data in milestones.items():
             if not milestone_data.get("completed", False):
                 return milestone_data.get("name", milestone_key)
 
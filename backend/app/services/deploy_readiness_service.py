@@ -22,6 +22,7 @@ from app.domain.deploy_checks import (
     run_deploy_checks,
 )
 from app.queue.schemas import JobStatus
+from app.sandbox.snapshot_store import get_snapshot_store, load_snapshot
 
 logger = structlog.get_logger(__name__)
 
@@ -147,12 +148,12 @@ class DeployReadinessService:
             }
 
         # 4. Get workspace files
-        # Reconstruct workspace from Job metadata. The Runner always produces README.md,
-        # .env.example, Procfile, and requirements.txt alongside application source code.
-        # Since the Job model doesn't store file content (only sandbox_id + build_version),
-        # we use a representative workspace that matches the Runner's deterministic output.
-        # Real workspace file scanning is a future enhancement (when E2B persists files).
-        working_files = _reconstruct_workspace_for_checks(latest_job)
+        # The build's workspace snapshot holds the real generated files. Builds from before
+        # snapshots (or with the store disabled) fall back to a representative workspace
+        # reconstructed from Job metadata.
+        working_files = await _load_build_files(project_id, latest_job)
+        if working_files is None:
+            working_files = _reconstruct_workspace_for_checks(latest_job)
 
         # 5. Run domain-level deploy checks
         checks = run_deploy_checks(working_files)
@@ -190,11 +191,24 @@ class DeployReadinessService:
         }
 
 
+async def _load_build_files(project_id: str, job: Job) -> dict[str, str] | None:
+    """Real files of the job's build from the workspace snapshot store, or None if unavailable."""
+    store = get_snapshot_store()
+    if store is None or not job.build_version:
+        return None
+    try:
+        return await load_snapshot(store, project_id, job.build_version)
+    except Exception:
+        logger.warning("workspace_snapshot_load_failed", project_id=project_id, exc_info=True)
+        return None
+
+
 def _reconstruct_workspace_for_checks(job: Job) -> dict[str, str]:
     """Reconstruct a representative workspace dict from Job metadata.
 
-    Since the Job model doesn't store file content (only sandbox_id + build_version),
-    we synthesize minimal workspace files based on what the generation pipeline produces.
+    Fallback for builds without a workspace snapshot: the Job model doesn't store
+    file content (only sandbox_id + build_version), so we synthesize minimal
+    workspace files based on what the generation pipeline produces.
 
     For a completed build (READY status), the Runner always generates:
     - Application source code (Python/FastAPI)
@@ -204,7 +218,7 @@ def _reconstruct_workspace_for_checks(job: Job) -> dict[str, str]:
     - requirements.txt with dependencies
 
     This approach satisfies DEPL-01 for the MVP without requiring E2B reconnection.
-    Real workspace file scanning is a future enhancement (when E2B persists files).
+    Real files come from the workspace snapshot store when the build has a snapshot.
 
     Args:
         job: Completed Job record with READY status
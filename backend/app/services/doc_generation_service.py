@@ -1,7 +1,7 @@
 """DocGenerationService — Claude-powered documentation generation.
 
 Architecture:
-- Direct anthropic.AsyncAnthropic call with claude-3-5-haiku-20241022 (NOT LangChain)
+- Direct anthropic.AsyncAnthropic call (shared client, app.core.llm_clients) with claude-3-5-haiku-20241022 (NOT LangChain)
 - asyncio.wait_for(timeout=30.0) wraps the API call
 - One retry with 2.5s backoff on RateLimitError, APITimeoutError, asyncio.TimeoutError
 - Four sections written progressively to job:{id}:docs Redis hash
@@ -17,11 +17,11 @@ import asyncio
 import json
 import re
 
-import anthropic
 import structlog
 
 from app.agent.llm_helpers import _strip_json_fences
 from app.core.config import get_settings
+from app.core.llm_clients import get_anthropic_client, llm_role
 from app.queue.state_machine import JobStateMachine, SSEEventType
 
 logger = structlog.get_logger(__name__)
@@ -186,20 +186,19 @@ class DocGenerationService:
         """
         from anthropic._exceptions import APITimeoutError, RateLimitError
 
-        settings = get_settings()
-
         for attempt in range(2):
             try:
-                client = anthropic.AsyncAnthropic(api_key=settings.anthropic_api_key)
-                response = await asyncio.wait_for(
-                    client.messages.create(
-                        model=DOC_GEN_MODEL,
-                        max_tokens=DOC_GEN_MAX_TOKENS,
-                        system=system,
-                        messages=messages,
-                    ),
-                    timeout=DOC_GEN_TIMEOUT_SECONDS,
-                )
+                client = get_anthropic_client()
+                with llm_role("docs"):
+                    response = await asyncio.wait_for(
+                        client.messages.create(
+                            model=DOC_GEN_MODEL,
+                            max_tokens=DOC_GEN_MAX_TOKENS,
+                            system=system,
+                            messages=messages,
+                        ),
+                        timeout=DOC_GEN_TIMEOUT_SECONDS,
+                    )
                 raw_text: str = response.content[0].text
                 return json.loads(_strip_json_fences(raw_text))
 
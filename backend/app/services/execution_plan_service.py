@@ -9,17 +9,20 @@ from datetime import UTC, datetime
 
 from fastapi import HTTPException
 from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app.agent.runner import Runner
 from app.db.models.artifact import Artifact
 from app.db.models.project import Project
+from app.db.optimistic import update_if_unchanged
 from app.schemas.artifacts import ArtifactType
 from app.schemas.execution_plans import (
     ExecutionOption,
     GeneratePlansResponse,
     SelectPlanResponse,
 )
+from app.services.dashboard_cache import invalidate_dashboard
 from app.services.gate_service import GateService
 
 
@@ -41,7 +44,7 @@ class ExecutionPlanService:
         self.session_factory = session_factory
 
     async def generate_options(
-        self, clerk_user_id: str, project_id: str, feedback: str | None = None
+        self, clerk_user_id: str, project_id: str, feedback: str | None = None, regenerate: bool = False
     ) -> GeneratePlansResponse:
         """Generate execution plan options for a project.
 
@@ -49,17 +52,19 @@ class ExecutionPlanService:
             clerk_user_id: Clerk user ID for ownership check
             project_id: UUID string of the project
             feedback: Optional feedback on previous options (for regeneration)
+            regenerate: User asked for fresh options; bypasses the runner's response cache
 
         Returns:
             GeneratePlansResponse with 2-3 options and recommended option ID
 
         Raises:
             HTTPException(404): Project not found or not owned by user
-            HTTPException(409): Decision Gate 1 not resolved or resolved as non-proceed
+            HTTPException(409): Decision Gate 1 not resolved or resolved as non-proceed,
+                or the plan artifact changed while options were being generated
         """
+        project_uuid = uuid.UUID(project_id)
         async with self.session_factory() as session:
             # Verify project ownership
-            project_uuid = uuid.UUID(project_id)
             result = await session.execute(
                 select(Project).where(Project.id == project_uuid, Project.clerk_user_id == clerk_user_id)
             )
@@ -67,15 +72,16 @@ class ExecutionPlanService:
             if not project:
                 raise HTTPException(status_code=404, detail="Project not found")
 
-            # Check gate blocking via GateService
-            gate_service = GateService(self.runner, self.session_factory)
-            is_blocking = await gate_service.check_gate_blocking(project_id)
-            if is_blocking:
-                raise HTTPException(
-                    status_code=409,
-                    detail="Decision Gate 1 must be resolved before generating execution plans",
-                )
+        # Check gate blocking via GateService (opens its own session)
+        gate_service = GateService(self.runner, self.session_factory)
+        is_blocking = await gate_service.check_gate_blocking(project_id)
+        if is_blocking:
+            raise HTTPException(
+                status_code=409,
+                detail="Decision Gate 1 must be resolved before generating execution plans",
+            )
 
+        async with self.session_factory() as session:
             # Check that gate was resolved with "proceed" decision
             # (Load the latest decided gate and verify decision == "proceed")
             from app.db.models.decision_gate import DecisionGate
@@ -110,27 +116,7 @@ class ExecutionPlanService:
                     detail="Idea Brief not found. Complete understanding interview first.",
                 )
 
-            # Generate options via Runner
-            options_data = await self.runner.generate_execution_options(brief_artifact.current_content, feedback)
-
-            # Store plan set as Artifact
-            plan_set_id = str(uuid.uuid4())
-            execution_plan_artifact = Artifact(
-                project_id=project_uuid,
-                artifact_type=ArtifactType.EXECUTION_PLAN,
-                current_content={
-                    "_schema_version": 1,
-                    "plan_set_id": plan_set_id,
-                    "options": options_data["options"],
-                    "recommended_id": options_data["recommended_id"],
-                    "generated_at": datetime.now(UTC).isoformat(),
-                    "feedback_context": feedback,
-                },
-                version_number=1,
-                generation_status="idle",
-            )
-
-            # Check if execution plan artifact already exists
+            # Check if execution plan artifact already exists (its version guards the write below)
             result = await session.execute(
                 select(Artifact).where(
                     Artifact.project_id == project_uuid,
@@ -138,24 +124,68 @@ class ExecutionPlanService:
                 )
             )
             existing_plan = result.scalar_one_or_none()
+
+        # Generate options via Runner — no session (and no pooled connection) held across the LLM call
+        brief = brief_artifact.current_content
+        if regenerate:
+            brief = {**brief, "_regenerate": True}
+        options_data = await self.runner.generate_execution_options(brief, feedback)
+
+        plan_set_id = str(uuid.uuid4())
+        plan_content = {
+            "_schema_version": 1,
+            "plan_set_id": plan_set_id,
+            "options": options_data["options"],
+            "recommended_id": options_data["recommended_id"],
+            "generated_at": datetime.now(UTC).isoformat(),
+            "feedback_context": feedback,
+        }
+
+        # Store plan set as Artifact
+        async with self.session_factory() as session:
             if existing_plan:
-                # Version rotate
-                existing_plan.previous_content = existing_plan.current_content
-                existing_plan.current_content = execution_plan_artifact.current_content
-                existing_plan.version_number += 1
-                existing_plan.updated_at = datetime.now(UTC)
-                await session.commit()
+                # Version rotate, unless the plan changed while options were generated
+                stored = await update_if_unchanged(
+                    session,
+                    Artifact,
+                    existing_plan.id,
+                    Artifact.version_number,
+                    existing_plan.version_number,
+                    previous_content=existing_plan.current_content,
+                    current_content=plan_content,
+                    version_number=existing_plan.version_number + 1,
+                    updated_at=datetime.now(UTC),
+                )
             else:
                 # Create new
-                session.add(execution_plan_artifact)
+                session.add(
+                    Artifact(
+                        project_id=project_uuid,
+                        artifact_type=ArtifactType.EXECUTION_PLAN,
+                        current_content=plan_content,
+                        version_number=1,
+                        generation_status="idle",
+                    )
+                )
+                stored = True
+            try:
                 await session.commit()
+            except IntegrityError:
+                # Another request created the plan artifact first
+                stored = False
+            if not stored:
+                raise HTTPException(
+                    status_code=409,
+                    detail="Execution plans were updated by another request. Reload and try again.",
+                )
+        await invalidate_dashboard(project_uuid)
 
-            return GeneratePlansResponse(
-                plan_set_id=plan_set_id,
-                options=[ExecutionOption(**opt) for opt in options_data["options"]],
-                recommended_id=options_data["recommended_id"],
-                generated_at=datetime.now(UTC).isoformat(),
-            )
+        return GeneratePlansResponse(
+            plan_set_id=plan_set_id,
+            options=[ExecutionOption(**opt) for opt in options_data["options"]],
+            recommended_id=options_data["recommended_id"],
+            generated_at=datetime.now(UTC).isoformat(),
+        )
 
     async def select_option(self, clerk_user_id: str, project_id: str, option_id: str) -> SelectPlanResponse:
         """Select an execution plan option.
@@ -214,6 +244,7 @@ class ExecutionPlanService:
             plan_artifact.current_content = updated_content
             plan_artifact.updated_at = datetime.now(UTC)
             await session.commit()
+            await invalidate_dashboard(plan_artifact.project_id)
 
             return SelectPlanResponse(
                 selected_option=ExecutionOption(**selected_option),
@@ -311,4 +342,4 @@ class ExecutionPlanService:
             HTTPException(409): Decision Gate 1 not resolved
         """
         # Regeneration is the same as generation with feedback
-        return await self.generate_options(clerk_user_id, project_id, feedback)
+        return await self.generate_options(clerk_user_id, project_id, feedback, regenerate=True)
@@ -1,6 +1,7 @@
 """GateService — orchestrates decision gate lifecycle with domain logic."""
 
 import uuid
+from dataclasses import dataclass, field
 from datetime import UTC, datetime
 
 import structlog
@@ -15,6 +16,7 @@ from app.db.models.decision_gate import DecisionGate
 from app.db.models.onboarding_session import OnboardingSession
 from app.db.models.project import Project
 from app.db.models.understanding_session import UnderstandingSession
+from app.db.optimistic import update_if_unchanged
 from app.schemas.decision_gates import (
     GATE_1_OPTIONS,
     GATE_2_OPTIONS,
@@ -28,6 +30,18 @@ from app.services.journey import JourneyService
 logger = structlog.get_logger(__name__)
 
 
+@dataclass
+class _BriefRewrite:
+    """Idea Brief state read before a narrow/pivot regeneration (brief_id None: no brief yet)."""
+
+    brief_id: uuid.UUID | None = None
+    version_number: int = 0
+    current_content: dict | None = None
+    idea: str = ""
+    questions: list = field(default_factory=list)
+    answers: dict = field(default_factory=dict)
+
+
 class GateService:
     """Service layer for decision gate operations.
 
@@ -143,7 +157,8 @@ class GateService:
 
         Raises:
             HTTPException(404): Gate not found or not owned by user
-            HTTPException(409): Gate already decided
+            HTTPException(409): Gate already decided, or the Idea Brief changed during a
+                narrow/pivot regeneration
             HTTPException(422): Missing required action_text for narrow/pivot
         """
         async with self.session_factory() as session:
@@ -173,47 +188,62 @@ class GateService:
                     detail=f"action_text is required for {decision} decision",
                 )
 
-            # Resolve gate via JourneyService
+            if gate.gate_type != "solidification" and decision in ("narrow", "pivot"):
+                rewrite = await self._load_brief_rewrite(session, project, decision, action_text)
+            else:
+                return await self._decide(session, gate, project, decision, action_text, park_note)
+
+        # Narrow/pivot regenerate the Idea Brief via Runner. No session is held across the LLM
+        # call; the new brief and the gate decision are then committed in one short transaction.
+        new_brief_content = None
+        if rewrite.brief_id is not None:
+            new_brief_content = await self.runner.generate_idea_brief(
+                idea=rewrite.idea, questions=rewrite.questions, answers=rewrite.answers
+            )
+
+        async with self.session_factory() as session:
+            result = await session.execute(select(DecisionGate).where(DecisionGate.id == gate_uuid))
+            gate = result.scalar_one()
+            if gate.status != "pending":
+                raise HTTPException(status_code=409, detail=f"Gate already decided (status: {gate.status})")
+
+            if new_brief_content is not None:
+                # Rotate versions, unless the brief was edited while the new one was generated
+                rotated = await update_if_unchanged(
+                    session,
+                    Artifact,
+                    rewrite.brief_id,
+                    Artifact.version_number,
+                    rewrite.version_number,
+                    previous_content=rewrite.current_content,
+                    current_content=new_brief_content,
+                    version_number=rewrite.version_number + 1,
+                    has_user_edits=False,
+                    updated_at=datetime.now(UTC),
+                )
+                if not rotated:
+                    raise HTTPException(
+                        status_code=409,
+                        detail="The Idea Brief changed while it was being regenerated. Please try again.",
+                    )
+
+            # Store action_text in gate context
+            context_key = "narrowing_instruction" if decision == "narrow" else "pivot_description"
+            gate.context = {**(gate.context or {}), context_key: action_text}
+            flag_modified(gate, "context")
+
+            # Resolve gate via JourneyService (commits the gate, its context and the brief together)
             journey_service = JourneyService(session)
             await journey_service.decide_gate(
-                gate_id=gate_uuid, decision=decision, decided_by="founder", reason=action_text or park_note
+                gate_id=gate_uuid, decision=decision, decided_by="founder", reason=action_text
             )
 
-            # Handle decision-specific actions
-            if gate.gate_type == "solidification":
-                # Gate 2: compute alignment score and store in context (SOLD-02)
-                score, creep = await self._compute_gate2_alignment(session, gate.project_id)
-                gate.context = gate.context or {}
-                gate.context["alignment_score"] = score
-                gate.context["scope_creep_detected"] = creep
-                from sqlalchemy.orm.attributes import flag_modified
-
-                flag_modified(gate, "context")
-                await session.commit()
-
-                if decision == "iterate":
-                    resolution_summary = f"Ready to iterate. Alignment: {score}%"
-                    next_action = "Submit your change request"
-                elif decision == "ship":
-                    resolution_summary = "Ready to assess deploy readiness"
-                    next_action = "We'll check your build for deploy readiness"
-                else:  # park
-                    resolution_summary = f"Project parked: {park_note or 'No note provided'}"
-                    next_action = "You can revisit this project anytime from the Parked section"
-            elif decision == "narrow":
-                await self._handle_narrow(session, gate, project, action_text)
+            if decision == "narrow":
                 resolution_summary = "Scope narrowed based on your input"
                 next_action = "Review the updated Idea Brief, then proceed to execution planning"
-            elif decision == "pivot":
-                await self._handle_pivot(session, gate, project, action_text)
+            else:
                 resolution_summary = "New direction set based on your pivot"
                 next_action = "Review the new Idea Brief, then proceed to execution planning"
-            elif decision == "park":
-                resolution_summary = f"Project parked: {park_note or 'No note provided'}"
-                next_action = "You can revisit this project anytime from the Parked section"
-            else:  # proceed
-                resolution_summary = "Ready to proceed to execution planning"
-                next_action = "We'll generate execution plan options for you to choose from"
 
             response = ResolveGateResponse(
                 gate_id=str(gate_uuid),
@@ -224,10 +254,67 @@ class GateService:
             )
 
             # Dual-write to Neo4j strategy graph (non-fatal)
-            await self._sync_to_graph(gate, project.id)
+            await self._sync_to_graph(gate, gate.project_id)
 
             return response
 
+    async def _decide(
+        self,
+        session: AsyncSession,
+        gate: DecisionGate,
+        project: Project,
+        decision: str,
+        action_text: str | None,
+        park_note: str | None,
+    ) -> ResolveGateResponse:
+        """Resolve a gate whose decision needs no LLM call, in the caller's session."""
+        gate_uuid = gate.id
+
+        # Resolve gate via JourneyService
+        journey_service = JourneyService(session)
+        await journey_service.decide_gate(
+            gate_id=gate_uuid, decision=decision, decided_by="founder", reason=action_text or park_note
+        )
+
+        # Handle decision-specific actions
+        if gate.gate_type == "solidification":
+            # Gate 2: compute alignment score and store in context (SOLD-02)
+            score, creep = await self._compute_gate2_alignment(session, gate.project_id)
+            gate.context = gate.context or {}
+            gate.context["alignment_score"] = score
+            gate.context["scope_creep_detected"] = creep
+            flag_modified(gate, "context")
+            await session.commit()
+
+            if decision == "iterate":
+                resolution_summary = f"Ready to iterate. Alignment: {score}%"
+                next_action = "Submit your change request"
+            elif decision == "ship":
+                resolution_summary = "Ready to assess deploy readiness"
+                next_action = "We'll check your build for deploy readiness"
+            else:  # park
+                resolution_summary = f"Project parked: {park_note or 'No note provided'}"
+                next_action = "You can revisit this project anytime from the Parked section"
+        elif decision == "park":
+            resolution_summary = f"Project parked: {park_note or 'No note provided'}"
+            next_action = "You can revisit this project anytime from the Parked section"
+        else:  # proceed
+            resolution_summary = "Ready to proceed to execution planning"
+            next_action = "We'll generate execution plan options for you to choose from"
+
+        response = ResolveGateResponse(
+            gate_id=str(gate_uuid),
+            decision=decision,
+            status="decided",
+            resolution_summary=resolution_summary,
+            next_action=next_action,
+        )
+
+        # Dual-write to Neo4j strategy graph (non-fatal)
+        await self._sync_to_graph(gate, project.id)
+
+        return response
+
     async def _compute_gate2_alignment(self, session: AsyncSession, project_id: uuid.UUID) -> tuple[int, bool]:
         """Compute alignment score for Gate 2 (solidification) using existing artifacts.
 
@@ -275,29 +362,27 @@ class GateService:
         except Exception:
             logger.warning("neo4j_sync_failed", entity="gate", gate_id=str(gate.id), exc_info=True)
 
-    async def _handle_narrow(
-        self, session: AsyncSession, gate: DecisionGate, project: Project, action_text: str
-    ) -> None:
-        """Handle narrow decision: regenerate brief with narrowed scope via Runner.
+    async def _load_brief_rewrite(
+        self, session: AsyncSession, project: Project, decision: str, action_text: str
+    ) -> _BriefRewrite:
+        """Read everything a narrow/pivot Idea Brief regeneration needs.
 
         Args:
             session: SQLAlchemy session
-            gate: DecisionGate being resolved
-            project: Project being narrowed
-            action_text: Narrowing instructions from founder
-        """
-        # Store action_text in gate context
-        gate.context = gate.context or {}
-        gate.context["narrowing_instruction"] = action_text
-        flag_modified(gate, "context")
+            project: Project being narrowed or pivoted
+            decision: "narrow" or "pivot"
+            action_text: Narrowing instructions or pivot description from founder
 
+        Returns:
+            _BriefRewrite; brief_id is None when the project has no Idea Brief to update
+        """
         # Get existing Idea Brief
         result = await session.execute(
             select(Artifact).where(Artifact.project_id == project.id, Artifact.artifact_type == "idea_brief")
         )
         brief_artifact = result.scalar_one_or_none()
         if not brief_artifact:
-            return  # No brief to update
+            return _BriefRewrite()  # No brief to update
 
         # Load OnboardingSession for idea_text context
         onboarding_result = await session.execute(
@@ -317,96 +402,26 @@ class GateService:
         )
         understanding = understanding_result.scalar_one_or_none()
 
-        # Build narrowing context
-        if onboarding:
-            narrowed_idea = f"{onboarding.idea_text}\n\n[NARROWING INSTRUCTION]: {action_text}"
+        if decision == "narrow":
+            # Build narrowing context
+            if onboarding:
+                idea = f"{onboarding.idea_text}\n\n[NARROWING INSTRUCTION]: {action_text}"
+            else:
+                idea = f"{project.name}: {project.description}\n\n[NARROWING INSTRUCTION]: {action_text}"
         else:
-            narrowed_idea = f"{project.name}: {project.description}\n\n[NARROWING INSTRUCTION]: {action_text}"
-
-        questions = understanding.questions if understanding else []
-        answers = understanding.answers if understanding else {}
-
-        # Regenerate full brief with narrowing context via Runner
-        new_brief_content = await self.runner.generate_idea_brief(
-            idea=narrowed_idea, questions=questions, answers=answers
+            # Build pivot context — action_text IS the new direction
+            original_idea = onboarding.idea_text if onboarding else project.name
+            idea = f"[PIVOT — NEW DIRECTION]: {action_text}\n\nOriginal idea: {original_idea}"
+
+        return _BriefRewrite(
+            brief_id=brief_artifact.id,
+            version_number=brief_artifact.version_number,
+            current_content=brief_artifact.current_content,
+            idea=idea,
+            questions=understanding.questions if understanding else [],
+            answers=understanding.answers if understanding else {},
         )
 
-        # Rotate versions
-        brief_artifact.previous_content = brief_artifact.current_content
-        brief_artifact.current_content = new_brief_content
-        flag_modified(brief_artifact, "current_content")
-        flag_modified(brief_artifact, "previous_content")
-        brief_artifact.version_number += 1
-        brief_artifact.has_user_edits = False
-        brief_artifact.updated_at = datetime.now(UTC)
-
-        await session.commit()
-
-    async def _handle_pivot(
-        self, session: AsyncSession, gate: DecisionGate, project: Project, action_text: str
-    ) -> None:
-        """Handle pivot decision: regenerate brief with new direction via Runner.
-
-        Args:
-            session: SQLAlchemy session
-            gate: DecisionGate being resolved
-            project: Project being pivoted
-            action_text: Pivot description from founder
-        """
-        # Store action_text in gate context
-        gate.context = gate.context or {}
-        gate.context["pivot_description"] = action_text
-        flag_modified(gate, "context")
-
-        # Get existing Idea Brief
-        result = await session.execute(
-            select(Artifact).where(Artifact.project_id == project.id, Artifact.artifact_type == "idea_brief")
-        )
-        brief_artifact = result.scalar_one_or_none()
-        if not brief_artifact:
-            return  # No brief to update
-
-        # Load OnboardingSession for original idea context
-        onboarding_result = await session.execute(
-            select(OnboardingSession)
-            .where(OnboardingSession.project_id == project.id)
-            .order_by(OnboardingSession.created_at.desc())
-            .limit(1)
-        )
-        onboarding = onboarding_result.scalar_one_or_none()
-
-        # Load UnderstandingSession for questions/answers context
-        understanding_result = await session.execute(
-            select(UnderstandingSession)
-            .where(UnderstandingSession.project_id == project.id)
-            .order_by(UnderstandingSession.created_at.desc())
-            .limit(1)
-        )
-        understanding = understanding_result.scalar_one_or_none()
-
-        # Build pivot context — action_text IS the new direction
-        original_idea = onboarding.idea_text if onboarding else project.name
-        pivoted_idea = f"[PIVOT — NEW DIRECTION]: {action_text}\n\nOriginal idea: {original_idea}"
-
-        questions = understanding.questions if understanding else []
-        answers = understanding.answers if understanding else {}
-
-        # Regenerate full brief with pivot context via Runner
-        new_brief_content = await self.runner.generate_idea_brief(
-            idea=pivoted_idea, questions=questions, answers=answers
-        )
-
-        # Rotate versions
-        brief_artifact.previous_content = brief_artifact.current_content
-        brief_artifact.current_content = new_brief_content
-        flag_modified(brief_artifact, "current_content")
-        flag_modified(brief_artifact, "previous_content")
-        brief_artifact.version_number += 1
-        brief_artifact.has_user_edits = False
-        brief_artifact.updated_at = datetime.now(UTC)
-
-        await session.commit()
-
     async def get_gate_status(self, clerk_user_id: str, gate_id: str) -> GateStatusResponse:
         """Get status of a decision gate.
 
@@ -5,6 +5,7 @@ the JobStateMachine transitions, persisting sandbox build results.
 """
 
 import asyncio
+import time
 import uuid
 from collections.abc import Callable
 from datetime import UTC, datetime
@@ -19,12 +20,16 @@ from app.core.config import get_settings as _get_settings
 from app.core.exceptions import SandboxError
 from app.db.base import get_session_factory
 from app.db.redis import get_redis
-from app.metrics.cloudwatch import emit_business_event
+from app.metrics.cloudwatch import emit_business_event, emit_time_to_preview
 from app.queue.schemas import JobStatus
 from app.queue.state_machine import JobStateMachine
 from app.sandbox.e2b_runtime import E2BSandboxRuntime
+from app.sandbox.lease import SandboxLease, register_lease, release_lease
+from app.sandbox.pool import SandboxPool, detect_stack
+from app.sandbox.snapshot_store import get_snapshot_store, save_snapshot
+from app.services.dashboard_cache import invalidate_dashboard
 from app.services.doc_generation_service import DocGenerationService
-from app.services.log_streamer import LogStreamer
+from app.services.log_streamer import LogStreamer, register_streamer, release_streamer
 from app.services.narration_service import NarrationService
 from app.services.screenshot_service import ScreenshotService
 
@@ -46,16 +51,22 @@ class GenerationService:
     Args:
         runner: Runner implementation (RunnerReal in prod, RunnerFake in tests)
         sandbox_runtime_factory: Zero-arg callable returning an E2BSandboxRuntime
-            (or compatible fake). Called once per execute_build invocation.
+            (or compatible fake). Called at most once per build: the sandbox is leased
+            to the job (see app.sandbox.lease) and shared by the executor node and the
+            DEPS/CHECKS stages.
+        sandbox_pool: Warm sandbox pool for first builds; the factory is only called
+            on a pool miss. None boots every sandbox cold.
     """
 
     def __init__(
         self,
         runner: Runner,
         sandbox_runtime_factory: Callable[[], E2BSandboxRuntime],
+        sandbox_pool: SandboxPool | None = None,
     ) -> None:
         self.runner = runner
         self.sandbox_runtime_factory = sandbox_runtime_factory
+        self.sandbox_pool = sandbox_pool
 
     # ------------------------------------------------------------------
     # Public API
@@ -85,6 +96,7 @@ class GenerationService:
             Exception: On any pipeline failure (after transitioning to FAILED)
         """
         sandbox = None
+        build_started = time.monotonic()
         user_id = job_data.get("user_id", "")
         project_id = job_data.get("project_id", "")
         _redis = None  # resolved below; None when Redis unavailable (test env)
@@ -94,6 +106,12 @@ class GenerationService:
         except RuntimeError:
             # Redis not initialized (test environment or misconfiguration) — use no-op streamer
             streamer = _NullStreamer()  # type: ignore[assignment]
+        register_streamer(job_id, streamer)
+
+        # One sandbox per job: started lazily by the first executor visit (or at DEPS),
+        # reused by every retry and by DEPS/CHECKS below. Taken warm from the pool when possible.
+        lease = SandboxLease(self.sandbox_runtime_factory, pool=self.sandbox_pool)
+        register_lease(job_id, lease)
 
         try:
             # Resolve settings once before first stage — needed for all feature flag gates below
@@ -183,17 +201,13 @@ class GenerationService:
                     )
                 )
 
-            sandbox = self.sandbox_runtime_factory()
-            await sandbox.start()
+            sandbox = await lease.acquire(detect_stack(working_files))
 
             # Extend sandbox lifetime so it survives the full build cycle
             await sandbox.set_timeout(3600)
-            workspace_path = "/home/user/project"
-            for rel_path, file_change in working_files.items():
-                # FileChange is a TypedDict — content is in the 'new_content' key
-                content = file_change.get("new_content", "") if isinstance(file_change, dict) else str(file_change)
-                abs_path = rel_path if rel_path.startswith("/") else f"{workspace_path}/{rel_path}"
-                await sandbox.write_file(abs_path, content)
+            workspace_path = lease.workspace_path
+            # Files the executor already wrote with identical content are skipped
+            await _sync_or_raise(lease, working_files)
 
             # 5. CHECKS — basic health check
             await state_machine.transition(job_id, JobStatus.CHECKS, "Running health checks")
@@ -227,6 +241,15 @@ class GenerationService:
                 on_stdout=streamer.on_stdout,
                 on_stderr=streamer.on_stderr,
             )
+            time_to_preview = time.monotonic() - build_started
+            logger.info(
+                "build_preview_ready",
+                job_id=job_id,
+                time_to_preview_seconds=round(time_to_preview, 1),
+                sandbox_pool_hit=lease.pool_hit,
+            )
+            await emit_time_to_preview(time_to_preview, lease.pool_hit)
+            await _report_install_savings(streamer, sandbox, job_id)
 
             # SNAP-03: Fire-and-forget screenshot captures after dev server is live
             if _settings.screenshot_enabled and _redis is not None:
@@ -251,6 +274,9 @@ class GenerationService:
             sandbox_id = sandbox.sandbox_id
             build_version = await self._get_next_build_version(project_id, state_machine)
 
+            # 6b. Content-addressed snapshot of the generated files (non-fatal)
+            await _snapshot_workspace(job_id, project_id, build_version, working_files)
+
             # 7. Post-build hook: MVP Built state transition (non-fatal)
             try:
                 await self._handle_mvp_built_transition(
@@ -274,6 +300,8 @@ class GenerationService:
             }
 
         except Exception as exc:
+            # Failed builds don't hand the sandbox to the worker — stop billing now
+            await lease.close()
             debug_id = str(uuid4())
             logger.error(
                 "execute_build_failed",
@@ -298,6 +326,8 @@ class GenerationService:
             raise
 
         finally:
+            release_lease(job_id)
+            release_streamer(job_id)
             try:
                 await streamer.flush()
             except Exception:
@@ -341,6 +371,7 @@ class GenerationService:
         except RuntimeError:
             # Redis not initialized (test environment or misconfiguration) — use no-op streamer
             streamer = _NullStreamer()  # type: ignore[assignment]
+        register_streamer(job_id, streamer)
 
         try:
             # Resolve settings once before first stage — needed for all feature flag gates below
@@ -382,6 +413,10 @@ class GenerationService:
             # Extend sandbox lifetime
             await sandbox.set_timeout(3600)
 
+            # Lease the (reconnected or fresh) sandbox so the executor patches it in place
+            lease = SandboxLease(runtime=sandbox)
+            register_lease(job_id, lease)
+
             # DOCS-03: Start doc generation as background task after scaffold completes (iteration builds)
             if _settings.docs_generation_enabled and _redis is not None:
                 asyncio.create_task(
@@ -462,11 +497,8 @@ class GenerationService:
                     )
                 )
 
-            workspace_path = "/home/user/project"
-            for rel_path, file_change in working_files.items():
-                content = file_change.get("new_content", "") if isinstance(file_change, dict) else str(file_change)
-                abs_path = rel_path if rel_path.startswith("/") else f"{workspace_path}/{rel_path}"
-                await sandbox.write_file(abs_path, content)
+            workspace_path = lease.workspace_path
+            await _sync_or_raise(lease, working_files)
 
             # 5. CHECKS — run health check, attempt rollback if fails (GENL-03)
             await state_machine.transition(job_id, JobStatus.CHECKS, "Running health checks on patched build")
@@ -505,12 +537,7 @@ class GenerationService:
                     )
                     rollback_result = await self.runner.run(rollback_state)
                     rollback_files: dict = rollback_result.get("working_files", {})
-                    for rel_path, file_change in rollback_files.items():
-                        content = (
-                            file_change.get("new_content", "") if isinstance(file_change, dict) else str(file_change)
-                        )
-                        abs_path = rel_path if rel_path.startswith("/") else f"{workspace_path}/{rel_path}"
-                        await sandbox.write_file(abs_path, content)
+                    await _sync_or_raise(lease, rollback_files)
                 except Exception as rollback_exc:
                     logger.error(
                         "iteration_rollback_failed",
@@ -539,6 +566,7 @@ class GenerationService:
                 on_stdout=streamer.on_stdout,
                 on_stderr=streamer.on_stderr,
             )
+            await _report_install_savings(streamer, sandbox, job_id)
 
             # SNAP-03: Fire-and-forget screenshot captures after dev server is live
             if _settings.screenshot_enabled and _redis is not None:
@@ -563,6 +591,11 @@ class GenerationService:
             sandbox_id = sandbox.sandbox_id
             build_version = await self._get_next_build_version(project_id, state_machine)
 
+            # 6b. Snapshot: this build's changed files on top of the previous version's manifest
+            await _snapshot_workspace(
+                job_id, project_id, build_version, working_files, base_version=_previous_build_version(build_version)
+            )
+
             # DOCS-09: Generate changelog for v0.2+ iteration builds
             if _settings.docs_generation_enabled and _redis is not None and build_version != "build_v0_1":
                 prev_spec = await self._fetch_previous_spec(project_id)
@@ -627,6 +660,8 @@ class GenerationService:
             raise
 
         finally:
+            release_lease(job_id)
+            release_streamer(job_id)
             try:
                 await streamer.flush()
             except Exception:
@@ -792,6 +827,7 @@ class GenerationService:
             )
             session.add(mvp_event)
             await session.commit()
+        await invalidate_dashboard(pid)
 
         # Sync to Neo4j strategy graph (MVPS-04, non-fatal)
         try:
@@ -850,6 +886,44 @@ class GenerationService:
 _JS_TS_EXTENSIONS = {".js", ".jsx", ".ts", ".tsx", ".mjs", ".cjs"}
 
 
+async def _sync_or_raise(lease: SandboxLease, working_files: dict) -> None:
+    """Write changed files into the leased sandbox; any failed write aborts the build."""
+    _written, failed = await lease.sync_files(working_files)
+    if failed:
+        path, error = next(iter(failed.items()))
+        raise SandboxError(f"Failed to write {len(failed)} file(s) to sandbox (first: {path}): {error}")
+
+
+async def _snapshot_workspace(
+    job_id: str, project_id: str, build_version: str, working_files: dict, base_version: str | None = None
+) -> None:
+    """Store the build's files in the workspace snapshot store, when one is configured. Never raises."""
+    store = get_snapshot_store()
+    if store is None:
+        return
+    try:
+        await save_snapshot(store, project_id, build_version, working_files, base_version=base_version)
+    except Exception:
+        logger.warning("workspace_snapshot_failed", job_id=job_id, build_version=build_version, exc_info=True)
+
+
+def _previous_build_version(build_version: str) -> str | None:
+    """Version before build_version ("build_v0_3" -> "build_v0_2"); None for the first build."""
+    prefix, _, n = build_version.rpartition("_")
+    if not n.isdigit() or int(n) <= 1:
+        return None
+    return f"{prefix}_{int(n) - 1}"
+
+
+async def _report_install_savings(streamer: LogStreamer, sandbox: E2BSandboxRuntime, job_id: str) -> None:
+    """Tell the founder how much install time manifest skips and cache restores saved."""
+    saved = getattr(sandbox, "install_seconds_saved", 0.0)  # test fakes don't track it
+    if saved < 1:
+        return
+    logger.info("dependency_install_time_saved", job_id=job_id, seconds=round(saved, 1))
+    await streamer.write_event(f"--- Dependency cache saved ~{saved:.0f}s of install time ---")
+
+
 def _validate_working_files(working_files: dict) -> None:
     """Validate that working_files contain required scaffolding files.
 
@@ -0,0 +1,328 @@
+"""Per-pod fan-out of job log and event streams to SSE subscribers.
+
+Without this, every /logs/stream connection ran its own XREAD BLOCK loop plus an
+HGET status poll per iteration, and every /events/stream connection opened its
+own Pub/Sub connection, so Redis load grew with the number of browser tabs.
+
+Both feeds are capped Redis Streams:
+- job:{id}:logs    — build output written by LogStreamer
+- job:{id}:events  — status/stage events appended by JobStateMachine
+
+JobStreamBroadcaster keeps one XREAD reader task per job with local subscribers
+(the events stream always, the logs stream while someone is watching it) and
+fans entries out to bounded per-subscriber asyncio queues. The reader never
+waits on a consumer: a subscriber whose queue is full is evicted (its stream
+closes and the browser's EventSource reconnects). Terminal state comes from
+the status events in the events stream — when a job reaches ready/failed the
+reader drains what is left of the logs and then signals "done".
+
+Every entry keeps its stream ID, which the SSE endpoints send as `id:`. A
+reconnecting client's Last-Event-ID becomes the subscription's start position:
+replay() pages the missed entries with XRANGE, and live entries already
+replayed are skipped, so resume is gap- and duplicate-free.
+
+Usage (inside an SSE generator):
+    sub = await broadcaster.subscribe(job_id, "logs", after_id=last_event_id)
+    try:
+        async for message in broadcaster.replay(sub):
+            ...
+        while True:
+            message = await sub.get(timeout=0.5)  # None on timeout: heartbeat, disconnect check
+            ...
+    finally:
+        await broadcaster.unsubscribe(sub)
+"""
+
+import asyncio
+import json
+import re
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from typing import Any, Literal
+
+import structlog
+from fastapi import Depends, Request
+
+from app.db.redis import get_redis
+
+logger = structlog.get_logger(__name__)
+
+TERMINAL_STATUSES = frozenset({"ready", "failed"})
+
+SUBSCRIBER_QUEUE_SIZE = 1000  # messages buffered per subscriber before eviction
+READ_BLOCK_MS = 500  # XREAD block per reader iteration
+READ_COUNT = 200  # max entries per XREAD / XRANGE page
+
+FeedKind = Literal["logs", "events"]
+
+_STREAM_ID_RE = re.compile(r"^\d+-\d+$")
+
+
+def stream_key(job_id: str, kind: FeedKind) -> str:
+    """Redis Stream key for a job's logs or events."""
+    return f"job:{job_id}:{kind}"
+
+
+def parse_last_event_id(value: str | None) -> str | None:
+    """Return a Last-Event-ID header value if it is a Redis Stream ID, else None."""
+    if isinstance(value, str) and _STREAM_ID_RE.match(value.strip()):
+        return value.strip()
+    return None
+
+
+def _id_key(entry_id: str) -> tuple[int, int]:
+    ms, _, seq = entry_id.partition("-")
+    return int(ms), int(seq or 0)
+
+
+@dataclass(frozen=True)
+class BroadcastMessage:
+    """One item delivered to a subscriber.
+
+    kind:
+        "log"     — data is the entry's fields from job:{id}:logs
+        "event"   — data is the raw JSON payload from job:{id}:events
+        "done"    — data is the terminal status ("ready" / "failed")
+        "evicted" — the subscriber fell behind and was dropped; data is None
+    id: Stream entry ID for "log"/"event" messages, None otherwise
+    """
+
+    kind: str
+    data: Any = None
+    id: str | None = None
+
+
+def _to_message(kind: FeedKind, entry_id: str, fields: dict) -> BroadcastMessage:
+    if kind == "logs":
+        return BroadcastMessage("log", fields, entry_id)
+    return BroadcastMessage("event", fields.get("data", "{}"), entry_id)
+
+
+class Subscription:
+    """A subscriber's bounded queue for one job feed.
+
+    last_id is the newest stream ID this subscriber has been given; entries at
+    or before it (e.g. already sent during replay) are skipped.
+    """
+
+    def __init__(self, job_id: str, kind: FeedKind, last_id: str, maxsize: int = SUBSCRIBER_QUEUE_SIZE):
+        self.job_id = job_id
+        self.kind = kind
+        self.last_id = last_id
+        self.evicted = False
+        self._queue: asyncio.Queue[BroadcastMessage] = asyncio.Queue(maxsize)
+
+    async def get(self, timeout: float | None = None) -> BroadcastMessage | None:
+        """Next message, or None if nothing arrives within timeout seconds."""
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - loop.time())
+            try:
+                message = await asyncio.wait_for(self._queue.get(), remaining)
+            except TimeoutError:
+                return None
+            if message.id is not None:
+                if _id_key(message.id) <= _id_key(self.last_id):
+                    continue
+                self.last_id = message.id
+            return message
+
+    def _offer(self, message: BroadcastMessage) -> bool:
+        try:
+            self._queue.put_nowait(message)
+        except asyncio.QueueFull:
+            return False
+        return True
+
+    def _evict(self) -> None:
+        # Drop the backlog so the eviction notice is guaranteed to fit
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self._queue.put_nowait(BroadcastMessage("evicted"))
+        self.evicted = True
+
+
+@dataclass
+class _JobFeed:
+    job_id: str
+    subs: dict[str, set[Subscription]] = field(default_factory=lambda: {"logs": set(), "events": set()})
+    # Last stream ID the reader has fanned out, per kind
+    positions: dict[str, str] = field(default_factory=dict)
+    reader: asyncio.Task | None = None
+    terminal: str | None = None
+
+    @property
+    def idle(self) -> bool:
+        return not any(self.subs.values())
+
+
+class JobStreamBroadcaster:
+    """Shares one Redis reader per job across local SSE clients.
+
+    Args:
+        redis: redis.asyncio client
+        queue_size: Per-subscriber queue bound; a full queue evicts the subscriber
+        block_ms: XREAD block per reader iteration
+        read_count: Max entries per XREAD / replay page
+    """
+
+    def __init__(
+        self,
+        redis,
+        queue_size: int = SUBSCRIBER_QUEUE_SIZE,
+        block_ms: int = READ_BLOCK_MS,
+        read_count: int = READ_COUNT,
+    ):
+        self.redis = redis
+        self.queue_size = queue_size
+        self.block_ms = block_ms
+        self.read_count = read_count
+        self._feeds: dict[str, _JobFeed] = {}
+        self._loop = asyncio.get_running_loop()
+
+    # ------------------------------------------------------------------
+    # Subscriptions
+    # ------------------------------------------------------------------
+
+    async def subscribe(self, job_id: str, kind: FeedKind, after_id: str | None = None) -> Subscription:
+        """Register a subscriber for a job's log lines or events.
+
+        Args:
+            job_id: Job to follow
+            kind: "logs" or "events"
+            after_id: Resume after this stream ID (Last-Event-ID); call replay()
+                to receive the entries since then. None = new entries only.
+        """
+        tail = await self._tail(stream_key(job_id, kind))
+        # The reader always follows events (terminal detection), so it needs a start there too
+        events_tail = tail if kind == "events" else await self._tail(stream_key(job_id, "events"))
+        sub = Subscription(job_id, kind, after_id or tail, self.queue_size)
+
+        # No awaits from here on: concurrent subscribers must not start two readers
+        feed = self._feeds.setdefault(job_id, _JobFeed(job_id))
+        if not feed.subs[kind]:
+            feed.positions[kind] = tail
+        feed.positions.setdefault("events", events_tail)
+        feed.subs[kind].add(sub)
+        if feed.terminal is not None:
+            sub._offer(BroadcastMessage("done", feed.terminal))
+        elif feed.reader is None:
+            feed.reader = asyncio.create_task(self._read(feed), name=f"job-stream-reader-{job_id}")
+        return sub
+
+    async def replay(self, sub: Subscription) -> AsyncIterator[BroadcastMessage]:
+        """Yield the entries after sub.last_id that are already in the stream."""
+        key = stream_key(sub.job_id, sub.kind)
+        while True:
+            entries = await self.redis.xrange(key, min=f"({sub.last_id}", max="+", count=self.read_count)
+            for entry_id, fields in entries:
+                sub.last_id = entry_id
+                yield _to_message(sub.kind, entry_id, fields)
+            if len(entries) < self.read_count:
+                return
+
+    async def unsubscribe(self, sub: Subscription) -> None:
+        """Remove a subscriber; stops the job's reader when it was the last one."""
+        feed = self._feeds.get(sub.job_id)
+        if feed is None:
+            return
+        feed.subs[sub.kind].discard(sub)
+        if feed.idle:
+            del self._feeds[sub.job_id]
+            if feed.reader is not None:
+                feed.reader.cancel()
+
+    def stats(self) -> dict[str, int]:
+        """Active jobs, subscribers and readers on this process."""
+        return {
+            "jobs": len(self._feeds),
+            "log_subscribers": sum(len(f.subs["logs"]) for f in self._feeds.values()),
+            "event_subscribers": sum(len(f.subs["events"]) for f in self._feeds.values()),
+            "readers": sum(1 for f in self._feeds.values() if f.reader is not None),
+        }
+
+    async def close(self) -> None:
+        """Cancel all readers."""
+        tasks = [f.reader for f in self._feeds.values() if f.reader is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._feeds.clear()
+
+    # ------------------------------------------------------------------
+    # Reader
+    # ------------------------------------------------------------------
+
+    def _fan_out(self, subs: set[Subscription], message: BroadcastMessage) -> None:
+        for sub in list(subs):
+            if not sub._offer(message):
+                subs.discard(sub)
+                sub._evict()
+                logger.warning("stream_subscriber_evicted", job_id=sub.job_id, kind=sub.kind)
+
+    async def _tail(self, key: str) -> str:
+        """ID of the newest entry in a stream ("0-0" when empty or unreadable)."""
+        try:
+            tail = await self.redis.xrevrange(key, count=1)
+        except Exception:
+            logger.warning("stream_broadcaster_read_failed", key=key)
+            return "0-0"
+        return tail[0][0] if tail else "0-0"
+
+    async def _read(self, feed: _JobFeed) -> None:
+        while True:
+            draining = feed.terminal is not None
+            # Events are always read (terminal detection); logs only while watched
+            kinds: list[FeedKind] = ["events", "logs"] if feed.subs["logs"] else ["events"]
+            try:
+                results = await self.redis.xread(
+                    {stream_key(feed.job_id, kind): feed.positions[kind] for kind in kinds},
+                    block=None if draining else self.block_ms,
+                    count=self.read_count,
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("stream_broadcaster_read_failed", job_id=feed.job_id)
+                await asyncio.sleep(0.5)
+                continue
+
+            more = False
+            for key, entries in results or []:
+                kind: FeedKind = "logs" if key.endswith(":logs") else "events"
+                more = more or len(entries) >= self.read_count
+                for entry_id, fields in entries:
+                    feed.positions[kind] = entry_id
+                    message = _to_message(kind, entry_id, fields)
+                    self._fan_out(feed.subs[kind], message)
+                    if kind == "events" and feed.terminal is None:
+                        feed.terminal = terminal_status(message.data)
+
+            if draining and not more:
+                for subs in feed.subs.values():
+                    self._fan_out(subs, BroadcastMessage("done", feed.terminal))
+                feed.reader = None
+                return
+
+
+def terminal_status(data: str) -> str | None:
+    """The ready/failed status carried by an event payload, else None."""
+    try:
+        status = json.loads(data).get("status")
+    except (json.JSONDecodeError, TypeError, AttributeError):
+        return None
+    return status if status in TERMINAL_STATUSES else None
+
+
+async def get_stream_broadcaster(request: Request, redis=Depends(get_redis)) -> JobStreamBroadcaster:
+    """FastAPI dependency returning this process's broadcaster (created on first use).
+
+    Stored on app.state and closed in the app lifespan. Rebuilt if the event loop
+    changed (e.g. separate TestClient sessions against the same app).
+    """
+    broadcaster = getattr(request.app.state, "stream_broadcaster", None)
+    if broadcaster is None or broadcaster._loop is not asyncio.get_running_loop():
+        broadcaster = JobStreamBroadcaster(redis)
+        request.app.state.stream_broadcaster = broadcaster
+    return broadcaster
@@ -22,6 +22,7 @@ from app.domain.progress import compute_global_progress, compute_stage_progress
 from app.domain.risks import detect_llm_risks, detect_system_risks
 from app.domain.stages import ProjectStatus, Stage, validate_transition
 from app.domain.templates import get_stage_template
+from app.services.dashboard_cache import invalidate_dashboard
 
 
 class JourneyService:
@@ -31,6 +32,7 @@ class JourneyService:
     - Generates correlation_id if not provided
     - Logs a StageEvent for observability
     - Commits changes to the database
+    - Invalidates the project's cached dashboard snapshot after committing
     """
 
     def __init__(self, session: AsyncSession):
@@ -82,6 +84,7 @@ class JourneyService:
         self.session.add(event)
 
         await self.session.commit()
+        await invalidate_dashboard(project_id)
 
     async def create_gate(
         self,
@@ -133,6 +136,7 @@ class JourneyService:
         self.session.add(event)
 
         await self.session.commit()
+        await invalidate_dashboard(project_id)
         return gate.id
 
     async def decide_gate(
@@ -246,6 +250,7 @@ class JourneyService:
         self.session.add(event)
 
         await self.session.commit()
+        await invalidate_dashboard(gate.project_id)
 
         return {
             "decision": decision,
@@ -414,6 +419,7 @@ class JourneyService:
         self.session.add(event)
 
         await self.session.commit()
+        await invalidate_dashboard(project_id)
 
     async def complete_milestone(
         self,
@@ -489,6 +495,7 @@ class JourneyService:
         self.session.add(event)
 
         await self.session.commit()
+        await invalidate_dashboard(project_id)
         return stage_progress
 
     async def get_project_progress(self, project_id: uuid.UUID) -> dict[str, Any]:
@@ -4,6 +4,13 @@ Receives raw string chunks from E2B on_stdout/on_stderr callbacks, buffers them
 into complete lines, sanitizes (strip ANSI codes, redact secrets, truncate),
 and writes structured entries to a Redis Stream with 24-hour TTL.
 
+Sanitized lines are batched: a batch is written as one non-transactional
+pipeline (XADD per line plus a single EXPIRE) once batch_lines lines are
+pending or batch_interval seconds after the first pending line, whichever
+comes first. An `npm install` emitting thousands of lines therefore costs a
+few dozen round trips instead of two per line. write_event() and flush()
+write through immediately.
+
 Usage:
     streamer = LogStreamer(redis=redis, job_id=job_id, phase="install")
     result = await sandbox.commands.run(
@@ -14,8 +21,13 @@ Usage:
         timeout=300.0,
     )
     await streamer.flush()
+
+GenerationService registers each job's streamer under the job_id (the graph's
+session_id) so LangGraph nodes can write progress events — e.g. the coder
+announcing each file as soon as the model finishes it — via get_streamer().
 """
 
+import asyncio
 import re
 from datetime import UTC, datetime
 
@@ -29,6 +41,9 @@ logger = structlog.get_logger(__name__)
 
 MAX_LINE_LENGTH = 2000  # chars — truncate beyond this
 STREAM_TTL_SECONDS = 86400  # 24 hours
+STREAM_MAXLEN = 50000  # approximate cap on entries per job stream
+BATCH_LINES = 50  # write once this many lines are pending...
+BATCH_INTERVAL_SECONDS = 0.1  # ...or this long after the first pending line
 
 # ---------------------------------------------------------------------------
 # Compiled regex patterns
@@ -37,43 +52,40 @@ STREAM_TTL_SECONDS = 86400  # 24 hours
 # Covers all standard ANSI/VT100 escape sequences
 _ANSI_RE = re.compile(r"\x1b(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])")
 
-# Secret redaction patterns — checked in order, first match wins for each pattern.
-# For key=value patterns: preserve key name, replace value with [REDACTED].
-# For standalone patterns (sk-..., AKIA..., connection strings): replace entire match.
-_SECRET_PATTERNS = [
+# Secret redaction — all patterns combined into one alternation so each line is
+# scanned once. For key=value / key: value matches the key and separator (group
+# "key") are preserved and only the value is replaced; standalone matches
+# (sk-..., AKIA..., connection strings) are replaced entirely.
+_SECRET_RE = re.compile(
+    r"(?i)"
     # Generic key=value / key: value patterns (API keys, secrets, tokens, passwords)
-    re.compile(r"(?i)(api[_-]?key|secret|token|password|passwd|auth)\s*[=:]\s*\S{8,}"),
+    r"(?P<key>(?:api[_-]?key|secret|token|password|passwd|auth)\s*[=:]\s*)\S{8,}"
     # OpenAI-style API keys: sk-<20+ alphanumeric chars>
-    re.compile(r"(?i)sk-[a-zA-Z0-9]{20,}"),
+    r"|sk-[a-zA-Z0-9]{20,}"
     # Stripe keys: pk_live_... or pk_test_...
-    re.compile(r"(?i)pk_(?:live|test)_[a-zA-Z0-9]{20,}"),
-    # PostgreSQL connection strings
-    re.compile(r"(?i)postgresql://[^\s'\"]+"),
-    # Redis connection strings
-    re.compile(r"(?i)redis://[^\s'\"]+"),
-    # MongoDB connection strings
-    re.compile(r"(?i)mongodb(?:\+srv)?://[^\s'\"]+"),
+    r"|pk_(?:live|test)_[a-zA-Z0-9]{20,}"
+    # PostgreSQL, Redis and MongoDB connection strings
+    r"|(?:postgresql|redis|mongodb(?:\+srv)?)://[^\s'\"]+"
     # AWS access key IDs
-    re.compile(r"(?i)AKIA[0-9A-Z]{16}"),
-]
+    r"|AKIA[0-9A-Z]{16}"
+)
+
+
+def _redact_match(m: re.Match) -> str:
+    return (m.group("key") or "") + "[REDACTED]"
 
 
 def _redact_secrets(text: str) -> str:
-    """Apply all secret patterns to text, replacing matches with [REDACTED]."""
-    for pattern in _SECRET_PATTERNS:
+    """Replace every secret in text with [REDACTED] in a single pass."""
+    return _SECRET_RE.sub(_redact_match, text)
 
-        def _replace(m: re.Match) -> str:
-            matched = m.group(0)
-            # For key=value or key: value patterns, preserve key name
-            sep_match = re.search(r"[=:]\s*", matched)
-            if sep_match:
-                prefix = matched[: sep_match.end()]
-                return prefix + "[REDACTED]"
-            # Standalone patterns — replace entire match
-            return "[REDACTED]"
 
-        text = pattern.sub(_replace, text)
-    return text
+def _sanitize(line: str) -> str:
+    """Strip ANSI codes, redact secrets and truncate one log line."""
+    clean = _redact_secrets(_ANSI_RE.sub("", line))
+    if len(clean) > MAX_LINE_LENGTH:
+        clean = clean[:MAX_LINE_LENGTH] + "...[truncated]"
+    return clean
 
 
 # ---------------------------------------------------------------------------
@@ -86,11 +98,18 @@ class LogStreamer:
 
     Provides on_stdout and on_stderr async callables compatible with the E2B
     OutputHandler[str] type. Buffers partial chunks until newlines are received,
-    then sanitizes and writes complete lines.
+    then sanitizes complete lines and writes them in pipelined batches.
 
     Stream key format: job:{job_id}:logs
-    TTL: 86400 seconds (24 hours) — set on every write.
+    TTL: 86400 seconds (24 hours) — refreshed once per batch.
     Stream cap: 50,000 entries (approximate, via MAXLEN).
+
+    Args:
+        redis: redis.asyncio client
+        job_id: Build job the stream belongs to
+        phase: Initial phase tag recorded on each entry (callers update _phase)
+        batch_lines: Pending lines that trigger an immediate write (1 = write per line)
+        batch_interval: Max seconds a line waits before its batch is written
     """
 
     def __init__(
@@ -98,6 +117,8 @@ class LogStreamer:
         redis,
         job_id: str,
         phase: str = "build",
+        batch_lines: int = BATCH_LINES,
+        batch_interval: float = BATCH_INTERVAL_SECONDS,
     ) -> None:
         self._redis = redis
         self._job_id = job_id
@@ -105,101 +126,144 @@ class LogStreamer:
         self._stream_key = f"job:{job_id}:logs"
         self._stdout_buf = ""
         self._stderr_buf = ""
+        self._batch_lines = max(1, batch_lines)
+        self._batch_interval = batch_interval
+        self._pending: list[dict[str, str]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._timer_task: asyncio.Task | None = None
+        # Serializes pipelines so batches land in the stream in order
+        self._write_lock = asyncio.Lock()
 
     # -----------------------------------------------------------------------
     # Public E2B callbacks
     # -----------------------------------------------------------------------
 
     async def on_stdout(self, chunk: str) -> None:
-        """Receive a stdout chunk from E2B, buffer to lines, write complete lines."""
+        """Receive a stdout chunk from E2B, buffer to lines, queue complete lines."""
         self._stdout_buf += chunk
         lines = self._stdout_buf.split("\n")
         # Last element is the incomplete remainder (empty string if chunk ended with \n)
         self._stdout_buf = lines[-1]
         for line in lines[:-1]:
-            await self._write(line, "stdout")
+            self._enqueue(line, "stdout")
+        await self._maybe_write()
 
     async def on_stderr(self, chunk: str) -> None:
-        """Receive a stderr chunk from E2B, buffer to lines, write complete lines."""
+        """Receive a stderr chunk from E2B, buffer to lines, queue complete lines."""
         self._stderr_buf += chunk
         lines = self._stderr_buf.split("\n")
         self._stderr_buf = lines[-1]
         for line in lines[:-1]:
-            await self._write(line, "stderr")
+            self._enqueue(line, "stderr")
+        await self._maybe_write()
 
     async def flush(self) -> None:
-        """Flush any remaining buffered content (call after command completes).
+        """Write everything buffered (call after command completes).
 
-        Drains both stdout and stderr buffers. Content without a trailing newline
-        (partial last line) is written as-is.
+        Drains both stdout and stderr buffers plus any pending batch. Content
+        without a trailing newline (partial last line) is written as-is.
         """
         if self._stdout_buf:
-            await self._write(self._stdout_buf, "stdout")
+            self._enqueue(self._stdout_buf, "stdout")
             self._stdout_buf = ""
         if self._stderr_buf:
-            await self._write(self._stderr_buf, "stderr")
+            self._enqueue(self._stderr_buf, "stderr")
             self._stderr_buf = ""
+        await self._write_pending()
 
     async def write_event(self, text: str, source: str = "system") -> None:
         """Write a synthetic stage-change or control event to the stream.
 
         Used for lines like "--- Installing dependencies ---" that mark phase
-        transitions. These bypass the line buffer and write immediately.
+        transitions. These bypass the line buffer and write immediately, after
+        any lines already pending so ordering is preserved.
         """
-        await self._write(text, source)
+        self._enqueue(text, source)
+        await self._write_pending()
 
     # -----------------------------------------------------------------------
     # Internal
     # -----------------------------------------------------------------------
 
-    async def _write(self, line: str, source: str) -> None:
-        """Sanitize one line and write it to the Redis Stream.
+    def _enqueue(self, line: str, source: str) -> None:
+        """Sanitize one line and add it to the pending batch.
 
-        Steps:
-        1. Skip blank/whitespace-only lines
-        2. Strip ANSI escape codes
-        3. Redact secret patterns
-        4. Truncate lines exceeding MAX_LINE_LENGTH
-        5. Write to Redis Stream with MAXLEN cap
-        6. Set/refresh 24-hour TTL on the stream key
-
-        Errors from xadd or expire are caught and logged — never propagated,
-        so a Redis connectivity issue cannot crash the build.
+        Blank/whitespace-only lines are dropped. The phase is captured now so
+        a later phase change does not relabel lines still waiting in the batch.
         """
         if not line.strip():
             return
+        self._pending.append(
+            {
+                "ts": datetime.now(UTC).isoformat(),
+                "source": source,
+                "text": _sanitize(line),
+                "phase": self._phase,
+            }
+        )
+
+    async def _maybe_write(self) -> None:
+        """Write now if the batch is full, otherwise make sure a timer will write it."""
+        if len(self._pending) >= self._batch_lines:
+            await self._write_pending()
+        elif self._pending and self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self._batch_interval, self._on_timer)
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        # Keep a reference so the task is not garbage-collected mid-write
+        self._timer_task = asyncio.ensure_future(self._write_pending())
+
+    async def _write_pending(self) -> None:
+        """Write the pending batch as one pipeline: XADD per entry + one EXPIRE.
+
+        Errors are caught and logged — never propagated, so a Redis
+        connectivity issue cannot crash the build. A failed batch is dropped.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        async with self._write_lock:
+            batch, self._pending = self._pending, []
+            if not batch:
+                return
+            try:
+                pipe = self._redis.pipeline(transaction=False)
+                for entry in batch:
+                    pipe.xadd(self._stream_key, entry, maxlen=STREAM_MAXLEN, approximate=True)
+                # Set/refresh TTL once per batch, so the key expires ~24h after
+                # the last log line, approximately aligning with job completion.
+                pipe.expire(self._stream_key, STREAM_TTL_SECONDS)
+                await pipe.execute()
+            except Exception:
+                logger.warning(
+                    "log_stream_write_failed",
+                    job_id=self._job_id,
+                    lines=len(batch),
+                )
+
+
+# ---------------------------------------------------------------------------
+# Per-job registry
+# ---------------------------------------------------------------------------
+
+# Streamers are runtime objects and cannot live in CoFounderState (the
+# checkpointer serialises it); the graph runs in the process that registered them.
+_streamers: dict[str, LogStreamer] = {}
+
+
+def register_streamer(key: str, streamer: LogStreamer) -> None:
+    """Make streamer available to graph nodes running under session_id == key."""
+    _streamers[key] = streamer
+
+
+def get_streamer(key: str | None) -> LogStreamer | None:
+    """Return the streamer registered for a session, if any."""
+    if not key:
+        return None
+    return _streamers.get(key)
+
 
-        # 1. Strip ANSI escape codes
-        clean = _ANSI_RE.sub("", line)
-
-        # 2. Redact secrets
-        clean = _redact_secrets(clean)
-
-        # 3. Truncate long lines
-        if len(clean) > MAX_LINE_LENGTH:
-            clean = clean[:MAX_LINE_LENGTH] + "...[truncated]"
-
-        ts = datetime.now(UTC).isoformat()
-
-        try:
-            await self._redis.xadd(
-                self._stream_key,
-                {
-                    "ts": ts,
-                    "source": source,
-                    "text": clean,
-                    "phase": self._phase,
-                },
-                maxlen=50000,
-                approximate=True,
-            )
-            # Set/refresh TTL — idempotent, resets timer on every write.
-            # This ensures the key expires ~24h after the last log line,
-            # approximately aligning with job completion.
-            await self._redis.expire(self._stream_key, STREAM_TTL_SECONDS)
-        except Exception:
-            logger.warning(
-                "log_stream_write_failed",
-                job_id=self._job_id,
-                source=source,
-            )
+def release_streamer(key: str) -> LogStreamer | None:
+    """Remove a streamer from the registry without flushing it."""
+    return _streamers.pop(key, None)
@@ -1,7 +1,7 @@
 """NarrationService — Claude Haiku stage narration with safety filter.
 
 Architecture:
-- Direct anthropic.AsyncAnthropic call with claude-3-5-haiku-20241022 (NOT LangChain)
+- Direct anthropic.AsyncAnthropic call (shared client, app.core.llm_clients) with claude-3-5-haiku-20241022 (NOT LangChain)
 - asyncio.wait_for(timeout=NARRATION_TIMEOUT_SECONDS) wraps the API call
 - One retry with 2.5s backoff on RateLimitError, APITimeoutError, asyncio.TimeoutError
 - Emits enriched build.stage.started SSE event per stage via JobStateMachine.publish_event()
@@ -14,10 +14,9 @@ Phase 36 plan 01: TDD implementation.
 
 import asyncio
 
-import anthropic
 import structlog
 
-from app.core.config import get_settings
+from app.core.llm_clients import get_anthropic_client, llm_role
 from app.queue.state_machine import JobStateMachine, SSEEventType
 from app.services.doc_generation_service import _SAFETY_PATTERNS
 
@@ -150,21 +149,21 @@ class NarrationService:
         """
         from anthropic._exceptions import APITimeoutError, RateLimitError
 
-        settings = get_settings()
         system_prompt, messages = self._build_prompt(stage, spec)
 
         for attempt in range(2):
             try:
-                client = anthropic.AsyncAnthropic(api_key=settings.anthropic_api_key)
-                response = await asyncio.wait_for(
-                    client.messages.create(
-                        model=NARRATION_MODEL,
-                        max_tokens=NARRATION_MAX_TOKENS,
-                        system=system_prompt,
-                        messages=messages,
-                    ),
-                    timeout=NARRATION_TIMEOUT_SECONDS,
-                )
+                client = get_anthropic_client()
+                with llm_role("narration"):
+                    response = await asyncio.wait_for(
+                        client.messages.create(
+                            model=NARRATION_MODEL,
+                            max_tokens=NARRATION_MAX_TOKENS,
+                            system=system_prompt,
+                            messages=messages,
+                        ),
+                        timeout=NARRATION_TIMEOUT_SECONDS,
+                    )
                 return response.content[0].text.strip()
 
             except (TimeoutError, RateLimitError, APITimeoutError) as exc:
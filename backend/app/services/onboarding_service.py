@@ -6,6 +6,7 @@ Responsibilities:
 - User isolation via clerk_user_id filtering
 - ThesisSnapshot tier filtering
 - JSONB persistence with flag_modified tracking
+- No DB session held across Runner calls; writes after them are optimistic (409 on conflict)
 """
 
 from datetime import UTC, datetime
@@ -18,6 +19,7 @@ from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.orm.attributes import flag_modified
 
 from app.agent.runner import Runner
+from app.core.llm_config import invalidate_user_settings
 from app.db.models.artifact import Artifact
 from app.db.models.decision_gate import DecisionGate
 from app.db.models.job import Job
@@ -28,6 +30,7 @@ from app.db.models.stage_config import StageConfig
 from app.db.models.stage_event import StageEvent
 from app.db.models.understanding_session import UnderstandingSession
 from app.db.models.user_settings import UserSettings
+from app.db.optimistic import update_if_unchanged
 
 # Tier session limits (concurrent active sessions)
 TIER_SESSION_LIMITS = {
@@ -76,22 +79,14 @@ class OnboardingService:
         max_sessions = TIER_SESSION_LIMITS.get(tier_slug, 1)
 
         async with self.session_factory() as session:
-            if max_sessions != -1:
-                result = await session.execute(
-                    select(func.count(OnboardingSession.id)).where(
-                        OnboardingSession.clerk_user_id == user_id,
-                        OnboardingSession.status == "in_progress",
-                    )
-                )
-                active_count = result.scalar() or 0
-                if active_count >= max_sessions:
-                    raise HTTPException(
-                        status_code=403,
-                        detail=f"Active session limit reached ({active_count}/{max_sessions}). Complete or abandon an existing session to start a new one.",
-                    )
+            await self._check_session_limit(session, user_id, max_sessions)
 
-            # Generate questions via Runner
-            questions_data = await self.runner.generate_questions({"idea": idea_stripped})
+        # Generate questions via Runner — no session (and no pooled connection) held across the LLM call
+        questions_data = await self.runner.generate_questions({"idea": idea_stripped})
+
+        async with self.session_factory() as session:
+            # Re-check: another session may have started while questions were generated
+            await self._check_session_limit(session, user_id, max_sessions)
 
             # Create session
             new_session = OnboardingSession(
@@ -109,6 +104,23 @@ class OnboardingService:
 
             return new_session
 
+    async def _check_session_limit(self, session: AsyncSession, user_id: str, max_sessions: int) -> None:
+        """Raise 403 if user_id already has max_sessions in-progress sessions (-1: unlimited)."""
+        if max_sessions == -1:
+            return
+        result = await session.execute(
+            select(func.count(OnboardingSession.id)).where(
+                OnboardingSession.clerk_user_id == user_id,
+                OnboardingSession.status == "in_progress",
+            )
+        )
+        active_count = result.scalar() or 0
+        if active_count >= max_sessions:
+            raise HTTPException(
+                status_code=403,
+                detail=f"Active session limit reached ({active_count}/{max_sessions}). Complete or abandon an existing session to start a new one.",
+            )
+
     async def submit_answer(self, user_id: str, session_id: str, question_id: str, answer: str) -> OnboardingSession:
         """Submit an answer to a question and advance current_question_index.
 
@@ -215,6 +227,7 @@ class OnboardingService:
         Raises:
             HTTPException(404): If session not found or user mismatch
             HTTPException(400): If required answers are missing
+            HTTPException(409): If the session changed while the thesis was being generated
         """
         async with self.session_factory() as session:
             result = await session.execute(
@@ -243,22 +256,33 @@ class OnboardingService:
                     detail=f"Missing required answers: {', '.join(missing_required)}",
                 )
 
-            # Generate ThesisSnapshot via Runner
-            brief_data = await self.runner.generate_brief(answers)
+        # Generate ThesisSnapshot via Runner — no session held across the LLM call
+        brief_data = await self.runner.generate_brief(answers)
 
-            # Filter by tier
-            filtered_snapshot = self._filter_thesis_by_tier(brief_data, tier_slug)
-
-            # Store in session
-            onboarding_session.thesis_snapshot = filtered_snapshot
-            onboarding_session.status = "completed"
-            onboarding_session.completed_at = datetime.now(UTC)
-            flag_modified(onboarding_session, "thesis_snapshot")
+        # Filter by tier
+        filtered_snapshot = self._filter_thesis_by_tier(brief_data, tier_slug)
 
+        # Store in session, unless it changed (e.g. an answer was edited) while the brief was generated
+        async with self.session_factory() as session:
+            stored = await update_if_unchanged(
+                session,
+                OnboardingSession,
+                onboarding_session.id,
+                OnboardingSession.updated_at,
+                onboarding_session.updated_at,
+                thesis_snapshot=filtered_snapshot,
+                status="completed",
+                completed_at=datetime.now(UTC),
+                updated_at=datetime.now(UTC),
+            )
+            if not stored:
+                raise HTTPException(
+                    status_code=409,
+                    detail="Session changed while the thesis was being generated. Please try again.",
+                )
             await session.commit()
-            await session.refresh(onboarding_session)
 
-            return onboarding_session
+            return await session.get(OnboardingSession, onboarding_session.id)
 
     async def edit_thesis_field(
         self, user_id: str, session_id: str, field_name: str, new_value: str
@@ -464,6 +488,7 @@ class OnboardingService:
                 user_settings.onboarding_completed = True
 
             await session.commit()
+            invalidate_user_settings(user_id)
             await session.refresh(onboarding_session)
             await session.refresh(project)
 
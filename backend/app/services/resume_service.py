@@ -12,13 +12,25 @@ Error classification (per locked decision — phase 32 research):
 - SandboxUnreachableError — transient failure or corruption → may succeed on retry
 
 Retry policy: 2 attempts total with 5s backoff between them.
+
+Cold restore (restore_sandbox): when the paused sandbox has expired, a fresh sandbox
+is booted from the build's workspace snapshot (app.sandbox.snapshot_store). The files
+are uploaded as one archive, dependencies come from the dependency cache via
+start_dev_server(), and no LLM calls are made. Restore latency is logged and emitted
+as CoFounder/Sandbox RestoreTime, separate from build TimeToPreview.
 """
 
 import asyncio
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
 
 import structlog
 
+from app.core.exceptions import SandboxError
+from app.metrics.cloudwatch import emit_sandbox_restore
 from app.sandbox.e2b_runtime import E2BSandboxRuntime
+from app.sandbox.snapshot_store import get_snapshot_store, load_snapshot
 
 logger = structlog.get_logger(__name__)
 
@@ -31,10 +43,15 @@ logger = structlog.get_logger(__name__)
 class SandboxExpiredError(Exception):
     """Sandbox not found in E2B (404). The paused snapshot is gone.
 
-    Recovery: full rebuild from DB-stored workspace files.
+    Recovery: restore_sandbox() from the build's stored workspace files, or a full
+    rebuild when the build has no workspace snapshot.
     """
 
 
+class SnapshotUnavailableError(Exception):
+    """No workspace snapshot is stored for the build. Recovery: full rebuild."""
+
+
 class SandboxUnreachableError(Exception):
     """Transient sandbox failure or corruption. May recover on retry.
 
@@ -116,3 +133,85 @@ async def resume_sandbox(sandbox_id: str, workspace_path: str) -> str:
         ) from last_exc
 
     raise SandboxUnreachableError(f"Sandbox {sandbox_id} is unreachable after 2 attempts: {last_exc}") from last_exc
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Cold restore from a workspace snapshot
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+@dataclass
+class RestoreResult:
+    """A fresh sandbox serving a stored build."""
+
+    preview_url: str
+    sandbox_id: str
+    file_count: int
+    restore_seconds: float
+
+
+async def restore_sandbox(
+    project_id: str,
+    build_version: str,
+    workspace_path: str,
+    runtime_factory: Callable[[], E2BSandboxRuntime] = E2BSandboxRuntime,
+) -> RestoreResult:
+    """Boot a new sandbox from the build's workspace snapshot and start its dev server.
+
+    Args:
+        project_id:      Project UUID string.
+        build_version:   Build whose manifest to restore (e.g. "build_v0_2").
+        workspace_path:  Absolute path to project root inside sandbox.
+        runtime_factory: Zero-arg callable returning a sandbox runtime (fakes in tests).
+
+    Returns:
+        RestoreResult with the live preview URL and the new sandbox_id.
+
+    Raises:
+        SnapshotUnavailableError: Snapshots are disabled or none is stored for the build.
+        SandboxError:             The sandbox failed to start, take the files or serve.
+    """
+    store = get_snapshot_store()
+    if store is None:
+        raise SnapshotUnavailableError("Workspace snapshots are not configured")
+
+    started = time.monotonic()
+    files = await load_snapshot(store, project_id, build_version)
+    if not files:
+        raise SnapshotUnavailableError(f"No workspace snapshot for {project_id} {build_version}")
+
+    runtime = runtime_factory()
+    try:
+        await runtime.start()
+        await runtime.set_timeout(3600)
+
+        errors = await runtime.write_files(
+            {f"{workspace_path}/{path}": content for path, content in files.items()}, archive=True
+        )
+        if errors:
+            path, error = next(iter(errors.items()))
+            raise SandboxError(f"Failed to restore {len(errors)} file(s) (first: {path}): {error}")
+
+        # Installs from the dependency cache when this manifest has been built before
+        preview_url = await runtime.start_dev_server(workspace_path=workspace_path, working_files=files)
+    except Exception:
+        await runtime.stop()
+        raise
+
+    restore_seconds = time.monotonic() - started
+    logger.info(
+        "sandbox_restored_from_snapshot",
+        project_id=project_id,
+        build_version=build_version,
+        sandbox_id=runtime.sandbox_id,
+        file_count=len(files),
+        restore_seconds=round(restore_seconds, 1),
+        install_seconds_saved=round(getattr(runtime, "install_seconds_saved", 0.0), 1),
+    )
+    await emit_sandbox_restore(restore_seconds)
+    return RestoreResult(
+        preview_url=preview_url,
+        sandbox_id=runtime.sandbox_id or "",
+        file_count=len(files),
+        restore_seconds=restore_seconds,
+    )
@@ -5,6 +5,7 @@ Responsibilities:
 - User isolation via clerk_user_id filtering
 - JSONB persistence with flag_modified tracking
 - Idea Brief generation and artifact storage
+- No DB session held across Runner calls; writes after them are optimistic (409 on conflict)
 """
 
 from datetime import UTC, datetime
@@ -13,6 +14,7 @@ from uuid import UUID
 
 from fastapi import HTTPException
 from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.orm.attributes import flag_modified
 
@@ -22,9 +24,13 @@ from app.db.models.artifact import Artifact
 from app.db.models.onboarding_session import OnboardingSession
 from app.db.models.project import Project
 from app.db.models.understanding_session import UnderstandingSession
+from app.db.optimistic import update_if_unchanged
 from app.schemas.artifacts import ArtifactType
+from app.services.dashboard_cache import invalidate_dashboard
 from app.services.graph_service import GraphService
 
+_SESSION_CHANGED = "Understanding session changed while it was being processed. Please try again."
+
 
 class UnderstandingService:
     """Service layer for understanding interview flow with Runner integration."""
@@ -72,22 +78,23 @@ class UnderstandingService:
                     detail="Onboarding session must be completed before starting understanding interview",
                 )
 
-            # Resolve tier for the user
-            from app.core.llm_config import get_or_create_user_settings
+        # Resolve tier for the user
+        from app.core.llm_config import get_or_create_user_settings
 
-            user_settings = await get_or_create_user_settings(clerk_user_id)
-            tier_slug = user_settings.plan_tier.slug if user_settings.plan_tier else "bootstrapper"
+        user_settings = await get_or_create_user_settings(clerk_user_id)
+        tier_slug = user_settings.plan_tier.slug if user_settings.plan_tier else "bootstrapper"
 
-            # Generate understanding questions via Runner
-            context = {
-                "idea_text": onboarding.idea_text,
-                "onboarding_answers": onboarding.answers,
-                "user_id": clerk_user_id,
-                "session_id": str(onboarding.id),
-                "tier": tier_slug,
-            }
-            questions_data = await self.runner.generate_understanding_questions(context)
+        # Generate understanding questions via Runner — no session held across the LLM call
+        context = {
+            "idea_text": onboarding.idea_text,
+            "onboarding_answers": onboarding.answers,
+            "user_id": clerk_user_id,
+            "session_id": str(onboarding.id),
+            "tier": tier_slug,
+        }
+        questions_data = await self.runner.generate_understanding_questions(context)
 
+        async with self.session_factory() as session:
             # Create understanding session
             new_session = UnderstandingSession(
                 clerk_user_id=clerk_user_id,
@@ -167,6 +174,7 @@ class UnderstandingService:
 
         Raises:
             HTTPException(404): If session not found or not owned by user
+            HTTPException(409): If the session changed during the relevance check
         """
         async with self.session_factory() as session:
             # Load session with user isolation
@@ -181,43 +189,54 @@ class UnderstandingService:
             if not understanding:
                 raise HTTPException(status_code=404, detail="Understanding session not found")
 
-            # Update answer
-            understanding.answers[question_id] = new_answer
-            flag_modified(understanding, "answers")
-
-            # Determine which questions have been answered
-            answered_questions = [q for q in understanding.questions if q["id"] in understanding.answers]
-            remaining_questions = [q for q in understanding.questions if q["id"] not in understanding.answers]
-
             # Load onboarding session for idea_text
             onboarding_result = await session.execute(
                 select(OnboardingSession).where(OnboardingSession.id == understanding.onboarding_session_id)
             )
             onboarding = onboarding_result.scalar_one()
 
-            # Check if remaining questions need regeneration
-            relevance_check = await self.runner.check_question_relevance(
-                idea=onboarding.idea_text,
-                answered=answered_questions,
-                answers=understanding.answers,
-                remaining=remaining_questions,
-            )
+        # Update answer
+        answers = {**understanding.answers, question_id: new_answer}
+
+        # Determine which questions have been answered
+        answered_questions = [q for q in understanding.questions if q["id"] in answers]
+        remaining_questions = [q for q in understanding.questions if q["id"] not in answers]
+
+        # Check if remaining questions need regeneration — no session held across the LLM call
+        relevance_check = await self.runner.check_question_relevance(
+            idea=onboarding.idea_text,
+            answered=answered_questions,
+            answers=answers,
+            remaining=remaining_questions,
+        )
 
-            regenerated = False
-            if relevance_check["needs_regeneration"] and remaining_questions:
-                # Regenerate remaining questions (not implemented in fake, but framework ready)
-                # In real implementation, we'd call runner.generate_understanding_questions
-                # with updated context and replace remaining questions
-                regenerated = True
+        regenerated = False
+        if relevance_check["needs_regeneration"] and remaining_questions:
+            # Regenerate remaining questions (not implemented in fake, but framework ready)
+            # In real implementation, we'd call runner.generate_understanding_questions
+            # with updated context and replace remaining questions
+            regenerated = True
 
+        async with self.session_factory() as session:
+            stored = await update_if_unchanged(
+                session,
+                UnderstandingSession,
+                understanding.id,
+                UnderstandingSession.updated_at,
+                understanding.updated_at,
+                answers=answers,
+                updated_at=datetime.now(UTC),
+            )
+            if not stored:
+                raise HTTPException(status_code=409, detail=_SESSION_CHANGED)
             await session.commit()
-            await session.refresh(understanding)
+            understanding = await session.get(UnderstandingSession, understanding.id)
 
-            return {
-                "updated_session": understanding,
-                "needs_regeneration": relevance_check["needs_regeneration"],
-                "regenerated": regenerated,
-            }
+        return {
+            "updated_session": understanding,
+            "needs_regeneration": relevance_check["needs_regeneration"],
+            "regenerated": regenerated,
+        }
 
     async def finalize(self, clerk_user_id: str, session_id: str) -> dict[str, Any]:
         """Generate Rationalised Idea Brief and store as Artifact.
@@ -232,6 +251,7 @@ class UnderstandingService:
         Raises:
             HTTPException(404): If session not found or not owned by user
             HTTPException(400): If not all questions answered
+            HTTPException(409): If the session or brief changed while the brief was generated
         """
         async with self.session_factory() as session:
             # Load session with user isolation
@@ -260,72 +280,103 @@ class UnderstandingService:
             )
             onboarding = onboarding_result.scalar_one()
 
-            # Resolve tier for the user
-            from app.core.llm_config import get_or_create_user_settings
+            # Existing brief (re-finalize): its version guards the write below
+            existing_brief = await session.execute(
+                select(Artifact).where(
+                    Artifact.project_id == understanding.project_id,
+                    Artifact.artifact_type == ArtifactType.IDEA_BRIEF,
+                )
+            )
+            existing = existing_brief.scalar_one_or_none()
 
-            user_settings = await get_or_create_user_settings(clerk_user_id)
-            tier_slug = user_settings.plan_tier.slug if user_settings.plan_tier else "bootstrapper"
+        # Resolve tier for the user
+        from app.core.llm_config import get_or_create_user_settings
 
-            # Inject tier into answers so generate_idea_brief can read it
-            answers_with_tier = {**understanding.answers, "_tier": tier_slug}
+        user_settings = await get_or_create_user_settings(clerk_user_id)
+        tier_slug = user_settings.plan_tier.slug if user_settings.plan_tier else "bootstrapper"
 
-            # Generate Idea Brief via Runner
-            brief_content = await self.runner.generate_idea_brief(
-                idea=onboarding.idea_text,
-                questions=understanding.questions,
-                answers=answers_with_tier,
-            )
+        # Inject tier into answers so generate_idea_brief can read it
+        answers_with_tier = {**understanding.answers, "_tier": tier_slug}
 
-            # Inject _tier into brief content for downstream tier-differentiation
-            brief_content["_tier"] = tier_slug
+        # Generate Idea Brief via Runner — no session held across the LLM call
+        brief_content = await self.runner.generate_idea_brief(
+            idea=onboarding.idea_text,
+            questions=understanding.questions,
+            answers=answers_with_tier,
+        )
+
+        # Inject _tier into brief content for downstream tier-differentiation
+        brief_content["_tier"] = tier_slug
+
+        async with self.session_factory() as session:
+            # Mark session as completed, unless its answers changed while the brief was generated
+            stored = await update_if_unchanged(
+                session,
+                UnderstandingSession,
+                understanding.id,
+                UnderstandingSession.updated_at,
+                understanding.updated_at,
+                status="completed",
+                completed_at=datetime.now(UTC),
+                updated_at=datetime.now(UTC),
+            )
 
             # Store as Artifact (upsert — handle re-finalize idempotently)
-            existing_brief = await session.execute(
+            if stored and existing:
+                stored = await update_if_unchanged(
+                    session,
+                    Artifact,
+                    existing.id,
+                    Artifact.version_number,
+                    existing.version_number,
+                    previous_content=existing.current_content,
+                    current_content=brief_content,
+                    version_number=existing.version_number + 1,
+                    generation_status="idle",
+                    updated_at=datetime.now(UTC),
+                )
+            elif stored:
+                session.add(
+                    Artifact(
+                        project_id=understanding.project_id,
+                        artifact_type=ArtifactType.IDEA_BRIEF,
+                        current_content=brief_content,
+                        previous_content=None,
+                        version_number=1,
+                        schema_version=1,
+                        generation_status="idle",
+                    )
+                )
+            if not stored:
+                raise HTTPException(status_code=409, detail=_SESSION_CHANGED)
+            try:
+                await session.commit()
+            except IntegrityError:
+                # Another finalize created the brief first
+                raise HTTPException(status_code=409, detail=_SESSION_CHANGED) from None
+            await invalidate_dashboard(understanding.project_id)
+
+            result = await session.execute(
                 select(Artifact).where(
                     Artifact.project_id == understanding.project_id,
                     Artifact.artifact_type == ArtifactType.IDEA_BRIEF,
                 )
             )
-            artifact = existing_brief.scalar_one_or_none()
-            if artifact:
-                artifact.previous_content = artifact.current_content
-                artifact.current_content = brief_content
-                artifact.version_number += 1
-                artifact.generation_status = "idle"
-                flag_modified(artifact, "current_content")
-            else:
-                artifact = Artifact(
-                    project_id=understanding.project_id,
-                    artifact_type=ArtifactType.IDEA_BRIEF,
-                    current_content=brief_content,
-                    previous_content=None,
-                    version_number=1,
-                    schema_version=1,
-                    generation_status="idle",
-                )
-                session.add(artifact)
-
-            # Mark session as completed
-            understanding.status = "completed"
-            understanding.completed_at = datetime.now(UTC)
-
-            await session.commit()
-            await session.refresh(artifact)
-            await session.refresh(understanding)
-
-            # Sync artifact to Neo4j strategy graph (non-fatal)
-            graph_service = GraphService(get_strategy_graph())
-            await graph_service.sync_artifact_to_graph(artifact, str(understanding.project_id))
-
-            return {
-                "brief": brief_content,
-                "artifact_id": str(artifact.id),
-                "version": artifact.version_number,
-                "project_id": str(understanding.project_id),
-                "idea_text": onboarding.idea_text,
-                "onboarding_answers": onboarding.answers or {},
-                "tier": tier_slug,
-            }
+            artifact = result.scalar_one()
+
+        # Sync artifact to Neo4j strategy graph (non-fatal)
+        graph_service = GraphService(get_strategy_graph())
+        await graph_service.sync_artifact_to_graph(artifact, str(understanding.project_id))
+
+        return {
+            "brief": brief_content,
+            "artifact_id": str(artifact.id),
+            "version": artifact.version_number,
+            "project_id": str(understanding.project_id),
+            "idea_text": onboarding.idea_text,
+            "onboarding_answers": onboarding.answers or {},
+            "tier": tier_slug,
+        }
 
     async def get_brief(self, clerk_user_id: str, project_id: str) -> dict[str, Any]:
         """Get Idea Brief artifact for a project.
@@ -387,6 +438,7 @@ class UnderstandingService:
         Raises:
             HTTPException(404): If brief not found
             HTTPException(400): If section_key invalid
+            HTTPException(409): If the brief changed while confidence was reassessed
         """
         async with self.session_factory() as session:
             # Verify project ownership before allowing edits
@@ -416,28 +468,44 @@ class UnderstandingService:
             if section_key not in artifact.current_content:
                 raise HTTPException(status_code=400, detail=f"Invalid section key: {section_key}")
 
-            # Version rotation pattern (from Phase 06 decision)
-            artifact.previous_content = artifact.current_content.copy()
-            artifact.current_content[section_key] = new_content
-            flag_modified(artifact, "current_content")
+        # Recalculate confidence for edited section — no session held across the LLM call
+        new_confidence = await self.runner.assess_section_confidence(section_key, new_content)
 
-            # Recalculate confidence for edited section
-            new_confidence = await self.runner.assess_section_confidence(section_key, new_content)
-            artifact.current_content["confidence_scores"][section_key] = new_confidence
-            flag_modified(artifact, "current_content")
-
-            # Increment version and mark as edited
-            artifact.version_number += 1
-            artifact.has_user_edits = True
+        # Version rotation pattern (from Phase 06 decision)
+        content = artifact.current_content
+        updated_content = {
+            **content,
+            section_key: new_content,
+            "confidence_scores": {**content.get("confidence_scores", {}), section_key: new_confidence},
+        }
 
+        async with self.session_factory() as session:
+            # Increment version and mark as edited, unless the brief changed in the meantime
+            stored = await update_if_unchanged(
+                session,
+                Artifact,
+                artifact.id,
+                Artifact.version_number,
+                artifact.version_number,
+                previous_content=content,
+                current_content=updated_content,
+                version_number=artifact.version_number + 1,
+                has_user_edits=True,
+                updated_at=datetime.now(UTC),
+            )
+            if not stored:
+                raise HTTPException(
+                    status_code=409,
+                    detail="The Idea Brief changed while this edit was being saved. Reload and try again.",
+                )
             await session.commit()
-            await session.refresh(artifact)
+        await invalidate_dashboard(project_id)
 
-            return {
-                "updated_section": new_content,
-                "new_confidence": new_confidence,
-                "version": artifact.version_number,
-            }
+        return {
+            "updated_section": new_content,
+            "new_confidence": new_confidence,
+            "version": artifact.version_number + 1,
+        }
 
     async def re_interview(self, clerk_user_id: str, session_id: str) -> UnderstandingSession:
         """Reset understanding session for re-interview (major changes).
@@ -451,6 +519,7 @@ class UnderstandingService:
 
         Raises:
             HTTPException(404): If session not found or not owned by user
+            HTTPException(409): If the session changed while new questions were generated
         """
         async with self.session_factory() as session:
             # Load session
@@ -471,38 +540,44 @@ class UnderstandingService:
             )
             onboarding = onboarding_result.scalar_one()
 
-            # Resolve tier for the user
-            from app.core.llm_config import get_or_create_user_settings
+        # Resolve tier for the user
+        from app.core.llm_config import get_or_create_user_settings
 
-            user_settings = await get_or_create_user_settings(clerk_user_id)
-            tier_slug = user_settings.plan_tier.slug if user_settings.plan_tier else "bootstrapper"
+        user_settings = await get_or_create_user_settings(clerk_user_id)
+        tier_slug = user_settings.plan_tier.slug if user_settings.plan_tier else "bootstrapper"
 
-            # Generate fresh questions
-            context = {
-                "idea_text": onboarding.idea_text,
-                "onboarding_answers": onboarding.answers,
-                "existing_brief": (understanding.answers if understanding.answers else None),
-                "user_id": clerk_user_id,
-                "session_id": str(understanding.id),
-                "tier": tier_slug,
-            }
-            questions_data = await self.runner.generate_understanding_questions(context)
+        # Generate fresh questions — no session held across the LLM call
+        context = {
+            "idea_text": onboarding.idea_text,
+            "onboarding_answers": onboarding.answers,
+            "existing_brief": (understanding.answers if understanding.answers else None),
+            "user_id": clerk_user_id,
+            "session_id": str(understanding.id),
+            "tier": tier_slug,
+        }
+        questions_data = await self.runner.generate_understanding_questions(context)
 
+        async with self.session_factory() as session:
             # Reset session state
-            understanding.questions = questions_data
-            understanding.answers = {}
-            understanding.current_question_index = 0
-            understanding.total_questions = len(questions_data)
-            understanding.status = "in_progress"
-            understanding.completed_at = None
-
-            flag_modified(understanding, "questions")
-            flag_modified(understanding, "answers")
-
+            stored = await update_if_unchanged(
+                session,
+                UnderstandingSession,
+                understanding.id,
+                UnderstandingSession.updated_at,
+                understanding.updated_at,
+                questions=questions_data,
+                answers={},
+                current_question_index=0,
+                total_questions=len(questions_data),
+                status="in_progress",
+                completed_at=None,
+                updated_at=datetime.now(UTC),
+            )
+            if not stored:
+                raise HTTPException(status_code=409, detail=_SESSION_CHANGED)
             await session.commit()
-            await session.refresh(understanding)
 
-            return understanding
+            return await session.get(UnderstandingSession, understanding.id)
 
     async def get_session(self, clerk_user_id: str, session_id: str) -> UnderstandingSession:
         """Get current understanding session state (for resumption).
@@ -0,0 +1,112 @@
+"""AI Co-Founder Worker: dedicated job consumer process entry point.
+
+Runs JobWorkerPool against the shared Redis queue so builds execute independently
+of API pod lifetimes. Scale throughput by adding replicas of this process.
+
+    python -m app.worker
+"""
+
+import asyncio
+import signal
+
+from app.core.config import get_settings as _get_settings_early
+
+# CRITICAL ORDER: configure_structlog MUST be called before all other app imports
+# to avoid the structlog cache pitfall (structlog caches the processor chain on first use).
+from app.core.logging import configure_structlog
+
+_early_settings = _get_settings_early()
+configure_structlog(
+    log_level="DEBUG" if _early_settings.debug else "INFO",
+    json_logs=not _early_settings.debug,
+)
+
+import structlog
+
+from app.agent.checkpointer import close_checkpointer, open_checkpointer
+from app.core.config import get_settings
+from app.core.llm_clients import close_llm_clients
+from app.core.usage_ledger import flush_usage_ledger
+from app.db import close_db, close_redis, get_redis, init_db, init_redis
+from app.queue.task_protection import TaskProtection
+from app.queue.worker import JobWorkerPool
+from app.sandbox.e2b_runtime import E2BSandboxRuntime
+from app.sandbox.pool import SandboxPool, set_sandbox_pool
+
+logger = structlog.get_logger(__name__)
+
+
+def build_runner(checkpointer=None):
+    """Build a Runner instance — RunnerReal in production, RunnerFake in dev."""
+    settings = get_settings()
+    if settings.anthropic_api_key:
+        from app.agent.runner_real import RunnerReal
+
+        return RunnerReal(checkpointer=checkpointer)
+    else:
+        from app.agent.runner_fake import RunnerFake
+
+        return RunnerFake()
+
+
+async def run_worker() -> None:
+    """Start the worker pool and block until SIGTERM/SIGINT, then drain gracefully."""
+    settings = get_settings()
+    logger.info("worker_startup_begin", concurrency=settings.worker_concurrency)
+
+    await init_db(service="worker")
+    logger.info("db_initialized")
+
+    await init_redis()
+    logger.info("redis_initialized")
+
+    checkpointer, checkpointer_cm = await open_checkpointer(settings.database_url)
+
+    pool = JobWorkerPool(
+        get_redis(),
+        runner=build_runner(checkpointer),
+        concurrency=settings.worker_concurrency,
+        poll_timeout=settings.worker_poll_timeout_seconds,
+        error_backoff=settings.worker_error_backoff_seconds,
+        protection=TaskProtection(expires_minutes=settings.worker_protection_minutes),
+        # Queue-depth metrics drive ECS autoscaling; skip CloudWatch in local dev
+        metrics_interval=0.0 if settings.debug else settings.worker_metrics_interval_seconds,
+    )
+
+    # Warm sandboxes cut time-to-preview for first builds; only useful with real E2B
+    sandbox_pool = None
+    if settings.sandbox_pool_size > 0 and settings.e2b_api_key:
+        sandbox_pool = SandboxPool(
+            runtime_factory=lambda: E2BSandboxRuntime(),
+            stacks=[s.strip() for s in settings.sandbox_pool_stacks.split(",") if s.strip()],
+            size=settings.sandbox_pool_size,
+            idle_seconds=settings.sandbox_pool_idle_seconds,
+        )
+        set_sandbox_pool(sandbox_pool)
+        sandbox_pool.start()
+
+    stop_requested = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop_requested.set)
+
+    pool.start()
+    try:
+        await stop_requested.wait()
+        logger.info("sigterm_received", action="draining_in_flight_jobs")
+        await pool.stop(drain_timeout=settings.worker_drain_timeout_seconds)
+    finally:
+        logger.info("worker_shutdown_begin")
+        if sandbox_pool is not None:
+            set_sandbox_pool(None)
+            await sandbox_pool.stop()
+        await close_checkpointer(checkpointer_cm)
+        await close_llm_clients()
+        await flush_usage_ledger()
+        await close_redis()
+        await close_db()
+        logger.info("worker_shutdown_complete")
+
+
+if __name__ == "__main__":
+    asyncio.run(run_worker())
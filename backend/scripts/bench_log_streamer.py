@@ -0,0 +1,208 @@
+"""Benchmark: per-line LogStreamer writes vs. batched pipelines.
+
+Feeds an `npm install` log through two paths and reports Redis round trips and
+wall time:
+
+    legacy    7 redaction passes + XADD + EXPIRE per line   (2 round trips/line)
+    batched   LogStreamer: combined redaction, one pipeline of XADDs + EXPIRE
+              per BATCH_LINES lines
+
+Usage:
+
+    python -m scripts.bench_log_streamer --fake --latency-ms 0.5
+    python -m scripts.bench_log_streamer --redis-url redis://localhost:6379/15 --log npm-install.log
+
+--log replays a recorded log (e.g. `npm install --loglevel=http 2>&1 | tee npm-install.log`);
+without it a synthetic npm log with ANSI colours and a few secret-bearing lines is
+generated. Chunks are delivered in --chunk-bytes pieces, as E2B's on_stdout does.
+The benchmark deletes its own stream keys only.
+"""
+
+import argparse
+import asyncio
+import random
+import re
+import time
+from datetime import UTC, datetime
+
+from app.services.log_streamer import _ANSI_RE, MAX_LINE_LENGTH, STREAM_TTL_SECONDS, LogStreamer, _redact_secrets
+
+# The pre-batching redaction: one regex pass per pattern, re-searching each match
+# for its separator
+_LEGACY_PATTERNS = [
+    re.compile(r"(?i)(api[_-]?key|secret|token|password|passwd|auth)\s*[=:]\s*\S{8,}"),
+    re.compile(r"(?i)sk-[a-zA-Z0-9]{20,}"),
+    re.compile(r"(?i)pk_(?:live|test)_[a-zA-Z0-9]{20,}"),
+    re.compile(r"(?i)postgresql://[^\s'\"]+"),
+    re.compile(r"(?i)redis://[^\s'\"]+"),
+    re.compile(r"(?i)mongodb(?:\+srv)?://[^\s'\"]+"),
+    re.compile(r"(?i)AKIA[0-9A-Z]{16}"),
+]
+
+
+def legacy_redact(text: str) -> str:
+    for pattern in _LEGACY_PATTERNS:
+
+        def _replace(m: re.Match) -> str:
+            matched = m.group(0)
+            sep_match = re.search(r"[=:]\s*", matched)
+            if sep_match:
+                return matched[: sep_match.end()] + "[REDACTED]"
+            return "[REDACTED]"
+
+        text = pattern.sub(_replace, text)
+    return text
+
+
+async def legacy_write(redis, stream_key: str, line: str, source: str, phase: str) -> None:
+    if not line.strip():
+        return
+    clean = legacy_redact(_ANSI_RE.sub("", line))
+    if len(clean) > MAX_LINE_LENGTH:
+        clean = clean[:MAX_LINE_LENGTH] + "...[truncated]"
+    fields = {"ts": datetime.now(UTC).isoformat(), "source": source, "text": clean, "phase": phase}
+    await redis.xadd(stream_key, fields, maxlen=50000, approximate=True)
+    await redis.expire(stream_key, STREAM_TTL_SECONDS)
+
+
+def synthetic_npm_log(lines: int, seed: int = 7) -> str:
+    rng = random.Random(seed)
+    packages = ["react", "next", "postcss", "glob", "inflight", "rimraf", "eslint", "typescript", "@types/node"]
+    out = []
+    for i in range(lines):
+        pkg = rng.choice(packages)
+        kind = rng.random()
+        if kind < 0.55:
+            out.append(f"npm http fetch GET 200 https://registry.npmjs.org/{pkg} {rng.randint(5, 400)}ms (cache miss)")
+        elif kind < 0.85:
+            out.append(
+                f"\x1b[33mnpm\x1b[0m \x1b[43mWARN\x1b[0m deprecated {pkg}@{rng.randint(1, 9)}.0.{i % 10}: no longer supported"
+            )
+        elif kind < 0.99:
+            out.append(f"\x1b[2K\x1b[1G[{'#' * (i % 18):<18}] \\ reify:{pkg}: timing reifyNode:node_modules/{pkg}")
+        else:
+            out.append(f"env DATABASE_URL=postgresql://app:hunter2@db:5432/app API_KEY=sk-{'a' * 24}")
+    out.append(f"added {lines} packages, and audited {lines + 1} packages in 41s")
+    return "\n".join(out) + "\n"
+
+
+class _CountingPipeline:
+    def __init__(self, owner: "_RoundTrips", pipe):
+        self._owner = owner
+        self._pipe = pipe
+
+    def __getattr__(self, name):
+        return getattr(self._pipe, name)
+
+    async def execute(self):
+        await self._owner.trip()
+        return await self._pipe.execute()
+
+
+class _RoundTrips:
+    """Client proxy counting awaited Redis calls, each delayed by latency_ms."""
+
+    def __init__(self, redis, latency_ms: float):
+        self._redis = redis
+        self._latency = latency_ms / 1000
+        self.count = 0
+
+    async def trip(self) -> None:
+        self.count += 1
+        if self._latency:
+            await asyncio.sleep(self._latency)
+
+    async def xadd(self, *args, **kwargs):
+        await self.trip()
+        return await self._redis.xadd(*args, **kwargs)
+
+    async def expire(self, *args, **kwargs):
+        await self.trip()
+        return await self._redis.expire(*args, **kwargs)
+
+    def pipeline(self, transaction: bool = True):
+        return _CountingPipeline(self, self._redis.pipeline(transaction=transaction))
+
+
+def _chunks(log: str, size: int) -> list[str]:
+    return [log[i : i + size] for i in range(0, len(log), size)]
+
+
+async def run(redis, log: str, chunk_bytes: int, latency_ms: float) -> None:
+    chunks = _chunks(log, chunk_bytes)
+    lines = log.count("\n")
+    print(f"{lines} lines in {len(chunks)} chunks of {chunk_bytes} bytes, {latency_ms} ms simulated RTT")
+
+    start = time.perf_counter()
+    for line in log.splitlines():
+        legacy_redact(line)
+    old_redact = time.perf_counter() - start
+    start = time.perf_counter()
+    for line in log.splitlines():
+        _redact_secrets(line)
+    new_redact = time.perf_counter() - start
+    print("redaction")
+    print(f"  {'legacy (7 passes)':<28} {old_redact * 1e6 / lines:>8.2f} us/line")
+    print(f"  {'combined pattern':<28} {new_redact * 1e6 / lines:>8.2f} us/line")
+
+    print("stream writes")
+    results = {}
+    for label, key in (("legacy (per line)", "bench:legacy:logs"), ("batched pipeline", "job:bench-batched:logs")):
+        await redis.delete(key)
+        client = _RoundTrips(redis, latency_ms)
+        start = time.perf_counter()
+        if key == "bench:legacy:logs":
+            buf = ""
+            for chunk in chunks:
+                buf += chunk
+                parts = buf.split("\n")
+                buf = parts[-1]
+                for line in parts[:-1]:
+                    await legacy_write(client, key, line, "stdout", "install")
+        else:
+            streamer = LogStreamer(redis=client, job_id="bench-batched", phase="install")
+            for chunk in chunks:
+                await streamer.on_stdout(chunk)
+            await streamer.flush()
+        elapsed = time.perf_counter() - start
+        entries = await redis.xlen(key)
+        results[label] = elapsed
+        print(f"  {label:<28} {client.count:>6} round trips  {elapsed * 1000:>9.1f} ms  ({entries} entries)")
+        await redis.delete(key)
+    old, new = results.values()
+    print(f"  speedup x{old / new:.2f}")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--redis-url", default="redis://localhost:6379/15")
+    parser.add_argument("--fake", action="store_true", help="use fakeredis instead of a server")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="simulated per-round-trip delay")
+    parser.add_argument("--log", help="recorded npm install output to replay")
+    parser.add_argument("--lines", type=int, default=5000, help="synthetic log length (without --log)")
+    parser.add_argument("--chunk-bytes", type=int, default=4096)
+    args = parser.parse_args()
+
+    if args.log:
+        with open(args.log, encoding="utf-8", errors="replace") as f:
+            log = f.read()
+    else:
+        log = synthetic_npm_log(args.lines)
+
+    if args.fake:
+        from fakeredis import aioredis
+
+        redis = aioredis.FakeRedis(decode_responses=True)
+    else:
+        import redis.asyncio as aioredis_client
+
+        redis = aioredis_client.from_url(args.redis_url, decode_responses=True)
+
+    try:
+        await run(redis, log, args.chunk_bytes, args.latency_ms)
+    finally:
+        await redis.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
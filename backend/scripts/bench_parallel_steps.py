@@ -0,0 +1,152 @@
+"""Benchmark: sequential vs. parallel plan-step execution in the LangGraph pipeline.
+
+Runs the full graph twice on the same plan with stubbed LLMs (RunnerFake-style
+canned responses, each call delayed by a simulated latency) and a stubbed
+executor, then reports wall-clock time:
+
+    sequential   max_parallel_steps=1: coder -> executor -> reviewer per step, in order
+    parallel     max_parallel_steps=N: steps whose dependencies are done fan out with Send
+
+The stub architect emits a scaffold step followed by --steps steps that each depend
+only on the scaffold (--chain makes every step depend on its predecessor, the
+worst case for fan-out). Both runs must produce the same working files.
+
+Usage:
+
+    python -m scripts.bench_parallel_steps
+    python -m scripts.bench_parallel_steps --steps 8 --parallel 4 --opus-ms 900 --sonnet-ms 400
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import time
+from contextlib import ExitStack
+from unittest.mock import patch
+
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+from app.agent.graph import create_cofounder_graph
+from app.agent.state import create_initial_state
+
+_FILES_RE = re.compile(r"Files to modify: \[(.*?)\]")
+
+
+def stub_plan(steps: int, chain: bool) -> list[dict]:
+    plan = [
+        {
+            "index": 0,
+            "description": "Scaffold project",
+            "status": "pending",
+            "files_to_modify": ["package.json"],
+            "depends_on": [],
+        }
+    ]
+    for i in range(1, steps + 1):
+        plan.append(
+            {
+                "index": i,
+                "description": f"Create page {i}",
+                "status": "pending",
+                "files_to_modify": [f"src/pages/Page{i}.tsx"],
+                "depends_on": [i - 1] if chain else [0],
+            }
+        )
+    return plan
+
+
+class StubLLM:
+    """Answers each agent role with a canned response after latency seconds."""
+
+    def __init__(self, role: str, latency: float, plan: list[dict]):
+        self.role = role
+        self.latency = latency
+        self.plan = plan
+
+    def _respond(self, messages) -> str:
+        if self.role == "architect":
+            return json.dumps(self.plan)
+        if self.role == "reviewer":
+            return "===VERDICT===\nAPPROVED\n===ISSUES===\nNone\n===SUGGESTIONS===\n"
+        if self.role == "debugger":
+            return "===ANALYSIS===\nstub\n===FIX===\nstub\n===FILES===\n"
+        match = _FILES_RE.search(messages[-1].content)
+        paths = [p.strip().strip("'\"") for p in match.group(1).split(",")] if match else ["main.py"]
+        return "".join(f"===FILE: {p}===\nexport const page = {p!r};\n===END FILE===\n" for p in paths)
+
+    async def ainvoke(self, messages):
+        await asyncio.sleep(self.latency)
+        return AIMessage(content=self._respond(messages))
+
+    async def astream(self, messages):
+        await asyncio.sleep(self.latency)
+        yield AIMessageChunk(content=self._respond(messages))
+
+
+class _NoMemory:
+    async def get_context_for_prompt(self, **kwargs) -> str:
+        return ""
+
+
+def stubbed_pipeline(plan: list[dict], opus_s: float, sonnet_s: float, executor_s: float) -> ExitStack:
+    """Patch LLMs, semantic memory and the executor for a graph built inside the block."""
+    latency = {"architect": opus_s, "reviewer": opus_s, "coder": sonnet_s, "debugger": sonnet_s}
+
+    async def tracked_llm(user_id: str, role: str, session_id: str | None = None):
+        return StubLLM(role, latency[role], plan)
+
+    async def executor(state) -> dict:
+        await asyncio.sleep(executor_s)
+        return {
+            "last_tool_output": "ok",
+            "last_command_exit_code": 0,
+            "active_errors": [],
+            "current_node": "executor",
+            "status_message": "Executed step, exit code: 0",
+            "messages": [],
+        }
+
+    stack = ExitStack()
+    for role in ("architect", "coder", "reviewer", "debugger"):
+        stack.enter_context(patch(f"app.agent.nodes.{role}.create_tracked_llm", tracked_llm))
+    stack.enter_context(patch("app.agent.nodes.architect.get_semantic_memory", return_value=_NoMemory()))
+    stack.enter_context(patch("app.agent.graph.executor_node", executor))
+    return stack
+
+
+async def run_graph(max_parallel_steps: int, session_id: str) -> tuple[float, dict]:
+    graph = create_cofounder_graph(max_parallel_steps=max_parallel_steps)
+    state = create_initial_state("bench", "bench", "/tmp/bench", "Build a multi-page site", session_id=session_id)
+    start = time.perf_counter()
+    final = await graph.ainvoke(state, config={"configurable": {"thread_id": session_id}})
+    return time.perf_counter() - start, final
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--steps", type=int, default=6, help="plan steps after the scaffold step")
+    parser.add_argument("--parallel", type=int, default=3, help="max_parallel_steps for the parallel run")
+    parser.add_argument("--chain", action="store_true", help="make every step depend on the previous one")
+    parser.add_argument("--opus-ms", type=float, default=600.0, help="architect/reviewer call latency")
+    parser.add_argument("--sonnet-ms", type=float, default=300.0, help="coder/debugger call latency")
+    parser.add_argument("--executor-ms", type=float, default=100.0, help="executor visit latency")
+    args = parser.parse_args()
+
+    plan = stub_plan(args.steps, args.chain)
+    print(f"{len(plan)} steps ({'chained' if args.chain else 'fan-out after scaffold'}), opus {args.opus_ms} ms,")
+    print(f"sonnet {args.sonnet_ms} ms, executor {args.executor_ms} ms per call")
+
+    with stubbed_pipeline(plan, args.opus_ms / 1000, args.sonnet_ms / 1000, args.executor_ms / 1000):
+        sequential, seq_state = await run_graph(1, "bench-sequential")
+        parallel, par_state = await run_graph(args.parallel, "bench-parallel")
+
+    assert seq_state["working_files"] == par_state["working_files"], "runs produced different files"
+    assert all(step["status"] == "completed" for step in par_state["plan"])
+    print(f"  {'sequential':<28} {sequential:>8.2f} s")
+    print(f"  {f'parallel (max {args.parallel})':<28} {parallel:>8.2f} s")
+    print(f"  speedup x{sequential / parallel:.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
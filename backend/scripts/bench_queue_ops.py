@@ -0,0 +1,180 @@
+"""Microbenchmark: multi-round-trip queue/semaphore ops vs. the EVALSHA scripts.
+
+Compares, per operation, the pre-Lua command sequences against the scripted paths:
+
+    enqueue   ZCARD → INCR → ZADD → ZRANK        vs  ENQUEUE (1 EVALSHA)
+    acquire   SCARD → SADD → SET EX, SREM → DEL  vs  SEMAPHORE_ACQUIRE + SEMAPHORE_RELEASE
+              (acquire/release cycle on a tier-sized semaphore)
+    admit     ZPOPMIN → HGETALL → acquire x2     vs  ADMIT_NEXT (1 EVALSHA)
+
+Usage (against local Redis, e.g. `docker compose up redis`):
+
+    python -m scripts.bench_queue_ops --redis-url redis://localhost:6379/15
+
+Without a Redis server, --fake runs against fakeredis; add --latency-ms to simulate a
+network round trip per command (fakeredis alone measures only client overhead).
+The benchmark FLUSHES the selected database — point it at a scratch DB.
+"""
+
+import argparse
+import asyncio
+import time
+
+from app.queue.manager import QueueManager
+from app.queue.schemas import GLOBAL_QUEUE_CAP, TIER_BOOST
+from app.queue.semaphore import RedisSemaphore
+
+
+async def legacy_enqueue(redis, job_id: str, tier: str) -> int:
+    length = await redis.zcard(QueueManager.QUEUE_KEY)
+    if length >= GLOBAL_QUEUE_CAP:
+        return 0
+    counter = await redis.incr("queue:counter")
+    score = (1000 - TIER_BOOST.get(tier, 0)) * 1e12 + counter
+    await redis.zadd(QueueManager.QUEUE_KEY, {job_id: score})
+    rank = await redis.zrank(QueueManager.QUEUE_KEY, job_id)
+    return rank + 1
+
+
+async def legacy_acquire(redis, key: str, job_id: str, max_concurrent: int, ttl: int = 3600) -> bool:
+    current = await redis.scard(f"{key}:slots")
+    if current >= max_concurrent:
+        return False
+    if await redis.sadd(f"{key}:slots", job_id):
+        await redis.set(f"{key}:slot:{job_id}", "1", ex=ttl)
+        return True
+    return False
+
+
+async def legacy_admit(redis) -> str | None:
+    result = await redis.zpopmin(QueueManager.QUEUE_KEY, count=1)
+    if not result:
+        return None
+    job_id, _score = result[0]
+    meta = await redis.hgetall(f"job:{job_id}")
+    await legacy_acquire(redis, f"concurrency:user:{meta['user_id']}", job_id, 1_000_000)
+    await legacy_acquire(redis, f"concurrency:project:{meta['project_id']}", job_id, 1_000_000)
+    return job_id
+
+
+async def legacy_release(redis, key: str, job_id: str) -> None:
+    await redis.srem(f"{key}:slots", job_id)
+    await redis.delete(f"{key}:slot:{job_id}")
+
+
+async def _seed_jobs(redis, n: int) -> None:
+    pipe = redis.pipeline(transaction=False)
+    for i in range(n):
+        pipe.hset(f"job:bench-{i}", mapping={"user_id": f"u{i}", "project_id": f"p{i}", "tier": "cto_scale"})
+    await pipe.execute()
+
+
+async def _timed(label: str, n: int, op) -> float:
+    start = time.perf_counter()
+    for i in range(n):
+        await op(i)
+    elapsed = time.perf_counter() - start
+    rate = n / elapsed
+    print(f"  {label:<28} {rate:>10.0f} ops/s  ({elapsed * 1000 / n:.3f} ms/op)")
+    return rate
+
+
+async def run(redis, n: int) -> None:
+    queue = QueueManager(redis)
+    sem_scripted = RedisSemaphore(redis, "bench:sem:lua", max_concurrent=10)
+
+    print(f"{n} ops per path")
+
+    print("enqueue")
+    await redis.flushdb()
+    old = await _timed("legacy (4 round trips)", n, lambda i: legacy_enqueue(redis, f"old-{i % 90}", "partner"))
+    await redis.flushdb()
+    new = await _timed("ENQUEUE script", n, lambda i: queue.enqueue(f"new-{i % 90}", "partner"))
+    print(f"  speedup x{new / old:.2f}")
+
+    print("semaphore acquire + release")
+    await redis.flushdb()
+    # Hold a few slots so the limit check sees a realistic set size (cto_scale user limit is 10)
+    for i in range(5):
+        await sem_scripted.acquire(f"held-{i}")
+        await legacy_acquire(redis, "bench:sem:old", f"held-{i}", 10)
+
+    async def old_cycle(i):
+        await legacy_acquire(redis, "bench:sem:old", f"j{i}", 10)
+        await legacy_release(redis, "bench:sem:old", f"j{i}")
+
+    async def new_cycle(i):
+        await sem_scripted.acquire(f"j{i}")
+        await sem_scripted.release(f"j{i}")
+
+    old = await _timed("legacy (5 round trips)", n, old_cycle)
+    new = await _timed("scripts (2 round trips)", n, new_cycle)
+    print(f"  speedup x{new / old:.2f}")
+
+    print("admit (dequeue + 2 semaphores)")
+    batch = min(n, GLOBAL_QUEUE_CAP)
+    rounds = max(1, n // batch)
+    old_total = new_total = 0.0
+    for _ in range(rounds):
+        await redis.flushdb()
+        await _seed_jobs(redis, batch)
+        await redis.zadd(QueueManager.QUEUE_KEY, {f"bench-{i}": i for i in range(batch)})
+        start = time.perf_counter()
+        for _ in range(batch):
+            await legacy_admit(redis)
+        old_total += time.perf_counter() - start
+
+        await redis.flushdb()
+        await _seed_jobs(redis, batch)
+        await redis.zadd(QueueManager.QUEUE_KEY, {f"bench-{i}": i for i in range(batch)})
+        start = time.perf_counter()
+        for _ in range(batch):
+            await queue.admit_next()
+        new_total += time.perf_counter() - start
+    total = batch * rounds
+    print(f"  {'legacy (5+ round trips)':<28} {total / old_total:>10.0f} ops/s")
+    print(f"  {'ADMIT_NEXT script':<28} {total / new_total:>10.0f} ops/s")
+    print(f"  speedup x{old_total / new_total:.2f}")
+
+    await redis.flushdb()
+
+
+def _with_latency(redis, latency_ms: float):
+    """Delay every command by latency_ms to emulate a network round trip."""
+    execute = redis.execute_command
+
+    async def delayed(*args, **kwargs):
+        await asyncio.sleep(latency_ms / 1000)
+        return await execute(*args, **kwargs)
+
+    redis.execute_command = delayed
+    return redis
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--redis-url", default="redis://localhost:6379/15")
+    parser.add_argument("--fake", action="store_true", help="use fakeredis instead of a server")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="simulated per-command RTT (with --fake)")
+    parser.add_argument("-n", type=int, default=2000)
+    args = parser.parse_args()
+
+    if args.fake:
+        from fakeredis import aioredis
+
+        redis = aioredis.FakeRedis(decode_responses=True)
+        if args.latency_ms:
+            redis = _with_latency(redis, args.latency_ms)
+    else:
+        import redis.asyncio as aioredis_client
+
+        redis = aioredis_client.from_url(args.redis_url, decode_responses=True)
+
+    try:
+        await run(redis, args.n)
+    finally:
+        await redis.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
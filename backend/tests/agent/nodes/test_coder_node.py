@@ -1,14 +1,23 @@
 """Tests for the Coder node.
 
-Covers: empty ===FILE:=== parse detection returning an error instead of silent success.
+Covers: empty ===FILE:=== parse detection returning an error instead of silent success,
+incremental parsing of the streamed response and per-file log events.
 """
 
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
-
-from app.agent.nodes.coder import _format_errors, _format_working_files, _parse_file_changes, coder_node
+from langchain_core.messages import AIMessageChunk
+
+from app.agent.nodes.coder import (
+    FileBlockParser,
+    _format_errors,
+    _format_working_files,
+    _parse_file_changes,
+    coder_node,
+)
 from app.agent.state import create_initial_state
+from app.services.log_streamer import register_streamer, release_streamer
 
 pytestmark = pytest.mark.unit
 
@@ -34,6 +43,18 @@ def _make_state(**overrides):
     return state
 
 
+def _streaming_llm(content: str, chunk_size: int = 7) -> MagicMock:
+    """Mock LLM whose astream yields content in chunk_size pieces."""
+
+    async def astream(messages):
+        for i in range(0, len(content), chunk_size):
+            yield AIMessageChunk(content=content[i : i + chunk_size])
+
+    llm = MagicMock()
+    llm.astream = astream
+    return llm
+
+
 VALID_LLM_RESPONSE = """\
 ===FILE: main.py===
 print("Hello, world!")
@@ -60,10 +81,7 @@ class TestCoderNodeEmptyParseDetection:
         """When LLM returns no ===FILE:=== blocks, coder must return active_errors."""
         state = _make_state()
 
-        mock_response = MagicMock()
-        mock_response.content = EMPTY_LLM_RESPONSE
-        mock_llm = AsyncMock()
-        mock_llm.ainvoke = AsyncMock(return_value=mock_response)
+        mock_llm = _streaming_llm(EMPTY_LLM_RESPONSE)
 
         with patch("app.agent.nodes.coder.create_tracked_llm", return_value=mock_llm):
             result = await coder_node(state)
@@ -77,10 +95,7 @@ class TestCoderNodeEmptyParseDetection:
         """Empty parse result must propagate as a detectable failure for the router."""
         state = _make_state()
 
-        mock_response = MagicMock()
-        mock_response.content = EMPTY_LLM_RESPONSE
-        mock_llm = AsyncMock()
-        mock_llm.ainvoke = AsyncMock(return_value=mock_response)
+        mock_llm = _streaming_llm(EMPTY_LLM_RESPONSE)
 
         with patch("app.agent.nodes.coder.create_tracked_llm", return_value=mock_llm):
             result = await coder_node(state)
@@ -94,10 +109,7 @@ class TestCoderNodeEmptyParseDetection:
         state = _make_state()
         state["working_files"] = {}
 
-        mock_response = MagicMock()
-        mock_response.content = EMPTY_LLM_RESPONSE
-        mock_llm = AsyncMock()
-        mock_llm.ainvoke = AsyncMock(return_value=mock_response)
+        mock_llm = _streaming_llm(EMPTY_LLM_RESPONSE)
 
         with patch("app.agent.nodes.coder.create_tracked_llm", return_value=mock_llm):
             result = await coder_node(state)
@@ -113,10 +125,7 @@ class TestCoderNodeEmptyParseDetection:
         """Malformed FILE markers (missing colon) also trigger empty-parse error."""
         state = _make_state()
 
-        mock_response = MagicMock()
-        mock_response.content = MALFORMED_LLM_RESPONSE
-        mock_llm = AsyncMock()
-        mock_llm.ainvoke = AsyncMock(return_value=mock_response)
+        mock_llm = _streaming_llm(MALFORMED_LLM_RESPONSE)
 
         with patch("app.agent.nodes.coder.create_tracked_llm", return_value=mock_llm):
             result = await coder_node(state)
@@ -128,10 +137,7 @@ class TestCoderNodeEmptyParseDetection:
         """Valid LLM response with proper FILE blocks must succeed (regression guard)."""
         state = _make_state()
 
-        mock_response = MagicMock()
-        mock_response.content = VALID_LLM_RESPONSE
-        mock_llm = AsyncMock()
-        mock_llm.ainvoke = AsyncMock(return_value=mock_response)
+        mock_llm = _streaming_llm(VALID_LLM_RESPONSE)
 
         with patch("app.agent.nodes.coder.create_tracked_llm", return_value=mock_llm):
             result = await coder_node(state)
@@ -145,10 +151,7 @@ class TestCoderNodeEmptyParseDetection:
         state = _make_state()
         state["current_step_index"] = 0
 
-        mock_response = MagicMock()
-        mock_response.content = EMPTY_LLM_RESPONSE
-        mock_llm = AsyncMock()
-        mock_llm.ainvoke = AsyncMock(return_value=mock_response)
+        mock_llm = _streaming_llm(EMPTY_LLM_RESPONSE)
 
         with patch("app.agent.nodes.coder.create_tracked_llm", return_value=mock_llm):
             result = await coder_node(state)
@@ -157,6 +160,86 @@ class TestCoderNodeEmptyParseDetection:
         assert error["step_index"] == 0
 
 
+class TestCoderNodeStreaming:
+    """Coder streams the response and announces each file as its block closes."""
+
+    async def test_each_completed_file_is_written_to_the_log_stream(self):
+        response = "===FILE: a.py===\nA = 1\n===END FILE===\n===FILE: b.py===\nB = 2\nC = 3\n===END FILE===\n"
+        streamer = MagicMock()
+        streamer.write_event = AsyncMock()
+        register_streamer("s1", streamer)
+        try:
+            with patch("app.agent.nodes.coder.create_tracked_llm", return_value=_streaming_llm(response, 5)):
+                result = await coder_node(_make_state())
+        finally:
+            release_streamer("s1")
+
+        assert [c.args[0] for c in streamer.write_event.await_args_list] == [
+            "--- Wrote a.py (1 lines) ---",
+            "--- Wrote b.py (2 lines) ---",
+        ]
+        assert result["working_files"]["b.py"]["new_content"] == "B = 2\nC = 3"
+
+    async def test_file_is_announced_before_the_response_finishes(self):
+        seen_before_end: list[str] = []
+        streamer = MagicMock()
+        streamer.write_event = AsyncMock()
+
+        async def astream(messages):
+            yield AIMessageChunk(content="===FILE: a.py===\nA = 1\n===END FILE===\n")
+            seen_before_end.extend(c.args[0] for c in streamer.write_event.await_args_list)
+            yield AIMessageChunk(content="===FILE: b.py===\nB = 2\n===END FILE===\n")
+
+        llm = MagicMock()
+        llm.astream = astream
+        register_streamer("s1", streamer)
+        try:
+            with patch("app.agent.nodes.coder.create_tracked_llm", return_value=llm):
+                await coder_node(_make_state())
+        finally:
+            release_streamer("s1")
+
+        assert seen_before_end == ["--- Wrote a.py (1 lines) ---"]
+
+    async def test_list_content_chunks_are_parsed(self):
+        """Anthropic streams text as content blocks, not plain strings."""
+
+        async def astream(messages):
+            for text in ("===FILE: main.py===\n", "print(1)\n", "===END FILE==="):
+                yield AIMessageChunk(content=[{"type": "text", "text": text, "index": 0}])
+
+        llm = MagicMock()
+        llm.astream = astream
+        with patch("app.agent.nodes.coder.create_tracked_llm", return_value=llm):
+            result = await coder_node(_make_state())
+
+        assert result["working_files"]["main.py"]["new_content"] == "print(1)"
+
+
+class TestFileBlockParser:
+    """Streaming parser must find the same files whatever the chunking."""
+
+    RESPONSE = (
+        "Here you go.\n===FILE:  src/a.py  ===\nx = '==='\n===END FILE===\n"
+        "notes\n===FILE: b.ts===\nexport const b = 1;\n===END FILE===\ntrailing"
+    )
+
+    @pytest.mark.parametrize("size", [1, 2, 3, 8, 13, 1000])
+    def test_chunked_feed_matches_full_parse(self, size):
+        parser = FileBlockParser()
+        changes = []
+        for i in range(0, len(self.RESPONSE), size):
+            changes.extend(parser.feed(self.RESPONSE[i : i + size]))
+
+        assert {c["path"]: c for c in changes} == _parse_file_changes(self.RESPONSE)
+        assert [c["path"] for c in changes] == ["src/a.py", "b.ts"]
+        assert changes[0]["new_content"] == "x = '==='"
+
+    def test_unterminated_block_is_not_emitted(self):
+        parser = FileBlockParser()
+        assert parser.feed("===FILE: a.py===\npartial content") == []
+
+
 class TestParseFileChanges:
     """Unit tests for _parse_file_changes helper."""
 
@@ -63,8 +63,7 @@ class TestExecutorErrorPathsHaveMessages:
         mock_runtime.session = MagicMock()
         mock_runtime.session.return_value.__aenter__ = AsyncMock(return_value=mock_runtime)
         mock_runtime.session.return_value.__aexit__ = AsyncMock(return_value=False)
-        mock_runtime.make_dir = AsyncMock()
-        mock_runtime.write_file = AsyncMock(side_effect=SandboxError("disk full"))
+        mock_runtime.write_files = AsyncMock(return_value={"/home/user/project/main.py": SandboxError("disk full")})
 
         with (
             patch("app.agent.nodes.executor.get_settings", return_value=mock_settings),
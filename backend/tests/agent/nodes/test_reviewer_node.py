@@ -0,0 +1,119 @@
+"""Tests for the Reviewer node.
+
+Covers: diff-based review context (changes since the last approval) and the
+hash-keyed summaries of already-approved files.
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.agent.llm_helpers import message_text
+from app.agent.nodes import reviewer
+from app.agent.nodes.reviewer import _build_review_context, _file_summary, reviewer_node
+from app.agent.state import create_initial_state
+
+pytestmark = pytest.mark.unit
+
+APPROVED = "===VERDICT===\nAPPROVED\n===ISSUES===\nNone"
+REJECTED = "===VERDICT===\nNEEDS_CHANGES\n===ISSUES===\n- handle empty input"
+
+
+def _file(path: str, content: str) -> dict:
+    return {"path": path, "original_content": None, "new_content": content, "change_type": "create"}
+
+
+def _big_module(name: str, functions: int = 40) -> str:
+    return "\n".join(f"def {name}_{i}(x):\n    return x + {i}\n" for i in range(functions))
+
+
+def _state(files: dict[str, str], approved: dict[str, str] | None = None):
+    state = create_initial_state(
+        user_id="u1",
+        project_id="p1",
+        project_path="/tmp/proj",
+        goal="Build an API",
+        session_id="s1",
+    )
+    state["plan"] = [
+        {"index": 0, "description": "Models", "status": "completed", "files_to_modify": ["models.py"]},
+        {"index": 1, "description": "Handlers", "status": "in_progress", "files_to_modify": ["handlers.py"]},
+    ]
+    state["current_step_index"] = 1
+    state["last_tool_output"] = "ok"
+    state["last_command_exit_code"] = 0
+    state["working_files"] = {path: _file(path, content) for path, content in files.items()}
+    state["approved_files"] = approved or {}
+    return state
+
+
+async def _review(state, verdict: str) -> tuple[dict, str]:
+    llm = MagicMock()
+    llm.ainvoke = AsyncMock(return_value=MagicMock(content=verdict))
+    with patch("app.agent.nodes.reviewer.create_tracked_llm", AsyncMock(return_value=llm)):
+        update = await reviewer_node(state)
+    sent = "".join(message_text(m) for m in llm.ainvoke.await_args.args[0][1:])
+    return update, sent
+
+
+class TestReviewContext:
+    def test_unapproved_files_are_sent_as_new_file_diffs(self):
+        stable, volatile = _build_review_context(_state({"models.py": "class User:\n    pass\n"}))
+
+        assert "--- /dev/null" in volatile and "+++ b/models.py" in volatile
+        assert "+class User:" in volatile
+        assert "models.py" not in stable
+
+    def test_approved_files_are_summarised_not_resent(self):
+        models = _big_module("model")
+        state = _state({"models.py": models, "handlers.py": "def get():\n    return 1\n"}, {"models.py": models})
+
+        stable, volatile = _build_review_context(state)
+
+        assert "- models.py: 120 lines; defines model_0, model_1" in stable
+        assert "return x + 7" not in stable + volatile
+        assert "+++ b/handlers.py" in volatile
+
+    def test_modified_file_sends_only_the_hunk(self):
+        before = _big_module("h")
+        after = before.replace("return x + 20", "return x - 20")
+        stable, volatile = _build_review_context(_state({"handlers.py": after}, {"handlers.py": before}))
+
+        assert "-    return x + 20" in volatile and "+    return x - 20" in volatile
+        assert "return x + 5\n" not in volatile
+
+    def test_summary_is_cached_by_content_hash(self):
+        content = "export function a() {}\nexport const b = 1\n"
+        with patch.object(reviewer, "_SYMBOL_RE", wraps=reviewer._SYMBOL_RE) as pattern:
+            reviewer._summary_cache.clear()
+            first = _file_summary(content)
+            second = _file_summary(content)
+
+        assert first == second == "3 lines; defines a, b"
+        assert pattern.findall.call_count == 1
+
+
+class TestReviewerApprovalBaseline:
+    async def test_approval_records_reviewed_content(self):
+        update, _ = await _review(
+            _state({"models.py": "A = 1", "handlers.py": "B = 2"}, {"models.py": "A = 1"}), APPROVED
+        )
+
+        assert update["approved_files"] == {"handlers.py": "B = 2"}
+
+    async def test_rejection_keeps_the_baseline(self):
+        update, _ = await _review(_state({"handlers.py": "B = 2"}), REJECTED)
+
+        assert "approved_files" not in update
+
+    async def test_retry_after_one_file_fix_sends_far_less(self):
+        """A debugger fix to one file must not re-send the approved project."""
+        files = {f"mod{i}.py": _big_module(f"m{i}") for i in range(6)}
+        first_state = _state(files)
+        update, first = await _review(first_state, APPROVED)
+
+        fixed = {**files, "mod3.py": files["mod3.py"].replace("return x + 1\n", "return x + 100\n", 1)}
+        _, second = await _review(_state(fixed, update["approved_files"]), APPROVED)
+
+        assert "+    return x + 100" in second
+        assert len(second) < len(first) / 5
@@ -0,0 +1,189 @@
+"""Tests for token-budgeted file context assembly."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from langchain_core.messages import AIMessageChunk
+
+from app.agent import context_builder
+from app.agent.context_builder import (
+    build_file_context,
+    error_paths,
+    estimate_tokens,
+    import_graph,
+    pack,
+    rank_files,
+    report_context,
+)
+from app.agent.nodes.coder import coder_node
+from app.agent.nodes.debugger import debugger_node
+from app.agent.state import create_initial_state
+
+pytestmark = pytest.mark.unit
+
+
+def _files(contents: dict[str, str]) -> dict:
+    return {
+        path: {"path": path, "original_content": None, "new_content": content, "change_type": "create"}
+        for path, content in contents.items()
+    }
+
+
+PROJECT = {
+    "app/main.py": "from app.routes import router\n\napp = make(router)\n",
+    "app/routes.py": "from .models import User\n\nrouter = []\n",
+    "app/models.py": "class User:\n    pass\n",
+    "app/unrelated.py": "X = 1\n",
+    "src/pages/Home.tsx": "import { Button } from '../components/Button'\nimport api from '@/lib/api'\n",
+    "src/components/Button.tsx": "export function Button() { return null }\n",
+    "src/lib/api.ts": "import axios from 'axios'\nexport default axios\n",
+}
+
+
+def _state(step_files: list[str], contents: dict[str, str] | None = None, errors: list | None = None):
+    state = create_initial_state("u1", "p1", "/tmp/p", "goal", session_id="s1")
+    state["plan"] = [{"index": 0, "description": "Do it", "status": "in_progress", "files_to_modify": step_files}]
+    state["working_files"] = _files(contents or PROJECT)
+    state["active_errors"] = errors or []
+    return state
+
+
+class TestImportGraph:
+    def test_python_absolute_and_relative_imports(self):
+        graph = import_graph(_files(PROJECT))
+
+        assert graph["app/main.py"] == {"app/routes.py"}
+        assert graph["app/routes.py"] == {"app/main.py", "app/models.py"}
+        assert graph["app/unrelated.py"] == set()
+
+    def test_javascript_relative_and_alias_imports(self):
+        graph = import_graph(_files(PROJECT))
+
+        assert graph["src/pages/Home.tsx"] == {"src/components/Button.tsx", "src/lib/api.ts"}
+        # Package imports are not project files
+        assert graph["src/lib/api.ts"] == {"src/pages/Home.tsx"}
+
+    def test_imports_are_parsed_once_per_content(self):
+        context_builder._import_cache.clear()
+        files = _files(PROJECT)
+        with patch.object(context_builder, "get_knowledge_graph", wraps=context_builder.get_knowledge_graph) as kg:
+            import_graph(files)
+            import_graph(files)
+        assert kg.call_count == len(PROJECT)
+
+
+class TestRanking:
+    def test_targets_then_errors_then_neighbours(self):
+        errors = [
+            {
+                "error_type": "test_failure",
+                "message": "",
+                "stdout": "",
+                "file_path": None,
+                "stderr": 'File "app/models.py", line 2\n    pass\nIndentationError',
+            }
+        ]
+        ranked = rank_files(_state(["src/pages/Home.tsx"], errors=errors))
+
+        assert ranked[:2] == ["src/pages/Home.tsx", "app/models.py"]
+        # Neighbours of the target and of the errored file, before unrelated files
+        assert set(ranked[2:5]) == {"app/routes.py", "src/components/Button.tsx", "src/lib/api.ts"}
+        assert ranked.index("app/unrelated.py") > 4
+
+    def test_error_paths_use_file_path_and_trace_text(self):
+        files = _files(PROJECT)
+        errors = [{"file_path": "app/main.py", "message": "boom in app/routes.py", "stdout": "", "stderr": ""}]
+        assert error_paths(errors, files) == {"app/main.py", "app/routes.py"}
+
+
+class TestPacking:
+    def test_estimate_is_chars_over_ratio(self):
+        assert estimate_tokens("x" * 35) == 10
+        assert estimate_tokens("") == 0
+
+    def test_whole_then_truncated_then_omitted(self):
+        sections = [("a.py", "a" * 700), ("b.py", "b" * 3500), ("c.py", "c" * 70)]
+
+        packed = pack(sections, budget=600)
+
+        assert packed.included == ["a.py", "b.py"]
+        assert packed.truncated == ["b.py"]
+        assert packed.omitted == ["c.py"]
+        assert packed.tokens <= 600
+        assert "... [truncated]" in packed.render()
+        assert "(Not shown, over the context budget: c.py)" in packed.render()
+
+    def test_small_remainder_is_not_truncated_into(self):
+        packed = pack([("a.py", "a" * 1400), ("b.py", "b" * 7000)], budget=500)
+        assert packed.included == ["a.py"] and packed.omitted == ["b.py"]
+
+    def test_build_file_context_prefers_step_files_under_budget(self):
+        contents = {**PROJECT, "big.py": "z" * 20_000}
+        packed = build_file_context(_state(["app/routes.py"], contents), "coder", budget=300)
+
+        assert packed.included[0] == "app/routes.py"
+        assert "big.py" in packed.omitted
+        assert packed.tokens <= 300
+
+
+class TestNodes:
+    async def test_coder_prompt_carries_ranked_contents_and_reports_tokens(self):
+        captured = {}
+
+        async def astream(messages):
+            captured["prompt"] = messages[-1].content
+            yield AIMessageChunk(content="===FILE: app/routes.py===\nrouter = [1]\n===END FILE===")
+
+        llm = MagicMock()
+        llm.astream = astream
+        with (
+            patch("app.agent.nodes.coder.create_tracked_llm", AsyncMock(return_value=llm)),
+            patch("app.agent.context_builder.emit_context_tokens", new=AsyncMock()) as emit,
+        ):
+            await coder_node(_state(["app/routes.py"]))
+
+        assert "=== app/routes.py ===\nfrom .models import User" in captured["prompt"]
+        role, context_tokens, prompt_tokens, budget = emit.await_args.args
+        assert role == "coder" and 0 < context_tokens <= budget
+        assert prompt_tokens > context_tokens
+
+    async def test_debugger_sees_file_named_in_trace(self):
+        errors = [
+            {
+                "step_index": 0,
+                "error_type": "test_failure",
+                "message": "Tests failed",
+                "stdout": "",
+                "stderr": 'File "app/models.py", line 2',
+                "file_path": None,
+            }
+        ]
+        state = _state(["app/main.py"], errors=errors)
+        llm = MagicMock()
+        llm.ainvoke = AsyncMock(return_value=MagicMock(content="===ANALYSIS===\nx\n===FIX===\ny\n===FILES===\n"))
+
+        with (
+            patch("app.agent.nodes.debugger.create_tracked_llm", AsyncMock(return_value=llm)),
+            patch("app.agent.context_builder.emit_context_tokens", new=AsyncMock()),
+            patch.object(context_builder, "budget_for", return_value=40),
+        ):
+            await debugger_node(state)
+
+        _, human = llm.ainvoke.await_args.args[0]
+        stable, volatile = (block["text"] for block in human.content)
+        # With room for two files: the step's file, then the one in the trace
+        assert "=== app/main.py ===" in volatile
+        assert "=== app/models.py ===" in stable
+        assert "Not shown" in stable and "app/unrelated.py" in stable
+
+
+async def test_report_context_logs_budget_use():
+    packed = pack([("a.py", "a" * 70)], budget=100)
+    with (
+        patch("app.agent.context_builder.emit_context_tokens", new=AsyncMock()) as emit,
+        patch.object(context_builder, "logger") as log,
+    ):
+        await report_context("reviewer", _state([]), packed, [MagicMock(content="x" * 350)])
+
+    emit.assert_awaited_once_with("reviewer", packed.tokens, 100, 100)
+    assert log.info.call_args.kwargs["files_included"] == 1
@@ -0,0 +1,211 @@
+"""Tests for dependency-scheduled parallel plan steps in the LangGraph pipeline."""
+
+import asyncio
+import json
+import re
+import time
+from unittest.mock import patch
+
+import pytest
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+from app.agent.graph import create_cofounder_graph, dispatch_steps, merge_steps_node, ready_steps
+from app.agent.nodes.architect import _resolve_dependencies
+from app.agent.state import create_initial_state, merge_files
+
+pytestmark = pytest.mark.unit
+
+LATENCY = 0.05
+
+
+def _plan(*deps: list[int]) -> list[dict]:
+    return [
+        {
+            "index": i,
+            "description": f"step {i}",
+            "status": "pending",
+            "files_to_modify": [f"f{i}.py"],
+            "depends_on": d,
+        }
+        for i, d in enumerate(deps)
+    ]
+
+
+def _state(plan: list[dict]) -> dict:
+    state = create_initial_state("u1", "p1", "/tmp/p", "goal", session_id="s1")
+    state["plan"] = plan
+    return state
+
+
+class _StubLLM:
+    """Canned per-role responses; the reviewer rejects each step listed in reject once."""
+
+    def __init__(self, role: str, plan: list[dict], reject: set[str]):
+        self.role = role
+        self.plan = plan
+        self.reject = reject
+
+    def _respond(self, messages) -> str:
+        prompt = messages[-1].content if isinstance(messages[-1].content, str) else json.dumps(messages[-1].content)
+        if self.role == "architect":
+            return json.dumps(self.plan)
+        if self.role == "reviewer":
+            for step in sorted(self.reject):
+                if f"Current Step: {step}" in prompt:
+                    self.reject.discard(step)
+                    return "===VERDICT===\nNEEDS_CHANGES\n===ISSUES===\n- rename things\n"
+            return "===VERDICT===\nAPPROVED\n===ISSUES===\nNone\n"
+        description = re.search(r"Current Step \(\d+/\d+\):\n(.+)", prompt).group(1)
+        step = next(s for s in self.plan if s["description"] == description)
+        return "".join(f"===FILE: {p}===\n# {step['description']}\n===END FILE===\n" for p in step["files_to_modify"])
+
+    async def ainvoke(self, messages):
+        await asyncio.sleep(LATENCY)
+        return AIMessage(content=self._respond(messages))
+
+    async def astream(self, messages):
+        await asyncio.sleep(LATENCY)
+        yield AIMessageChunk(content=self._respond(messages))
+
+
+class _NoMemory:
+    async def get_context_for_prompt(self, **kwargs) -> str:
+        return ""
+
+
+async def _executor(state) -> dict:
+    return {"last_tool_output": "ok", "last_command_exit_code": 0, "active_errors": [], "messages": []}
+
+
+async def _run(
+    plan: list[dict], max_parallel_steps: int, reject: set[str] | None = None, executor=_executor
+) -> tuple[float, dict]:
+    reject = set(reject or ())
+
+    async def tracked_llm(user_id, role, session_id=None):
+        return _StubLLM(role, plan, reject)
+
+    with (
+        patch("app.agent.nodes.architect.create_tracked_llm", tracked_llm),
+        patch("app.agent.nodes.coder.create_tracked_llm", tracked_llm),
+        patch("app.agent.nodes.reviewer.create_tracked_llm", tracked_llm),
+        patch("app.agent.nodes.architect.get_semantic_memory", return_value=_NoMemory()),
+        patch("app.agent.graph.executor_node", executor),
+    ):
+        graph = create_cofounder_graph(max_parallel_steps=max_parallel_steps)
+        state = create_initial_state("u1", "p1", "/tmp/p", "goal", session_id=f"s-{max_parallel_steps}")
+        start = time.perf_counter()
+        final = await graph.ainvoke(state, config={"configurable": {"thread_id": state["session_id"]}})
+    return time.perf_counter() - start, final
+
+
+class TestResolveDependencies:
+    def test_missing_depends_on_runs_sequentially(self):
+        steps = [{"files_to_modify": ["a"]}, {"files_to_modify": ["b"]}, {"files_to_modify": ["c"]}]
+        assert _resolve_dependencies(steps) == [[], [0], [1]]
+
+    def test_step_zero_is_implicit_and_forward_refs_dropped(self):
+        steps = [
+            {"files_to_modify": ["package.json"], "depends_on": []},
+            {"files_to_modify": ["a.tsx"], "depends_on": [2, 7, "x"]},
+            {"files_to_modify": ["b.tsx"], "depends_on": []},
+        ]
+        assert _resolve_dependencies(steps) == [[], [0], [0]]
+
+    def test_steps_sharing_a_file_are_ordered(self):
+        steps = [
+            {"files_to_modify": ["package.json"], "depends_on": []},
+            {"files_to_modify": ["a.tsx", "shared.ts"], "depends_on": [0]},
+            {"files_to_modify": ["shared.ts"], "depends_on": [0]},
+        ]
+        assert _resolve_dependencies(steps)[2] == [0, 1]
+
+
+class TestScheduling:
+    def test_ready_steps_wait_for_dependencies(self):
+        plan = _plan([], [0], [0], [1, 2])
+        assert ready_steps(_state(plan)) == [0]
+        plan[0]["status"] = "completed"
+        plan[1]["status"] = "completed"
+        assert ready_steps(_state(plan)) == [2]
+
+    def test_steps_without_depends_on_wait_for_all_earlier_steps(self):
+        plan = _plan([], [])
+        for step in plan:
+            del step["depends_on"]
+        assert ready_steps(_state(plan)) == [0]
+
+    def test_dispatch_caps_fan_out(self):
+        plan = _plan([], [0], [0], [0], [0])
+        plan[0]["status"] = "completed"
+        sends = dispatch_steps(_state(plan), max_parallel_steps=3)
+        assert [s.arg["current_step_index"] for s in sends] == [1, 2, 3]
+        assert all(s.node == "step" for s in sends)
+
+    def test_dispatch_routes_terminal_states(self):
+        state = _state(_plan([]))
+        assert dispatch_steps({**state, "is_complete": True}, 3) == "git_manager"
+        assert dispatch_steps({**state, "needs_human_review": True}, 3) == "end"
+        assert dispatch_steps({**state, "plan": []}, 3) == "end"
+
+    def test_merge_marks_plan_and_escalates_failures(self):
+        state = _state(_plan([], [0], [0]))
+        ok = {"index": 0, "status": "completed", "retry_count": 0, "needs_human_review": False}
+        bad = {"index": 2, "status": "failed", "retry_count": 5, "needs_human_review": True}
+        for r in (ok, bad):
+            r.update(has_fatal_error=False, active_errors=[], last_tool_output="", last_command_exit_code=0)
+        state["step_results"] = [ok, bad]
+
+        update = merge_steps_node(state)
+
+        assert [s["status"] for s in update["plan"]] == ["completed", "pending", "failed"]
+        assert update["needs_human_review"] is True
+        assert update["is_complete"] is False
+        assert update["retry_count"] == 5
+
+    def test_working_files_reducer_merges(self):
+        a = {"path": "a", "original_content": None, "new_content": "1", "change_type": "create"}
+        b = {**a, "path": "b"}
+        assert merge_files({"a": a}, {"b": b}) == {"a": a, "b": b}
+
+
+class TestParallelGraph:
+    async def test_same_files_as_sequential_and_faster(self):
+        plan = _plan([], [0], [0], [0], [0], [0], [0])
+
+        sequential, seq = await _run(plan, max_parallel_steps=1)
+        parallel, par = await _run(plan, max_parallel_steps=3)
+
+        assert par["working_files"] == seq["working_files"]
+        assert set(par["working_files"]) == {f"f{i}.py" for i in range(7)}
+        assert all(step["status"] == "completed" for step in par["plan"])
+        assert par["is_complete"] is True
+        # 7 sequential steps vs. 3 waves (scaffold, then 2 waves of 3)
+        assert parallel < sequential * 0.7
+
+    async def test_rejected_step_retries_on_its_own_branch(self):
+        plan = _plan([], [0], [0])
+
+        _, final = await _run(plan, max_parallel_steps=3, reject={"step 2"})
+
+        assert all(step["status"] == "completed" for step in final["plan"])
+        rejections = [m for m in final["messages"] if m.get("node") == "reviewer" and "found issues" in m["content"]]
+        assert len(rejections) == 1
+        # The retry count belongs to the branch and does not leak into the parent
+        assert final["retry_count"] == 0
+
+    async def test_dependent_step_sees_dependency_files(self):
+        plan = _plan([], [0], [0], [1, 2])
+        seen: dict[int, set[str]] = {}
+
+        async def executor(state) -> dict:
+            seen[state["current_step_index"]] = set(state["working_files"])
+            return await _executor(state)
+
+        _, final = await _run(plan, max_parallel_steps=3, executor=executor)
+
+        # Siblings build on the scaffold only; the join step sees both of them
+        assert seen[1] == {"f0.py", "f1.py"}
+        assert seen[2] == {"f0.py", "f2.py"}
+        assert seen[3] == {"f0.py", "f1.py", "f2.py", "f3.py"}
+        assert set(final["working_files"]) == {"f0.py", "f1.py", "f2.py", "f3.py"}
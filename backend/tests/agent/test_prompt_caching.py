@@ -0,0 +1,150 @@
+"""Tests for Anthropic prompt-cache markers and cache-aware usage accounting."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, LLMResult
+
+from app.agent.llm_helpers import CACHE_CONTROL, cacheable_context, cacheable_system, message_text
+from app.agent.nodes.reviewer import _build_review_context, reviewer_node
+from app.agent.state import create_initial_state
+from app.core.llm_config import UsageTrackingCallback, _calculate_cost
+
+pytestmark = pytest.mark.unit
+
+
+def _state():
+    state = create_initial_state(
+        user_id="u1",
+        project_id="p1",
+        project_path="/tmp/proj",
+        goal="Build a todo app",
+        session_id="s1",
+    )
+    state["plan"] = [
+        {"index": 0, "description": "Scaffold", "status": "completed", "files_to_modify": ["package.json"]},
+        {"index": 1, "description": "Add list page", "status": "in_progress", "files_to_modify": ["app/page.tsx"]},
+    ]
+    state["current_step_index"] = 1
+    state["last_tool_output"] = "tests passed"
+    state["working_files"] = {
+        "package.json": {
+            "path": "package.json",
+            "original_content": None,
+            "new_content": "{}",
+            "change_type": "create",
+        },
+        "app/page.tsx": {
+            "path": "app/page.tsx",
+            "original_content": None,
+            "new_content": "export default 1",
+            "change_type": "create",
+        },
+    }
+    return state
+
+
+def test_cacheable_system_puts_retry_suffix_after_breakpoint():
+    message = cacheable_system("static prompt", suffix="Respond with JSON only.")
+
+    assert message.content[0] == {"type": "text", "text": "static prompt", "cache_control": CACHE_CONTROL}
+    assert "cache_control" not in message.content[1]
+    assert message_text(message) == "static promptRespond with JSON only."
+
+
+def test_cacheable_context_omits_empty_volatile_block():
+    assert len(cacheable_context("stable", "").content) == 1
+
+
+def test_review_context_keeps_unapproved_files_out_of_cached_block():
+    state = _state()
+    state["approved_files"] = {"package.json": "{}"}
+
+    stable, volatile = _build_review_context(state)
+
+    assert "package.json" in stable and "app/page.tsx" not in stable
+    assert "app/page.tsx" in volatile and "Add list page" in volatile
+
+
+async def test_reviewer_marks_system_and_stable_context():
+    llm = MagicMock()
+    llm.ainvoke = AsyncMock(return_value=MagicMock(content="===VERDICT===\nAPPROVED\n===ISSUES===\nNone"))
+
+    with patch("app.agent.nodes.reviewer.create_tracked_llm", AsyncMock(return_value=llm)):
+        await reviewer_node(_state())
+
+    system, human = llm.ainvoke.await_args.args[0]
+    assert system.content[-1]["cache_control"] == CACHE_CONTROL
+    assert human.content[0]["cache_control"] == CACHE_CONTROL
+    assert "cache_control" not in human.content[1]
+
+
+def test_cost_prices_cache_reads_and_writes():
+    model = "claude-sonnet-4-20250514"
+    uncached = _calculate_cost(model, 10_000, 1_000)
+
+    # Same 10k prompt tokens: 9k read from cache, 1k uncached
+    assert _calculate_cost(model, 1_000, 1_000, cache_read_tokens=9_000) == 3_000 + 15_000 + 2_700
+    assert _calculate_cost(model, 1_000, 1_000, cache_read_tokens=9_000) < uncached
+    # Writing the cache costs 25% more than plain input
+    assert _calculate_cost(model, 0, 0, cache_write_tokens=10_000) == 37_500
+
+
+async def test_callback_records_cache_tokens():
+    ledger = MagicMock()
+    redis = MagicMock()
+    redis.pipeline.return_value.execute = AsyncMock()
+    response = LLMResult(
+        generations=[[ChatGeneration(message=AIMessage(content="ok"))]],
+        llm_output={
+            "usage": {
+                "input_tokens": 50,
+                "output_tokens": 10,
+                "cache_read_input_tokens": 2_000,
+                "cache_creation_input_tokens": 300,
+            }
+        },
+    )
+
+    with (
+        patch("app.core.llm_config.get_usage_ledger", return_value=ledger),
+        patch("app.core.llm_config.get_redis", return_value=redis),
+    ):
+        await UsageTrackingCallback("u1", "s1", "reviewer", "claude-sonnet-4-20250514").on_llm_end(response)
+
+    record = ledger.record.call_args.args[0]
+    assert (record.cache_read_tokens, record.cache_write_tokens) == (2_000, 300)
+    assert record.total_tokens == 2_360
+    assert record.cost_microdollars == _calculate_cost("claude-sonnet-4-20250514", 50, 10, 2_000, 300)
+    redis.pipeline.return_value.incrby.assert_called_once_with(
+        redis.pipeline.return_value.incrby.call_args.args[0], 2_360
+    )
+
+
+async def test_callback_reads_usage_metadata_from_streamed_calls():
+    """astream results carry only usage_metadata, whose input_tokens includes cache tokens."""
+    ledger = MagicMock()
+    redis = MagicMock()
+    redis.pipeline.return_value.execute = AsyncMock()
+    message = AIMessage(
+        content="ok",
+        usage_metadata={
+            "input_tokens": 2_350,
+            "output_tokens": 10,
+            "total_tokens": 2_360,
+            "input_token_details": {"cache_read": 2_000, "cache_creation": 300},
+        },
+    )
+    response = LLMResult(generations=[[ChatGeneration(message=message)]])
+
+    with (
+        patch("app.core.llm_config.get_usage_ledger", return_value=ledger),
+        patch("app.core.llm_config.get_redis", return_value=redis),
+    ):
+        await UsageTrackingCallback("u1", "s1", "coder", "claude-sonnet-4-20250514").on_llm_end(response)
+
+    record = ledger.record.call_args.args[0]
+    assert (record.input_tokens, record.output_tokens) == (50, 10)
+    assert (record.cache_read_tokens, record.cache_write_tokens) == (2_000, 300)
+    assert record.total_tokens == 2_360
@@ -0,0 +1,147 @@
+"""Tests for the RunnerReal Redis response cache."""
+
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import fakeredis
+import pytest
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from app.agent.response_cache import cache_key, cache_response, get_cached_response, prompt_hash
+from app.agent.runner_real import RunnerReal
+from app.artifacts.generator import ArtifactGenerator
+from app.schemas.artifacts import ArtifactType
+
+pytestmark = pytest.mark.unit
+
+ARTIFACTS = {"brief": {"problem_statement": "p"}, "mvp_scope": {}, "milestones": {}, "risk_log": {}, "how_it_works": {}}
+
+
+@pytest.fixture
+def redis():
+    client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    with patch("app.db.redis.get_redis", return_value=client):
+        yield client
+
+
+@pytest.fixture
+def enabled():
+    settings = MagicMock(llm_response_cache_ttl_seconds=600)
+    with patch("app.agent.response_cache.get_settings", return_value=settings):
+        yield settings
+
+
+@pytest.fixture
+def emit():
+    with patch("app.agent.response_cache.emit_llm_cache", new=AsyncMock()) as mock:
+        yield mock
+
+
+def _llm(*contents: str):
+    llm = MagicMock()
+    llm.model = "claude-sonnet"
+    llm.ainvoke = AsyncMock(side_effect=[MagicMock(content=c) for c in contents])
+
+    async def factory(**kwargs):
+        return llm
+
+    return factory, llm
+
+
+class TestKeys:
+    def test_whitespace_is_normalized(self):
+        a = [SystemMessage(content="Be  helpful.\n"), HumanMessage(content="Idea:\tX")]
+        b = [SystemMessage(content=[{"type": "text", "text": "Be helpful."}]), HumanMessage(content="Idea: X")]
+        assert prompt_hash(a) == prompt_hash(b)
+
+    def test_role_method_and_model_are_part_of_the_key(self):
+        human = [HumanMessage(content="x")]
+        assert prompt_hash(human) != prompt_hash([SystemMessage(content="x")])
+        assert cache_key("generate_brief", "m1", human) != cache_key("generate_artifacts", "m1", human)
+        assert cache_key("generate_brief", "m1", human) != cache_key("generate_brief", "m2", human)
+        assert cache_key("generate_brief", "m1", human).startswith("cofounder:llm_cache:generate_brief:m1:")
+
+
+class TestStore:
+    async def test_round_trip_with_ttl_and_metrics(self, redis, enabled, emit):
+        messages = [HumanMessage(content="x")]
+
+        assert await get_cached_response("generate_brief", "m", messages) is None
+        await cache_response("generate_brief", "m", messages, {"a": 1})
+
+        assert await get_cached_response("generate_brief", "m", messages) == {"a": 1}
+        assert 0 < await redis.ttl(cache_key("generate_brief", "m", messages)) <= 600
+        assert [c.args for c in emit.await_args_list] == [("generate_brief", False), ("generate_brief", True)]
+
+    async def test_disabled_by_default(self, redis, emit):
+        messages = [HumanMessage(content="x")]
+        await cache_response("generate_brief", "m", messages, {"a": 1})
+
+        assert await redis.keys("*") == []
+        assert await get_cached_response("generate_brief", "m", messages) is None
+        emit.assert_not_awaited()
+
+    async def test_redis_errors_are_misses(self, enabled, emit):
+        with patch("app.db.redis.get_redis", side_effect=RuntimeError("Redis not initialized")):
+            await cache_response("generate_brief", "m", [HumanMessage(content="x")], {"a": 1})
+            assert await get_cached_response("generate_brief", "m", [HumanMessage(content="x")]) is None
+
+
+class TestRunnerReal:
+    async def test_repeat_call_is_served_from_cache(self, redis, enabled, emit):
+        factory, llm = _llm(json.dumps(ARTIFACTS))
+        runner = RunnerReal()
+        with (
+            patch("app.agent.runner_real.create_tracked_llm", factory),
+            patch("app.agent.runner_real.emit_llm_latency", new=AsyncMock()),
+        ):
+            first = await runner.generate_artifacts({"idea": "Dog walking", "_user_id": "u1"})
+            # Internal keys are not part of the prompt, so another user's identical brief hits too
+            second = await runner.generate_artifacts({"idea": "Dog walking", "_user_id": "u2"})
+
+        assert first == second == ARTIFACTS
+        assert llm.ainvoke.await_count == 1
+
+    async def test_regenerate_bypasses_lookup_and_refreshes_entry(self, redis, enabled, emit):
+        fresh = {**ARTIFACTS, "brief": {"problem_statement": "fresh"}}
+        factory, llm = _llm(json.dumps(ARTIFACTS), json.dumps(fresh))
+        runner = RunnerReal()
+        with (
+            patch("app.agent.runner_real.create_tracked_llm", factory),
+            patch("app.agent.runner_real.emit_llm_latency", new=AsyncMock()),
+        ):
+            await runner.generate_artifacts({"idea": "Dog walking"})
+            regenerated = await runner.generate_artifacts({"idea": "Dog walking", "_regenerate": True})
+            after = await runner.generate_artifacts({"idea": "Dog walking"})
+
+        assert regenerated == after == fresh
+        assert llm.ainvoke.await_count == 2
+
+    async def test_section_confidence_is_cached_per_section(self, redis, enabled, emit):
+        factory, llm = _llm("strong", "needs_depth")
+        runner = RunnerReal()
+        with (
+            patch("app.agent.runner_real.create_tracked_llm", factory),
+            patch("app.agent.runner_real.emit_llm_latency", new=AsyncMock()),
+        ):
+            results = [
+                await runner.assess_section_confidence("target_user", "Dog owners in NYC, 40 interviews"),
+                await runner.assess_section_confidence("target_user", "Dog owners in NYC, 40 interviews"),
+                await runner.assess_section_confidence("risks", "Unclear"),
+            ]
+
+        assert results == ["strong", "strong", "needs_depth"]
+        assert llm.ainvoke.await_count == 2
+
+
+async def test_artifact_regeneration_marks_the_brief_context():
+    runner = MagicMock()
+    runner.generate_artifacts = AsyncMock(return_value=ARTIFACTS)
+    generator = ArtifactGenerator(runner)
+
+    await generator.generate_artifact(ArtifactType.BRIEF, {"idea": "x"})
+    await generator.generate_artifact(ArtifactType.BRIEF, {"idea": "x"}, regenerate=True)
+
+    first, second = (c.args[0] for c in runner.generate_artifacts.await_args_list)
+    assert "_regenerate" not in first
+    assert second["_regenerate"] is True
@@ -9,6 +9,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from app.agent.llm_helpers import message_text
 from app.agent.runner_real import RunnerReal
 
 pytestmark = pytest.mark.unit
@@ -280,7 +281,7 @@ class TestTierDifferentiation:
             )
 
         call_args = mock_llm.ainvoke.call_args[0][0]
-        system_content = call_args[0].content
+        system_content = message_text(call_args[0])
         assert "6-8" in system_content
 
     @pytest.mark.asyncio
@@ -310,7 +311,7 @@ class TestTierDifferentiation:
             )
 
         call_args = mock_llm.ainvoke.call_args[0][0]
-        system_content = call_args[0].content
+        system_content = message_text(call_args[0])
         assert "14-16" in system_content
 
 
@@ -331,5 +332,5 @@ class TestCofounderVoice:
 
         # Check the system message content
         call_args = mock_llm.ainvoke.call_args[0][0]  # first positional arg (messages list)
-        system_content = call_args[0].content  # first message is system
+        system_content = message_text(call_args[0])  # first message is system
         assert "co-founder" in system_content.lower() or "we" in system_content.lower()
@@ -196,6 +196,7 @@ async def test_events_stream_returns_streaming_response(fake_redis, user_a):
     from fastapi.responses import StreamingResponse
 
     from app.api.routes.jobs import stream_job_events
+    from app.services.job_stream_broadcaster import JobStreamBroadcaster
 
     job_id = f"test-events-active-{uuid.uuid4().hex[:8]}"
     await _seed_job(fake_redis, job_id, _USER_A_ID, "scaffold")
@@ -209,6 +210,7 @@ async def test_events_stream_returns_streaming_response(fake_redis, user_a):
         request=mock_request,
         user=user_a,
         redis=fake_redis,
+        broadcaster=JobStreamBroadcaster(fake_redis),
     )
 
     assert isinstance(response, StreamingResponse)
@@ -26,6 +26,7 @@ from app.core.auth import ClerkUser, require_auth, require_build_subscription, r
 from app.db.redis import get_redis
 from app.queue.schemas import JobStatus
 from app.queue.state_machine import JobStateMachine
+from tests.conftest import BulkWriteMixin
 
 pytestmark = pytest.mark.integration
 
@@ -495,7 +496,7 @@ def test_workspace_files_expected():
             def set_timeout(self, t):
                 pass
 
-        class _FakeSandboxRuntime:
+        class _FakeSandboxRuntime(BulkWriteMixin):
             files: dict = {}
             _started = False
             _sandbox = _FakeSandboxInner()
@@ -7,6 +7,7 @@ Tests:
 4. test_resume_expired                  — POST /resume with mocked SandboxExpiredError → 503 error_type=sandbox_expired
 5. test_resume_unreachable              — POST /resume with mocked SandboxUnreachableError → 503 error_type=sandbox_unreachable
 6. test_resume_not_found                — POST /resume on nonexistent job → 404
+7. test_resume_expired_restores_from_snapshot — SandboxExpiredError + stored snapshot → 200, new sandbox_id
 
 Pattern: minimal FastAPI app with generation router, fakeredis, no real sandbox connections.
 """
@@ -25,7 +26,7 @@ from app.core.auth import ClerkUser, require_auth
 from app.db.redis import get_redis
 from app.queue.schemas import JobStatus
 from app.queue.state_machine import JobStateMachine
-from app.services.resume_service import SandboxExpiredError, SandboxUnreachableError
+from app.services.resume_service import RestoreResult, SandboxExpiredError, SandboxUnreachableError
 
 pytestmark = pytest.mark.unit
 
@@ -274,3 +275,42 @@ def test_resume_not_found(app_client):
     response = client.post(f"/api/generation/{nonexistent_job_id}/resume")
 
     assert response.status_code == 404, f"Expected 404, got {response.status_code}: {response.json()}"
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Test 7: expired sandbox with a workspace snapshot → restored into a new sandbox
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+def test_resume_expired_restores_from_snapshot(app_client):
+    """POST /resume on an expired sandbox restores the build's snapshot instead of failing."""
+    client, fake_redis, test_user = app_client
+    job_id = _create_ready_job(fake_redis, test_user.user_id, sandbox_id="sbx_expired_002")
+    asyncio.run(fake_redis.hset(f"job:{job_id}", "build_version", "build_v0_2"))
+
+    async def mock_resume_expired(sandbox_id: str, workspace_path: str) -> str:
+        raise SandboxExpiredError("Sandbox sbx_expired_002 not found")
+
+    restore = AsyncMock(
+        return_value=RestoreResult(
+            preview_url="https://3000-sbx-restored.e2b.app",
+            sandbox_id="sbx-restored",
+            file_count=12,
+            restore_seconds=9.5,
+        )
+    )
+    with (
+        patch("app.api.routes.generation.resume_sandbox", mock_resume_expired),
+        patch("app.api.routes.generation.restore_sandbox", restore),
+    ):
+        response = client.post(f"/api/generation/{job_id}/resume")
+
+    assert response.status_code == 200, response.json()
+    assert response.json() == {
+        "preview_url": "https://3000-sbx-restored.e2b.app",
+        "sandbox_id": "sbx-restored",
+        "restored": True,
+    }
+    project_id = asyncio.run(fake_redis.hget(f"job:{job_id}", "project_id"))
+    restore.assert_awaited_once_with(project_id, "build_v0_2", "/home/user/project")
+    assert asyncio.run(fake_redis.hget(f"job:{job_id}", "sandbox_id")) == "sbx-restored"
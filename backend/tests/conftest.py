@@ -4,6 +4,29 @@ import pytest
 
 from app.agent.runner_fake import RunnerFake
 from app.agent.state import create_initial_state
+from app.core.exceptions import SandboxError
+from app.core.llm_config import invalidate_user_settings
+
+
+class BulkWriteMixin:
+    """E2BSandboxRuntime.write_files() for fake runtimes, built on their write_file()."""
+
+    async def write_files(self, files: dict[str, str], archive: bool | None = None) -> dict[str, SandboxError]:
+        failed: dict[str, SandboxError] = {}
+        for path, content in files.items():
+            try:
+                await self.write_file(path, content)
+            except SandboxError as e:
+                failed[path] = e
+        return failed
+
+
+@pytest.fixture(autouse=True)
+def _clear_user_settings_cache():
+    """Tests rewrite UserSettings rows directly; never serve them from a previous test's cache."""
+    invalidate_user_settings()
+    yield
+    invalidate_user_settings()
 
 
 @pytest.fixture
@@ -0,0 +1,62 @@
+"""Tests for compare-and-set writes after LLM calls."""
+
+import pytest
+from sqlalchemy import Column, Integer, String
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase
+
+from app.db.optimistic import update_if_unchanged
+
+pytestmark = pytest.mark.unit
+
+
+class _Base(DeclarativeBase):
+    pass
+
+
+class _Doc(_Base):
+    __tablename__ = "docs"
+
+    id = Column(Integer, primary_key=True)
+    body = Column(String, nullable=False)
+    version_number = Column(Integer, nullable=False)
+
+
+@pytest.fixture
+async def session_factory(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'cas.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(_Base.metadata.create_all)
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with factory() as session:
+        session.add(_Doc(id=1, body="v1", version_number=1))
+        await session.commit()
+    yield factory
+    await engine.dispose()
+
+
+async def test_write_applies_when_version_is_unchanged(session_factory):
+    async with session_factory() as session:
+        assert await update_if_unchanged(session, _Doc, 1, _Doc.version_number, 1, body="v2", version_number=2)
+        await session.commit()
+        doc = await session.get(_Doc, 1)
+
+    assert (doc.body, doc.version_number) == ("v2", 2)
+
+
+async def test_concurrent_change_is_not_overwritten(session_factory):
+    # Two requests read version 1, then both call the LLM; the first writer wins
+    async with session_factory() as session:
+        assert await update_if_unchanged(session, _Doc, 1, _Doc.version_number, 1, body="first", version_number=2)
+        await session.commit()
+    async with session_factory() as session:
+        assert not await update_if_unchanged(session, _Doc, 1, _Doc.version_number, 1, body="second", version_number=2)
+        await session.commit()
+        doc = await session.get(_Doc, 1)
+
+    assert doc.body == "first"
+
+
+async def test_missing_row_is_a_conflict(session_factory):
+    async with session_factory() as session:
+        assert not await update_if_unchanged(session, _Doc, 99, _Doc.version_number, 1, body="x")
@@ -0,0 +1,105 @@
+"""Tests for DB connection-pool telemetry and engine configuration."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.db.base import engine_options
+from app.db.pool_metrics import PoolStats, TimedAsyncQueuePool, instrument_pool
+
+pytestmark = pytest.mark.unit
+
+ASYNCPG_URL = "postgresql+asyncpg://u:p@db:5432/cofounder"
+
+
+def _settings(**overrides) -> MagicMock:
+    values = {
+        "debug": False,
+        "db_pool_size": 5,
+        "db_max_overflow": 10,
+        "db_pool_timeout_seconds": 30.0,
+        "db_pool_recycle_seconds": 1800,
+        "db_pool_pre_ping": False,
+        "db_statement_cache_size": 100,
+        "db_pgbouncer": False,
+    }
+    return MagicMock(**{**values, **overrides})
+
+
+def test_waits_and_events_are_aggregated_and_flushed_per_interval():
+    stats = PoolStats(flush_interval=60.0, service="worker")
+    with (
+        patch("app.db.pool_metrics.emit_db_pool_stats") as emit,
+        patch("app.db.pool_metrics.time.monotonic", side_effect=[10.0, 20.0, 30.0, 40.0, 75.0]),
+    ):
+        stats._reset(0.0)
+        stats.record_wait(0.002)
+        stats.record_checkout(checked_out=6, overflow=1)
+        stats.record_wait(0.010)
+        stats.record_connect()
+        emit.assert_not_called()
+        stats.record_wait(0.004)  # 75s after the window opened: flush
+
+    service, flushed = emit.call_args.args
+    assert service == "worker"
+    assert flushed["wait_count"] == 3
+    assert flushed["wait_total_ms"] == pytest.approx(16.0)
+    assert (flushed["wait_min_ms"], flushed["wait_max_ms"]) == (pytest.approx(2.0), pytest.approx(10.0))
+    assert (flushed["checkouts"], flushed["connects"], flushed["invalidations"]) == (1, 1, 0)
+    assert (flushed["peak_checked_out"], flushed["peak_overflow"]) == (6, 1)
+    assert stats.wait_count == stats.checkouts == 0
+
+
+def test_slow_wait_is_logged():
+    stats = PoolStats()
+    with patch("app.db.pool_metrics.logger") as logger, patch("app.db.pool_metrics.emit_db_pool_stats"):
+        stats.record_wait(0.01)
+        logger.warning.assert_not_called()
+        stats.record_wait(1.5)
+
+    logger.warning.assert_called_once_with("db_pool_wait_slow", service="api", wait_ms=1500.0)
+
+
+async def test_instrumented_pool_records_checkouts_and_invalidations(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}", poolclass=TimedAsyncQueuePool)
+    stats = PoolStats()
+    try:
+        with patch("app.db.pool_metrics.pool_stats", stats):
+            instrument_pool(engine, "worker")
+            for _ in range(3):
+                async with engine.connect() as conn:
+                    await conn.execute(text("SELECT 1"))
+            async with engine.connect() as conn:
+                await conn.invalidate()
+    finally:
+        await engine.dispose()
+
+    assert stats.service == "worker"
+    assert stats.wait_count == stats.checkouts == 4
+    assert stats.connects == 1
+    assert stats.invalidations == 1
+    assert stats.peak_checked_out == 1
+
+
+def test_engine_options_come_from_settings():
+    options = engine_options(_settings(db_pool_size=2, db_max_overflow=0, db_pool_pre_ping=True), ASYNCPG_URL)
+
+    assert options["poolclass"] is TimedAsyncQueuePool
+    assert (options["pool_size"], options["max_overflow"], options["pool_timeout"]) == (2, 0, 30.0)
+    assert (options["pool_recycle"], options["pool_pre_ping"]) == (1800, True)
+    assert options["connect_args"] == {"statement_cache_size": 100}
+
+
+def test_pgbouncer_mode_disables_statement_caches():
+    connect_args = engine_options(_settings(db_pgbouncer=True), ASYNCPG_URL)["connect_args"]
+
+    assert connect_args["statement_cache_size"] == 0
+    assert connect_args["prepared_statement_cache_size"] == 0
+    name_func = connect_args["prepared_statement_name_func"]
+    assert name_func() != name_func()
+
+
+def test_non_asyncpg_urls_get_no_driver_arguments():
+    assert "connect_args" not in engine_options(_settings(db_pgbouncer=True), "sqlite+aiosqlite:///x.db")
@@ -4,6 +4,9 @@ Uses RunnerFake for deterministic, instant test execution.
 Tests cover single artifact generation, cascade logic, partial failure handling, and tier filtering.
 """
 
+import asyncio
+import time
+
 import pytest
 
 from app.agent.runner_fake import RunnerFake
@@ -11,6 +14,7 @@ from app.artifacts.generator import ArtifactGenerator
 
 pytestmark = pytest.mark.unit
 from app.schemas.artifacts import (
+    GENERATION_ORDER,
     ArtifactType,
     HowItWorksContent,
     MilestonesContent,
@@ -258,3 +262,102 @@ async def test_tier_filter_cto_keeps_all(generator):
     assert filtered["problem_statement"] == "Problem"
     assert filtered["market_analysis"] == "Market analysis content"
     assert filtered["competitive_strategy"] == "Competitive strategy content"
+
+
+class _TimedGenerator(ArtifactGenerator):
+    """Records when each artifact starts and finishes; fails the types listed in fail."""
+
+    def __init__(self, fail: set[ArtifactType] = frozenset(), delay: float = 0.05):
+        super().__init__(runner=RunnerFake(scenario="happy_path"))
+        self.fail = fail
+        self.delay = delay
+        self.events: list[tuple[str, ArtifactType]] = []
+        self.context: dict[ArtifactType, set[str]] = {}
+
+    async def generate_artifact(self, artifact_type, onboarding_data, prior_artifacts=None, regenerate=False):
+        self.events.append(("start", artifact_type))
+        self.context[artifact_type] = set(prior_artifacts or {})
+        await asyncio.sleep(self.delay)
+        self.events.append(("end", artifact_type))
+        if artifact_type in self.fail:
+            raise RuntimeError(f"{artifact_type} failed")
+        return {"type": artifact_type.value}
+
+
+DOWNSTREAM = {ArtifactType.MILESTONES, ArtifactType.RISK_LOG, ArtifactType.HOW_IT_WORKS}
+
+
+@pytest.mark.asyncio
+async def test_cascade_runs_downstream_artifacts_concurrently():
+    generator = _TimedGenerator()
+
+    start = time.perf_counter()
+    completed, failed = await generator.generate_cascade(onboarding_data={"idea": "x"})
+    elapsed = time.perf_counter() - start
+
+    assert set(completed) == set(GENERATION_ORDER) and failed == []
+    # Brief, then MVP Scope, then the other three together
+    assert generator.events[:4] == [
+        ("start", ArtifactType.BRIEF),
+        ("end", ArtifactType.BRIEF),
+        ("start", ArtifactType.MVP_SCOPE),
+        ("end", ArtifactType.MVP_SCOPE),
+    ]
+    assert {t for _, t in generator.events[4:7]} == DOWNSTREAM
+    assert all(kind == "start" for kind, _ in generator.events[4:7])
+    assert elapsed < generator.delay * 4.5
+    assert generator.context[ArtifactType.RISK_LOG] == {"brief", "mvp_scope"}
+
+
+@pytest.mark.asyncio
+async def test_cascade_downstream_failure_does_not_stop_siblings():
+    generator = _TimedGenerator(fail={ArtifactType.MILESTONES})
+
+    completed, failed = await generator.generate_cascade(onboarding_data={"idea": "x"})
+
+    assert failed == ["milestones"]
+    assert ArtifactType.RISK_LOG in completed and ArtifactType.HOW_IT_WORKS in completed
+
+
+@pytest.mark.asyncio
+async def test_cascade_mvp_failure_fails_dependents_without_generating_them():
+    generator = _TimedGenerator(fail={ArtifactType.MVP_SCOPE})
+
+    completed, failed = await generator.generate_cascade(onboarding_data={"idea": "x"})
+
+    assert list(completed) == [ArtifactType.BRIEF]
+    assert failed == ["mvp_scope", "milestones", "risk_log", "how_it_works"]
+    assert not DOWNSTREAM & set(generator.context)
+
+
+@pytest.mark.asyncio
+async def test_cascade_skips_existing_and_persists_each_as_it_completes():
+    generator = _TimedGenerator()
+    persisted: list[ArtifactType] = []
+
+    async def on_complete(artifact_type, content):
+        assert content == {"type": artifact_type.value}
+        persisted.append(artifact_type)
+
+    existing = {ArtifactType.BRIEF: {"type": "brief"}, ArtifactType.MVP_SCOPE: {"type": "mvp_scope"}}
+    completed, failed = await generator.generate_cascade(
+        onboarding_data={"idea": "x"}, existing_artifacts=existing, on_complete=on_complete
+    )
+
+    assert set(persisted) == DOWNSTREAM and len(persisted) == 3
+    assert set(generator.context) == DOWNSTREAM
+    assert len(completed) == 5 and failed == []
+
+
+@pytest.mark.asyncio
+async def test_cascade_persist_failure_fails_that_artifact():
+    generator = _TimedGenerator(delay=0)
+
+    async def on_complete(artifact_type, content):
+        if artifact_type == ArtifactType.HOW_IT_WORKS:
+            raise RuntimeError("db down")
+
+    completed, failed = await generator.generate_cascade(onboarding_data={"idea": "x"}, on_complete=on_complete)
+
+    assert failed == ["how_it_works"]
+    assert ArtifactType.HOW_IT_WORKS not in completed
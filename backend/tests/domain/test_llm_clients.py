@@ -0,0 +1,89 @@
+"""Tests for the shared Anthropic client registry and its connection metrics."""
+
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import AsyncMock, patch
+
+import anthropic
+import pytest
+
+from app.core import llm_clients
+from app.core.llm_clients import get_anthropic_client, get_chat_model, llm_role
+from app.core.llm_config import create_tracked_llm
+
+pytestmark = pytest.mark.unit
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def _reset_registry():
+    llm_clients._clients = None
+    llm_clients._stats.clear()
+    yield
+    llm_clients._clients = None
+    llm_clients._stats.clear()
+
+
+async def test_registry_shares_clients_per_model():
+    coder = get_chat_model("claude-sonnet-4-20250514", 8192)
+
+    assert get_chat_model("claude-sonnet-4-20250514", 8192) is coder
+    assert get_chat_model("claude-sonnet-4-20250514", 4096) is not coder
+    assert coder._async_client is get_anthropic_client()
+
+
+async def test_tracked_llm_binds_callback_per_call_on_shared_model():
+    with patch("app.core.llm_config.resolve_llm_config", AsyncMock(return_value="claude-sonnet-4-20250514")):
+        first = await create_tracked_llm("u1", "architect", "job-1")
+        second = await create_tracked_llm("u2", "architect", "job-2")
+
+    assert first.bound is second.bound
+    assert first.model == "claude-sonnet-4-20250514"
+    (cb1,) = first.config["callbacks"]
+    (cb2,) = second.config["callbacks"]
+    assert (cb1.user_id, cb1.session_id) == ("u1", "job-1")
+    assert (cb2.user_id, cb2.session_id) == ("u2", "job-2")
+    assert first.bound.callbacks is None
+
+
+async def test_connection_reuse_and_ttfb_recorded_per_role(server_url):
+    http = anthropic.DefaultAsyncHttpxClient(
+        event_hooks={"request": [llm_clients._on_request], "response": [llm_clients._on_response]}
+    )
+    with patch("app.core.llm_clients.emit_llm_connection", AsyncMock()) as emit:
+        with llm_role("coder"):
+            await http.get(server_url)
+            await http.get(server_url)
+        await asyncio.gather(http.get(server_url))
+    await http.aclose()
+
+    stats = llm_clients.stats()
+    assert stats["coder"]["requests"] == 2
+    assert stats["coder"]["new_connections"] == 1
+    assert stats["coder"]["reuse_ratio"] == 0.5
+    assert stats["coder"]["mean_ttfb_ms"] > 0
+    assert stats["other"]["new_connections"] == 0  # pooled connection from the coder calls
+    assert [c.kwargs["reused"] for c in emit.await_args_list] == [False, True, True]
@@ -0,0 +1,95 @@
+"""Tests for the UserSettings cache and per-job model memo in llm_config."""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fakeredis import FakeAsyncRedis
+
+from app.core import llm_config
+from app.core.llm_config import get_or_create_user_settings, invalidate_user_settings, resolve_llm_config
+
+pytestmark = pytest.mark.unit
+
+
+def _settings(models: dict | None = None, max_tokens: int = 1000, suspended: bool = False):
+    return SimpleNamespace(
+        is_suspended=suspended,
+        override_models=None,
+        override_max_tokens_per_day=None,
+        plan_tier=SimpleNamespace(default_models=models or {"coder": "model-a"}, max_tokens_per_day=max_tokens),
+    )
+
+
+@pytest.fixture
+def redis():
+    fake = FakeAsyncRedis(decode_responses=True)
+    with patch("app.core.llm_config.get_redis", return_value=fake):
+        yield fake
+
+
+async def test_settings_served_from_cache_until_invalidated():
+    load = AsyncMock(side_effect=[_settings(), _settings({"coder": "model-b"})])
+    with patch("app.core.llm_config._load_user_settings", load):
+        first = await get_or_create_user_settings("u1")
+        assert await get_or_create_user_settings("u1") is first
+        assert load.await_count == 1
+
+        invalidate_user_settings("u1")
+        second = await get_or_create_user_settings("u1")
+
+    assert second is not first
+    assert load.await_count == 2
+
+
+async def test_expired_entry_is_reloaded():
+    load = AsyncMock(side_effect=[_settings(), _settings()])
+    with (
+        patch("app.core.llm_config._load_user_settings", load),
+        patch("app.core.llm_config.time.monotonic", side_effect=[0.0, 1000.0, 1000.0]),
+    ):
+        await get_or_create_user_settings("u1")
+        await get_or_create_user_settings("u1")
+
+    assert load.await_count == 2
+
+
+async def test_job_model_is_memoized_but_token_budget_stays_live(redis):
+    load = AsyncMock(return_value=_settings({"coder": "model-a"}))
+    with patch("app.core.llm_config._load_user_settings", load):
+        assert await resolve_llm_config("u1", "coder", "job-1") == "model-a"
+
+        # Plan default changes under the cached object: the job keeps its model,
+        # a new job (or a call without a job) resolves afresh
+        load.return_value.plan_tier.default_models = {"coder": "model-b"}
+        assert await resolve_llm_config("u1", "coder", "job-1") == "model-a"
+        assert await resolve_llm_config("u1", "coder", "job-2") == "model-b"
+        assert await resolve_llm_config("u1", "coder") == "model-b"
+
+        await redis.set(f"cofounder:usage:u1:{llm_config.date.today().isoformat()}", 1000)
+        with pytest.raises(PermissionError, match="Daily token limit"):
+            await resolve_llm_config("u1", "coder", "job-1")
+
+    assert load.await_count == 1
+
+
+async def test_invalidation_drops_job_models_for_that_user_only(redis):
+    load = AsyncMock(side_effect=lambda user_id: _settings({"coder": f"model-{user_id}"}))
+    with patch("app.core.llm_config._load_user_settings", load):
+        await resolve_llm_config("u1", "coder", "job-1")
+        await resolve_llm_config("u2", "coder", "job-2")
+
+        invalidate_user_settings("u1")
+
+    assert ("u1", "job-1", "coder") not in llm_config._job_models
+    assert ("u2", "job-2", "coder") in llm_config._job_models
+    assert "u2" in llm_config._user_settings_cache
+
+
+async def test_suspension_applies_after_invalidation(redis):
+    load = AsyncMock(side_effect=[_settings(), _settings(suspended=True)])
+    with patch("app.core.llm_config._load_user_settings", load):
+        await resolve_llm_config("u1", "coder", "job-1")
+        invalidate_user_settings("u1")
+        with pytest.raises(PermissionError, match="suspended"):
+            await resolve_llm_config("u1", "coder", "job-1")
@@ -0,0 +1,131 @@
+"""Tests for the batched usage ledger and UsageTrackingCallback's use of it."""
+
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import patch
+
+import pytest
+from fakeredis import FakeAsyncRedis
+
+from app.core import usage_ledger
+from app.core.llm_config import UsageTrackingCallback
+from app.core.usage_ledger import FALLBACK_KEY, UsageLedger, UsageRecord
+
+pytestmark = pytest.mark.unit
+
+
+class _FakeDB:
+    """Session factory recording bulk inserts; fail=True makes every execute raise."""
+
+    def __init__(self):
+        self.inserts: list[list[dict]] = []
+        self.fail = False
+
+    def __call__(self):
+        db = self
+
+        @asynccontextmanager
+        async def session():
+            class _Session:
+                async def execute(self, stmt, rows):
+                    if db.fail:
+                        raise ConnectionError("db down")
+                    db.inserts.append(rows)
+
+                async def commit(self):
+                    pass
+
+            yield _Session()
+
+        return session()
+
+
+@pytest.fixture
+def db():
+    fake = _FakeDB()
+    with patch("app.core.usage_ledger.get_session_factory", return_value=fake):
+        yield fake
+
+
+@pytest.fixture
+def redis():
+    fake = FakeAsyncRedis(decode_responses=True)
+    with (
+        patch("app.core.usage_ledger.get_redis", return_value=fake),
+        patch("app.core.llm_config.get_redis", return_value=fake),
+    ):
+        yield fake
+
+
+def _record(n: int = 1) -> UsageRecord:
+    return UsageRecord("u1", "job-1", "coder", "claude-sonnet-4-20250514", n, n, 2 * n, 10 * n)
+
+
+async def test_full_batch_is_one_bulk_insert(db, redis):
+    ledger = UsageLedger(batch_size=3, flush_interval=60)
+    for i in range(3):
+        ledger.record(_record(i))
+    await asyncio.sleep(0)  # let the scheduled flush run
+    await ledger.flush()
+
+    assert len(db.inserts) == 1
+    assert [row["input_tokens"] for row in db.inserts[0]] == [0, 1, 2]
+
+
+async def test_time_window_flushes_partial_batch(db, redis):
+    ledger = UsageLedger(batch_size=100, flush_interval=0.01)
+    ledger.record(_record())
+    assert db.inserts == []
+
+    await asyncio.sleep(0.05)
+
+    assert len(db.inserts) == 1
+    assert ledger.pending == 0
+
+
+async def test_db_failure_falls_back_to_redis_and_replays(db, redis):
+    ledger = UsageLedger(batch_size=10, flush_interval=60)
+    db.fail = True
+    ledger.record(_record(1))
+    ledger.record(_record(2))
+    await ledger.flush()
+
+    assert await redis.llen(FALLBACK_KEY) == 2
+
+    db.fail = False
+    ledger.record(_record(3))
+    await ledger.flush()
+
+    assert await redis.llen(FALLBACK_KEY) == 0
+    assert [row["input_tokens"] for row in db.inserts[0]] == [3]
+    replayed = db.inserts[1]
+    assert [row["input_tokens"] for row in replayed] == [1, 2]
+    assert replayed[0]["created_at"].tzinfo is not None
+
+
+async def test_callback_queues_row_and_updates_counter_immediately(db, redis):
+    from langchain_core.messages import AIMessage
+    from langchain_core.outputs import ChatGeneration, LLMResult
+
+    with patch.object(usage_ledger, "_ledger", None):
+        callback = UsageTrackingCallback("u1", "job-1", "coder", "claude-sonnet-4-20250514")
+        response = LLMResult(
+            generations=[
+                [
+                    ChatGeneration(
+                        message=AIMessage(content="ok"),
+                        generation_info={"usage": {"input_tokens": 100, "output_tokens": 20}},
+                    )
+                ]
+            ]
+        )
+        await callback.on_llm_end(response)
+
+        assert db.inserts == []  # not on the call path
+        keys = await redis.keys("cofounder:usage:u1:*")
+        assert [int(await redis.get(k)) for k in keys] == [120]
+        assert await redis.ttl(keys[0]) > 0
+
+        await usage_ledger.flush_usage_ledger()
+
+    assert db.inserts[0][0]["total_tokens"] == 120
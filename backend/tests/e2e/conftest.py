@@ -10,13 +10,14 @@ from fastapi.testclient import TestClient
 from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 
 from app.db.base import Base
+from tests.conftest import BulkWriteMixin
 
 # ──────────────────────────────────────────────────────────────────────────────
 # FakeSandboxRuntime
 # ──────────────────────────────────────────────────────────────────────────────
 
 
-class FakeSandboxRuntime:
+class FakeSandboxRuntime(BulkWriteMixin):
     """Test double for E2BSandboxRuntime — no real E2B API calls."""
 
     def __init__(self, template: str = "base"):
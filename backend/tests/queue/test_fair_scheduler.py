@@ -0,0 +1,149 @@
+"""Tests for weighted fair queuing within a tier and per-tier queue-wait histograms."""
+
+from datetime import UTC, datetime
+
+import pytest
+from fakeredis import aioredis
+
+from app.queue.estimator import QueueWaitHistogram
+from app.queue.manager import QueueManager
+from app.queue.schemas import FAIR_SHARE_QUANTUM
+from app.queue.state_machine import JobStateMachine
+
+pytestmark = pytest.mark.unit
+
+NOW = datetime(2026, 10, 16, 12, 30, tzinfo=UTC)
+
+
+@pytest.fixture
+async def redis_client():
+    """Create a fake Redis client for testing."""
+    client = aioredis.FakeRedis(decode_responses=True)
+    yield client
+    await client.flushall()
+    await client.aclose()
+
+
+async def _submit(redis_client, job_id: str, user_id: str, tier: str = "bootstrapper", weight: float = 1.0) -> None:
+    await JobStateMachine(redis_client).create_job(
+        job_id, {"user_id": user_id, "project_id": f"proj-{job_id}", "tier": tier}
+    )
+    await QueueManager(redis_client).enqueue(job_id, tier, user_id=user_id, weight=weight)
+
+
+async def _queue_order(redis_client) -> list[str]:
+    return await redis_client.zrange("queue:pending", 0, -1)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Weighted fair queuing
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+@pytest.mark.asyncio
+async def test_backlogged_user_is_interleaved_with_later_arrivals(redis_client):
+    """A user who queues a burst does not push later users to the back of the tier."""
+    for i in range(3):
+        await _submit(redis_client, f"a-{i}", "alice")
+    await _submit(redis_client, "b-0", "bob")
+
+    order = await _queue_order(redis_client)
+
+    assert order.index("b-0") < order.index("a-1")
+    # Each user's own jobs stay FIFO
+    assert [job for job in order if job.startswith("a-")] == ["a-0", "a-1", "a-2"]
+
+
+@pytest.mark.asyncio
+async def test_weight_scales_share_within_tier(redis_client):
+    """A weight-2 flow gets two queue slots for every one of a weight-1 flow."""
+    for i in range(4):
+        await _submit(redis_client, f"heavy-{i}", "heavy", weight=2.0)
+        await _submit(redis_client, f"light-{i}", "light")
+
+    order = await _queue_order(redis_client)
+
+    # heavy tags: 500, 1000, 1500, 2000 — light tags: 1000, 2000, 3000, 4000
+    assert order.index("heavy-3") < order.index("light-2")
+    assert order[-2:] == ["light-2", "light-3"]
+
+
+@pytest.mark.asyncio
+async def test_tier_boost_still_dominates_fair_share(redis_client):
+    """Fair queuing only orders users within a tier; higher tiers still go first."""
+    for i in range(5):
+        await _submit(redis_client, f"cto-{i}", "cto-user", tier="cto_scale")
+    await _submit(redis_client, "boot-0", "boot-user")
+
+    order = await _queue_order(redis_client)
+
+    assert order[-1] == "boot-0"
+
+
+@pytest.mark.asyncio
+async def test_admission_advances_virtual_time_for_new_arrivals(redis_client):
+    """A user arriving after others were served starts at the tier's virtual time, not at zero."""
+    queue = QueueManager(redis_client)
+    for i in range(3):
+        await _submit(redis_client, f"a-{i}", "alice")
+    # Bootstrapper users run two jobs at a time
+    assert await queue.admit_next() == ("admitted", "a-0")
+    assert await queue.admit_next() == ("admitted", "a-1")
+
+    await _submit(redis_client, "late", "latecomer")
+
+    # Virtual time sits at the last admitted finish tag; the latecomer starts there,
+    # level with alice's remaining job rather than jumping ahead of it from zero
+    vtime = int(await redis_client.get("queue:fair:vtime:bootstrapper"))
+    assert vtime == 2 * FAIR_SHARE_QUANTUM
+    assert await redis_client.zscore("queue:pending", "late") == 1000 * 1e12 + vtime + FAIR_SHARE_QUANTUM
+    assert await redis_client.zscore("queue:pending", "a-2") == 1000 * 1e12 + 3 * FAIR_SHARE_QUANTUM
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Queue-wait histograms
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+@pytest.mark.asyncio
+async def test_admission_records_wait_in_tier_histogram(redis_client):
+    """Time from enqueue to admission lands in the admitted job's tier and bucket."""
+    queue = QueueManager(redis_client)
+    await _submit(redis_client, "job-1", "alice", tier="partner")
+    await redis_client.hset(QueueManager.ENQUEUED_AT_KEY, "job-1", NOW.timestamp() - 42)
+
+    assert await queue.admit_next(now=NOW.timestamp()) == ("admitted", "job-1")
+
+    snapshot = await QueueWaitHistogram(redis_client).snapshot("partner", hours=1, now=NOW)
+    assert snapshot["count"] == 1
+    assert snapshot["mean_seconds"] == 42.0
+    assert snapshot["buckets"]["le_30"] == 0
+    assert snapshot["buckets"]["le_60"] == 1
+    assert snapshot["p95_seconds"] == 60
+    assert not await redis_client.hexists(QueueManager.ENQUEUED_AT_KEY, "job-1")
+
+
+@pytest.mark.asyncio
+async def test_snapshot_percentiles_across_hours(redis_client):
+    """Snapshots sum the hourly histograms in the window and report bucket-bound percentiles."""
+    histogram = QueueWaitHistogram(redis_client)
+    await redis_client.hset("queue:wait_hist:bootstrapper:2026101612", mapping={"le_5": 90, "count": 90, "sum": 180})
+    await redis_client.hset("queue:wait_hist:bootstrapper:2026101611", mapping={"le_600": 10, "count": 10, "sum": 5000})
+    await redis_client.hset("queue:wait_hist:bootstrapper:2026101509", mapping={"inf": 50, "count": 50})
+
+    snapshot = await histogram.snapshot("bootstrapper", hours=2, now=NOW)
+
+    assert snapshot["count"] == 100
+    assert snapshot["p50_seconds"] == 5
+    assert snapshot["p95_seconds"] == 600
+    assert snapshot["buckets"]["inf"] == 100
+
+
+@pytest.mark.asyncio
+async def test_snapshot_all_lists_tiers_by_priority(redis_client):
+    """Every tier is reported, empty ones with no percentiles."""
+    snapshots = await QueueWaitHistogram(redis_client).snapshot_all(hours=1, now=NOW)
+
+    assert [s["tier"] for s in snapshots] == ["cto_scale", "partner", "bootstrapper"]
+    assert snapshots[0]["count"] == 0
+    assert snapshots[0]["p95_seconds"] is None
@@ -0,0 +1,195 @@
+"""Tests for the atomic Lua queue/semaphore scripts (enqueue, admission, semaphore ops)."""
+
+import asyncio
+
+import pytest
+from fakeredis import aioredis
+
+from app.queue.manager import QueueManager
+from app.queue.schemas import FAIR_SHARE_QUANTUM, GLOBAL_QUEUE_CAP
+from app.queue.semaphore import RedisSemaphore, user_semaphore
+from app.queue.state_machine import JobStateMachine
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+async def redis_client():
+    """Create a fake Redis client for testing."""
+    client = aioredis.FakeRedis(decode_responses=True)
+    yield client
+    await client.flushall()
+    await client.aclose()
+
+
+async def _create_job(redis_client, job_id: str, user_id: str, project_id: str = "proj-1") -> None:
+    await JobStateMachine(redis_client).create_job(
+        job_id, {"user_id": user_id, "project_id": project_id, "tier": "bootstrapper"}
+    )
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# ENQUEUE
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+@pytest.mark.asyncio
+async def test_enqueue_returns_position_and_composite_score(redis_client):
+    """Score follows (1000 - boost) * 1e12 + finish tag and position reflects tier boost."""
+    queue = QueueManager(redis_client)
+
+    first = await queue.enqueue("job-boot", "bootstrapper", user_id="u1")
+    second = await queue.enqueue("job-cto", "cto_scale", user_id="u1")
+    third = await queue.enqueue("job-boot-2", "bootstrapper", user_id="u1")
+
+    assert first == {"rejected": False, "position": 1, "score": 1000 * 1e12 + FAIR_SHARE_QUANTUM}
+    assert second == {"rejected": False, "position": 1, "score": 995 * 1e12 + FAIR_SHARE_QUANTUM}
+    assert third == {"rejected": False, "position": 3, "score": 1000 * 1e12 + 2 * FAIR_SHARE_QUANTUM}
+    assert await redis_client.zscore("queue:pending", "job-boot") == first["score"]
+
+
+@pytest.mark.asyncio
+async def test_enqueue_rejects_at_global_cap(redis_client):
+    """At GLOBAL_QUEUE_CAP the script rejects without advancing the user's finish tag."""
+    queue = QueueManager(redis_client)
+    await redis_client.zadd("queue:pending", {f"job-{i}": i for i in range(GLOBAL_QUEUE_CAP)})
+
+    result = await queue.enqueue("job-over", "cto_scale", user_id="u1")
+
+    assert result["rejected"] is True
+    assert result["retry_after_minutes"] >= 1
+    assert await redis_client.hget("queue:fair:finish:cto_scale", "u1") is None
+    assert await queue.get_length() == GLOBAL_QUEUE_CAP
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Semaphore
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+@pytest.mark.asyncio
+async def test_concurrent_acquire_never_overshoots_limit(redis_client):
+    """Racing acquires are serialized server-side: exactly max_concurrent succeed."""
+    sem = RedisSemaphore(redis_client, "test:sem", max_concurrent=3)
+
+    results = await asyncio.gather(*(sem.acquire(f"job-{i}") for i in range(20)))
+
+    assert sum(results) == 3
+    assert await sem.count() == 3
+
+
+@pytest.mark.asyncio
+async def test_acquire_purges_slot_with_expired_ttl_key(redis_client):
+    """A slot whose lease key expired (crashed worker) no longer counts toward the limit."""
+    sem = RedisSemaphore(redis_client, "test:sem", max_concurrent=1)
+    await sem.acquire("crashed")
+    await redis_client.delete("test:sem:slot:crashed")  # simulate lease expiry
+
+    assert await sem.acquire("next") is True
+    assert await redis_client.smembers("test:sem:slots") == {"next"}
+
+
+@pytest.mark.asyncio
+async def test_heartbeat_returns_false_after_purge(redis_client):
+    """Once an expired lease is purged, heartbeat reports the slot as lost."""
+    sem = RedisSemaphore(redis_client, "test:sem", max_concurrent=2)
+    await sem.acquire("job-1")
+    assert await sem.heartbeat("job-1") is True
+
+    await redis_client.delete("test:sem:slot:job-1")
+    await sem.acquire("job-2")  # purges job-1
+
+    assert await sem.heartbeat("job-1") is False
+    assert await redis_client.exists("test:sem:slot:job-1") == 0
+
+
+@pytest.mark.asyncio
+async def test_release_signals_waiting_consumer(redis_client):
+    """Releasing a held slot leaves a wake-up token; releasing an unheld one does not."""
+    sem = RedisSemaphore(redis_client, "test:sem", max_concurrent=1)
+    await sem.release("never-held")
+    assert await redis_client.llen("queue:signal") == 0
+
+    await sem.acquire("job-1")
+    await sem.release("job-1")
+    assert await redis_client.llen("queue:signal") == 1
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# ADMIT_NEXT
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+@pytest.mark.asyncio
+async def test_admit_next_returns_none_on_empty_queue(redis_client):
+    assert await QueueManager(redis_client).admit_next() is None
+
+
+@pytest.mark.asyncio
+async def test_admit_next_acquires_both_slots(redis_client):
+    """Admission removes the job and holds its user and project slots."""
+    queue = QueueManager(redis_client)
+    await _create_job(redis_client, "job-1", "user-1")
+    await queue.enqueue("job-1", "bootstrapper")
+
+    assert await queue.admit_next() == ("admitted", "job-1")
+    assert await queue.get_length() == 0
+    assert await redis_client.sismember("concurrency:user:user-1:slots", "job-1")
+    assert await redis_client.sismember("concurrency:project:proj-1:slots", "job-1")
+    assert await redis_client.ttl("concurrency:user:user-1:slot:job-1") > 0
+
+
+@pytest.mark.asyncio
+async def test_admit_next_removes_job_without_metadata(redis_client):
+    """A queued job whose hash is gone is dropped and reported as missing."""
+    queue = QueueManager(redis_client)
+    await queue.enqueue("ghost", "bootstrapper")
+
+    assert await queue.admit_next() == ("missing", "ghost")
+    assert await queue.get_length() == 0
+
+
+@pytest.mark.asyncio
+async def test_admit_next_skips_blocked_job_and_keeps_its_score(redis_client):
+    """A blocked user's head job keeps its exact score while a later job is admitted."""
+    queue = QueueManager(redis_client)
+    sem = user_semaphore(redis_client, "busy", "bootstrapper")
+    await sem.acquire("busy-1")
+    await sem.acquire("busy-2")
+
+    await _create_job(redis_client, "busy-3", "busy", project_id="proj-busy")
+    await _create_job(redis_client, "other-1", "other", project_id="proj-other")
+    blocked = await queue.enqueue("busy-3", "bootstrapper")
+    await queue.enqueue("other-1", "bootstrapper")
+
+    assert await queue.admit_next() == ("admitted", "other-1")
+    assert await queue.admit_next() == ("blocked", "busy-3")
+    assert await redis_client.zscore("queue:pending", "busy-3") == blocked["score"]
+
+
+@pytest.mark.asyncio
+async def test_admit_next_respects_project_limit(redis_client):
+    """Project limit applies across users sharing a project."""
+    queue = QueueManager(redis_client)
+    for i in range(3):
+        await _create_job(redis_client, f"job-{i}", f"user-{i}", project_id="shared")
+        await queue.enqueue(f"job-{i}", "bootstrapper")
+
+    outcomes = [await queue.admit_next() for _ in range(3)]
+
+    assert [o[0] for o in outcomes] == ["admitted", "admitted", "blocked"]
+    assert await queue.get_position("job-2") == 1
+
+
+@pytest.mark.asyncio
+async def test_admission_script_refuses_cluster_client():
+    """Scripts touching undeclared keys fail fast on cluster-mode clients."""
+    from unittest.mock import MagicMock
+
+    from redis.asyncio.cluster import RedisCluster
+
+    cluster = MagicMock(spec=RedisCluster)
+
+    with pytest.raises(RuntimeError, match="non-cluster"):
+        await QueueManager(cluster).admit_next()
+    cluster.evalsha.assert_not_called()
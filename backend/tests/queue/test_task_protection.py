@@ -0,0 +1,60 @@
+"""Tests for TaskProtection — ECS agent scale-in protection toggling."""
+
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from app.queue.task_protection import TaskProtection
+
+pytestmark = pytest.mark.unit
+
+
+_RealAsyncClient = httpx.AsyncClient
+
+
+def _client_factory(handler):
+    transport = httpx.MockTransport(handler)
+    return lambda **kwargs: _RealAsyncClient(transport=transport, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_disabled_outside_ecs(monkeypatch):
+    """Without ECS_AGENT_URI every call is a no-op."""
+    monkeypatch.delenv("ECS_AGENT_URI", raising=False)
+    protection = TaskProtection()
+
+    assert protection.enabled is False
+    assert await protection.set(True) is False
+
+
+@pytest.mark.asyncio
+async def test_enable_sends_expiry_and_disable_omits_it():
+    """Enabling sets a lease; disabling just clears the flag."""
+    requests: list[httpx.Request] = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json={"protection": {}})
+
+    protection = TaskProtection(agent_uri="http://169.254.170.2/v1", expires_minutes=90)
+    with patch("app.queue.task_protection.httpx.AsyncClient", _client_factory(handler)):
+        assert await protection.set(True) is True
+        assert protection.protected is True
+        assert await protection.set(False) is True
+        assert protection.protected is False
+
+    assert str(requests[0].url) == "http://169.254.170.2/v1/task-protection/v1/state"
+    assert requests[0].method == "PUT"
+    assert requests[0].read() == b'{"ProtectionEnabled":true,"ExpiresInMinutes":90}'
+    assert requests[1].read() == b'{"ProtectionEnabled":false}'
+
+
+@pytest.mark.asyncio
+async def test_agent_error_is_non_fatal():
+    """A failing agent call is logged and reported as False, never raised."""
+    protection = TaskProtection(agent_uri="http://agent")
+    with patch("app.queue.task_protection.httpx.AsyncClient", _client_factory(lambda r: httpx.Response(500))):
+        assert await protection.set(True) is False
+
+    assert protection.protected is False
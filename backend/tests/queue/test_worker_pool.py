@@ -0,0 +1,288 @@
+"""Tests for JobWorkerPool — long-running consumers with graceful drain."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from fakeredis import aioredis
+
+from app.queue.manager import QueueManager
+from app.queue.schemas import JobStatus
+from app.queue.state_machine import JobStateMachine
+from app.queue.worker import JobWorkerPool
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+async def redis_client():
+    """Create a fake Redis client for testing."""
+    client = aioredis.FakeRedis(decode_responses=True)
+    yield client
+    await client.flushall()
+    await client.aclose()
+
+
+async def _submit(redis_client, job_id: str, user_id: str = "user-1", project_id: str = "proj-1") -> None:
+    await JobStateMachine(redis_client).create_job(
+        job_id,
+        {"user_id": user_id, "project_id": project_id, "tier": "bootstrapper", "goal": "Build"},
+    )
+    await QueueManager(redis_client).enqueue(job_id, "bootstrapper")
+
+
+async def _wait_for(predicate, timeout: float = 5.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not await predicate():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("condition not met before timeout")
+        await asyncio.sleep(0.02)
+
+
+@pytest.mark.asyncio
+async def test_wait_for_signal_times_out_when_idle(redis_client):
+    """wait_for_signal() returns False when nothing is enqueued or released."""
+    assert await QueueManager(redis_client).wait_for_signal(timeout=0.05) is False
+
+
+@pytest.mark.asyncio
+async def test_enqueue_leaves_single_wakeup_token(redis_client):
+    """Bursts of enqueues collapse into one token so idle consumers never spin on stale signals."""
+    queue = QueueManager(redis_client)
+    for i in range(5):
+        await queue.enqueue(f"job-{i}", "bootstrapper")
+
+    assert await redis_client.llen("queue:signal") == 1
+    assert await queue.wait_for_signal(timeout=0.05) is True
+    assert await queue.wait_for_signal(timeout=0.05) is False
+
+
+@pytest.mark.asyncio
+async def test_pool_drains_queue_without_new_submissions(redis_client):
+    """Consumers keep pulling until the queue is empty — no API traffic required."""
+    for i in range(3):
+        await _submit(redis_client, f"job-{i}", user_id=f"user-{i}", project_id=f"proj-{i}")
+
+    pool = JobWorkerPool(redis_client, concurrency=2, poll_timeout=0.05, error_backoff=0.01)
+    pool.start()
+
+    async def all_ready():
+        statuses = [await redis_client.hget(f"job:job-{i}", "status") for i in range(3)]
+        return all(status == JobStatus.READY.value for status in statuses)
+
+    await _wait_for(all_ready)
+    await pool.stop(drain_timeout=1.0)
+
+    assert await QueueManager(redis_client).get_length() == 0
+
+
+@pytest.mark.asyncio
+async def test_pool_admits_blocked_job_after_slot_frees(redis_client):
+    """A job blocked by a concurrency limit keeps its place and runs once a slot frees up."""
+    from app.queue.semaphore import user_semaphore
+
+    # Fill both bootstrapper user slots
+    sem = user_semaphore(redis_client, "user-1", "bootstrapper")
+    await sem.acquire("other-a")
+    await sem.acquire("other-b")
+
+    await _submit(redis_client, "job-blocked")
+
+    pool = JobWorkerPool(redis_client, concurrency=1, poll_timeout=0.05, error_backoff=0.01)
+    pool.start()
+    await asyncio.sleep(0.1)
+    assert await redis_client.hget("job:job-blocked", "status") == JobStatus.QUEUED.value
+
+    await sem.release("other-a")
+
+    async def ready():
+        return await redis_client.hget("job:job-blocked", "status") == JobStatus.READY.value
+
+    await _wait_for(ready)
+    await pool.stop(drain_timeout=1.0)
+
+
+@pytest.mark.asyncio
+async def test_pool_runs_other_users_jobs_past_blocked_head(redis_client):
+    """A busy user's job at the head of the queue must not hold up other users."""
+    from app.queue.semaphore import user_semaphore
+
+    sem = user_semaphore(redis_client, "busy", "bootstrapper")
+    await sem.acquire("busy-1")
+    await sem.acquire("busy-2")
+
+    await _submit(redis_client, "busy-3", user_id="busy", project_id="proj-busy")
+    await _submit(redis_client, "other-1", user_id="other", project_id="proj-other")
+
+    pool = JobWorkerPool(redis_client, concurrency=1, poll_timeout=0.05, error_backoff=0.01)
+    pool.start()
+
+    async def other_ready():
+        return await redis_client.hget("job:other-1", "status") == JobStatus.READY.value
+
+    await _wait_for(other_ready)
+    await pool.stop(drain_timeout=1.0)
+
+    assert await redis_client.hget("job:busy-3", "status") == JobStatus.QUEUED.value
+    assert await QueueManager(redis_client).get_position("busy-3") == 1
+
+
+@pytest.mark.asyncio
+async def test_stop_waits_for_in_flight_job(redis_client):
+    """stop() lets the running job finish and stops consumers taking new work."""
+    started = asyncio.Event()
+    release = asyncio.Event()
+    processed: list[str] = []
+
+    async def slow_process(job_id, runner=None, redis=None):
+        started.set()
+        await release.wait()
+        processed.append(job_id)
+        return True
+
+    await _submit(redis_client, "job-1")
+
+    with patch("app.queue.worker.process_job", side_effect=slow_process):
+        pool = JobWorkerPool(redis_client, concurrency=1, poll_timeout=0.05)
+        pool.start()
+        await started.wait()
+
+        stop_task = asyncio.create_task(pool.stop(drain_timeout=5.0))
+        await asyncio.sleep(0.05)
+        await _submit(redis_client, "job-2", user_id="user-2", project_id="proj-2")
+        assert not stop_task.done()
+
+        release.set()
+        await stop_task
+
+    assert processed == ["job-1"]
+    assert await QueueManager(redis_client).get_position("job-2") == 1
+
+
+@pytest.mark.asyncio
+async def test_stop_cancels_after_drain_timeout(redis_client):
+    """Jobs still running after drain_timeout are cancelled so the process can exit."""
+    started = asyncio.Event()
+
+    async def hung_process(job_id, runner=None, redis=None):
+        started.set()
+        await asyncio.sleep(3600)
+        return True
+
+    await _submit(redis_client, "job-1")
+
+    with patch("app.queue.worker.process_job", side_effect=hung_process):
+        pool = JobWorkerPool(redis_client, concurrency=1, poll_timeout=0.05)
+        pool.start()
+        await started.wait()
+        await pool.stop(drain_timeout=0.05)
+
+    assert pool.in_flight == {}
+    job = await redis_client.hgetall("job:job-1")
+    assert job["status"] == JobStatus.FAILED.value
+    assert "interrupted by worker shutdown" in job["status_message"]
+    # Slots acquired at admission are freed immediately rather than waiting for the lease TTL
+    assert await redis_client.scard("concurrency:user:user-1:slots") == 0
+    assert await redis_client.scard("concurrency:project:proj-1:slots") == 0
+
+
+@pytest.mark.asyncio
+async def test_stop_drains_before_deregistering_and_survives_redis_errors(redis_client):
+    """A Redis outage at SIGTERM must not skip the drain or fail stop()."""
+    finished: list[str] = []
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def slow_process(job_id, runner=None, redis=None):
+        started.set()
+        await release.wait()
+        finished.append(job_id)
+        return True
+
+    await _submit(redis_client, "job-1")
+
+    with patch("app.queue.worker.process_job", side_effect=slow_process):
+        pool = JobWorkerPool(redis_client, concurrency=1, poll_timeout=0.05)
+        pool.start()
+        pool._reporter = asyncio.create_task(asyncio.sleep(3600))  # registered in queue:workers
+        await started.wait()
+
+        async def hdel_fails(*args):
+            raise ConnectionError("redis down")
+
+        redis_client.hdel = hdel_fails
+        asyncio.get_running_loop().call_later(0.1, release.set)
+        await pool.stop(drain_timeout=5.0)
+
+    assert finished == ["job-1"]
+    assert pool.in_flight == {}
+
+
+class _RecordingProtection:
+    enabled = True
+
+    def __init__(self):
+        self.protected = False
+        self.calls: list[bool] = []
+
+    async def set(self, protected: bool) -> bool:
+        self.calls.append(protected)
+        self.protected = protected
+        return True
+
+
+@pytest.mark.asyncio
+async def test_task_protected_only_while_jobs_in_flight(redis_client):
+    """The ECS task is scale-in protected while a job runs and released when idle."""
+    release = asyncio.Event()
+    protection = _RecordingProtection()
+
+    async def slow_process(job_id, runner=None, redis=None):
+        assert protection.protected is True
+        await release.wait()
+        return True
+
+    await _submit(redis_client, "job-1")
+
+    with patch("app.queue.worker.process_job", side_effect=slow_process):
+        pool = JobWorkerPool(redis_client, concurrency=1, poll_timeout=0.05, protection=protection)
+        pool.start()
+        await _wait_for(lambda: _true_if(protection.calls))
+        release.set()
+        await _wait_for(lambda: _true_if(protection.calls == [True, False]))
+        await pool.stop(drain_timeout=1.0)
+
+    assert protection.calls == [True, False]
+
+
+async def _true_if(value) -> bool:
+    return bool(value)
+
+
+@pytest.mark.asyncio
+async def test_backlog_reporter_publishes_jobs_per_live_worker(redis_client):
+    """Backlog per worker counts queued + running jobs across live workers; dead entries are dropped."""
+    import json
+    import time
+
+    await redis_client.hset(JobWorkerPool.WORKERS_KEY, "peer", json.dumps({"busy": 3, "seen": time.time()}))
+    await redis_client.hset(JobWorkerPool.WORKERS_KEY, "dead", json.dumps({"busy": 4, "seen": time.time() - 3600}))
+    for i in range(5):
+        await QueueManager(redis_client).enqueue(f"queued-{i}", "bootstrapper")
+
+    emitted: list[tuple[int, float]] = []
+
+    async def record(pending, backlog_per_worker):
+        emitted.append((pending, backlog_per_worker))
+
+    with patch("app.metrics.cloudwatch.emit_queue_backlog", side_effect=record):
+        pool = JobWorkerPool(redis_client, concurrency=0, metrics_interval=10.0)
+        pool._tasks = [asyncio.create_task(asyncio.sleep(0))]  # reporter only — no consumers
+        pool._reporter = asyncio.create_task(pool._report_backlog())
+        await _wait_for(lambda: _true_if(emitted))
+        await pool.stop(drain_timeout=1.0)
+
+    # (5 pending + 3 busy on the peer) / 2 live workers
+    assert emitted[0] == (5, 4.0)
+    assert not await redis_client.hexists(JobWorkerPool.WORKERS_KEY, "dead")
+    assert not await redis_client.hexists(JobWorkerPool.WORKERS_KEY, pool.worker_id)
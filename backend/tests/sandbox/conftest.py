@@ -0,0 +1,24 @@
+"""Shared fixtures for sandbox tests."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.core.config import get_settings
+
+
+@pytest.fixture(autouse=True)
+def _no_side_services():
+    """Keep execute_build off CloudWatch and the fire-and-forget docs/narration/screenshot tasks.
+
+    Yields the emit_time_to_preview mock.
+    """
+    settings = get_settings().model_copy(
+        update={"screenshot_enabled": False, "docs_generation_enabled": False, "narration_enabled": False}
+    )
+    with (
+        patch("app.services.generation_service._get_settings", return_value=settings),
+        patch("app.services.generation_service.emit_time_to_preview", new=AsyncMock()) as time_to_preview,
+        patch("app.services.generation_service.emit_business_event", new=AsyncMock()),
+    ):
+        yield time_to_preview
@@ -0,0 +1,122 @@
+"""Tests for E2BSandboxRuntime.write_files (batched and tar-archive uploads)."""
+
+import io
+import tarfile
+import time
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.core.exceptions import SandboxError
+from app.sandbox import e2b_runtime
+from app.sandbox.e2b_runtime import E2BSandboxRuntime
+
+pytestmark = pytest.mark.unit
+
+
+class FakeFiles:
+    """Stand-in for AsyncSandbox.files recording single and multi-file uploads."""
+
+    def __init__(self, fail_batches: bool = False, bad_paths: frozenset[str] = frozenset()):
+        self.fail_batches = fail_batches
+        self.bad_paths = bad_paths
+        self.batches: list[list[str]] = []
+        self.singles: dict[str, str | bytes] = {}
+
+    async def write_files(self, entries):
+        self.batches.append([entry["path"] for entry in entries])
+        if self.fail_batches:
+            raise RuntimeError("batch rejected")
+
+    async def write(self, path, data):
+        if path in self.bad_paths:
+            raise RuntimeError("permission denied")
+        self.singles[path] = data
+
+
+class _FakeSandbox:
+    def __init__(self, files: FakeFiles):
+        self.files = files
+
+
+def _runtime(files: FakeFiles, tar_exit_code: int = 0) -> E2BSandboxRuntime:
+    runtime = E2BSandboxRuntime()
+    runtime._sandbox = _FakeSandbox(files)  # type: ignore[assignment]
+    runtime.run_command = AsyncMock(return_value={"stdout": "", "stderr": "tar: boom", "exit_code": tar_exit_code})
+    return runtime
+
+
+def _project(count: int) -> dict[str, str]:
+    return {f"project/src/f{i}.js": f"export const v = {i}" for i in range(count)}
+
+
+@pytest.mark.asyncio
+async def test_small_upload_uses_batched_multi_file_writes(monkeypatch):
+    monkeypatch.setattr(e2b_runtime, "WRITE_BATCH_SIZE", 4)
+    files = FakeFiles()
+    runtime = _runtime(files)
+
+    failed = await runtime.write_files(_project(10))
+
+    assert failed == {}
+    assert [len(batch) for batch in files.batches] == [4, 4, 2]
+    assert files.batches[0][0] == "/home/user/project/src/f0.js"
+    runtime.run_command.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_large_upload_uses_single_archive_with_current_mtimes():
+    """At ARCHIVE_MIN_FILES the files go up as one tar.gz, stamped with the upload time."""
+    files = FakeFiles()
+    runtime = _runtime(files)
+    before = time.time()
+
+    failed = await runtime.write_files(_project(e2b_runtime.ARCHIVE_MIN_FILES))
+
+    assert failed == {} and files.batches == []
+    [(archive_path, payload)] = files.singles.items()
+    with tarfile.open(fileobj=io.BytesIO(payload), mode="r:gz") as tar:
+        members = tar.getmembers()
+    assert len(members) == e2b_runtime.ARCHIVE_MIN_FILES
+    assert members[0].name == "home/user/project/src/f0.js"
+    assert all(m.mtime >= int(before) for m in members)
+    command = runtime.run_command.await_args.args[0]
+    assert command.startswith(f"tar -xzf {archive_path} -C /")
+
+
+@pytest.mark.asyncio
+async def test_failed_extraction_falls_back_to_batches():
+    files = FakeFiles()
+    runtime = _runtime(files, tar_exit_code=2)
+
+    failed = await runtime.write_files(_project(3), archive=True)
+
+    assert failed == {}
+    assert files.batches == [[f"/home/user/project/src/f{i}.js" for i in range(3)]]
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_is_retried_per_file_reporting_only_bad_paths():
+    files = FakeFiles(fail_batches=True, bad_paths=frozenset({"/home/user/project/src/f1.js"}))
+    runtime = _runtime(files)
+
+    failed = await runtime.write_files(_project(3), archive=False)
+
+    assert list(failed) == ["project/src/f1.js"]
+    assert isinstance(failed["project/src/f1.js"], SandboxError)
+    assert sorted(files.singles) == ["/home/user/project/src/f0.js", "/home/user/project/src/f2.js"]
+
+
+@pytest.mark.asyncio
+async def test_duplicate_paths_rejected():
+    """A relative and an absolute spelling of the same file would race each other."""
+    runtime = _runtime(FakeFiles())
+
+    with pytest.raises(SandboxError, match="Duplicate"):
+        await runtime.write_files({"project/a.js": "1", "/home/user/project/a.js": "2"})
+
+
+@pytest.mark.asyncio
+async def test_write_files_requires_started_sandbox():
+    with pytest.raises(SandboxError, match="not started"):
+        await E2BSandboxRuntime().write_files({"a.js": "1"})
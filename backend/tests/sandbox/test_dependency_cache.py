@@ -0,0 +1,144 @@
+"""Tests for the content-addressed dependency install cache."""
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.sandbox.dependency_cache import LocalDependencyCache
+from app.sandbox.e2b_runtime import E2BSandboxRuntime, dependency_manifest_hash
+
+pytestmark = pytest.mark.unit
+
+MANIFEST_HASH = dependency_manifest_hash({"package.json": '{"dependencies": {"next": "14"}}'}, "node")
+CACHE_KEY = f"base-node-{MANIFEST_HASH}"
+PROJECT = "/home/user/project"
+
+
+class _FakeFiles:
+    def __init__(self):
+        self.written: dict[str, bytes] = {}
+
+    async def write(self, path, data):
+        self.written[path] = data
+
+    async def read(self, path, format="text"):
+        return bytearray(b"archived-node-modules")
+
+
+class _FakeSandbox:
+    def __init__(self):
+        self.files = _FakeFiles()
+
+
+def _runtime(cache, commands: list[str]) -> E2BSandboxRuntime:
+    runtime = E2BSandboxRuntime(dependency_cache=cache)
+    runtime._sandbox = _FakeSandbox()  # type: ignore[assignment]
+
+    async def run_command(command, **kwargs):
+        commands.append(command)
+        stdout = "2048\n" if command.startswith("tar -czf") else ""
+        return {"stdout": stdout, "stderr": "", "exit_code": 0}
+
+    runtime.run_command = run_command  # type: ignore[method-assign]
+    return runtime
+
+
+@pytest.mark.asyncio
+async def test_local_cache_round_trip_and_lru_eviction(tmp_path):
+    cache = LocalDependencyCache(tmp_path, max_bytes=10)
+
+    assert await cache.get("a") is None
+    await cache.put("a", b"123456", 42.0)
+    assert await cache.get("a") == (b"123456", 42.0)
+
+    await cache.put("b", b"abcdef", 7.0)  # 12 bytes > cap: least recently used "a" goes
+
+    assert await cache.get("a") is None
+    assert await cache.get("b") == (b"abcdef", 7.0)
+
+
+@pytest.mark.asyncio
+async def test_install_miss_runs_npm_and_uploads_tree(tmp_path):
+    cache = LocalDependencyCache(tmp_path)
+    commands: list[str] = []
+    runtime = _runtime(cache, commands)
+
+    result = await runtime.install_dependencies("node", MANIFEST_HASH, cwd=PROJECT)
+
+    assert result["exit_code"] == 0
+    assert commands[0] == "npm install"
+    assert commands[1].startswith(f"tar -czf /tmp/deps-{CACHE_KEY}.tar.gz node_modules")
+    data, install_seconds = await cache.get(CACHE_KEY)
+    assert data == b"archived-node-modules" and install_seconds >= 0
+
+
+@pytest.mark.asyncio
+async def test_install_hit_restores_tarball_and_reports_time_saved(tmp_path):
+    cache = LocalDependencyCache(tmp_path)
+    await cache.put(CACHE_KEY, b"tarball", 95.0)
+    commands: list[str] = []
+    runtime = _runtime(cache, commands)
+    stdout = AsyncMock()
+
+    result = await runtime.install_dependencies("node", MANIFEST_HASH, cwd=PROJECT, on_stdout=stdout)
+
+    assert "npm install" not in commands
+    assert commands == [
+        f"rm -rf node_modules && tar -xzf /tmp/deps-{CACHE_KEY}.tar.gz && rm -f /tmp/deps-{CACHE_KEY}.tar.gz"
+    ]
+    assert runtime._sandbox.files.written[f"/tmp/deps-{CACHE_KEY}.tar.gz"] == b"tarball"
+    assert result["exit_code"] == 0
+    assert 90 < runtime.install_seconds_saved <= 95
+    assert "Restored node dependencies" in stdout.await_args.args[0]
+
+    # Same manifest again in this sandbox: skipped outright, saving the full install time
+    assert await runtime.install_dependencies("node", MANIFEST_HASH, cwd=PROJECT) is None
+    assert len(commands) == 1
+    assert runtime.install_seconds_saved > 185
+
+
+@pytest.mark.asyncio
+async def test_failed_restore_falls_back_to_install(tmp_path):
+    cache = LocalDependencyCache(tmp_path)
+    await cache.put(CACHE_KEY, b"corrupt", 95.0)
+    commands: list[str] = []
+    runtime = _runtime(cache, commands)
+
+    async def run_command(command, **kwargs):
+        commands.append(command)
+        exit_code = 2 if command.startswith("rm -rf node_modules") else 0
+        return {"stdout": "1\n", "stderr": "gzip: invalid", "exit_code": exit_code}
+
+    runtime.run_command = run_command  # type: ignore[method-assign]
+
+    result = await runtime.install_dependencies("node", MANIFEST_HASH, cwd=PROJECT)
+
+    assert result["exit_code"] == 0
+    assert "npm install" in commands
+    assert runtime.install_seconds_saved == 0
+
+
+@pytest.mark.asyncio
+async def test_custom_install_commands_bypass_cache(tmp_path):
+    cache = LocalDependencyCache(tmp_path)
+    commands: list[str] = []
+    runtime = _runtime(cache, commands)
+
+    await runtime.install_dependencies("node", MANIFEST_HASH, cwd=PROJECT, command="npm ci --omit=dev")
+
+    assert commands == ["npm ci --omit=dev"]
+    assert await cache.get(CACHE_KEY) is None
+
+
+@pytest.mark.asyncio
+async def test_build_log_reports_install_time_saved():
+    from types import SimpleNamespace
+
+    from app.services.generation_service import _report_install_savings
+
+    streamer = SimpleNamespace(write_event=AsyncMock())
+
+    await _report_install_savings(streamer, SimpleNamespace(install_seconds_saved=0.2), "job-1")
+    await _report_install_savings(streamer, SimpleNamespace(install_seconds_saved=84.6), "job-1")
+
+    streamer.write_event.assert_awaited_once_with("--- Dependency cache saved ~85s of install time ---")
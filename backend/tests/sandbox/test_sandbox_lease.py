@@ -0,0 +1,240 @@
+"""Tests for per-job sandbox leases and manifest-aware dependency installs."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import fakeredis
+import pytest
+
+from app.agent.nodes.executor import executor_node
+from app.agent.state import create_initial_state
+from app.core.exceptions import SandboxError
+from app.queue.state_machine import JobStateMachine
+from app.sandbox.e2b_runtime import E2BSandboxRuntime, dependency_manifest_hash
+from app.sandbox.lease import SandboxLease, get_lease, register_lease, release_lease
+from app.services.generation_service import GenerationService
+from tests.conftest import BulkWriteMixin
+
+pytestmark = pytest.mark.unit
+
+PACKAGE_JSON = '{"dependencies": {"next": "14.0.0"}}'
+
+
+def _fc(content: str) -> dict:
+    return {"path": "", "original_content": None, "new_content": content, "change_type": "create"}
+
+
+class RecordingRuntime(BulkWriteMixin):
+    """E2BSandboxRuntime stand-in that counts boots, writes and commands."""
+
+    def __init__(self):
+        self.starts = 0
+        self.stops = 0
+        self.writes: list[str] = []
+        self.commands: list[str] = []
+        self._installed: dict = {}
+
+    async def start(self):
+        self.starts += 1
+
+    async def stop(self):
+        self.stops += 1
+
+    async def set_timeout(self, seconds):
+        pass
+
+    @property
+    def sandbox_id(self):
+        return "sbx-1"
+
+    def get_host(self, port):
+        return f"{port}-sbx-1.e2b.app"
+
+    async def write_file(self, path, content):
+        self.writes.append(path)
+
+    async def run_command(self, command, **kwargs):
+        self.commands.append(command)
+        return {"stdout": "", "stderr": "", "exit_code": 0}
+
+    # Reuse the real skip-if-unchanged logic
+    async def install_dependencies(self, ecosystem, manifest_hash, cwd=None, **kwargs):
+        key = (cwd, ecosystem)
+        if manifest_hash is not None and self._installed.get(key) == manifest_hash:
+            return None
+        self.commands.append(f"install:{ecosystem}")
+        self._installed[key] = manifest_hash
+        return {"stdout": "", "stderr": "", "exit_code": 0}
+
+    async def start_dev_server(self, workspace_path, working_files=None, on_stdout=None, on_stderr=None):
+        files = {"package.json": working_files["package.json"]["new_content"]}
+        await self.install_dependencies("node", dependency_manifest_hash(files, "node"), cwd=workspace_path)
+        return "https://3000-sbx-1.e2b.app"
+
+
+def _node_state(session_id: str, files: dict) -> dict:
+    state = create_initial_state(
+        user_id="u1", project_id="p1", project_path="/home/user/project", goal="Build", session_id=session_id
+    )
+    state["plan"] = [{"index": 0, "description": "UI", "status": "pending", "files_to_modify": ["index.js"]}]
+    state["current_step_index"] = 0
+    state["working_files"] = {path: _fc(content) for path, content in files.items()}
+    return state
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# SandboxLease
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+@pytest.mark.asyncio
+async def test_sync_writes_only_changed_files():
+    """A second sync rewrites only files whose content changed."""
+    runtime = RecordingRuntime()
+    lease = SandboxLease(lambda: runtime)
+
+    written, failed = await lease.sync_files({"a.js": _fc("1"), "b.js": _fc("2")})
+    assert sorted(written) == ["a.js", "b.js"] and failed == {}
+
+    written, _ = await lease.sync_files({"a.js": _fc("1"), "b.js": _fc("changed"), "c.js": _fc("3")})
+
+    assert sorted(written) == ["b.js", "c.js"]
+    assert runtime.starts == 1
+    assert runtime.writes[-2:] == ["/home/user/project/b.js", "/home/user/project/c.js"]
+
+
+@pytest.mark.asyncio
+async def test_failed_write_is_retried_on_next_sync():
+    """Files whose write failed are not recorded as synced."""
+    runtime = RecordingRuntime()
+    runtime.write_file = AsyncMock(side_effect=[SandboxError("disk full"), None])
+    lease = SandboxLease(runtime=runtime)
+
+    _, failed = await lease.sync_files({"a.js": _fc("1")})
+    written, failed_again = await lease.sync_files({"a.js": _fc("1")})
+
+    assert list(failed) == ["a.js"]
+    assert written == ["a.js"] and failed_again == {}
+
+
+@pytest.mark.asyncio
+async def test_runtime_install_skips_unchanged_manifest():
+    """E2BSandboxRuntime.install_dependencies runs npm install once per manifest hash."""
+    runtime = E2BSandboxRuntime()
+    runtime.run_command = AsyncMock(return_value={"stdout": "", "stderr": "", "exit_code": 0})
+    first = dependency_manifest_hash({"package.json": PACKAGE_JSON}, "node")
+    second = dependency_manifest_hash({"package.json": '{"dependencies": {"vite": "5"}}'}, "node")
+
+    assert await runtime.install_dependencies("node", first, cwd="/home/user/project") is not None
+    assert await runtime.install_dependencies("node", first, cwd="/home/user/project") is None
+    assert await runtime.install_dependencies("node", second, cwd="/home/user/project") is not None
+    assert runtime.run_command.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_runtime_install_failure_is_not_recorded():
+    """A failed install is retried next time rather than being treated as installed."""
+    runtime = E2BSandboxRuntime()
+    runtime.run_command = AsyncMock(return_value={"stdout": "", "stderr": "ERR", "exit_code": 1})
+    digest = dependency_manifest_hash({"package.json": PACKAGE_JSON}, "node")
+
+    await runtime.install_dependencies("node", digest)
+    await runtime.install_dependencies("node", digest)
+
+    assert runtime.run_command.await_count == 2
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Executor + GenerationService share one sandbox
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+@pytest.mark.asyncio
+async def test_executor_reuses_registered_lease_across_visits():
+    """Debugger retries reuse the job's sandbox: one boot, one install, only changed files rewritten."""
+    runtime = RecordingRuntime()
+    register_lease("job-exec", SandboxLease(lambda: runtime))
+    settings = MagicMock(e2b_api_key="key")
+
+    try:
+        with patch("app.agent.nodes.executor.get_settings", return_value=settings):
+            files = {"package.json": PACKAGE_JSON, "index.js": "bad"}
+            await executor_node(_node_state("job-exec", files))
+            files["index.js"] = "fixed"
+            result = await executor_node(_node_state("job-exec", files))
+    finally:
+        release_lease("job-exec")
+
+    assert runtime.starts == 1
+    assert runtime.commands.count("install:node") == 1
+    assert runtime.writes == [
+        "/home/user/project/package.json",
+        "/home/user/project/index.js",
+        "/home/user/project/index.js",
+    ]
+    assert "1 files written" in result["messages"][0]["content"]
+
+
+class _ExecutingRunner:
+    """Runner whose graph run includes an executor visit against the job's lease."""
+
+    def __init__(self, files: dict):
+        self.files = files
+
+    async def run(self, state):
+        state["working_files"] = {path: _fc(content) for path, content in self.files.items()}
+        lease = get_lease(state["session_id"])
+        await lease.sync_files(state["working_files"])
+        runtime = await lease.acquire()
+        await runtime.install_dependencies(
+            "node", dependency_manifest_hash(self.files, "node"), cwd=lease.workspace_path
+        )
+        return state
+
+
+@pytest.mark.asyncio
+async def test_execute_build_hands_executor_sandbox_to_deps_and_checks():
+    """DEPS/CHECKS run in the sandbox the graph used; nothing is re-written or re-installed."""
+    redis = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    state_machine = JobStateMachine(redis)
+    job_data = {"user_id": "u1", "project_id": "00000000-0000-0000-0000-000000000001", "goal": "Build"}
+    await state_machine.create_job("job-lease", job_data)
+
+    runtime = RecordingRuntime()
+    factory = MagicMock(return_value=runtime)
+    service = GenerationService(
+        runner=_ExecutingRunner({"package.json": PACKAGE_JSON, "index.js": "x"}), sandbox_runtime_factory=factory
+    )
+    service._get_next_build_version = AsyncMock(return_value="build_v0_2")  # type: ignore[method-assign]
+
+    result = await service.execute_build("job-lease", job_data, state_machine, redis=redis)
+
+    assert factory.call_count == 1
+    assert runtime.starts == 1
+    assert len(runtime.writes) == 2
+    assert runtime.commands.count("install:node") == 1
+    assert result["_sandbox_runtime"] is runtime
+    assert get_lease("job-lease") is None
+    await redis.aclose()
+
+
+@pytest.mark.asyncio
+async def test_execute_build_failure_stops_leased_sandbox():
+    """A build that fails after the sandbox started kills it instead of leaking it."""
+    redis = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    state_machine = JobStateMachine(redis)
+    job_data = {"user_id": "u1", "project_id": "00000000-0000-0000-0000-000000000001", "goal": "Build"}
+    await state_machine.create_job("job-fail", job_data)
+
+    runtime = RecordingRuntime()
+    runtime.start_dev_server = AsyncMock(side_effect=RuntimeError("boom"))
+    service = GenerationService(
+        runner=_ExecutingRunner({"package.json": PACKAGE_JSON, "index.js": "x"}),
+        sandbox_runtime_factory=lambda: runtime,
+    )
+
+    with pytest.raises(RuntimeError):
+        await service.execute_build("job-fail", job_data, state_machine, redis=redis)
+
+    assert runtime.stops == 1
+    assert get_lease("job-fail") is None
+    await redis.aclose()
@@ -0,0 +1,215 @@
+"""Tests for the warm sandbox pool and its integration with SandboxLease / GenerationService."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import fakeredis
+import pytest
+
+from app.queue.state_machine import JobStateMachine
+from app.sandbox.lease import SandboxLease
+from app.sandbox.pool import SandboxPool, detect_stack
+from app.services.generation_service import GenerationService
+from tests.sandbox.test_sandbox_lease import PACKAGE_JSON, RecordingRuntime, _ExecutingRunner, _fc
+
+pytestmark = pytest.mark.unit
+
+
+class FakeRuntimeFactory:
+    """Hands out a fresh RecordingRuntime per call and remembers them all."""
+
+    def __init__(self, install_exit_code: int = 0):
+        self.runtimes: list[RecordingRuntime] = []
+        self.install_exit_code = install_exit_code
+
+    def __call__(self) -> RecordingRuntime:
+        runtime = RecordingRuntime()
+        exit_code = self.install_exit_code
+        original = runtime.install_dependencies
+
+        async def install(ecosystem, manifest_hash, cwd=None, **kwargs):
+            if exit_code != 0:
+                return {"stdout": "", "stderr": "ERR", "exit_code": exit_code}
+            return await original(ecosystem, manifest_hash, cwd=cwd, **kwargs)
+
+        runtime.install_dependencies = install
+        self.runtimes.append(runtime)
+        return runtime
+
+
+@pytest.fixture(autouse=True)
+def _no_cloudwatch(_no_side_services):
+    with patch("app.sandbox.pool.emit_sandbox_pool_checkout", new=AsyncMock()) as checkout:
+        yield checkout, _no_side_services
+
+
+async def _settle(pool: SandboxPool) -> None:
+    """Wait for background refills spawned by checkout()."""
+    while pool._background:
+        await asyncio.gather(*list(pool._background))
+
+
+def test_detect_stack():
+    assert detect_stack({"package.json": _fc(PACKAGE_JSON)}) == "nextjs"
+    assert detect_stack({"package.json": _fc('{"devDependencies": {"vite": "5"}}')}) == "vite"
+    assert detect_stack({"package.json": _fc('{"dependencies": {"express": "4"}}')}) is None
+    assert detect_stack({"package.json": _fc("not json")}) is None
+    assert detect_stack({"main.py": _fc("")}) is None
+
+
+def test_unknown_stack_rejected():
+    with pytest.raises(ValueError, match="rails"):
+        SandboxPool(FakeRuntimeFactory(), stacks=["nextjs", "rails"])
+
+
+@pytest.mark.asyncio
+async def test_miss_then_refill_then_hit(_no_cloudwatch):
+    """An empty pool misses, refills in the background, and serves the next checkout warm."""
+    checkout_metric, _ = _no_cloudwatch
+    factory = FakeRuntimeFactory()
+    pool = SandboxPool(factory, stacks=["nextjs"], size=2)
+
+    assert await pool.checkout("nextjs") is None
+    await _settle(pool)
+    assert pool.stats()["nextjs"]["idle"] == 2
+
+    warm = await pool.checkout("nextjs")
+    await _settle(pool)
+
+    assert warm in factory.runtimes
+    assert pool.stats()["nextjs"] == {"idle": 2, "booting": 0, "hits": 1, "misses": 1}
+    assert len(factory.runtimes) == 3
+    assert [c.args for c in checkout_metric.await_args_list] == [("nextjs", False), ("nextjs", True)]
+
+
+@pytest.mark.asyncio
+async def test_boot_preinstalls_stack_manifest():
+    """Warm sandboxes have the canonical package.json written and installed."""
+    factory = FakeRuntimeFactory()
+    pool = SandboxPool(factory, stacks=["vite"], size=1)
+
+    await pool._refill("vite")
+    runtime = factory.runtimes[0]
+
+    assert runtime.starts == 1
+    assert runtime.writes == ["/home/user/project/package.json"]
+    assert runtime.commands == ["install:node"]
+
+
+@pytest.mark.asyncio
+async def test_failed_boot_is_discarded():
+    """A sandbox whose install failed is stopped and never handed out."""
+    factory = FakeRuntimeFactory(install_exit_code=1)
+    pool = SandboxPool(factory, stacks=["nextjs"], size=1)
+
+    await pool._refill("nextjs")
+
+    assert pool.stats()["nextjs"]["idle"] == 0
+    assert factory.runtimes[0].stops == 1
+
+
+@pytest.mark.asyncio
+async def test_reap_kills_idle_sandboxes():
+    """Sandboxes idle past idle_seconds are stopped by reap() and skipped by checkout()."""
+    factory = FakeRuntimeFactory()
+    pool = SandboxPool(factory, stacks=["nextjs"], size=2, idle_seconds=60)
+    await pool._refill("nextjs")
+    pool._idle["nextjs"][0].booted_at -= 120
+
+    assert await pool.reap() == 1
+    assert pool.stats()["nextjs"]["idle"] == 1
+    assert sum(r.stops for r in factory.runtimes) == 1
+
+    pool._idle["nextjs"][0].booted_at -= 120
+    assert await pool.checkout("nextjs") is None
+    await pool.stop()
+
+
+@pytest.mark.asyncio
+async def test_stop_kills_idle_and_cancels_maintenance():
+    factory = FakeRuntimeFactory()
+    pool = SandboxPool(factory, stacks=["nextjs", "vite"], size=1, maintenance_interval=3600)
+    pool.start()
+    while pool.stats()["nextjs"]["idle"] + pool.stats()["vite"]["idle"] < 2:
+        await asyncio.sleep(0)
+
+    await pool.stop()
+
+    assert [r.stops for r in factory.runtimes] == [1, 1]
+    assert pool._maintenance is None
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Lease / build integration
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+@pytest.mark.asyncio
+async def test_lease_takes_warm_sandbox_without_booting():
+    factory = FakeRuntimeFactory()
+    pool = SandboxPool(factory, stacks=["nextjs"], size=1)
+    await pool._refill("nextjs")
+    warm = factory.runtimes[0]
+    cold_factory = MagicMock()
+
+    lease = SandboxLease(cold_factory, pool=pool)
+    runtime = await lease.acquire("nextjs")
+    await _settle(pool)
+
+    assert runtime is warm and lease.pool_hit
+    assert warm.starts == 1
+    cold_factory.assert_not_called()
+    await pool.stop()
+    assert warm.stops == 0  # owned by the lease now
+
+
+@pytest.mark.asyncio
+async def test_lease_falls_back_to_factory_for_unpooled_stack(_no_cloudwatch):
+    """A cold boot for an unknown stack (no package.json yet) is still counted as a miss."""
+    checkout_metric, _ = _no_cloudwatch
+    pool = SandboxPool(FakeRuntimeFactory(), stacks=["nextjs"], size=1)
+    cold = RecordingRuntime()
+
+    lease = SandboxLease(lambda: cold, pool=pool)
+
+    assert await lease.acquire(None) is cold
+    assert cold.starts == 1 and not lease.pool_hit
+    assert pool.stats()["unknown"]["misses"] == 1
+    checkout_metric.assert_awaited_once_with("unknown", False)
+
+
+@pytest.mark.asyncio
+async def test_execute_build_reports_time_to_preview_with_pool_hit(_no_cloudwatch):
+    """A pooled build never calls the cold factory and tags time-to-preview as a hit."""
+    _, time_to_preview = _no_cloudwatch
+    redis = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    state_machine = JobStateMachine(redis)
+    job_data = {"user_id": "u1", "project_id": "00000000-0000-0000-0000-000000000001", "goal": "Build"}
+    await state_machine.create_job("job-pool", job_data)
+
+    factory = FakeRuntimeFactory()
+    pool = SandboxPool(factory, stacks=["nextjs"], size=1)
+    await pool._refill("nextjs")
+    cold_factory = MagicMock()
+
+    class _DepsOnlyRunner(_ExecutingRunner):
+        async def run(self, state):
+            state["working_files"] = {path: _fc(content) for path, content in self.files.items()}
+            return state
+
+    service = GenerationService(
+        runner=_DepsOnlyRunner({"package.json": PACKAGE_JSON, "index.js": "x"}),
+        sandbox_runtime_factory=cold_factory,
+        sandbox_pool=pool,
+    )
+    service._get_next_build_version = AsyncMock(return_value="build_v0_1")  # type: ignore[method-assign]
+
+    result = await service.execute_build("job-pool", job_data, state_machine, redis=redis)
+    await _settle(pool)
+
+    cold_factory.assert_not_called()
+    assert result["_sandbox_runtime"] is factory.runtimes[0]
+    seconds, pool_hit = time_to_preview.await_args.args
+    assert pool_hit is True and seconds >= 0
+    await pool.stop()
+    await redis.aclose()
@@ -0,0 +1,172 @@
+"""Tests for content-addressed workspace snapshots and restoring expired sandboxes from them."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.core.exceptions import SandboxError
+from app.sandbox.snapshot_store import LocalSnapshotStore, blob_digest, load_snapshot, save_snapshot
+from app.services.deploy_readiness_service import _load_build_files
+from app.services.generation_service import _previous_build_version
+from app.services.resume_service import SnapshotUnavailableError, restore_sandbox
+from tests.conftest import BulkWriteMixin
+
+pytestmark = pytest.mark.unit
+
+PROJECT = "00000000-0000-0000-0000-000000000001"
+
+
+def _change(path: str, content: str, change_type: str = "create") -> dict:
+    return {"path": path, "original_content": None, "new_content": content, "change_type": change_type}
+
+
+async def test_round_trip_and_dedup(tmp_path):
+    store = LocalSnapshotStore(tmp_path)
+    files = {
+        "package.json": _change("package.json", "{}"),
+        "src/a.ts": _change("src/a.ts", "export const x = 1\n"),
+        "src/b.ts": _change("src/b.ts", "export const x = 1\n"),  # same content as a.ts
+    }
+
+    manifest = await save_snapshot(store, PROJECT, "build_v0_1", files)
+
+    assert manifest["file_count"] == 3 and manifest["new_blobs"] == 2
+    assert manifest["files"]["src/a.ts"] == manifest["files"]["src/b.ts"] == blob_digest(b"export const x = 1\n")
+    assert len(list((tmp_path / "blobs").rglob("*"))) == 2 + 2  # two shard dirs, two blobs
+    assert await load_snapshot(store, PROJECT, "build_v0_1") == {
+        "package.json": "{}",
+        "src/a.ts": "export const x = 1\n",
+        "src/b.ts": "export const x = 1\n",
+    }
+
+
+async def test_unchanged_files_are_not_uploaded_again(tmp_path):
+    store = LocalSnapshotStore(tmp_path)
+    files = {"a.py": _change("a.py", "A = 1\n"), "b.py": _change("b.py", "B = 1\n")}
+    await save_snapshot(store, PROJECT, "build_v0_1", files)
+
+    files["b.py"] = _change("b.py", "B = 2\n", "modify")
+    manifest = await save_snapshot(store, PROJECT, "build_v0_2", files)
+
+    assert manifest["new_blobs"] == 1
+    assert (await load_snapshot(store, PROJECT, "build_v0_1"))["b.py"] == "B = 1\n"
+
+
+async def test_iteration_applies_changes_on_top_of_base_version(tmp_path):
+    store = LocalSnapshotStore(tmp_path)
+    await save_snapshot(
+        store, PROJECT, "build_v0_1", {"a.py": _change("a.py", "A\n"), "old.py": _change("old.py", "O\n")}
+    )
+
+    patch_files = {"b.py": _change("b.py", "B\n"), "old.py": _change("old.py", "", "delete")}
+    manifest = await save_snapshot(store, PROJECT, "build_v0_2", patch_files, base_version="build_v0_1")
+
+    assert manifest["base_version"] == "build_v0_1"
+    assert manifest["total_bytes"] == 4
+    assert await load_snapshot(store, PROJECT, "build_v0_2") == {"a.py": "A\n", "b.py": "B\n"}
+
+
+async def test_missing_snapshot_or_blob_loads_as_none(tmp_path):
+    store = LocalSnapshotStore(tmp_path)
+    assert await load_snapshot(store, PROJECT, "build_v0_9") is None
+
+    manifest = await save_snapshot(store, PROJECT, "build_v0_1", {"a.py": _change("a.py", "A\n")})
+    digest = manifest["files"]["a.py"]
+    (tmp_path / "blobs" / digest[:2] / digest).unlink()
+
+    assert await load_snapshot(store, PROJECT, "build_v0_1") is None
+
+
+def test_previous_build_version():
+    assert _previous_build_version("build_v0_3") == "build_v0_2"
+    assert _previous_build_version("build_v0_1") is None
+    assert _previous_build_version("unexpected") is None
+
+
+async def test_deploy_checks_read_the_build_snapshot(tmp_path):
+    store = LocalSnapshotStore(tmp_path)
+    await save_snapshot(store, PROJECT, "build_v0_1", {"package.json": _change("package.json", "{}")})
+
+    class _Job:
+        build_version = "build_v0_1"
+
+    with patch("app.services.deploy_readiness_service.get_snapshot_store", return_value=store):
+        assert await _load_build_files(PROJECT, _Job()) == {"package.json": "{}"}
+    with patch("app.services.deploy_readiness_service.get_snapshot_store", return_value=None):
+        assert await _load_build_files(PROJECT, _Job()) is None
+
+
+class _RestoreRuntime(BulkWriteMixin):
+    """Sandbox fake that records the restore's uploads and dev-server start."""
+
+    def __init__(self):
+        self.files: dict[str, str] = {}
+        self.archives: list[int] = []
+        self.stopped = False
+        self.served_with: dict | None = None
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        self.stopped = True
+
+    async def set_timeout(self, seconds):
+        pass
+
+    @property
+    def sandbox_id(self):
+        return "sbx-restored"
+
+    async def write_file(self, path, content):
+        self.files[path] = content
+
+    async def write_files(self, files, archive=None):
+        self.archives.append(len(files))
+        return await super().write_files(files)
+
+    async def start_dev_server(self, workspace_path, working_files=None, on_stdout=None, on_stderr=None):
+        self.served_with = working_files
+        return "https://3000-sbx-restored.e2b.app"
+
+
+async def test_restore_boots_sandbox_from_snapshot_without_llm(tmp_path):
+    store = LocalSnapshotStore(tmp_path)
+    await save_snapshot(store, PROJECT, "build_v0_2", {"package.json": _change("package.json", "{}")})
+    runtime = _RestoreRuntime()
+
+    with (
+        patch("app.services.resume_service.get_snapshot_store", return_value=store),
+        patch("app.services.resume_service.emit_sandbox_restore", new=AsyncMock()) as emit,
+        patch("app.core.llm_config.create_tracked_llm", side_effect=AssertionError("no LLM calls")),
+    ):
+        result = await restore_sandbox(PROJECT, "build_v0_2", "/home/user/project", runtime_factory=lambda: runtime)
+
+    assert result.preview_url == "https://3000-sbx-restored.e2b.app"
+    assert result.sandbox_id == "sbx-restored" and result.file_count == 1
+    assert runtime.archives == [1]
+    assert runtime.files == {"/home/user/project/package.json": "{}"}
+    assert runtime.served_with == {"package.json": "{}"}
+    emit.assert_awaited_once_with(result.restore_seconds)
+
+
+async def test_restore_without_snapshot_is_unavailable(tmp_path):
+    with patch("app.services.resume_service.get_snapshot_store", return_value=LocalSnapshotStore(tmp_path)):
+        with pytest.raises(SnapshotUnavailableError):
+            await restore_sandbox(PROJECT, "build_v0_1", "/home/user/project", runtime_factory=_RestoreRuntime)
+    with patch("app.services.resume_service.get_snapshot_store", return_value=None):
+        with pytest.raises(SnapshotUnavailableError):
+            await restore_sandbox(PROJECT, "build_v0_1", "/home/user/project", runtime_factory=_RestoreRuntime)
+
+
+async def test_failed_restore_stops_the_new_sandbox(tmp_path):
+    store = LocalSnapshotStore(tmp_path)
+    await save_snapshot(store, PROJECT, "build_v0_1", {"a.py": _change("a.py", "A\n")})
+    runtime = _RestoreRuntime()
+    runtime.start_dev_server = AsyncMock(side_effect=SandboxError("dev server never came up"))
+
+    with patch("app.services.resume_service.get_snapshot_store", return_value=store):
+        with pytest.raises(SandboxError):
+            await restore_sandbox(PROJECT, "build_v0_1", "/home/user/project", runtime_factory=lambda: runtime)
+
+    assert runtime.stopped is True
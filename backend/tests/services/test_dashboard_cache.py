@@ -0,0 +1,162 @@
+"""Tests for the two-query dashboard load and its per-project Redis snapshot."""
+
+import uuid
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import fakeredis
+import pytest
+
+from app.services.dashboard_cache import (
+    dashboard_key,
+    get_dashboard_snapshot,
+    invalidate_dashboard,
+    store_dashboard_snapshot,
+)
+from app.services.dashboard_service import DashboardService
+
+pytestmark = pytest.mark.unit
+
+PROJECT_ID = uuid.uuid4()
+NOW = datetime.now(UTC)
+
+
+@pytest.fixture
+def redis():
+    client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    with patch("app.db.redis.get_redis", return_value=client):
+        yield client
+
+
+@pytest.fixture
+def enabled():
+    settings = MagicMock(dashboard_cache_ttl_seconds=30)
+    with patch("app.services.dashboard_cache.get_settings", return_value=settings):
+        yield settings
+
+
+@pytest.fixture
+def no_llm_risks():
+    with patch("app.services.dashboard_service.detect_llm_risks", new=AsyncMock(return_value=[])) as mock:
+        yield mock
+
+
+def _result(one=None, rows=()):
+    result = MagicMock()
+    result.one_or_none.return_value = one
+    result.all.return_value = list(rows)
+    return result
+
+
+def _session(build_version="build_v0_2", in_flight=None):
+    """Fake session answering the project query, then the artifact/gate UNION ALL."""
+    project = SimpleNamespace(stage_number=1, updated_at=NOW)
+    milestones = {"brief": {"name": "Brief", "weight": 1, "completed": False}}
+    project_row = (project, milestones, NOW, 0, build_version, "https://preview.example", in_flight)
+    item_rows = [
+        SimpleNamespace(
+            kind="artifact",
+            id=uuid.uuid4(),
+            type="brief",
+            status="idle",
+            version_number=2,
+            has_user_edits=True,
+            at=NOW - timedelta(hours=1),
+        ),
+        SimpleNamespace(
+            kind="gate",
+            id=uuid.uuid4(),
+            type="stage_advance",
+            status="pending",
+            version_number=None,
+            has_user_edits=None,
+            at=NOW,
+        ),
+    ]
+    session = MagicMock()
+    session.execute = AsyncMock(side_effect=[_result(one=project_row), _result(rows=item_rows)])
+    return session
+
+
+class TestLoad:
+    async def test_dashboard_is_built_from_two_queries(self, no_llm_risks):
+        session = _session()
+        with patch("app.services.dashboard_service.get_dashboard_snapshot", new=AsyncMock(return_value=None)):
+            dashboard = await DashboardService().get_dashboard(session, PROJECT_ID, "user_1")
+
+        assert session.execute.await_count == 2
+        assert dashboard.product_version == "v0.2"
+        assert dashboard.latest_build_status == "success"
+        assert dashboard.preview_url == "https://preview.example"
+        assert [a.artifact_type for a in dashboard.artifacts] == ["brief"]
+        assert [d.gate_type for d in dashboard.pending_decisions] == ["stage_advance"]
+        assert dashboard.next_milestone == "Brief"
+
+    async def test_in_flight_job_overrides_build_status(self, no_llm_risks):
+        session = _session(in_flight="code")
+        with patch("app.services.dashboard_service.get_dashboard_snapshot", new=AsyncMock(return_value=None)):
+            dashboard = await DashboardService().get_dashboard(session, PROJECT_ID, "user_1")
+
+        assert dashboard.latest_build_status == "running"
+
+    async def test_missing_project_stops_after_first_query(self, redis, enabled, no_llm_risks):
+        session = MagicMock()
+        session.execute = AsyncMock(return_value=_result(one=None))
+
+        assert await DashboardService().get_dashboard(session, PROJECT_ID, "user_1") is None
+        assert session.execute.await_count == 1
+        assert await redis.keys("*") == []
+
+
+class TestSnapshot:
+    async def test_second_read_is_served_from_redis(self, redis, enabled, no_llm_risks):
+        service = DashboardService()
+        first = await service.get_dashboard(_session(), PROJECT_ID, "user_1")
+
+        cached_session = MagicMock()
+        cached_session.execute = AsyncMock()
+        second = await service.get_dashboard(cached_session, PROJECT_ID, "user_1")
+
+        cached_session.execute.assert_not_awaited()
+        assert second == first
+        assert 0 < await redis.ttl(dashboard_key(PROJECT_ID)) <= 30
+
+    async def test_snapshot_is_not_served_to_another_user(self, redis, enabled, no_llm_risks):
+        service = DashboardService()
+        await service.get_dashboard(_session(), PROJECT_ID, "user_1")
+
+        assert await service.get_dashboard(MagicMock(), PROJECT_ID, "intruder") is None
+
+    async def test_llm_risks_are_read_live(self, redis, enabled, no_llm_risks):
+        service = DashboardService()
+        await service.get_dashboard(_session(), PROJECT_ID, "user_1")
+
+        no_llm_risks.return_value = [{"type": "llm", "rule": "high_token_usage", "message": "Usage high"}]
+        dashboard = await service.get_dashboard(MagicMock(), PROJECT_ID, "user_1")
+
+        assert [r.rule for r in dashboard.risk_flags] == ["high_token_usage"]
+        assert no_llm_risks.await_count == 2
+        # The stored snapshot still excludes the per-user risk
+        snapshot = await get_dashboard_snapshot(PROJECT_ID)
+        assert snapshot["dashboard"]["risk_flags"] == []
+
+    async def test_invalidate_drops_the_snapshot(self, redis, enabled):
+        await store_dashboard_snapshot(PROJECT_ID, {"clerk_user_id": "user_1", "dashboard": {}})
+        await invalidate_dashboard(str(PROJECT_ID))
+
+        assert await get_dashboard_snapshot(PROJECT_ID) is None
+
+    async def test_disabled_cache_never_touches_redis(self, redis):
+        with patch("app.services.dashboard_cache.get_settings", return_value=MagicMock(dashboard_cache_ttl_seconds=0)):
+            await store_dashboard_snapshot(PROJECT_ID, {"clerk_user_id": "user_1", "dashboard": {}})
+            assert await get_dashboard_snapshot(PROJECT_ID) is None
+            await invalidate_dashboard(PROJECT_ID)
+
+        assert await redis.keys("*") == []
+
+    async def test_redis_errors_are_misses(self, enabled):
+        with patch("app.db.redis.get_redis", side_effect=RuntimeError("Redis not initialized")):
+            await store_dashboard_snapshot(PROJECT_ID, {"clerk_user_id": "user_1", "dashboard": {}})
+            await invalidate_dashboard(PROJECT_ID)
+            assert await get_dashboard_snapshot(PROJECT_ID) is None
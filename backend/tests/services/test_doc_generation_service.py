@@ -374,7 +374,7 @@ class TestCallClaudeWithRetry:
     """API call structure, retry on RateLimitError, raises on second failure."""
 
     async def test_calls_with_correct_model(self) -> None:
-        """AsyncAnthropic.messages.create() called with claude-3-5-haiku-20241022."""
+        """Shared AsyncAnthropic client's messages.create() called with claude-3-5-haiku-20241022."""
         service = DocGenerationService()
         mock_response = MagicMock()
         mock_response.content = [
@@ -382,19 +382,19 @@ class TestCallClaudeWithRetry:
         ]
 
         with (
-            patch("app.services.doc_generation_service.anthropic") as mock_anthropic,
+            patch("app.services.doc_generation_service.get_anthropic_client") as mock_get_client,
             patch("app.services.doc_generation_service.asyncio.wait_for", new_callable=AsyncMock) as mock_wait,
         ):
             mock_client = AsyncMock()
-            mock_anthropic.AsyncAnthropic.return_value = mock_client
+            mock_get_client.return_value = mock_client
             mock_wait.return_value = mock_response
 
             system = "system prompt"
             messages = [{"role": "user", "content": "spec"}]
             await service._call_claude_with_retry(system, messages)
 
-            # Verify client created with api_key from settings
-            mock_anthropic.AsyncAnthropic.assert_called_once()
+            # Shared client taken from the registry
+            mock_get_client.assert_called_once()
 
     async def test_returns_parsed_json_dict(self) -> None:
         """Returns a dict from the JSON response."""
@@ -406,13 +406,13 @@ class TestCallClaudeWithRetry:
         mock_response.content = [MagicMock(text=sections_json)]
 
         with (
-            patch("app.services.doc_generation_service.anthropic") as mock_anthropic,
+            patch("app.services.doc_generation_service.get_anthropic_client") as mock_get_client,
             patch("app.services.doc_generation_service.asyncio.wait_for", new_callable=AsyncMock) as mock_wait,
             patch("app.services.doc_generation_service.get_settings") as mock_settings,
         ):
             mock_settings.return_value.anthropic_api_key = "test-key"
             mock_client = AsyncMock()
-            mock_anthropic.AsyncAnthropic.return_value = mock_client
+            mock_get_client.return_value = mock_client
             mock_wait.return_value = mock_response
 
             system = "system"
@@ -445,13 +445,13 @@ class TestCallClaudeWithRetry:
             return mock_success_response
 
         with (
-            patch("app.services.doc_generation_service.anthropic") as mock_anthropic,
+            patch("app.services.doc_generation_service.get_anthropic_client") as mock_get_client,
             patch("app.services.doc_generation_service.asyncio") as mock_asyncio,
             patch("app.services.doc_generation_service.get_settings") as mock_settings,
         ):
             mock_settings.return_value.anthropic_api_key = "test-key"
             mock_client = AsyncMock()
-            mock_anthropic.AsyncAnthropic.return_value = mock_client
+            mock_get_client.return_value = mock_client
             # Keep real asyncio.TimeoutError available
             mock_asyncio.TimeoutError = asyncio.TimeoutError
             mock_asyncio.wait_for = mock_wait_for
@@ -480,13 +480,13 @@ class TestCallClaudeWithRetry:
             )
 
         with (
-            patch("app.services.doc_generation_service.anthropic") as mock_anthropic,
+            patch("app.services.doc_generation_service.get_anthropic_client") as mock_get_client,
             patch("app.services.doc_generation_service.asyncio") as mock_asyncio,
             patch("app.services.doc_generation_service.get_settings") as mock_settings,
         ):
             mock_settings.return_value.anthropic_api_key = "test-key"
             mock_client = AsyncMock()
-            mock_anthropic.AsyncAnthropic.return_value = mock_client
+            mock_get_client.return_value = mock_client
             mock_asyncio.TimeoutError = asyncio.TimeoutError
             mock_asyncio.wait_for = mock_wait_for_always_fail
             mock_asyncio.sleep = AsyncMock()
@@ -21,6 +21,7 @@ import pytest
 from app.agent.runner_fake import RunnerFake
 from app.queue.state_machine import JobStateMachine
 from app.services.generation_service import GenerationService
+from tests.conftest import BulkWriteMixin
 
 pytestmark = pytest.mark.unit
 
@@ -30,7 +31,7 @@ pytestmark = pytest.mark.unit
 # ---------------------------------------------------------------------------
 
 
-class FakeSandboxRuntime:
+class FakeSandboxRuntime(BulkWriteMixin):
     """Test double for E2BSandboxRuntime — no real network calls."""
 
     def __init__(self) -> None:
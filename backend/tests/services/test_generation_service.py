@@ -17,6 +17,7 @@ from app.agent.runner_fake import RunnerFake
 from app.queue.schemas import JobStatus
 from app.queue.state_machine import JobStateMachine
 from app.services.generation_service import GenerationService
+from tests.conftest import BulkWriteMixin
 
 pytestmark = pytest.mark.unit
 
@@ -26,7 +27,7 @@ pytestmark = pytest.mark.unit
 # ---------------------------------------------------------------------------
 
 
-class FakeSandboxRuntime:
+class FakeSandboxRuntime(BulkWriteMixin):
     """Test double for E2BSandboxRuntime — no real network calls."""
 
     def __init__(self) -> None:
@@ -457,3 +458,24 @@ def test_coder_prompt_requires_package_json():
 
     prompt_lower = CODER_SYSTEM_PROMPT.lower()
     assert "package.json" in prompt_lower, "Coder prompt must mention package.json to ensure web projects include it"
+
+
+async def test_execute_build_writes_workspace_snapshot(tmp_path):
+    """A successful build stores its files as the (project, build_version) manifest."""
+    from app.sandbox.snapshot_store import LocalSnapshotStore, load_snapshot
+
+    job_id = "test-job-snapshot-001"
+    state_machine, _ = await _make_state_machine()
+    job_data = await _create_queued_job(state_machine, job_id)
+    store = LocalSnapshotStore(tmp_path)
+
+    runner = RunnerFake(scenario="happy_path")
+    service = GenerationService(runner=runner, sandbox_runtime_factory=FakeSandboxRuntime)
+    service._get_next_build_version = AsyncMock(return_value="build_v0_1")  # type: ignore[method-assign]
+
+    with patch("app.services.generation_service.get_snapshot_store", return_value=store):
+        await service.execute_build(job_id, job_data, state_machine)
+
+    final_state = await RunnerFake(scenario="happy_path").run({})
+    files = await load_snapshot(store, job_data["project_id"], "build_v0_1")
+    assert files == {path: change["new_content"] for path, change in final_state["working_files"].items()}
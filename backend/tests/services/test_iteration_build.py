@@ -16,6 +16,7 @@ from app.agent.runner_fake import RunnerFake
 from app.queue.schemas import JobStatus
 from app.queue.state_machine import JobStateMachine
 from app.services.generation_service import GenerationService
+from tests.conftest import BulkWriteMixin
 
 pytestmark = pytest.mark.unit
 
@@ -25,7 +26,7 @@ pytestmark = pytest.mark.unit
 # ---------------------------------------------------------------------------
 
 
-class FakeSandboxRuntime:
+class FakeSandboxRuntime(BulkWriteMixin):
     """Happy-path test double for E2BSandboxRuntime — no real network calls."""
 
     def __init__(self) -> None:
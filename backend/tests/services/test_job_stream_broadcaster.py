@@ -0,0 +1,174 @@
+"""Tests for JobStreamBroadcaster — shared per-pod log/event fan-out and Last-Event-ID resume."""
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+
+import fakeredis.aioredis
+import pytest
+import pytest_asyncio
+
+from app.queue.schemas import JobStatus
+from app.queue.state_machine import JobStateMachine
+from app.services.job_stream_broadcaster import JobStreamBroadcaster
+
+pytestmark = pytest.mark.unit
+
+JOB_ID = "job-fanout-001"
+LOG_KEY = f"job:{JOB_ID}:logs"
+
+
+@pytest_asyncio.fixture
+async def redis():
+    r = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    yield r
+    await r.aclose()
+
+
+@asynccontextmanager
+async def _broadcaster(redis, **kwargs):
+    # Built inside the test: readers must live on the test's event loop
+    b = JobStreamBroadcaster(redis, block_ms=20, **kwargs)
+    try:
+        yield b
+    finally:
+        await b.close()
+
+
+async def _next(sub, kind: str):
+    """Next message, asserting its kind; fails on timeout."""
+    message = await sub.get(timeout=2.0)
+    assert message is not None, f"timed out waiting for {kind}"
+    assert message.kind == kind, message
+    return message
+
+
+async def _start_job(redis) -> JobStateMachine:
+    state_machine = JobStateMachine(redis)
+    await state_machine.create_job(JOB_ID, {"user_id": "u1"})
+    for status in (JobStatus.STARTING, JobStatus.SCAFFOLD, JobStatus.CODE, JobStatus.DEPS, JobStatus.CHECKS):
+        await state_machine.transition(JOB_ID, status)
+    return state_machine
+
+
+@pytest.mark.asyncio
+async def test_log_subscribers_share_one_reader(redis):
+    async with _broadcaster(redis) as broadcaster:
+        await redis.xadd(LOG_KEY, {"text": "before connect"})
+        first = await broadcaster.subscribe(JOB_ID, "logs")
+        second = await broadcaster.subscribe(JOB_ID, "logs")
+
+        assert broadcaster.stats() == {"jobs": 1, "log_subscribers": 2, "event_subscribers": 0, "readers": 1}
+
+        await asyncio.sleep(0.05)  # let the reader resolve the stream tail
+        await redis.xadd(LOG_KEY, {"text": "npm install"})
+
+        for sub in (first, second):
+            message = await _next(sub, "log")
+            assert message.data["text"] == "npm install"
+            assert message.id == sub.last_id
+
+
+@pytest.mark.asyncio
+async def test_terminal_event_drains_logs_then_signals_done(redis):
+    async with _broadcaster(redis) as broadcaster:
+        state_machine = await _start_job(redis)
+        logs = await broadcaster.subscribe(JOB_ID, "logs")
+        events = await broadcaster.subscribe(JOB_ID, "events")
+        await asyncio.sleep(0.05)
+
+        await redis.xadd(LOG_KEY, {"text": "last line"})
+        await state_machine.transition(JOB_ID, JobStatus.READY)
+
+        assert (await _next(logs, "log")).data["text"] == "last line"
+        assert (await _next(logs, "done")).data == "ready"
+        assert json.loads((await _next(events, "event")).data)["status"] == "ready"
+        assert (await _next(events, "done")).data == "ready"
+
+        # Late subscriber to a finished job is told immediately
+        late = await broadcaster.subscribe(JOB_ID, "logs")
+        assert (await _next(late, "done")).data == "ready"
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_is_evicted(redis):
+    async with _broadcaster(redis, queue_size=2) as broadcaster:
+        slow = await broadcaster.subscribe(JOB_ID, "logs")
+        await asyncio.sleep(0.05)
+        for i in range(3):
+            await redis.xadd(LOG_KEY, {"text": f"line {i}"})
+
+        await _next(slow, "evicted")
+        assert slow.evicted
+        assert broadcaster.stats()["log_subscribers"] == 0
+
+
+@pytest.mark.asyncio
+async def test_last_unsubscribe_stops_reader(redis):
+    async with _broadcaster(redis) as broadcaster:
+        logs = await broadcaster.subscribe(JOB_ID, "logs")
+        events = await broadcaster.subscribe(JOB_ID, "events")
+        reader = broadcaster._feeds[JOB_ID].reader
+
+        await broadcaster.unsubscribe(logs)
+        assert broadcaster.stats()["readers"] == 1  # still following events
+
+        await broadcaster.unsubscribe(events)
+        await asyncio.sleep(0)
+        assert reader.cancelled() or reader.done()
+        assert broadcaster.stats() == {"jobs": 0, "log_subscribers": 0, "event_subscribers": 0, "readers": 0}
+
+
+@pytest.mark.asyncio
+async def test_transition_appends_capped_event_stream(redis):
+    state_machine = await _start_job(redis)
+
+    entries = await redis.xrange(f"job:{JOB_ID}:events")
+
+    assert [json.loads(fields["data"])["status"] for _id, fields in entries] == [
+        "starting",
+        "scaffold",
+        "code",
+        "deps",
+        "checks",
+    ]
+    assert await redis.ttl(f"job:{JOB_ID}:events") > 0
+
+    await state_machine.publish_event(JOB_ID, {"type": "snapshot.updated", "snapshot_url": "https://cdn/x.png"})
+    _id, fields = (await redis.xrevrange(f"job:{JOB_ID}:events", count=1))[0]
+    assert json.loads(fields["data"])["type"] == "snapshot.updated"
+
+
+@pytest.mark.asyncio
+async def test_resume_replays_missed_events_without_duplicates(redis):
+    """Events published while the client was away are replayed, then live ones follow once."""
+    state_machine = await _start_job(redis)
+    entries = await redis.xrange(f"job:{JOB_ID}:events")
+    last_seen = entries[1][0]  # client saw starting + scaffold before disconnecting
+
+    async with _broadcaster(redis) as broadcaster:
+        sub = await broadcaster.subscribe(JOB_ID, "events", after_id=last_seen)
+        await asyncio.sleep(0.05)  # reader may fan out entries the replay also returns
+        await state_machine.transition(JOB_ID, JobStatus.READY)
+
+        replayed = [json.loads(m.data)["status"] async for m in broadcaster.replay(sub)]
+        live = []
+        while (message := await _next_any(sub)).kind != "done":
+            live.append(json.loads(message.data)["status"])
+
+    assert replayed + live == ["code", "deps", "checks", "ready"]
+
+
+async def _next_any(sub):
+    message = await sub.get(timeout=2.0)
+    assert message is not None
+    return message
+
+
+def test_parse_last_event_id():
+    from app.services.job_stream_broadcaster import parse_last_event_id
+
+    assert parse_last_event_id("1718000000000-3") == "1718000000000-3"
+    assert parse_last_event_id(" 1718000000000-0 ") == "1718000000000-0"
+    assert parse_last_event_id("abc") is None
+    assert parse_last_event_id(None) is None
@@ -18,6 +18,7 @@ from app.queue.state_machine import JobStateMachine
 from app.queue.worker import _archive_logs_to_s3
 from app.services.generation_service import GenerationService
 from app.services.log_streamer import LogStreamer
+from tests.conftest import BulkWriteMixin
 
 pytestmark = pytest.mark.unit
 
@@ -27,7 +28,7 @@ pytestmark = pytest.mark.unit
 # ---------------------------------------------------------------------------
 
 
-class FakeSandboxRuntimeWithCallbacks:
+class FakeSandboxRuntimeWithCallbacks(BulkWriteMixin):
     """Test double for E2BSandboxRuntime that invokes on_stdout/on_stderr callbacks."""
 
     def __init__(self) -> None:
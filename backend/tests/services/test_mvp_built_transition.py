@@ -21,6 +21,7 @@ from app.db.base import Base
 from app.db.models.project import Project
 from app.db.models.stage_event import StageEvent
 from app.services.generation_service import GenerationService
+from tests.conftest import BulkWriteMixin
 
 pytestmark = pytest.mark.integration
 
@@ -95,7 +96,7 @@ def _build_service_with_mocked_db(session: AsyncSession) -> GenerationService:
         def set_timeout(self, t: int) -> None:
             pass
 
-    class _FakeSandbox:
+    class _FakeSandbox(BulkWriteMixin):
         _sandbox = _FakeSandboxInner()
         _started = False
 
@@ -229,24 +229,22 @@ class TestCallClaude:
     """Claude API call structure and retry behavior."""
 
     async def test_calls_with_correct_model(self) -> None:
-        """AsyncAnthropic.messages.create() called with NARRATION_MODEL."""
+        """Shared AsyncAnthropic client's messages.create() called with NARRATION_MODEL."""
         service = NarrationService()
         mock_response = MagicMock()
         mock_response.content = [MagicMock(text="We're building your project structure now.")]
 
         with (
-            patch("app.services.narration_service.anthropic") as mock_anthropic,
+            patch("app.services.narration_service.get_anthropic_client") as mock_get_client,
             patch("app.services.narration_service.asyncio.wait_for", new_callable=AsyncMock) as mock_wait,
-            patch("app.services.narration_service.get_settings") as mock_settings,
         ):
-            mock_settings.return_value.anthropic_api_key = "test-key"
             mock_client = AsyncMock()
-            mock_anthropic.AsyncAnthropic.return_value = mock_client
+            mock_get_client.return_value = mock_client
             mock_wait.return_value = mock_response
 
             result = await service._call_claude("scaffold", "Build a task manager")
 
-            mock_anthropic.AsyncAnthropic.assert_called_once()
+            mock_get_client.assert_called_once()
             assert isinstance(result, str)
 
     async def test_returns_stripped_text(self) -> None:
@@ -256,13 +254,11 @@ class TestCallClaude:
         mock_response.content = [MagicMock(text="  We're setting up your project.  ")]
 
         with (
-            patch("app.services.narration_service.anthropic") as mock_anthropic,
+            patch("app.services.narration_service.get_anthropic_client") as mock_get_client,
             patch("app.services.narration_service.asyncio.wait_for", new_callable=AsyncMock) as mock_wait,
-            patch("app.services.narration_service.get_settings") as mock_settings,
         ):
-            mock_settings.return_value.anthropic_api_key = "test-key"
             mock_client = AsyncMock()
-            mock_anthropic.AsyncAnthropic.return_value = mock_client
+            mock_get_client.return_value = mock_client
             mock_wait.return_value = mock_response
 
             result = await service._call_claude("scaffold", "spec")
@@ -290,13 +286,11 @@ class TestCallClaude:
             return mock_response
 
         with (
-            patch("app.services.narration_service.anthropic") as mock_anthropic,
+            patch("app.services.narration_service.get_anthropic_client") as mock_get_client,
             patch("app.services.narration_service.asyncio") as mock_asyncio,
-            patch("app.services.narration_service.get_settings") as mock_settings,
         ):
-            mock_settings.return_value.anthropic_api_key = "test-key"
             mock_client = AsyncMock()
-            mock_anthropic.AsyncAnthropic.return_value = mock_client
+            mock_get_client.return_value = mock_client
             mock_asyncio.TimeoutError = asyncio.TimeoutError
             mock_asyncio.wait_for = mock_wait_for
             mock_asyncio.sleep = AsyncMock()
@@ -321,13 +315,11 @@ class TestCallClaude:
             )
 
         with (
-            patch("app.services.narration_service.anthropic") as mock_anthropic,
+            patch("app.services.narration_service.get_anthropic_client") as mock_get_client,
             patch("app.services.narration_service.asyncio") as mock_asyncio,
-            patch("app.services.narration_service.get_settings") as mock_settings,
         ):
-            mock_settings.return_value.anthropic_api_key = "test-key"
             mock_client = AsyncMock()
-            mock_anthropic.AsyncAnthropic.return_value = mock_client
+            mock_get_client.return_value = mock_client
             mock_asyncio.TimeoutError = asyncio.TimeoutError
             mock_asyncio.wait_for = mock_wait_for_always_fail
             mock_asyncio.sleep = AsyncMock()
@@ -0,0 +1,259 @@
+"""Services release their DB session across Runner (LLM) calls and write back optimistically.
+
+Each flow is read → LLM with no session open → short compare-and-set write; a row
+changed during the LLM call is answered with 409 instead of being overwritten.
+"""
+
+import uuid
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+
+pytestmark = pytest.mark.unit
+
+
+class _Updated:
+    """execute() result for an UPDATE statement."""
+
+    def __init__(self, rowcount: int):
+        self.rowcount = rowcount
+
+
+class _Result:
+    def __init__(self, value):
+        self.value = value
+        self.rowcount = value.rowcount if isinstance(value, _Updated) else 0
+
+    def scalar_one_or_none(self):
+        return self.value
+
+    def scalar_one(self):
+        return self.value
+
+    def scalar(self):
+        return self.value
+
+
+class _Sessions:
+    """Session factory answering execute() calls in order and tracking open sessions."""
+
+    def __init__(self, results: list, get_result=None):
+        self.results = list(results)
+        self.get_result = get_result
+        self.open = 0
+        self.statements: list = []
+        self.added: list = []
+        self.commits = 0
+
+    def __call__(self):
+        return _Session(self)
+
+
+class _Session:
+    def __init__(self, owner: _Sessions):
+        self.owner = owner
+
+    async def __aenter__(self):
+        self.owner.open += 1
+        return self
+
+    async def __aexit__(self, *exc):
+        self.owner.open -= 1
+
+    async def execute(self, statement):
+        self.owner.statements.append(statement)
+        return _Result(self.owner.results.pop(0))
+
+    def add(self, obj):
+        self.owner.added.append(obj)
+
+    async def commit(self):
+        self.owner.commits += 1
+
+    async def refresh(self, obj):
+        pass
+
+    async def get(self, model, row_id):
+        return self.owner.get_result
+
+
+def _llm(sessions: _Sessions, result):
+    """AsyncMock Runner method that fails if any DB session is open while it runs."""
+
+    async def call(*args, **kwargs):
+        assert sessions.open == 0, "DB session held across LLM call"
+        return result
+
+    return AsyncMock(side_effect=call)
+
+
+def _obj(**attrs) -> MagicMock:
+    obj = MagicMock()
+    obj.id = uuid.uuid4()
+    obj.updated_at = datetime(2026, 1, 1, tzinfo=UTC)
+    for key, value in attrs.items():
+        setattr(obj, key, value)
+    return obj
+
+
+# ---------------------------------------------------------------------------
+# OnboardingService.finalize_session
+# ---------------------------------------------------------------------------
+
+
+async def test_finalize_session_generates_thesis_without_a_session():
+    from app.services.onboarding_service import OnboardingService
+
+    onboarding = _obj(questions=[{"id": "q1", "required": True}], answers={"q1": "a"})
+    completed = _obj(status="completed")
+    sessions = _Sessions([onboarding, _Updated(1)], get_result=completed)
+    runner = MagicMock()
+    runner.generate_brief = _llm(sessions, {"problem": "p", "target_user": "t"})
+
+    result = await OnboardingService(runner, sessions).finalize_session("user-1", str(onboarding.id), "cto_scale")
+
+    assert result is completed
+    runner.generate_brief.assert_awaited_once_with({"q1": "a"})
+    assert sessions.commits == 1
+    # The write is guarded by the updated_at read before the LLM call
+    assert onboarding.updated_at in sessions.statements[1].compile().params.values()
+
+
+async def test_finalize_session_conflict_returns_409():
+    from app.services.onboarding_service import OnboardingService
+
+    onboarding = _obj(questions=[], answers={})
+    sessions = _Sessions([onboarding, _Updated(0)])
+    runner = MagicMock()
+    runner.generate_brief = _llm(sessions, {"problem": "p"})
+
+    with pytest.raises(HTTPException) as exc:
+        await OnboardingService(runner, sessions).finalize_session("user-1", str(onboarding.id), "cto_scale")
+
+    assert exc.value.status_code == 409
+    assert sessions.commits == 0
+
+
+# ---------------------------------------------------------------------------
+# GateService narrow/pivot
+# ---------------------------------------------------------------------------
+
+
+def _narrow_fixtures():
+    project = _obj(name="DogWalk", description="Dog walking")
+    gate = _obj(gate_type="direction", status="pending", context={}, project_id=project.id)
+    brief = _obj(version_number=3, current_content={"problem_statement": "old"})
+    onboarding = _obj(idea_text="Dog walking app")
+    understanding = _obj(questions=[{"id": "q1"}], answers={"q1": "a"})
+    return project, gate, brief, onboarding, understanding
+
+
+async def test_narrow_regenerates_brief_without_a_session():
+    from app.services.gate_service import GateService
+
+    project, gate, brief, onboarding, understanding = _narrow_fixtures()
+    sessions = _Sessions([gate, project, brief, onboarding, understanding, gate, _Updated(1)])
+    runner = MagicMock()
+    runner.generate_idea_brief = _llm(sessions, {"problem_statement": "narrowed"})
+
+    with patch("app.services.gate_service.JourneyService") as journey_cls, patch.object(GateService, "_sync_to_graph"):
+        journey_cls.return_value.decide_gate = AsyncMock()
+        response = await GateService(runner, sessions).resolve_gate(
+            "user-1", str(gate.id), "narrow", action_text="Only NYC"
+        )
+
+    assert response.resolution_summary == "Scope narrowed based on your input"
+    assert "[NARROWING INSTRUCTION]: Only NYC" in runner.generate_idea_brief.await_args.kwargs["idea"]
+    assert gate.context == {"narrowing_instruction": "Only NYC"}
+    journey_cls.return_value.decide_gate.assert_awaited_once()
+
+
+async def test_narrow_with_brief_edited_meanwhile_leaves_gate_pending():
+    from app.services.gate_service import GateService
+
+    project, gate, brief, onboarding, understanding = _narrow_fixtures()
+    sessions = _Sessions([gate, project, brief, onboarding, understanding, gate, _Updated(0)])
+    runner = MagicMock()
+    runner.generate_idea_brief = _llm(sessions, {"problem_statement": "pivoted"})
+
+    with patch("app.services.gate_service.JourneyService") as journey_cls:
+        journey_cls.return_value.decide_gate = AsyncMock()
+        with pytest.raises(HTTPException) as exc:
+            await GateService(runner, sessions).resolve_gate("user-1", str(gate.id), "pivot", action_text="B2B")
+
+    assert exc.value.status_code == 409
+    journey_cls.return_value.decide_gate.assert_not_awaited()
+
+
+# ---------------------------------------------------------------------------
+# ExecutionPlanService.generate_options
+# ---------------------------------------------------------------------------
+
+_OPTIONS = {
+    "options": [],
+    "recommended_id": "fast-mvp",
+}
+
+
+async def test_generate_options_rotates_plan_after_llm_call():
+    from app.services.execution_plan_service import ExecutionPlanService
+
+    project = _obj()
+    brief = _obj(current_content={"problem_statement": "p"})
+    existing_plan = _obj(version_number=2, current_content={"plan_set_id": "old"})
+    sessions = _Sessions([project, None, brief, existing_plan, _Updated(1)])
+    runner = MagicMock()
+    runner.generate_execution_options = _llm(sessions, _OPTIONS)
+
+    with patch("app.services.execution_plan_service.GateService") as gate_cls:
+        gate_cls.return_value.check_gate_blocking = AsyncMock(return_value=False)
+        response = await ExecutionPlanService(runner, sessions).generate_options("user-1", str(uuid.uuid4()))
+
+    assert response.recommended_id == "fast-mvp"
+    assert sessions.commits == 1
+
+
+async def test_generate_options_conflict_returns_409():
+    from app.services.execution_plan_service import ExecutionPlanService
+
+    existing_plan = _obj(version_number=2, current_content={})
+    sessions = _Sessions([_obj(), None, _obj(current_content={"p": 1}), existing_plan, _Updated(0)])
+    runner = MagicMock()
+    runner.generate_execution_options = _llm(sessions, _OPTIONS)
+
+    with patch("app.services.execution_plan_service.GateService") as gate_cls:
+        gate_cls.return_value.check_gate_blocking = AsyncMock(return_value=False)
+        with pytest.raises(HTTPException) as exc:
+            await ExecutionPlanService(runner, sessions).generate_options("user-1", str(uuid.uuid4()))
+
+    assert exc.value.status_code == 409
+
+
+# ---------------------------------------------------------------------------
+# UnderstandingService.edit_brief_section
+# ---------------------------------------------------------------------------
+
+
+async def test_edit_brief_section_assesses_confidence_without_a_session():
+    from app.services.understanding_service import UnderstandingService
+
+    content = {"problem_statement": "old", "confidence_scores": {"problem_statement": "weak"}}
+    artifact = _obj(version_number=4, current_content=content)
+    sessions = _Sessions([_obj(), artifact, _Updated(1)])
+    runner = MagicMock()
+    runner.assess_section_confidence = _llm(sessions, "strong")
+
+    result = await UnderstandingService(runner, sessions).edit_brief_section(
+        "user-1", str(uuid.uuid4()), "problem_statement", "new"
+    )
+
+    assert result == {"updated_section": "new", "new_confidence": "strong", "version": 5}
+    params = sessions.statements[2].compile().params
+    assert params["current_content"]["confidence_scores"] == {"problem_statement": "strong"}
+    # previous_content keeps the pre-edit scores
+    assert params["previous_content"] == {
+        "problem_statement": "old",
+        "confidence_scores": {"problem_statement": "weak"},
+    }
@@ -33,6 +33,9 @@ const INITIAL_STATE: BuildLogsState = {
   autoFixAttempt: null,
 };
 
+// Delay before resuming a dropped log stream (e.g. ALB/idle disconnect)
+const RECONNECT_DELAY_MS = 2000;
+
 const AUTO_FIX_REGEX = /auto.fix.*?attempt\s+(\d+)\s+of\s+(\d+)/i;
 const CLEAR_AUTO_FIX_REGEX = /running health checks|starting dev server/i;
 
@@ -52,116 +55,138 @@ export function useBuildLogs(
     const controller = new AbortController();
     abortRef.current = controller;
 
-    let response: Response;
-    try {
-      response = await apiFetch(`/api/jobs/${jobId}/logs/stream`, getToken, {
-        signal: controller.signal,
-      });
-    } catch (err) {
-      if ((err as Error).name === "AbortError") return;
-      setState((s) => ({ ...s, isConnected: false }));
-      return;
-    }
+    // Stream ID of the last log line received; sent as Last-Event-ID on
+    // reconnect so the server replays exactly the lines missed in between
+    let lastEventId: string | null = null;
 
-    if (!response.ok || !response.body) {
-      setState((s) => ({ ...s, isConnected: false }));
-      return;
+    while (!controller.signal.aborted) {
+      const finished = await streamOnce();
+      if (finished || controller.signal.aborted) return;
+      await new Promise((resolve) => setTimeout(resolve, RECONNECT_DELAY_MS));
     }
 
-    setState((s) => ({ ...s, isConnected: true }));
+    // Reads one SSE connection; returns true once the build is done
+    async function streamOnce(): Promise<boolean> {
+      let response: Response;
+      try {
+        response = await apiFetch(`/api/jobs/${jobId}/logs/stream`, getToken, {
+          signal: controller.signal,
+          headers: lastEventId ? { "Last-Event-ID": lastEventId } : undefined,
+        });
+      } catch (err) {
+        if ((err as Error).name === "AbortError") return true;
+        setState((s) => ({ ...s, isConnected: false }));
+        return false;
+      }
 
-    const reader = response.body.getReader();
-    readerRef.current = reader;
-    const decoder = new TextDecoder("utf-8", { fatal: false });
-    let buffer = "";
+      if (!response.ok || !response.body) {
+        setState((s) => ({ ...s, isConnected: false }));
+        // 4xx (auth, unknown job) will not fix itself on retry
+        return response.status < 500;
+      }
 
-    try {
-      while (true) {
-        const { done, value } = await reader.read();
-        if (done) break;
+      setState((s) => ({ ...s, isConnected: true }));
 
-        buffer += decoder.decode(value, { stream: true });
+      const reader = response.body.getReader();
+      readerRef.current = reader;
+      const decoder = new TextDecoder("utf-8", { fatal: false });
+      let buffer = "";
 
-        // Split on double newline — SSE block separator
-        const blocks = buffer.split("\n\n");
-        // Keep the last potentially-incomplete segment in buffer
-        buffer = blocks.pop() ?? "";
+      try {
+        while (true) {
+          const { done, value } = await reader.read();
+          if (done) {
+            // Server closed without a done event — resume from lastEventId
+            setState((s) => ({ ...s, isConnected: false }));
+            return false;
+          }
 
-        for (const block of blocks) {
-          if (!block.trim()) continue;
+          buffer += decoder.decode(value, { stream: true });
 
-          // Parse named SSE fields
-          let eventType = "message";
-          let dataStr = "";
+          // Split on double newline — SSE block separator
+          const blocks = buffer.split("\n\n");
+          // Keep the last potentially-incomplete segment in buffer
+          buffer = blocks.pop() ?? "";
 
-          for (const line of block.split("\n")) {
-            if (line.startsWith("event:")) {
-              eventType = line.slice(6).trim();
-            } else if (line.startsWith("data:")) {
-              dataStr = line.slice(5).trim();
-            }
-          }
+          for (const block of blocks) {
+            if (!block.trim()) continue;
 
-          if (eventType === "heartbeat") {
-            // No-op — keeps connection alive past ALB 60s idle timeout
-            continue;
-          }
+            // Parse named SSE fields
+            let eventType = "message";
+            let dataStr = "";
 
-          if (eventType === "done") {
-            let parsedStatus: "ready" | "failed" | null = null;
-            try {
-              const parsed = JSON.parse(dataStr) as { status: "ready" | "failed" };
-              parsedStatus = parsed.status;
-            } catch {
-              // ignore parse error
+            for (const line of block.split("\n")) {
+              if (line.startsWith("id:")) {
+                lastEventId = line.slice(3).trim();
+              } else if (line.startsWith("event:")) {
+                eventType = line.slice(6).trim();
+              } else if (line.startsWith("data:")) {
+                dataStr = line.slice(5).trim();
+              }
             }
-            setState((s) => ({
-              ...s,
-              isDone: true,
-              isConnected: false,
-              doneStatus: parsedStatus,
-            }));
-            return;
-          }
 
-          if (eventType === "log") {
-            let logLine: LogLine;
-            try {
-              logLine = JSON.parse(dataStr) as LogLine;
-            } catch {
+            if (eventType === "heartbeat") {
+              // No-op — keeps connection alive past ALB 60s idle timeout
               continue;
             }
 
-            // Auto-fix detection from system source lines
-            if (logLine.source === "system") {
-              const autoFixMatch = AUTO_FIX_REGEX.exec(logLine.text);
-              if (autoFixMatch) {
-                const attempt = parseInt(autoFixMatch[1], 10);
-                setState((s) => ({
-                  ...s,
-                  lines: [...s.lines, logLine],
-                  autoFixAttempt: attempt,
-                }));
-                continue;
+            if (eventType === "done") {
+              let parsedStatus: "ready" | "failed" | null = null;
+              try {
+                const parsed = JSON.parse(dataStr) as { status: "ready" | "failed" };
+                parsedStatus = parsed.status;
+              } catch {
+                // ignore parse error
               }
+              setState((s) => ({
+                ...s,
+                isDone: true,
+                isConnected: false,
+                doneStatus: parsedStatus,
+              }));
+              return true;
+            }
 
-              if (CLEAR_AUTO_FIX_REGEX.test(logLine.text)) {
-                setState((s) => ({
-                  ...s,
-                  lines: [...s.lines, logLine],
-                  autoFixAttempt: null,
-                }));
+            if (eventType === "log") {
+              let logLine: LogLine;
+              try {
+                logLine = JSON.parse(dataStr) as LogLine;
+              } catch {
                 continue;
               }
-            }
 
-            setState((s) => ({ ...s, lines: [...s.lines, logLine] }));
+              // Auto-fix detection from system source lines
+              if (logLine.source === "system") {
+                const autoFixMatch = AUTO_FIX_REGEX.exec(logLine.text);
+                if (autoFixMatch) {
+                  const attempt = parseInt(autoFixMatch[1], 10);
+                  setState((s) => ({
+                    ...s,
+                    lines: [...s.lines, logLine],
+                    autoFixAttempt: attempt,
+                  }));
+                  continue;
+                }
+
+                if (CLEAR_AUTO_FIX_REGEX.test(logLine.text)) {
+                  setState((s) => ({
+                    ...s,
+                    lines: [...s.lines, logLine],
+                    autoFixAttempt: null,
+                  }));
+                  continue;
+                }
+              }
+
+              setState((s) => ({ ...s, lines: [...s.lines, logLine] }));
+            }
           }
         }
+      } catch (err) {
+        if ((err as Error).name === "AbortError") return true;
+        setState((s) => ({ ...s, isConnected: false }));
       }
-    } catch (err) {
-      if ((err as Error).name === "AbortError") return;
-      setState((s) => ({ ...s, isConnected: false }));
+      return false;
     }
   }, [jobId, getToken]);
 
@@ -7,6 +7,7 @@ import * as acm from "aws-cdk-lib/aws-certificatemanager";
 import * as route53 from "aws-cdk-lib/aws-route53";
 import * as secretsmanager from "aws-cdk-lib/aws-secretsmanager";
 import * as iam from "aws-cdk-lib/aws-iam";
+import * as cloudwatch from "aws-cdk-lib/aws-cloudwatch";
 import * as logs from "aws-cdk-lib/aws-logs";
 import * as route53Targets from "aws-cdk-lib/aws-route53-targets";
 import * as s3 from "aws-cdk-lib/aws-s3";
@@ -84,6 +85,64 @@ export class ComputeStack extends cdk.Stack {
       props.screenshotsBucket.grantPut(taskRole);
     }
 
+    // Shared by the API and worker containers (same image, different entry points)
+    const backendEnvironment: Record<string, string> = {
+      ENVIRONMENT: "production",
+      FRONTEND_URL: `https://${domainName}`,
+      BACKEND_URL: `https://api.${domainName}`,
+      REDIS_URL: `redis://${redisEndpoint}:6379`,
+      CLERK_PUBLISHABLE_KEY:
+        "pk_test_c3VwZXJiLXRpY2stNDUuY2xlcmsuYWNjb3VudHMuZGV2JA",
+      STRIPE_PRICE_BOOTSTRAPPER_MONTHLY: "price_1T126T63L5edW2iAdYPw3Pc6",
+      STRIPE_PRICE_BOOTSTRAPPER_ANNUAL: "price_1T126T63L5edW2iAWH9DDH0U",
+      STRIPE_PRICE_PARTNER_MONTHLY: "price_1T126U63L5edW2iAsPNrUdfM",
+      STRIPE_PRICE_PARTNER_ANNUAL: "price_1T126V63L5edW2iAmeWZT55r",
+      STRIPE_PRICE_CTO_MONTHLY: "price_1T126V63L5edW2iABYmT6Ol9",
+      STRIPE_PRICE_CTO_ANNUAL: "price_1T126W63L5edW2iAbuHnmrHQ",
+      // Screenshots infrastructure — provided by ScreenshotsStack; fallback to '' before first deploy
+      SCREENSHOTS_BUCKET: props.screenshotsBucket?.bucketName ?? '',
+      SCREENSHOTS_CLOUDFRONT_DOMAIN: props.screenshotsCloudFrontDomain ?? '',
+      SCREENSHOT_ENABLED: 'true',
+      DOCS_GENERATION_ENABLED: 'true',
+    };
+
+    const backendSecrets: Record<string, ecs.Secret> = {
+      ANTHROPIC_API_KEY: ecs.Secret.fromSecretsManager(
+        appSecrets,
+        "ANTHROPIC_API_KEY"
+      ),
+      E2B_API_KEY: ecs.Secret.fromSecretsManager(appSecrets, "E2B_API_KEY"),
+      CLERK_SECRET_KEY: ecs.Secret.fromSecretsManager(
+        appSecrets,
+        "CLERK_SECRET_KEY"
+      ),
+      GITHUB_APP_ID: ecs.Secret.fromSecretsManager(
+        appSecrets,
+        "GITHUB_APP_ID"
+      ),
+      GITHUB_PRIVATE_KEY: ecs.Secret.fromSecretsManager(
+        appSecrets,
+        "GITHUB_PRIVATE_KEY"
+      ),
+      NEO4J_URI: ecs.Secret.fromSecretsManager(appSecrets, "NEO4J_URI"),
+      NEO4J_PASSWORD: ecs.Secret.fromSecretsManager(
+        appSecrets,
+        "NEO4J_PASSWORD"
+      ),
+      DATABASE_URL: ecs.Secret.fromSecretsManager(
+        appSecrets,
+        "DATABASE_URL"
+      ),
+      STRIPE_SECRET_KEY: ecs.Secret.fromSecretsManager(
+        appSecrets,
+        "STRIPE_SECRET_KEY"
+      ),
+      STRIPE_WEBHOOK_SECRET: ecs.Secret.fromSecretsManager(
+        appSecrets,
+        "STRIPE_WEBHOOK_SECRET"
+      ),
+    };
+
     // Backend Task Definition
     const backendTaskDef = new ecs.FargateTaskDefinition(
       this,
@@ -102,61 +161,8 @@ export class ComputeStack extends cdk.Stack {
         streamPrefix: "backend",
         logRetention: logs.RetentionDays.ONE_MONTH,
       }),
-      environment: {
-        ENVIRONMENT: "production",
-        FRONTEND_URL: `https://${domainName}`,
-        BACKEND_URL: `https://api.${domainName}`,
-        REDIS_URL: `redis://${redisEndpoint}:6379`,
-        CLERK_PUBLISHABLE_KEY:
-          "pk_test_c3VwZXJiLXRpY2stNDUuY2xlcmsuYWNjb3VudHMuZGV2JA",
-        STRIPE_PRICE_BOOTSTRAPPER_MONTHLY: "price_1T126T63L5edW2iAdYPw3Pc6",
-        STRIPE_PRICE_BOOTSTRAPPER_ANNUAL: "price_1T126T63L5edW2iAWH9DDH0U",
-        STRIPE_PRICE_PARTNER_MONTHLY: "price_1T126U63L5edW2iAsPNrUdfM",
-        STRIPE_PRICE_PARTNER_ANNUAL: "price_1T126V63L5edW2iAmeWZT55r",
-        STRIPE_PRICE_CTO_MONTHLY: "price_1T126V63L5edW2iABYmT6Ol9",
-        STRIPE_PRICE_CTO_ANNUAL: "price_1T126W63L5edW2iAbuHnmrHQ",
-        // Screenshots infrastructure — provided by ScreenshotsStack; fallback to '' before first deploy
-        SCREENSHOTS_BUCKET: props.screenshotsBucket?.bucketName ?? '',
-        SCREENSHOTS_CLOUDFRONT_DOMAIN: props.screenshotsCloudFrontDomain ?? '',
-        SCREENSHOT_ENABLED: 'true',
-        DOCS_GENERATION_ENABLED: 'true',
-      },
-      secrets: {
-        ANTHROPIC_API_KEY: ecs.Secret.fromSecretsManager(
-          appSecrets,
-          "ANTHROPIC_API_KEY"
-        ),
-        E2B_API_KEY: ecs.Secret.fromSecretsManager(appSecrets, "E2B_API_KEY"),
-        CLERK_SECRET_KEY: ecs.Secret.fromSecretsManager(
-          appSecrets,
-          "CLERK_SECRET_KEY"
-        ),
-        GITHUB_APP_ID: ecs.Secret.fromSecretsManager(
-          appSecrets,
-          "GITHUB_APP_ID"
-        ),
-        GITHUB_PRIVATE_KEY: ecs.Secret.fromSecretsManager(
-          appSecrets,
-          "GITHUB_PRIVATE_KEY"
-        ),
-        NEO4J_URI: ecs.Secret.fromSecretsManager(appSecrets, "NEO4J_URI"),
-        NEO4J_PASSWORD: ecs.Secret.fromSecretsManager(
-          appSecrets,
-          "NEO4J_PASSWORD"
-        ),
-        DATABASE_URL: ecs.Secret.fromSecretsManager(
-          appSecrets,
-          "DATABASE_URL"
-        ),
-        STRIPE_SECRET_KEY: ecs.Secret.fromSecretsManager(
-          appSecrets,
-          "STRIPE_SECRET_KEY"
-        ),
-        STRIPE_WEBHOOK_SECRET: ecs.Secret.fromSecretsManager(
-          appSecrets,
-          "STRIPE_WEBHOOK_SECRET"
-        ),
-      },
+      environment: backendEnvironment,
+      secrets: backendSecrets,
       healthCheck: {
         command: [
           "CMD-SHELL",
@@ -320,6 +326,86 @@ export class ComputeStack extends cdk.Stack {
       scaleOutCooldown: cdk.Duration.seconds(60),
     });
 
+    // Job worker: same image, runs `python -m app.worker` and blocks on the Redis queue.
+    // No load balancer — builds scale by adding worker tasks, independent of API traffic.
+    const workerTaskDef = new ecs.FargateTaskDefinition(
+      this,
+      "WorkerTaskDef",
+      {
+        memoryLimitMiB: 2048,
+        cpu: 1024,
+        taskRole,
+      }
+    );
+
+    workerTaskDef.addContainer("Worker", {
+      image: ecs.ContainerImage.fromEcrRepository(backendRepo, "latest"),
+      command: ["python", "-m", "app.worker"],
+      logging: ecs.LogDrivers.awsLogs({
+        streamPrefix: "worker",
+        logRetention: logs.RetentionDays.ONE_MONTH,
+      }),
+      environment: {
+        ...backendEnvironment,
+        WORKER_CONCURRENCY: "4",
+        // Busy tasks are scale-in protected (and deployments wait for protection to
+        // clear), so SIGTERM only reaches a busy worker on host retirement. Jobs still
+        // running when the drain times out are marked FAILED before SIGKILL.
+        WORKER_DRAIN_TIMEOUT_SECONDS: "110",
+        WORKER_PROTECTION_MINUTES: "120",
+        // One warm Next.js and one warm Vite sandbox per task (reaped after 20 min idle)
+        SANDBOX_POOL_SIZE: "1",
+        // node_modules tarballs keyed on manifest + lockfile hash (task ephemeral storage)
+        DEPENDENCY_CACHE_DIR: "/tmp/dependency-cache",
+        // One pooled DB connection per consumer; overflow covers status/log writes during builds
+        DB_POOL_SIZE: "4",
+        DB_MAX_OVERFLOW: "4",
+      },
+      secrets: backendSecrets,
+      // Fargate maximum — SIGTERM stops new admissions, in-flight builds get the window
+      stopTimeout: cdk.Duration.seconds(120),
+    });
+
+    // Worker marks its own task protected via the ECS agent while builds are in flight
+    workerTaskDef.addToTaskRolePolicy(
+      new iam.PolicyStatement({
+        actions: ["ecs:GetTaskProtection", "ecs:UpdateTaskProtection"],
+        resources: ["*"],
+      })
+    );
+    // Queue-depth metrics (CoFounder/Queue) published by every worker
+    cloudwatch.Metric.grantPutMetricData(workerTaskDef.taskRole);
+
+    const workerService = new ecs.FargateService(this, "WorkerService", {
+      cluster: this.cluster,
+      taskDefinition: workerTaskDef,
+      desiredCount: 1,
+      securityGroups: [backendSg],
+      assignPublicIp: false,
+      vpcSubnets: {
+        subnetType: ec2.SubnetType.PRIVATE_WITH_EGRESS,
+      },
+    });
+
+    const workerScaling = workerService.autoScaleTaskCount({
+      minCapacity: 1,
+      maxCapacity: 6,
+    });
+
+    // Consumers are I/O-bound (LLM + sandbox calls), so CPU says little about load.
+    // Track (queued + running jobs) / live workers against per-task concurrency.
+    workerScaling.scaleToTrackCustomMetric("WorkerBacklogScaling", {
+      metric: new cloudwatch.Metric({
+        namespace: "CoFounder/Queue",
+        metricName: "BacklogPerWorker",
+        statistic: "Average",
+        period: cdk.Duration.minutes(1),
+      }),
+      targetValue: 4, // = WORKER_CONCURRENCY
+      scaleInCooldown: cdk.Duration.seconds(600),
+      scaleOutCooldown: cdk.Duration.seconds(60),
+    });
+
     // Outputs
     new cdk.CfnOutput(this, "BackendRepoUri", {
       value: backendRepo.repositoryUri,